@@ -181,5 +181,21 @@ def main():
         sys.exit(1)
 
 
+def profile_startup_imports():
+    """打印启动导入耗时报告（python -m app --profile-imports [--top N]）"""
+    from app.core.import_profile import profile_imports
+
+    top = 20
+    if "--top" in sys.argv:
+        try:
+            top = int(sys.argv[sys.argv.index("--top") + 1])
+        except (IndexError, ValueError):
+            pass
+    print(profile_imports("app.main", top=top))
+
+
 if __name__ == "__main__":
-    main()
+    if "--profile-imports" in sys.argv:
+        profile_startup_imports()
+    else:
+        main()
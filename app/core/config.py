@@ -120,6 +120,11 @@ class Settings(BaseSettings):
     CACHE_TTL: int = Field(default=3600)  # 1小时
     SCREENING_CACHE_TTL: int = Field(default=1800)  # 30分钟
 
+    # 报告导出（PDF/Word）渲染：按内容哈希缓存到磁盘，在独立进程池中生成
+    REPORT_RENDER_CACHE_DIR: str = Field(default="./data/cache/rendered_reports", description="渲染结果缓存目录")
+    REPORT_RENDER_CACHE_MAX_MB: int = Field(default=512, ge=0, description="渲染结果缓存上限（MB），超出后按最近使用时间淘汰")
+    REPORT_RENDER_WORKERS: int = Field(default=2, ge=1, le=16, description="渲染进程池大小")
+
     # 安全配置
     BCRYPT_ROUNDS: int = Field(default=12)
     SESSION_EXPIRE_HOURS: int = Field(default=24)
@@ -158,6 +163,15 @@ class Settings(BaseSettings):
     # 时区
     TIMEZONE: str = Field(default="Asia/Shanghai")
 
+    # 定时任务调度器运行方式
+    # - embedded：随 API 进程启动，多个 worker/副本通过 Redis 选举出唯一的调度器 Leader
+    # - standalone：API 进程不运行调度器，由独立进程 `python -m app.scheduler_runner` 负责（同样参与选举）
+    SCHEDULER_MODE: str = Field(default="embedded")
+    # Leader 锁过期时间（秒），Leader 每 1/3 TTL 续约一次
+    SCHEDULER_LEADER_TTL_SECONDS: int = Field(default=30)
+    # Leader 发布任务状态（供其他副本查询）的间隔（秒）
+    SCHEDULER_STATE_PUBLISH_INTERVAL_SECONDS: int = Field(default=15)
+
     # 实时行情入库任务
     QUOTES_INGEST_ENABLED: bool = Field(default=True)
     QUOTES_INGEST_INTERVAL_SECONDS: int = Field(
@@ -168,6 +182,22 @@ class Settings(BaseSettings):
     QUOTES_BACKFILL_ON_STARTUP: bool = Field(default=True)
     QUOTES_BACKFILL_ON_OFFHOURS: bool = Field(default=True)
 
+    # 进程内行情快照（由行情入库后的 Redis 事件刷新）
+    QUOTES_SNAPSHOT_CHANNEL: str = Field(default="quotes:updated", description="行情更新事件的 Redis pub/sub 频道")
+    QUOTES_SNAPSHOT_MAX_AGE_SECONDS: int = Field(
+        default=900,
+        description="未收到更新事件时（如 Redis 不可用）行情快照的最长使用时间（秒），超时后从 market_quotes 重新加载"
+    )
+
+    # 事件循环延迟监控（/api/health/event-loop 提供 p50/p99）
+    EVENT_LOOP_LAG_INTERVAL_SECONDS: float = Field(default=0.5, description="事件循环延迟采样间隔（秒）")
+    EVENT_LOOP_LAG_WARN_MS: float = Field(default=500.0, description="单次延迟超过该值（毫秒）时记录警告")
+
+    # 操作日志批量写入（中间件只入队，后台任务 insert_many）
+    OPERATION_LOG_QUEUE_MAX_SIZE: int = Field(default=10000, description="操作日志缓冲队列上限，队列满时丢弃新日志并计数")
+    OPERATION_LOG_BATCH_SIZE: int = Field(default=200, description="操作日志单次批量写入的最大条数")
+    OPERATION_LOG_FLUSH_INTERVAL_SECONDS: float = Field(default=2.0, description="操作日志最长缓冲时间（秒），到时即写入")
+
     # 实时行情接口轮换配置
     QUOTES_ROTATION_ENABLED: bool = Field(
         default=True,
@@ -577,6 +577,39 @@ def clear_bridged_config():
     logger.info("✅ 已清除所有桥接的配置")
 
 
+async def apply_runtime_config(logger_names=("webapi", "worker", "uvicorn", "fastapi")) -> None:
+    """
+    进程启动时应用统一配置（API 进程 lifespan 与独立调度器进程共用）
+
+    1. 桥接统一配置到环境变量，供 TradingAgents 核心库使用
+    2. 从 ConfigProvider 读取动态系统设置（日志级别、操作日志开关）并应用
+
+    需要在 init_db() 之后调用；失败只记录警告，不阻止启动。
+    """
+    try:
+        bridge_config_to_env()
+    except Exception as e:
+        logger.warning(f"⚠️  配置桥接失败: {e}")
+        logger.warning("⚠️  TradingAgents 将使用 .env 文件中的配置")
+
+    try:
+        from app.core.logging_config import setup_logging
+        from app.services.config_provider import provider as config_provider  # local import to avoid early DB init issues
+
+        eff = await config_provider.get_effective_system_settings()
+        desired_level = str(eff.get("log_level", "INFO")).upper()
+        setup_logging(log_level=desired_level)
+        for name in logger_names:
+            logging.getLogger(name).setLevel(desired_level)
+        try:
+            from app.middleware.operation_log_middleware import set_operation_log_enabled
+            set_operation_log_enabled(bool(eff.get("enable_monitoring", True)))
+        except Exception:
+            pass
+    except Exception as e:
+        logger.warning(f"Failed to apply dynamic settings: {e}")
+
+
 def reload_bridged_config():
     """
     重新加载桥接的配置
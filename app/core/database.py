@@ -5,7 +5,8 @@
 
 import logging
 import asyncio
-from typing import Optional
+from datetime import datetime, timezone
+from typing import Any, Dict, List, Optional
 from motor.motor_asyncio import AsyncIOMotorClient, AsyncIOMotorDatabase
 from pymongo import MongoClient
 from pymongo.database import Database
@@ -203,7 +204,7 @@ async def init_database():
 
         logger.info("🎉 所有数据库连接初始化完成")
 
-        # 🔥 初始化数据库视图和索引
+        # 🔥 初始化数据库物化集合和索引
         await init_database_views_and_indexes()
 
     except Exception as e:
@@ -212,136 +213,217 @@ async def init_database():
 
 
 async def init_database_views_and_indexes():
-    """初始化数据库视图和索引"""
+    """初始化数据库物化集合和索引"""
     try:
         db = get_mongo_db()
 
-        # 1. 创建股票筛选视图
-        await create_stock_screening_view(db)
-
-        # 2. 创建必要的索引
+        # 1. 创建必要的索引（物化刷新中的 $lookup 依赖 code 索引）
         await create_database_indexes(db)
 
-        logger.info("✅ 数据库视图和索引初始化完成")
+        # 2. 创建股票筛选物化集合
+        await create_stock_screening_collection(db)
+
+        logger.info("✅ 数据库物化集合和索引初始化完成")
 
     except Exception as e:
-        logger.warning(f"⚠️ 数据库视图和索引初始化失败: {e}")
+        logger.warning(f"⚠️ 数据库物化集合和索引初始化失败: {e}")
         # 不抛出异常，允许应用继续启动
 
 
-async def create_stock_screening_view(db):
-    """创建股票筛选视图"""
-    try:
-        # 检查视图是否已存在
-        collections = await db.list_collection_names()
-        if "stock_screening_view" in collections:
-            logger.info("📋 视图 stock_screening_view 已存在，跳过创建")
-            return
-
-        # 创建视图：将 stock_basic_info、market_quotes 和 stock_financial_data 关联
-        pipeline = [
-            # 第一步：关联实时行情数据 (market_quotes)
-            {
-                "$lookup": {
-                    "from": "market_quotes",
-                    "localField": "code",
-                    "foreignField": "code",
-                    "as": "quote_data"
-                }
-            },
-            # 第二步：展开 quote_data 数组
-            {
-                "$unwind": {
-                    "path": "$quote_data",
-                    "preserveNullAndEmptyArrays": True
-                }
-            },
-            # 第三步：关联财务数据 (stock_financial_data)
-            {
-                "$lookup": {
-                    "from": "stock_financial_data",
-                    "let": {"stock_code": "$code", "stock_source": "$source"},
-                    "pipeline": [
-                        {
-                            "$match": {
-                                "$expr": {
-                                    "$and": [
-                                        {"$eq": ["$code", "$$stock_code"]},
-                                        {"$eq": ["$data_source", "$$stock_source"]}
-                                    ]
-                                }
+# 物化的股票筛选集合（替代原 $lookup 视图 stock_screening_view）
+STOCK_SCREENING_COLLECTION = "stock_screening"
+
+
+def build_stock_screening_pipeline(
+    codes: Optional[List[str]] = None,
+    refreshed_at: Optional[datetime] = None,
+) -> List[Dict[str, Any]]:
+    """
+    构建 stock_screening 物化集合的刷新管道
+
+    将 stock_basic_info、market_quotes 和 stock_financial_data 关联后，
+    通过 $merge 按 (code, source) 增量写入 stock_screening 集合。
+
+    Args:
+        codes: 需要刷新的股票代码列表，None 表示全量刷新
+        refreshed_at: 写入 materialized_at 的刷新时间，None 表示使用数据库当前时间
+    """
+    # 第零步：$merge 按 (code, source) 匹配，缺少 source 的旧文档会使整个刷新失败，需要排除；
+    # 增量刷新时只处理指定股票
+    match: Dict[str, Any] = {"source": {"$exists": True, "$ne": None}}
+    if codes is not None:
+        match["code"] = {"$in": list(codes)}
+    pipeline: List[Dict[str, Any]] = [{"$match": match}]
+
+    pipeline.extend([
+        # 第一步：关联实时行情数据 (market_quotes)
+        {
+            "$lookup": {
+                "from": "market_quotes",
+                "localField": "code",
+                "foreignField": "code",
+                "as": "quote_data"
+            }
+        },
+        # 第二步：展开 quote_data 数组
+        {
+            "$unwind": {
+                "path": "$quote_data",
+                "preserveNullAndEmptyArrays": True
+            }
+        },
+        # 第三步：关联财务数据 (stock_financial_data)
+        {
+            "$lookup": {
+                "from": "stock_financial_data",
+                "let": {"stock_code": "$code", "stock_source": "$source"},
+                "pipeline": [
+                    {
+                        "$match": {
+                            "$expr": {
+                                "$and": [
+                                    {"$eq": ["$code", "$$stock_code"]},
+                                    {"$eq": ["$data_source", "$$stock_source"]}
+                                ]
                             }
-                        },
-                        {"$sort": {"report_period": -1}},
-                        {"$limit": 1}
-                    ],
-                    "as": "financial_data"
-                }
-            },
-            # 第四步：展开 financial_data 数组
-            {
-                "$unwind": {
-                    "path": "$financial_data",
-                    "preserveNullAndEmptyArrays": True
-                }
-            },
-            # 第五步：重新组织字段结构
-            {
-                "$project": {
-                    # 基础信息字段
-                    "code": 1,
-                    "name": 1,
-                    "industry": 1,
-                    "area": 1,
-                    "market": 1,
-                    "list_date": 1,
-                    "source": 1,
-                    # 市值信息
-                    "total_mv": 1,
-                    "circ_mv": 1,
-                    # 估值指标
-                    "pe": 1,
-                    "pb": 1,
-                    "pe_ttm": 1,
-                    "pb_mrq": 1,
-                    # 财务指标
-                    "roe": "$financial_data.roe",
-                    "roa": "$financial_data.roa",
-                    "netprofit_margin": "$financial_data.netprofit_margin",
-                    "gross_margin": "$financial_data.gross_margin",
-                    "report_period": "$financial_data.report_period",
-                    # 交易指标
-                    "turnover_rate": 1,
-                    "volume_ratio": 1,
-                    # 实时行情数据
-                    "close": "$quote_data.close",
-                    "open": "$quote_data.open",
-                    "high": "$quote_data.high",
-                    "low": "$quote_data.low",
-                    "pre_close": "$quote_data.pre_close",
-                    "pct_chg": "$quote_data.pct_chg",
-                    "amount": "$quote_data.amount",
-                    "volume": "$quote_data.volume",
-                    "trade_date": "$quote_data.trade_date",
-                    # 时间戳
-                    "updated_at": 1,
-                    "quote_updated_at": "$quote_data.updated_at",
-                    "financial_updated_at": "$financial_data.updated_at"
-                }
+                        }
+                    },
+                    {"$sort": {"report_period": -1}},
+                    {"$limit": 1}
+                ],
+                "as": "financial_data"
+            }
+        },
+        # 第四步：展开 financial_data 数组
+        {
+            "$unwind": {
+                "path": "$financial_data",
+                "preserveNullAndEmptyArrays": True
+            }
+        },
+        # 第五步：重新组织字段结构（去掉 _id，由 $merge 按 code+source 匹配）
+        {
+            "$project": {
+                "_id": 0,
+                # 基础信息字段
+                "code": 1,
+                "name": 1,
+                "industry": 1,
+                "area": 1,
+                "market": 1,
+                "sse": 1,
+                "list_date": 1,
+                "source": 1,
+                # 市值信息
+                "total_mv": 1,
+                "circ_mv": 1,
+                # 估值指标
+                "pe": 1,
+                "pb": 1,
+                "pe_ttm": 1,
+                "pb_mrq": 1,
+                # 财务指标
+                "roe": {"$ifNull": ["$financial_data.roe", "$roe"]},
+                "roa": "$financial_data.roa",
+                "netprofit_margin": "$financial_data.netprofit_margin",
+                "gross_margin": "$financial_data.gross_margin",
+                "report_period": "$financial_data.report_period",
+                # 交易指标
+                "turnover_rate": 1,
+                "volume_ratio": 1,
+                # 实时行情数据
+                "close": "$quote_data.close",
+                "open": "$quote_data.open",
+                "high": "$quote_data.high",
+                "low": "$quote_data.low",
+                "pre_close": "$quote_data.pre_close",
+                "pct_chg": "$quote_data.pct_chg",
+                "amount": "$quote_data.amount",
+                "volume": "$quote_data.volume",
+                "trade_date": "$quote_data.trade_date",
+                # 时间戳
+                "updated_at": 1,
+                "quote_updated_at": "$quote_data.updated_at",
+                "financial_updated_at": "$financial_data.updated_at",
+                "materialized_at": {"$literal": refreshed_at} if refreshed_at is not None else "$$NOW"
             }
-        ]
+        },
+        # 第六步：增量合并到物化集合（需要 MongoDB 4.2+）
+        {
+            "$merge": {
+                "into": STOCK_SCREENING_COLLECTION,
+                "on": ["code", "source"],
+                "whenMatched": "replace",
+                "whenNotMatched": "insert"
+            }
+        }
+    ])
+    return pipeline
 
-        # 创建视图
-        await db.command({
-            "create": "stock_screening_view",
-            "viewOn": "stock_basic_info",
-            "pipeline": pipeline
-        })
 
-        logger.info("✅ 视图 stock_screening_view 创建成功")
+async def create_stock_screening_collection(db):
+    """创建股票筛选物化集合的索引，并执行一次全量刷新"""
+    try:
+        collection = db[STOCK_SCREENING_COLLECTION]
+
+        # $merge 的 on 字段必须有唯一索引
+        await collection.create_index([("code", 1), ("source", 1)], unique=True, name="code_source_unique")
+
+        # 与常用筛选条件匹配的复合索引（查询总是带 source，默认按总市值降序）
+        await collection.create_index([("source", 1), ("total_mv", -1)], name="source_total_mv")
+        await collection.create_index([("source", 1), ("industry", 1), ("total_mv", -1)], name="source_industry_total_mv")
+        await collection.create_index([("source", 1), ("pe", 1)], name="source_pe")
+        await collection.create_index([("source", 1), ("pb", 1)], name="source_pb")
+        await collection.create_index([("source", 1), ("roe", -1)], name="source_roe")
+        await collection.create_index([("source", 1), ("turnover_rate", -1)], name="source_turnover_rate")
+        await collection.create_index([("source", 1), ("pct_chg", -1)], name="source_pct_chg")
+        await collection.create_index([("source", 1), ("amount", -1)], name="source_amount")
+
+        logger.info(f"✅ 物化集合 {STOCK_SCREENING_COLLECTION} 索引创建完成")
+
+        await refresh_stock_screening(db=db)
 
     except Exception as e:
-        logger.warning(f"⚠️ 创建视图失败: {e}")
+        logger.warning(f"⚠️ 创建物化集合 {STOCK_SCREENING_COLLECTION} 失败: {e}")
+
+
+async def refresh_stock_screening(codes: Optional[List[str]] = None, db=None) -> None:
+    """
+    刷新股票筛选物化集合
+
+    行情入库、财务数据同步、基础信息同步写入后调用；失败只记录警告，不影响写入方。
+    全量刷新后删除本次未写入的文档（已从 stock_basic_info 删除的股票）。
+
+    Args:
+        codes: 需要刷新的股票代码列表，None 表示全量刷新
+        db: 数据库实例，默认使用全局连接
+    """
+    if codes is not None and not codes:
+        return
+
+    try:
+        db = db if db is not None else get_mongo_db()
+        # MongoDB 日期精度为毫秒，截断后才能与写入的 materialized_at 精确比较
+        now = datetime.now(timezone.utc)
+        refreshed_at = now.replace(microsecond=now.microsecond // 1000 * 1000)
+        pipeline = build_stock_screening_pipeline(codes, refreshed_at=refreshed_at)
+        # $merge 阶段没有输出，需要遍历游标才会真正执行
+        await db["stock_basic_info"].aggregate(pipeline).to_list(length=None)
+
+        scope = "全量" if codes is None else f"{len(codes)} 只股票"
+        if codes is None:
+            result = await db[STOCK_SCREENING_COLLECTION].delete_many({
+                "$or": [
+                    {"materialized_at": {"$lt": refreshed_at}},
+                    {"materialized_at": {"$exists": False}},
+                ]
+            })
+            if result.deleted_count:
+                scope += f"，清理 {result.deleted_count} 只已移除股票"
+        logger.debug(f"✅ 物化集合 {STOCK_SCREENING_COLLECTION} 刷新完成: {scope}")
+
+    except Exception as e:
+        logger.warning(f"⚠️ 刷新物化集合 {STOCK_SCREENING_COLLECTION} 失败: {e}")
 
 
 async def create_database_indexes(db):
@@ -362,6 +444,30 @@ async def create_database_indexes(db):
         await market_quotes.create_index([("amount", -1)])
         await market_quotes.create_index([("updated_at", -1)])
 
+        # analysis_reports 的索引（报告列表按创建时间倒序，可按市场/股票代码筛选）
+        analysis_reports = db["analysis_reports"]
+        await analysis_reports.create_index(
+            [("created_at", -1), ("market_type", 1), ("stock_symbol", 1)],
+            name="created_at_market_type_stock_symbol",
+        )
+        await analysis_reports.create_index(
+            [("stock_symbol", 1), ("created_at", -1)],
+            name="stock_symbol_created_at",
+        )
+        # 游标分页按 (created_at, _id) 倒序
+        await analysis_reports.create_index([("created_at", -1), ("_id", -1)], name="created_at_id")
+        # 全文检索（写入时已完成中文切分，不使用语言分词）
+        await analysis_reports.create_index(
+            [("search_text", "text")],
+            name="search_text",
+            default_language="none",
+        )
+        # 旧报告没有 search_text，补齐后才能被关键词搜索到
+        from app.utils.report_fields import backfill_search_text
+        backfilled = await backfill_search_text(analysis_reports)
+        if backfilled:
+            logger.info(f"✅ 已为 {backfilled} 份旧报告补齐 search_text")
+
         logger.info("✅ 数据库索引创建完成")
 
     except Exception as e:
@@ -0,0 +1,80 @@
+"""
+启动导入耗时分析
+
+在子进程中以 `python -X importtime -c "import app.main"` 导入应用，解析 stderr 输出，
+按顶层包汇总自身耗时，并列出累计耗时最高的模块，用于定位拖慢冷启动的重量级依赖。
+
+使用方法：
+    python -m app --profile-imports [--top N]
+"""
+import re
+import subprocess
+import sys
+from collections import defaultdict
+from dataclasses import dataclass
+from typing import Dict, Iterable, List, Tuple
+
+_LINE_RE = re.compile(r"^import time:\s+(\d+) \|\s+(\d+) \|( *)(\S+)\s*$")
+
+
+@dataclass
+class ImportRecord:
+    module: str
+    self_us: int
+    cumulative_us: int
+    depth: int
+
+
+def parse_importtime(lines: Iterable[str]) -> List[ImportRecord]:
+    """解析 -X importtime 的输出行（非导入耗时行会被忽略）"""
+    records = []
+    for line in lines:
+        m = _LINE_RE.match(line)
+        if m:
+            records.append(ImportRecord(
+                module=m.group(4),
+                self_us=int(m.group(1)),
+                cumulative_us=int(m.group(2)),
+                depth=len(m.group(3)) // 2,
+            ))
+    return records
+
+
+def summarize_by_package(records: List[ImportRecord]) -> List[Tuple[str, int]]:
+    """按顶层包汇总自身耗时（微秒），降序"""
+    totals: Dict[str, int] = defaultdict(int)
+    for r in records:
+        totals[r.module.split(".")[0]] += r.self_us
+    return sorted(totals.items(), key=lambda kv: kv[1], reverse=True)
+
+
+def format_report(records: List[ImportRecord], target: str, top: int = 20) -> str:
+    total_us = sum(r.self_us for r in records)
+    lines = [
+        f"📦 导入 {target} 共 {len(records)} 个模块，耗时 {total_us / 1000:.0f}ms",
+        "",
+        f"按顶层包（自身耗时，前 {top}）：",
+    ]
+    for package, us in summarize_by_package(records)[:top]:
+        lines.append(f"  {us / 1000:8.1f}ms  {package}")
+
+    lines += ["", f"累计耗时最高的模块（前 {top}）："]
+    for r in sorted(records, key=lambda r: r.cumulative_us, reverse=True)[:top]:
+        lines.append(f"  {r.cumulative_us / 1000:8.1f}ms  {'  ' * r.depth}{r.module}")
+    return "\n".join(lines)
+
+
+def profile_imports(target: str = "app.main", top: int = 20) -> str:
+    """在新进程中导入 target 并返回耗时报告（新进程保证没有已缓存的模块）"""
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {target}"],
+        capture_output=True,
+        text=True,
+        encoding="utf-8",
+        errors="replace",
+    )
+    records = parse_importtime(proc.stderr.splitlines())
+    report = format_report(records, target, top)
+    if proc.returncode != 0:
+        report += f"\n\n⚠️ 导入 {target} 失败（退出码 {proc.returncode}），以上仅为失败前的导入"
+    return report
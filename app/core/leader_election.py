@@ -0,0 +1,80 @@
+"""
+基于 Redis 锁的 Leader 选举
+
+多个进程（API worker / 独立调度器副本）竞争同一个 key：
+- 获取：SET key <instance_id> NX PX ttl
+- 续约 / 释放：Lua 脚本先比较持有者再 PEXPIRE / DEL，避免误续或误删他人的锁
+持有者崩溃后锁在 ttl 后自动过期，其他实例接管。
+"""
+import logging
+import os
+import socket
+import uuid
+from typing import Optional
+
+logger = logging.getLogger(__name__)
+
+_RENEW_LUA = """
+if redis.call('GET', KEYS[1]) == ARGV[1] then
+  return redis.call('PEXPIRE', KEYS[1], ARGV[2])
+end
+return 0
+"""
+
+_RELEASE_LUA = """
+if redis.call('GET', KEYS[1]) == ARGV[1] then
+  return redis.call('DEL', KEYS[1])
+end
+return 0
+"""
+
+
+def default_instance_id() -> str:
+    """主机名:进程号:随机后缀（便于在 Redis 中看出当前 Leader）"""
+    return f"{socket.gethostname()}:{os.getpid()}:{uuid.uuid4().hex[:8]}"
+
+
+class RedisLeaderLock:
+    """Redis 分布式锁形式的 Leader 选举（redis.asyncio 客户端）"""
+
+    def __init__(self, redis, key: str, ttl_seconds: float = 30.0, instance_id: Optional[str] = None):
+        self.redis = redis
+        self.key = key
+        self.ttl_ms = int(ttl_seconds * 1000)
+        self.instance_id = instance_id or default_instance_id()
+        self.is_leader = False
+
+    async def try_acquire(self) -> bool:
+        """尝试成为 Leader（已是 Leader 时等同于续约）"""
+        if self.is_leader:
+            return await self.renew()
+        acquired = await self.redis.set(self.key, self.instance_id, nx=True, px=self.ttl_ms)
+        self.is_leader = bool(acquired)
+        if self.is_leader:
+            logger.info(f"👑 成为 Leader: {self.key} ({self.instance_id})")
+        return self.is_leader
+
+    async def renew(self) -> bool:
+        """续约；锁已过期或被他人持有时返回 False"""
+        renewed = await self.redis.eval(_RENEW_LUA, 1, self.key, self.instance_id, self.ttl_ms)
+        if not renewed and self.is_leader:
+            logger.warning(f"⚠️ Leader 续约失败，已失去领导权: {self.key} ({self.instance_id})")
+        self.is_leader = bool(renewed)
+        return self.is_leader
+
+    async def release(self) -> None:
+        """主动释放（仅当自己是持有者）"""
+        try:
+            await self.redis.eval(_RELEASE_LUA, 1, self.key, self.instance_id)
+        except Exception as e:
+            logger.warning(f"⚠️ 释放 Leader 锁失败: {e}")
+        finally:
+            if self.is_leader:
+                logger.info(f"👋 已释放 Leader: {self.key} ({self.instance_id})")
+            self.is_leader = False
+
+    async def current_leader(self) -> Optional[str]:
+        value = await self.redis.get(self.key)
+        if isinstance(value, bytes):
+            value = value.decode("utf-8")
+        return value
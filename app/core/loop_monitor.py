@@ -0,0 +1,79 @@
+"""
+事件循环延迟监控
+
+后台任务按固定间隔 sleep，实际唤醒时间与预期时间的差值就是事件循环被阻塞的时长。
+保留最近一段时间的采样，提供 p50/p99/max，用于确认同步 I/O 是否阻塞了 worker。
+"""
+import asyncio
+import logging
+import time
+from collections import deque
+from typing import Deque, Dict, Optional
+
+import numpy as np
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+
+class EventLoopLagMonitor:
+    """事件循环延迟采样器"""
+
+    def __init__(self, interval: float = 0.5, window: int = 1200, warn_ms: float = 500.0) -> None:
+        self.interval = interval
+        self.warn_ms = warn_ms
+        self._samples: Deque[float] = deque(maxlen=window)
+        self._task: Optional[asyncio.Task] = None
+
+    def record(self, lag_ms: float) -> None:
+        self._samples.append(lag_ms)
+        if lag_ms >= self.warn_ms:
+            logger.warning(f"🐢 事件循环阻塞 {lag_ms:.0f}ms")
+
+    def stats(self) -> Dict[str, float]:
+        """最近窗口内的延迟统计（毫秒）"""
+        if not self._samples:
+            return {"samples": 0, "p50_ms": 0.0, "p99_ms": 0.0, "max_ms": 0.0}
+        arr = np.fromiter(self._samples, dtype=np.float64)
+        p50, p99 = np.percentile(arr, [50, 99])
+        return {
+            "samples": int(arr.size),
+            "p50_ms": round(float(p50), 2),
+            "p99_ms": round(float(p99), 2),
+            "max_ms": round(float(arr.max()), 2),
+        }
+
+    async def _run(self) -> None:
+        loop = asyncio.get_running_loop()
+        while True:
+            expected = loop.time() + self.interval
+            await asyncio.sleep(self.interval)
+            self.record(max(0.0, (loop.time() - expected) * 1000.0))
+
+    def start(self) -> None:
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self._run())
+            logger.info(f"📈 事件循环延迟监控已启动（采样间隔 {self.interval}s）")
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except (asyncio.CancelledError, Exception):
+                pass
+            self._task = None
+
+
+_loop_lag_monitor: Optional[EventLoopLagMonitor] = None
+
+
+def get_loop_lag_monitor() -> EventLoopLagMonitor:
+    global _loop_lag_monitor
+    if _loop_lag_monitor is None:
+        _loop_lag_monitor = EventLoopLagMonitor(
+            interval=settings.EVENT_LOOP_LAG_INTERVAL_SECONDS,
+            warn_ms=settings.EVENT_LOOP_LAG_WARN_MS,
+        )
+    return _loop_lag_monitor
@@ -1,24 +1,33 @@
 """
 速率限制器
-用于控制API调用频率，避免超过数据源的限流限制
+用于控制API调用频率，避免超过数据源的限流限制（基于 Redis 令牌桶，跨进程共享预算）
 """
-import asyncio
 import time
 import logging
 from collections import deque
 from typing import Optional
 
+from tradingagents.utils.token_bucket import DEFAULT_BUDGETS, get_token_bucket
+
 logger = logging.getLogger(__name__)
 
 
 class RateLimiter:
     """
-    滑动窗口速率限制器
-    
-    使用滑动窗口算法精确控制API调用频率
+    令牌桶速率限制器
+
+    令牌桶存放在 Redis 中（Lua 脚本原子更新），多个 API 进程 / worker 共享同一份调用预算；
+    Redis 不可用时自动降级为进程内令牌桶。
     """
     
-    def __init__(self, max_calls: int, time_window: float, name: str = "RateLimiter"):
+    def __init__(
+        self,
+        max_calls: int,
+        time_window: float,
+        name: str = "RateLimiter",
+        bucket: Optional[str] = None,
+        burst: Optional[int] = None,
+    ):
         """
         初始化速率限制器
         
@@ -26,12 +35,23 @@ class RateLimiter:
             max_calls: 时间窗口内最大调用次数
             time_window: 时间窗口大小（秒）
             name: 限制器名称（用于日志）
+            bucket: 共享令牌桶名称（同名限制器跨进程共享预算），默认使用 name
+            burst: 突发额度，默认使用数据源默认预算（DEFAULT_BUDGETS）的突发额度，否则为窗口调用数的 10%
         """
         self.max_calls = max_calls
         self.time_window = time_window
         self.name = name
-        self.calls = deque()  # 存储调用时间戳
-        self.lock = asyncio.Lock()  # 确保线程安全
+        self.calls = deque()  # 本进程调用时间戳（仅用于统计）
+        bucket = bucket or name
+        if burst is None:
+            # 与数据源共用的令牌桶沿用其默认突发额度，避免同名令牌桶预算冲突
+            default = DEFAULT_BUDGETS.get(bucket.lower())
+            burst = default[1] if default else max(1, max_calls // 10)
+        self.bucket = get_token_bucket(
+            bucket,
+            per_minute=max_calls * 60.0 / time_window,
+            burst=burst,
+        )
         
         # 统计信息
         self.total_calls = 0
@@ -45,36 +65,18 @@ class RateLimiter:
         获取调用许可
         如果超过速率限制，会等待直到可以调用
         """
-        async with self.lock:
-            now = time.time()
-            
-            # 移除时间窗口外的旧调用记录
-            while self.calls and self.calls[0] <= now - self.time_window:
-                self.calls.popleft()
-            
-            # 如果当前窗口内调用次数已达上限，需要等待
-            if len(self.calls) >= self.max_calls:
-                # 计算需要等待的时间
-                oldest_call = self.calls[0]
-                wait_time = oldest_call + self.time_window - now + 0.01  # 加一点缓冲
-                
-                if wait_time > 0:
-                    self.total_waits += 1
-                    self.total_wait_time += wait_time
-                    
-                    logger.debug(f"⏳ {self.name} 达到速率限制，等待 {wait_time:.2f}秒")
-                    await asyncio.sleep(wait_time)
-                    
-                    # 重新获取当前时间
-                    now = time.time()
-                    
-                    # 再次清理旧记录
-                    while self.calls and self.calls[0] <= now - self.time_window:
-                        self.calls.popleft()
-            
-            # 记录本次调用
-            self.calls.append(now)
-            self.total_calls += 1
+        wait_time = await self.bucket.acquire_async()
+        if wait_time > 0:
+            self.total_waits += 1
+            self.total_wait_time += wait_time
+            logger.debug(f"⏳ {self.name} 达到速率限制，等待 {wait_time:.2f}秒")
+
+        # 记录本次调用
+        now = time.time()
+        while self.calls and self.calls[0] <= now - self.time_window:
+            self.calls.popleft()
+        self.calls.append(now)
+        self.total_calls += 1
     
     def get_stats(self) -> dict:
         """获取统计信息"""
@@ -86,7 +88,9 @@ class RateLimiter:
             "total_calls": self.total_calls,
             "total_waits": self.total_waits,
             "total_wait_time": self.total_wait_time,
-            "avg_wait_time": self.total_wait_time / self.total_waits if self.total_waits > 0 else 0
+            "avg_wait_time": self.total_wait_time / self.total_waits if self.total_waits > 0 else 0,
+            "max_wait_time": self.bucket.max_wait_time,
+            "backend": self.bucket.get_stats()["backend"],
         }
     
     def reset_stats(self):
@@ -134,7 +138,8 @@ class TushareRateLimiter(RateLimiter):
         super().__init__(
             max_calls=max_calls,
             time_window=time_window,
-            name=f"TushareRateLimiter({tier})"
+            name=f"TushareRateLimiter({tier})",
+            bucket="tushare_sync"  # 同步任务节奏；Tushare 总预算由 TushareProvider 的 "tushare" 令牌桶控制
         )
         
         self.tier = tier
@@ -162,7 +167,8 @@ class AKShareRateLimiter(RateLimiter):
         super().__init__(
             max_calls=max_calls,
             time_window=time_window,
-            name="AKShareRateLimiter"
+            name="AKShareRateLimiter",
+            bucket="akshare"
         )
 
 
@@ -184,7 +190,8 @@ class BaoStockRateLimiter(RateLimiter):
         super().__init__(
             max_calls=max_calls,
             time_window=time_window,
-            name="BaoStockRateLimiter"
+            name="BaoStockRateLimiter",
+            bucket="baostock"
         )
 
 
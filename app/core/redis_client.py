@@ -4,7 +4,7 @@ Redis客户端配置和连接管理
 
 import redis.asyncio as redis
 import logging
-from typing import Optional
+from typing import NamedTuple, Optional
 from .config import settings
 
 logger = logging.getLogger(__name__)
@@ -101,11 +101,68 @@ class RedisKeys:
     ANALYSIS_CACHE = "analysis:{cache_key}"
 
 
+# 滑动窗口限流 + 每日配额（一次调用完成，原子执行）
+# KEYS[1] 滑动窗口 ZSET（成员为请求ID，分值为毫秒时间戳）；KEYS[2] 每日配额计数
+# ARGV: window_ms, limit（<=0 不限流）, member, quota（<=0 不计配额）, quota_ttl
+# 返回 {状态(1通过/0限流/2配额用完), 窗口内请求数, 重试等待毫秒, 今日使用量}
+# 被拒绝的请求既不占用窗口也不消耗配额；时间取 Redis 服务器时间，多 worker 之间一致
+RATE_LIMIT_SCRIPT = """
+local t = redis.call('TIME')
+local now = tonumber(t[1]) * 1000 + math.floor(tonumber(t[2]) / 1000)
+local window = tonumber(ARGV[1])
+local limit = tonumber(ARGV[2])
+local quota = tonumber(ARGV[4])
+local count = 0
+if limit > 0 then
+    redis.call('ZREMRANGEBYSCORE', KEYS[1], '-inf', now - window)
+    count = redis.call('ZCARD', KEYS[1])
+    if count >= limit then
+        local oldest = redis.call('ZRANGE', KEYS[1], 0, 0, 'WITHSCORES')
+        local retry = window
+        if oldest[2] then
+            retry = tonumber(oldest[2]) + window - now
+        end
+        return {0, count, retry, 0}
+    end
+end
+local usage = 0
+if quota > 0 then
+    usage = tonumber(redis.call('GET', KEYS[2]) or '0')
+    if usage >= quota then
+        return {2, count, 0, usage}
+    end
+    usage = redis.call('INCR', KEYS[2])
+    if usage == 1 then
+        redis.call('EXPIRE', KEYS[2], ARGV[5])
+    end
+end
+if limit > 0 then
+    redis.call('ZADD', KEYS[1], now, ARGV[3])
+    redis.call('PEXPIRE', KEYS[1], window)
+    count = count + 1
+end
+return {1, count, 0, usage}
+"""
+
+
+class RateLimitResult(NamedTuple):
+    """check_rate_and_quota 的结果"""
+    status: int          # 1 通过，0 超过速率限制，2 每日配额用完
+    count: int           # 滑动窗口内的请求数
+    retry_after_ms: int  # 超过速率限制时，窗口内最早的请求过期前的等待时间
+    usage: int           # 今日配额使用量（未计配额时为 0）
+
+    ALLOWED = 1
+    RATE_LIMITED = 0
+    QUOTA_EXCEEDED = 2
+
+
 class RedisService:
     """Redis服务封装类"""
     
     def __init__(self):
         self.redis = get_redis()
+        self._rate_limit_script = None
     
     async def set_with_ttl(self, key: str, value: str, ttl: int = 3600):
         """设置带TTL的键值"""
@@ -136,6 +193,29 @@ class RedisService:
         results = await pipe.execute()
         return results[0]
     
+    async def check_rate_and_quota(
+        self,
+        rate_key: str,
+        limit: int,
+        window_seconds: int = 60,
+        quota_key: Optional[str] = None,
+        quota: int = 0,
+        quota_ttl: int = 86400,
+    ) -> RateLimitResult:
+        """
+        滑动窗口限流和每日配额检查（一次往返，Lua 脚本原子执行）
+
+        脚本通过 EVALSHA 执行，首次或脚本缓存被清空时自动回退为 EVAL
+        """
+        import uuid
+        if self._rate_limit_script is None:
+            self._rate_limit_script = self.redis.register_script(RATE_LIMIT_SCRIPT)
+        status, count, retry_after_ms, usage = await self._rate_limit_script(
+            keys=[rate_key, quota_key or rate_key],
+            args=[int(window_seconds * 1000), limit, uuid.uuid4().hex, quota if quota_key else 0, quota_ttl],
+        )
+        return RateLimitResult(int(status), int(count), int(retry_after_ms), int(usage))
+    
     async def add_to_queue(self, queue_key: str, item: dict):
         """添加项目到队列"""
         import json
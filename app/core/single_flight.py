@@ -0,0 +1,139 @@
+"""
+跨进程请求合并（single-flight）
+
+同一个 key 的并发请求只执行一次真正的获取：
+- 进程内：同一 key 共享一个 Future
+- 进程间：Redis 锁（SET NX PX）选出一个获取者，结果写入短 TTL 的广播 key，
+  其他进程轮询该 key 读取结果；获取者失败或崩溃（锁释放/过期且无结果）时由等待者接手重新竞争
+Redis 不可用时退化为仅进程内合并。
+"""
+import asyncio
+import json
+import logging
+import time
+import uuid
+from typing import Any, Awaitable, Callable, Dict, Optional
+
+logger = logging.getLogger(__name__)
+
+_RELEASE_LUA = """
+if redis.call('GET', KEYS[1]) == ARGV[1] then
+  return redis.call('DEL', KEYS[1])
+end
+return 0
+"""
+
+
+def _default_redis():
+    from app.core.database import get_redis_client
+
+    return get_redis_client()
+
+
+class RedisSingleFlight:
+    """Redis 锁 + 结果广播 key 的 single-flight（结果需可 JSON 序列化）"""
+
+    def __init__(
+        self,
+        namespace: str,
+        result_ttl: float = 5.0,
+        lock_ttl: float = 30.0,
+        poll_interval: float = 0.05,
+        redis_getter: Callable[[], Any] = _default_redis,
+    ):
+        self.namespace = namespace
+        self.result_ttl_ms = int(result_ttl * 1000)
+        self.lock_ttl = lock_ttl
+        self.poll_interval = poll_interval
+        self._redis_getter = redis_getter
+        self._inflight: Dict[str, asyncio.Future] = {}
+        self.stats = {"fetches": 0, "local_shared": 0, "remote_shared": 0, "fallbacks": 0}
+
+    def _redis(self):
+        try:
+            return self._redis_getter()
+        except Exception:
+            return None
+
+    async def run(self, key: str, fetch: Callable[[], Awaitable[Any]]) -> Any:
+        inflight = self._inflight.get(key)
+        if inflight is not None:
+            self.stats["local_shared"] += 1
+            return await asyncio.shield(inflight)
+
+        future: asyncio.Future = asyncio.get_running_loop().create_future()
+        self._inflight[key] = future
+        try:
+            value = await self._run_shared(key, fetch)
+            future.set_result(value)
+            return value
+        except asyncio.CancelledError:
+            future.cancel()
+            raise
+        except Exception as e:
+            future.set_exception(e)
+            # 没有其他等待者时避免 "exception was never retrieved" 警告
+            future.exception()
+            raise
+        finally:
+            self._inflight.pop(key, None)
+
+    async def _fetch(self, fetch: Callable[[], Awaitable[Any]]) -> Any:
+        self.stats["fetches"] += 1
+        return await fetch()
+
+    async def _run_shared(self, key: str, fetch: Callable[[], Awaitable[Any]]) -> Any:
+        redis = self._redis()
+        if redis is None:
+            return await self._fetch(fetch)
+
+        result_key = f"{self.namespace}:result:{key}"
+        lock_key = f"{self.namespace}:lock:{key}"
+        token = uuid.uuid4().hex
+        deadline = time.monotonic() + self.lock_ttl
+
+        try:
+            while True:
+                cached = await redis.get(result_key)
+                if cached is not None:
+                    self.stats["remote_shared"] += 1
+                    logger.info(f"⚡ [跨进程去重] 使用其他进程的结果: {key}")
+                    return json.loads(cached)
+
+                if await redis.set(lock_key, token, nx=True, px=int(self.lock_ttl * 1000)):
+                    break
+
+                # 其他进程正在获取：等待其广播结果
+                if time.monotonic() >= deadline:
+                    logger.warning(f"⚠️ 等待其他进程获取 {key} 超时，直接获取")
+                    self.stats["fallbacks"] += 1
+                    return await self._fetch(fetch)
+                await asyncio.sleep(self.poll_interval)
+        except Exception as e:
+            logger.warning(f"⚠️ Redis single-flight 不可用，直接获取 {key}: {e}")
+            self.stats["fallbacks"] += 1
+            return await self._fetch(fetch)
+
+        try:
+            value = await self._fetch(fetch)
+            try:
+                await redis.set(result_key, json.dumps(value, ensure_ascii=False), px=self.result_ttl_ms)
+            except Exception as e:
+                logger.warning(f"⚠️ 广播 {key} 结果失败: {e}")
+            return value
+        finally:
+            try:
+                await redis.eval(_RELEASE_LUA, 1, lock_key, token)
+            except Exception as e:
+                logger.debug(f"释放 single-flight 锁失败 {key}: {e}")
+
+
+_single_flights: Dict[str, RedisSingleFlight] = {}
+
+
+def get_single_flight(namespace: str, result_ttl: float = 5.0, lock_ttl: float = 30.0) -> RedisSingleFlight:
+    """按命名空间获取进程级共享实例（服务对象按请求创建时也能合并请求）"""
+    sf = _single_flights.get(namespace)
+    if sf is None:
+        sf = _single_flights[namespace] = RedisSingleFlight(namespace, result_ttl=result_ttl, lock_ttl=lock_ttl)
+    return sf
@@ -1,24 +1,130 @@
 """
 速率限制中间件
 防止API滥用，实现用户级和端点级速率限制
+
+- 端点速率：60 秒滑动窗口（Redis ZSET），没有固定窗口边界处的突发
+- 每日配额：与速率检查在同一个 Lua 脚本中完成，每个请求只有一次 Redis 往返
+- 进程内预检查：本进程已知超限（已放行的请求数达到限制，或 Redis 刚返回过限流）时
+  直接拒绝，高频用户的请求不再访问 Redis
 """
 
+import datetime
+import math
+import time
+from collections import OrderedDict, deque
 from fastapi import Request, Response, HTTPException
 from starlette.middleware.base import BaseHTTPMiddleware
 import logging
-from typing import Callable, Dict, Optional
-from core.redis_client import get_redis_service, RedisKeys
+from typing import Callable, Deque, Dict, Optional
+from app.core.redis_client import get_redis_service, RedisKeys, RateLimitResult
 
 logger = logging.getLogger(__name__)
 
+# 需要计入配额的端点
+QUOTA_ENDPOINTS = {
+    "/api/analysis/single",
+    "/api/analysis/batch",
+    "/api/screening/filter"
+}
+
+# Redis 返回配额用完后，本进程内直接拒绝的时长（秒）
+QUOTA_LOCAL_BLOCK_SECONDS = 60
+
+
+class LocalRateGate:
+    """
+    进程内限流预检查
+
+    只做"确定超限"的判断，不会误拒：
+    - 本进程在窗口内放行的请求数已达到限制（全局计数只会更多）
+    - Redis 返回限流 / 配额用完后，在返回的等待时间内
+    """
+
+    def __init__(self, max_keys: int = 10000):
+        self.max_keys = max_keys
+        self._hits: "OrderedDict[str, Deque[float]]" = OrderedDict()
+        self._blocked_until: Dict[str, float] = {}
+
+    def retry_after(self, key: str, limit: int, window: float) -> Optional[float]:
+        """确定超限时返回需要等待的秒数，否则返回 None"""
+        now = time.monotonic()
+        until = self._blocked_until.get(key)
+        if until is not None:
+            if until > now:
+                return until - now
+            del self._blocked_until[key]
+
+        hits = self._hits.get(key)
+        if hits is None or limit <= 0:
+            return None
+        while hits and hits[0] <= now - window:
+            hits.popleft()
+        if len(hits) >= limit:
+            return hits[0] + window - now
+        return None
+
+    def record(self, key: str, limit: int) -> None:
+        """记录一次放行的请求"""
+        if limit <= 0:
+            return
+        hits = self._hits.get(key)
+        if hits is None or hits.maxlen != limit:
+            hits = self._hits[key] = deque(hits or (), maxlen=limit)
+        self._hits.move_to_end(key)
+        hits.append(time.monotonic())
+        while len(self._hits) > self.max_keys:
+            self._hits.popitem(last=False)
+
+    def block(self, key: str, seconds: float) -> None:
+        self._blocked_until[key] = time.monotonic() + seconds
+        if len(self._blocked_until) > self.max_keys:
+            now = time.monotonic()
+            for k in [k for k, until in self._blocked_until.items() if until <= now]:
+                del self._blocked_until[k]
+
+
+def _rate_limit_exceeded(rate_limit: int, current_count: int, retry_after: float) -> HTTPException:
+    reset_time = max(1, math.ceil(retry_after))
+    return HTTPException(
+        status_code=429,
+        detail={
+            "error": {
+                "code": "RATE_LIMIT_EXCEEDED",
+                "message": f"请求过于频繁，请稍后重试",
+                "rate_limit": rate_limit,
+                "current_count": current_count,
+                "reset_time": reset_time
+            }
+        },
+        headers={"Retry-After": str(reset_time)}
+    )
+
+
+def _quota_exceeded(daily_quota: int, current_usage: int, today: str) -> HTTPException:
+    return HTTPException(
+        status_code=429,
+        detail={
+            "error": {
+                "code": "DAILY_QUOTA_EXCEEDED",
+                "message": "今日配额已用完，请明天再试",
+                "daily_quota": daily_quota,
+                "current_usage": current_usage,
+                "reset_date": today
+            }
+        }
+    )
+
 
 class RateLimitMiddleware(BaseHTTPMiddleware):
-    """速率限制中间件"""
-    
-    def __init__(self, app, default_rate_limit: int = 100):
+    """速率限制中间件（daily_quota > 0 时同时检查每日配额）"""
+
+    def __init__(self, app, default_rate_limit: int = 100, daily_quota: int = 0, window_seconds: int = 60):
         super().__init__(app)
         self.default_rate_limit = default_rate_limit
-        
+        self.daily_quota = daily_quota
+        self.window_seconds = window_seconds
+        self.local_gate = LocalRateGate()
+
         # 不同端点的速率限制配置
         self.endpoint_limits = {
             "/api/analysis/single": 10,      # 单股分析：每分钟10次
@@ -27,99 +133,118 @@ class RateLimitMiddleware(BaseHTTPMiddleware):
             "/api/auth/login": 5,            # 登录：每分钟5次
             "/api/auth/register": 3,         # 注册：每分钟3次
         }
-    
+
     async def dispatch(self, request: Request, call_next: Callable) -> Response:
         # 跳过健康检查和静态资源
         if request.url.path.startswith(("/api/health", "/docs", "/redoc", "/openapi.json")):
             return await call_next(request)
-        
+
         # 获取用户ID（如果已认证）
         user_id = getattr(request.state, "user_id", None)
+        # 未认证用户不受配额限制
+        quota_user_id = user_id if self.daily_quota > 0 and request.url.path in QUOTA_ENDPOINTS else None
         if not user_id:
             # 对于未认证用户，使用IP地址
             user_id = f"ip:{request.client.host}" if request.client else "unknown"
-        
+
         # 检查速率限制
         try:
-            await self.check_rate_limit(user_id, request.url.path)
+            await self.check_rate_limit(user_id, request.url.path, quota_user_id=quota_user_id)
         except HTTPException:
             raise
         except Exception as exc:
             logger.error(f"速率限制检查失败: {exc}")
             # 如果Redis不可用，允许请求通过
-        
+
         return await call_next(request)
-    
-    async def check_rate_limit(self, user_id: str, endpoint: str):
-        """检查速率限制"""
-        redis_service = get_redis_service()
-        
+
+    async def check_rate_limit(self, user_id: str, endpoint: str, quota_user_id: Optional[str] = None):
+        """检查速率限制（传入 quota_user_id 时同一次 Redis 调用中检查每日配额）"""
         # 获取端点的速率限制
         rate_limit = self.endpoint_limits.get(endpoint, self.default_rate_limit)
-        
+
         # 构建Redis键
         rate_key = RedisKeys.USER_RATE_LIMIT.format(
             user_id=user_id,
             endpoint=endpoint.replace("/", "_")
         )
-        
-        # 获取当前计数
-        current_count = await redis_service.increment_with_ttl(rate_key, ttl=60)
-        
+        quota_key = None
+        today = datetime.date.today().isoformat()
+        if quota_user_id:
+            quota_key = RedisKeys.USER_DAILY_QUOTA.format(user_id=quota_user_id, date=today)
+
+        # 进程内预检查：确定超限时不访问 Redis
+        retry_after = self.local_gate.retry_after(rate_key, rate_limit, self.window_seconds)
+        if retry_after is not None:
+            raise _rate_limit_exceeded(rate_limit, rate_limit, retry_after)
+        if quota_key and self.local_gate.retry_after(quota_key, 0, 0) is not None:
+            raise _quota_exceeded(self.daily_quota, self.daily_quota, today)
+
+        redis_service = get_redis_service()
+        result = await redis_service.check_rate_and_quota(
+            rate_key,
+            rate_limit,
+            window_seconds=self.window_seconds,
+            quota_key=quota_key,
+            quota=self.daily_quota,
+        )
+
         # 检查是否超过限制
-        if current_count > rate_limit:
+        if result.status == RateLimitResult.RATE_LIMITED:
             logger.warning(
                 f"速率限制触发 - 用户: {user_id}, "
                 f"端点: {endpoint}, "
-                f"当前计数: {current_count}, "
+                f"当前计数: {result.count}, "
                 f"限制: {rate_limit}"
             )
-            
-            raise HTTPException(
-                status_code=429,
-                detail={
-                    "error": {
-                        "code": "RATE_LIMIT_EXCEEDED",
-                        "message": f"请求过于频繁，请稍后重试",
-                        "rate_limit": rate_limit,
-                        "current_count": current_count,
-                        "reset_time": 60
-                    }
-                }
+            retry_after = result.retry_after_ms / 1000
+            self.local_gate.block(rate_key, retry_after)
+            raise _rate_limit_exceeded(rate_limit, result.count, retry_after)
+
+        if result.status == RateLimitResult.QUOTA_EXCEEDED:
+            logger.warning(
+                f"每日配额超限 - 用户: {quota_user_id}, "
+                f"今日使用: {result.usage}, "
+                f"配额: {self.daily_quota}"
             )
-        
+            self.local_gate.block(quota_key, QUOTA_LOCAL_BLOCK_SECONDS)
+            raise _quota_exceeded(self.daily_quota, result.usage, today)
+
+        self.local_gate.record(rate_key, rate_limit)
         logger.debug(
             f"速率限制检查通过 - 用户: {user_id}, "
             f"端点: {endpoint}, "
-            f"当前计数: {current_count}/{rate_limit}"
+            f"当前计数: {result.count}/{rate_limit}"
         )
 
 
 class QuotaMiddleware(BaseHTTPMiddleware):
-    """每日配额中间件"""
-    
+    """
+    每日配额中间件
+
+    与 RateLimitMiddleware 一起使用时，改为给 RateLimitMiddleware 传入 daily_quota，
+    配额和速率在同一次 Redis 调用中检查
+    """
+
     def __init__(self, app, daily_quota: int = 1000):
         super().__init__(app)
         self.daily_quota = daily_quota
-        
+        self.local_gate = LocalRateGate()
+
         # 需要计入配额的端点
-        self.quota_endpoints = {
-            "/api/analysis/single",
-            "/api/analysis/batch",
-            "/api/screening/filter"
-        }
-    
+        self.quota_endpoints = QUOTA_ENDPOINTS
+
     async def dispatch(self, request: Request, call_next: Callable) -> Response:
         # 只对需要配额的端点进行检查
         if request.url.path not in self.quota_endpoints:
             return await call_next(request)
-        
+
         # 获取用户ID
         user_id = getattr(request.state, "user_id", None)
         if not user_id:
             # 未认证用户不受配额限制
             return await call_next(request)
-        
+
         # 检查每日配额
         try:
             await self.check_daily_quota(user_id)
@@ -128,48 +253,40 @@ class QuotaMiddleware(BaseHTTPMiddleware):
         except Exception as exc:
             logger.error(f"配额检查失败: {exc}")
             # 如果Redis不可用，允许请求通过
-        
+
         return await call_next(request)
-    
+
     async def check_daily_quota(self, user_id: str):
         """检查每日配额"""
-        import datetime
-        
-        redis_service = get_redis_service()
-        
         # 获取今天的日期
         today = datetime.date.today().isoformat()
-        
+
         # 构建Redis键
         quota_key = RedisKeys.USER_DAILY_QUOTA.format(
             user_id=user_id,
             date=today
         )
-        
-        # 获取今日使用量
-        current_usage = await redis_service.increment_with_ttl(quota_key, ttl=86400)  # 24小时TTL
-        
+
+        if self.local_gate.retry_after(quota_key, 0, 0) is not None:
+            raise _quota_exceeded(self.daily_quota, self.daily_quota, today)
+
+        # 获取今日使用量（配额用完时不再计数）
+        redis_service = get_redis_service()
+        result = await redis_service.check_rate_and_quota(
+            quota_key, 0, quota_key=quota_key, quota=self.daily_quota
+        )
+        current_usage = result.usage
+
         # 检查是否超过配额
-        if current_usage > self.daily_quota:
+        if result.status == RateLimitResult.QUOTA_EXCEEDED:
             logger.warning(
                 f"每日配额超限 - 用户: {user_id}, "
                 f"今日使用: {current_usage}, "
                 f"配额: {self.daily_quota}"
             )
-            
-            raise HTTPException(
-                status_code=429,
-                detail={
-                    "error": {
-                        "code": "DAILY_QUOTA_EXCEEDED",
-                        "message": "今日配额已用完，请明天再试",
-                        "daily_quota": self.daily_quota,
-                        "current_usage": current_usage,
-                        "reset_date": today
-                    }
-                }
-            )
-        
+            self.local_gate.block(quota_key, QUOTA_LOCAL_BLOCK_SECONDS)
+            raise _quota_exceeded(self.daily_quota, current_usage, today)
+
         logger.debug(
             f"配额检查通过 - 用户: {user_id}, "
             f"今日使用: {current_usage}/{self.daily_quota}"
@@ -2,6 +2,9 @@ from fastapi import APIRouter
 import time
 from pathlib import Path
 
+from app.core.loop_monitor import get_loop_lag_monitor
+from app.services.operation_log_buffer import get_operation_log_buffer
+
 router = APIRouter()
 
 
@@ -30,6 +33,24 @@ async def health():
         "message": "服务运行正常"
     }
 
+@router.get("/health/event-loop")
+async def event_loop_lag():
+    """事件循环延迟统计（最近采样窗口的 p50/p99/max，毫秒）"""
+    return {
+        "success": True,
+        "data": get_loop_lag_monitor().stats(),
+        "message": "ok"
+    }
+
+@router.get("/health/operation-log")
+async def operation_log_buffer_stats():
+    """操作日志缓冲队列统计（排队 / 已写入 / 丢弃 / 写入失败条数）"""
+    return {
+        "success": True,
+        "data": get_operation_log_buffer().stats(),
+        "message": "ok"
+    }
+
 @router.get("/healthz")
 async def healthz():
     """Kubernetes健康检查"""
@@ -8,6 +8,7 @@ import re
 from app.routers.auth_db import get_current_user
 from app.core.database import get_mongo_db
 from app.core.response import ok
+from app.services.quote_snapshot import get_quote_snapshot_cache
 
 router = APIRouter(prefix="/paper", tags=["paper"])
 logger = logging.getLogger("webapi")
@@ -206,11 +207,8 @@ async def _get_last_price(code: str, market: str) -> Optional[float]:
 
     # A股：从数据库获取
     if market == "CN":
-        # 1. 尝试从 market_quotes 获取
-        q = await db["market_quotes"].find_one(
-            {"$or": [{"code": code}, {"symbol": code}]},
-            {"_id": 0, "close": 1}
-        )
+        # 1. 尝试从 market_quotes 获取（进程内行情快照）
+        q = await get_quote_snapshot_cache().get_quote(code)
         if q and q.get("close") is not None:
             try:
                 price = float(q["close"])
@@ -1,10 +1,11 @@
 """
 分析报告管理API路由
 """
+import asyncio
 import os
 import json
 from datetime import datetime, timedelta
-from typing import List, Optional, Dict, Any
+from typing import List, Optional, Dict, Any, Tuple
 from pathlib import Path
 
 from fastapi import APIRouter, Depends, HTTPException, Query, Response
@@ -14,10 +15,22 @@ from pydantic import BaseModel
 from .auth_db import get_current_user
 from ..core.database import get_mongo_db
 from ..utils.timezone import to_config_tz
+from ..services.report_render_service import get_report_render_service
+from ..utils.report_fields import (
+    REPORT_LIST_PROJECTION,
+    build_search_filter,
+    decode_report_cursor,
+    encode_report_cursor,
+    infer_market_type,
+    report_size_bytes,
+)
 import logging
 
 logger = logging.getLogger("webapi")
 
+# 估算模式下带筛选条件时最多统计的报告数
+REPORT_COUNT_LIMIT = 10000
+
 # 股票名称缓存
 _stock_name_cache = {}
 
@@ -85,6 +98,59 @@ def get_stock_name(stock_code: str) -> str:
         return stock_code
 
 
+async def _backfill_report_fields(db, docs: List[Dict[str, Any]]) -> None:
+    """为缺少 size_bytes / stock_name / market_type 的旧报告补齐字段并回写"""
+    missing = [
+        doc for doc in docs
+        if doc.get("size_bytes") is None or not doc.get("stock_name") or not doc.get("market_type")
+    ]
+    if not missing:
+        return
+
+    try:
+        ids = [doc["_id"] for doc in missing if doc.get("size_bytes") is None]
+        sizes: Dict[Any, int] = {}
+        if ids:
+            async for row in db.analysis_reports.find({"_id": {"$in": ids}}, {"reports": 1}):
+                sizes[row["_id"]] = report_size_bytes(row.get("reports"))
+
+        for doc in missing:
+            updates: Dict[str, Any] = {}
+            stock_code = doc.get("stock_symbol", "")
+            if doc.get("size_bytes") is None:
+                updates["size_bytes"] = sizes.get(doc["_id"], 0)
+            if not doc.get("stock_name"):
+                # get_stock_name 使用同步 MongoDB 客户端，放到线程池执行
+                updates["stock_name"] = await asyncio.to_thread(get_stock_name, stock_code)
+            if not doc.get("market_type"):
+                updates["market_type"] = infer_market_type(stock_code)
+
+            doc.update(updates)
+            await db.analysis_reports.update_one({"_id": doc["_id"]}, {"$set": updates})
+
+        logger.info(f"🔧 已为 {len(missing)} 份旧报告补齐列表字段")
+    except Exception as e:
+        logger.warning(f"⚠️ 补齐报告列表字段失败: {e}")
+
+
+async def _count_reports(db, query: Dict[str, Any], count_mode: str) -> Tuple[Optional[int], bool]:
+    """
+    统计报告数量，返回 (总数, 是否为估算值)
+
+    - exact: count_documents 精确统计
+    - estimated: 无筛选条件时读取集合元数据；有筛选条件时最多统计 REPORT_COUNT_LIMIT 条
+    - none: 不统计（配合游标分页使用）
+    """
+    if count_mode == "none":
+        return None, True
+    if count_mode == "exact":
+        return await db.analysis_reports.count_documents(query), False
+    if not query:
+        return await db.analysis_reports.estimated_document_count(), True
+    total = await db.analysis_reports.count_documents(query, limit=REPORT_COUNT_LIMIT)
+    return total, total >= REPORT_COUNT_LIMIT
+
+
 # 统一构建报告查询：支持 _id(ObjectId) / analysis_id / task_id 三种
 def _build_report_query(report_id: str) -> Dict[str, Any]:
     ors = [
@@ -125,6 +191,8 @@ async def get_reports_list(
     start_date: Optional[str] = Query(None, description="开始日期"),
     end_date: Optional[str] = Query(None, description="结束日期"),
     stock_code: Optional[str] = Query(None, description="股票代码"),
+    cursor: Optional[str] = Query(None, description="分页游标（上一页返回的 next_cursor），传入时忽略 page"),
+    count_mode: str = Query("estimated", pattern="^(exact|estimated|none)$", description="总数统计方式"),
     user: dict = Depends(get_current_user)
 ):
     """获取分析报告列表"""
@@ -136,13 +204,11 @@ async def get_reports_list(
         # 构建查询条件
         query = {}
 
-        # 搜索关键词
+        # 搜索关键词（search_text 文本索引）
         if search_keyword:
-            query["$or"] = [
-                {"stock_symbol": {"$regex": search_keyword, "$options": "i"}},
-                {"analysis_id": {"$regex": search_keyword, "$options": "i"}},
-                {"summary": {"$regex": search_keyword, "$options": "i"}}
-            ]
+            search_filter = build_search_filter(search_keyword)
+            if search_filter:
+                query.update(search_filter)
 
         # 市场筛选
         if market_filter:
@@ -164,33 +230,39 @@ async def get_reports_list(
         logger.info(f"📊 查询条件: {query}")
 
         # 计算总数
-        total = await db.analysis_reports.count_documents(query)
+        total, total_estimated = await _count_reports(db, query, count_mode)
+
+        # 分页查询（只取列表字段，不读取报告内容）
+        find_query = query
+        skip = 0
+        if cursor:
+            try:
+                cursor_filter = decode_report_cursor(cursor)
+                # 搜索条件也可能是 $or（单字符正则回退），不能与游标条件按键合并
+                find_query = {"$and": [query, cursor_filter]} if query else cursor_filter
+            except ValueError as e:
+                raise HTTPException(status_code=400, detail=str(e))
+        else:
+            skip = (page - 1) * page_size
 
-        # 分页查询
-        skip = (page - 1) * page_size
-        cursor = db.analysis_reports.find(query).sort("created_at", -1).skip(skip).limit(page_size)
+        docs = await (
+            db.analysis_reports.find(find_query, REPORT_LIST_PROJECTION)
+            .sort([("created_at", -1), ("_id", -1)])
+            .skip(skip)
+            .limit(page_size)
+            .to_list(length=page_size)
+        )
+        next_cursor = encode_report_cursor(docs[-1]) if len(docs) == page_size else None
+
+        # 🔥 旧文档没有预计算字段：补齐并回写，之后的查询直接命中
+        await _backfill_report_fields(db, docs)
 
         reports = []
-        async for doc in cursor:
+        for doc in docs:
             # 转换为前端需要的格式
             stock_code = doc.get("stock_symbol", "")
-            # 🔥 优先使用MongoDB中保存的股票名称，如果没有则查询
-            stock_name = doc.get("stock_name")
-            if not stock_name:
-                stock_name = get_stock_name(stock_code)
-
-            # 🔥 获取市场类型，如果没有则根据股票代码推断
-            market_type = doc.get("market_type")
-            if not market_type:
-                from tradingagents.utils.stock_utils import StockUtils
-                market_info = StockUtils.get_market_info(stock_code)
-                market_type_map = {
-                    "china_a": "A股",
-                    "hong_kong": "港股",
-                    "us": "美股",
-                    "unknown": "A股"
-                }
-                market_type = market_type_map.get(market_info.get("market", "unknown"), "A股")
+            stock_name = doc.get("stock_name") or stock_code
+            market_type = doc.get("market_type") or "A股"
 
             # 获取创建时间（数据库中是 UTC 时间，需要转换为 UTC+8）
             created_at = doc.get("created_at", datetime.utcnow())
@@ -212,7 +284,7 @@ async def get_reports_list(
                 "analysts": doc.get("analysts", []),
                 "research_depth": doc.get("research_depth", 1),
                 "summary": doc.get("summary", ""),
-                "file_size": len(str(doc.get("reports", {}))),  # 估算大小
+                "file_size": doc.get("size_bytes", 0),
                 "source": doc.get("source", "unknown"),
                 "task_id": doc.get("task_id", "")
             }
@@ -225,12 +297,16 @@ async def get_reports_list(
             "data": {
                 "reports": reports,
                 "total": total,
+                "total_estimated": total_estimated,
                 "page": page,
-                "page_size": page_size
+                "page_size": page_size,
+                "next_cursor": next_cursor
             },
             "message": "报告列表获取成功"
         }
 
+    except HTTPException:
+        raise
     except Exception as e:
         logger.error(f"❌ 获取报告列表失败: {e}")
         raise HTTPException(status_code=500, detail=str(e))
@@ -520,8 +596,8 @@ async def download_report(
                 )
 
             try:
-                # 生成 Word 文档
-                docx_content = report_exporter.generate_docx_report(doc)
+                # 生成 Word 文档（进程池渲染，按内容缓存）
+                docx_content = await get_report_render_service().render("docx", doc)
                 filename = f"{stock_symbol}_{analysis_date}_report.docx"
 
                 # 返回文件流
@@ -548,8 +624,8 @@ async def download_report(
                 )
 
             try:
-                # 生成 PDF 文档
-                pdf_content = report_exporter.generate_pdf_report(doc)
+                # 生成 PDF 文档（进程池渲染，按内容缓存）
+                pdf_content = await get_report_render_service().render("pdf", doc)
                 filename = f"{stock_symbol}_{analysis_date}_report.pdf"
 
                 # 返回文件流
@@ -12,6 +12,7 @@ import re
 from app.routers.auth_db import get_current_user
 from app.core.database import get_mongo_db
 from app.core.response import ok
+from app.services.quote_snapshot import get_quote_snapshot_cache
 
 logger = logging.getLogger(__name__)
 
@@ -111,8 +112,8 @@ async def get_quote(
     db = get_mongo_db()
     code6 = normalized_code
 
-    # 行情
-    q = await db["market_quotes"].find_one({"code": code6}, {"_id": 0})
+    # 行情（进程内行情快照，随 market_quotes 入库周期刷新）
+    q = await get_quote_snapshot_cache().get_quote(code6)
 
     # 🔥 调试日志：查看查询结果
     logger.info(f"🔍 查询 market_quotes: code={code6}")
@@ -576,11 +577,8 @@ async def get_kline(
             if should_fetch_realtime:
                 logger.info(f"🔥 尝试从 market_quotes 获取当天实时数据: {code_padded} (交易时间: {is_trading_time}, 已有当天数据: {has_today_data})")
 
-                db = get_mongo_db()
-                market_quotes_coll = db["market_quotes"]
-
-                # 查询当天的实时行情
-                realtime_quote = await market_quotes_coll.find_one({"code": code_padded})
+                # 查询当天的实时行情（进程内行情快照）
+                realtime_quote = await get_quote_snapshot_cache().get_quote(code_padded)
 
                 if realtime_quote:
                     # 🔥 构造当天的K线数据（使用统一的日期格式 YYYY-MM-DD）
@@ -0,0 +1,213 @@
+"""
+定时任务调度器运行器
+
+数据同步任务只能由一个进程执行，否则多 worker / 多副本部署时每个进程都会跑一遍同步。
+SchedulerRunner 通过 Redis 锁竞选 Leader，只有 Leader 创建并启动 APScheduler：
+- 当选后注册同步任务、启动调度器，并定期把任务状态发布到 MongoDB（scheduler_jobs）
+- 每 1/3 TTL 续约一次；续约失败（如长时间卡顿后锁被他人接管）立即停止调度器并重新竞选
+- 消费其他副本通过 Redis 转发的暂停 / 恢复 / 触发命令
+
+运行方式：
+- SCHEDULER_MODE=embedded（默认）：API 进程在 lifespan 中启动 SchedulerRunner，多个 worker 中只有一个成为 Leader
+- SCHEDULER_MODE=standalone：API 进程不运行调度器，单独启动 `python -m app.scheduler_runner`
+"""
+import asyncio
+import json
+import logging
+import signal
+import time
+from typing import Awaitable, Callable, Optional
+
+from apscheduler.schedulers.asyncio import AsyncIOScheduler
+
+from app.core.config import settings
+from app.core.leader_election import RedisLeaderLock
+
+logger = logging.getLogger("app.scheduler")
+
+SCHEDULER_LEADER_KEY = "scheduler:leader"
+
+# 每轮最多处理的转发命令数
+_MAX_COMMANDS_PER_TICK = 100
+
+
+class SchedulerRunner:
+    """Leader 选举 + 调度器生命周期管理"""
+
+    def __init__(
+        self,
+        redis=None,
+        ttl_seconds: Optional[float] = None,
+        publish_interval: Optional[float] = None,
+        register_jobs: Optional[Callable[[AsyncIOScheduler], Awaitable[None]]] = None,
+    ):
+        if redis is None:
+            from app.core.database import get_redis_client
+            redis = get_redis_client()
+        self.redis = redis
+        self.ttl_seconds = ttl_seconds or settings.SCHEDULER_LEADER_TTL_SECONDS
+        self.publish_interval = publish_interval or settings.SCHEDULER_STATE_PUBLISH_INTERVAL_SECONDS
+        self.lock = RedisLeaderLock(redis, SCHEDULER_LEADER_KEY, self.ttl_seconds)
+        if register_jobs is None:
+            from app.services.scheduler_jobs import register_sync_jobs
+            register_jobs = register_sync_jobs
+        self._register_jobs = register_jobs
+        self.scheduler: Optional[AsyncIOScheduler] = None
+        self._stop_event = asyncio.Event()
+        self._task: Optional[asyncio.Task] = None
+        self._last_renewed = 0.0
+        self._last_published = 0.0
+
+    @property
+    def is_leader(self) -> bool:
+        return self.scheduler is not None
+
+    async def _start_scheduler(self) -> None:
+        from app.services.scheduler_service import get_scheduler_service, set_scheduler_instance
+
+        scheduler = AsyncIOScheduler(timezone=settings.TIMEZONE)
+        await self._register_jobs(scheduler)
+        scheduler.start()
+        self.scheduler = scheduler
+
+        # 设置调度器实例到服务中，并立即创建服务以挂载执行事件监听器
+        set_scheduler_instance(scheduler)
+        await get_scheduler_service().publish_job_states(self.lock.instance_id)
+        self._last_published = time.monotonic()
+        logger.info(f"✅ 调度器已在 Leader 上启动: {self.lock.instance_id}")
+
+    async def _stop_scheduler(self) -> None:
+        from app.services.scheduler_service import set_scheduler_instance
+
+        if self.scheduler is None:
+            return
+        try:
+            self.scheduler.shutdown(wait=False)
+            logger.info("🛑 Scheduler stopped")
+        except Exception as e:
+            logger.warning(f"Scheduler shutdown error: {e}")
+        finally:
+            self.scheduler = None
+            set_scheduler_instance(None)
+
+    async def _drain_commands(self) -> None:
+        from app.services.scheduler_service import SCHEDULER_COMMANDS_KEY, get_scheduler_service
+
+        service = get_scheduler_service()
+        applied = 0
+        for _ in range(_MAX_COMMANDS_PER_TICK):
+            raw = await self.redis.lpop(SCHEDULER_COMMANDS_KEY)
+            if raw is None:
+                break
+            try:
+                command = json.loads(raw)
+            except (TypeError, ValueError):
+                logger.warning(f"⚠️ 忽略无法解析的调度器命令: {raw!r}")
+                continue
+            logger.info(f"📨 执行转发的调度器命令: {command.get('action')} {command.get('job_id')}")
+            await service.apply_command(command)
+            applied += 1
+        # 命令可能改变了任务状态，尽快发布（没有命令时按发布间隔发布）
+        if applied:
+            self._last_published = 0.0
+
+    async def tick(self) -> None:
+        """一轮选举 / 续约 / 命令处理 / 状态发布"""
+        now = time.monotonic()
+        try:
+            if self.is_leader:
+                if not await self.lock.renew():
+                    await self._stop_scheduler()
+                    return
+            else:
+                if not await self.lock.try_acquire():
+                    return
+                try:
+                    await self._start_scheduler()
+                except Exception:
+                    # 启动失败时让出领导权，由其他实例接管
+                    await self._stop_scheduler()
+                    await self.lock.release()
+                    raise
+            self._last_renewed = now
+        except Exception as e:
+            logger.warning(f"⚠️ 调度器 Leader 选举/续约失败: {e}")
+            # Redis 不可用时无法确认领导权：超过 TTL 后锁必然已过期，主动让位避免双 Leader
+            if self.is_leader and now - self._last_renewed >= self.ttl_seconds:
+                logger.warning("⚠️ 超过 Leader TTL 未能续约，停止本地调度器")
+                self.lock.is_leader = False
+                await self._stop_scheduler()
+            return
+
+        try:
+            await self._drain_commands()
+        except Exception as e:
+            logger.warning(f"⚠️ 处理调度器命令失败: {e}")
+
+        if time.monotonic() - self._last_published >= self.publish_interval:
+            from app.services.scheduler_service import get_scheduler_service
+
+            await get_scheduler_service().publish_job_states(self.lock.instance_id)
+            self._last_published = time.monotonic()
+
+    async def run(self) -> None:
+        logger.info(f"🗳️ 调度器参与 Leader 选举: {self.lock.instance_id}")
+        try:
+            while not self._stop_event.is_set():
+                await self.tick()
+                try:
+                    await asyncio.wait_for(self._stop_event.wait(), timeout=self.ttl_seconds / 3)
+                except asyncio.TimeoutError:
+                    pass
+        finally:
+            await self._stop_scheduler()
+            await self.lock.release()
+
+    def start(self) -> asyncio.Task:
+        """在当前事件循环中后台运行（embedded 模式）"""
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self.run())
+        return self._task
+
+    async def stop(self) -> None:
+        self._stop_event.set()
+        if self._task is not None:
+            try:
+                await self._task
+            except Exception as e:
+                logger.warning(f"Scheduler runner stop error: {e}")
+            self._task = None
+
+
+async def main():
+    from app.core.config_bridge import apply_runtime_config
+    from app.core.database import close_db, init_db
+    from app.core.logging_config import setup_logging
+
+    setup_logging("INFO")
+    await init_db()
+    # 与 API 进程一致：桥接统一配置到环境变量，应用动态日志级别
+    await apply_runtime_config(logger_names=("worker", "app.scheduler"))
+
+    runner = SchedulerRunner()
+
+    def _handle_signal(*_):
+        logger.info("Shutdown signal received")
+        runner._stop_event.set()
+
+    loop = asyncio.get_running_loop()
+    for sig in (signal.SIGINT, signal.SIGTERM):
+        try:
+            loop.add_signal_handler(sig, _handle_signal)
+        except NotImplementedError:
+            # Windows may not support signal handlers in event loop
+            pass
+
+    try:
+        await runner.run()
+    finally:
+        await close_db()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
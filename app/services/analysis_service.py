@@ -8,7 +8,7 @@ import uuid
 import json
 import logging
 from datetime import datetime
-from typing import Dict, Any, List, Optional, Callable
+from typing import TYPE_CHECKING, Dict, Any, List, Optional, Callable
 from pathlib import Path
 import sys
 
@@ -20,7 +20,6 @@ sys.path.insert(0, str(project_root))
 from tradingagents.utils.logging_init import init_logging
 init_logging()
 
-from tradingagents.graph.trading_graph import TradingAgentsGraph
 from tradingagents.default_config import DEFAULT_CONFIG
 from app.services.simple_analysis_service import create_analysis_config, get_provider_by_model_name
 from app.models.analysis import (
@@ -39,6 +38,9 @@ from app.services.queue import DEFAULT_USER_CONCURRENT_LIMIT, GLOBAL_CONCURRENT_
 from app.services.usage_statistics_service import UsageStatisticsService
 from app.models.config import UsageRecord
 
+if TYPE_CHECKING:
+    from tradingagents.graph.trading_graph import TradingAgentsGraph
+
 import logging
 logger = logging.getLogger(__name__)
 
@@ -52,7 +54,6 @@ class AnalysisService:
         self.queue_service = QueueService(redis_client)
         # 初始化使用统计服务
         self.usage_service = UsageStatisticsService()
-        self._trading_graph_cache = {}
         # 进度跟踪器缓存
         self._progress_trackers: Dict[str, RedisProgressTracker] = {}
 
@@ -79,22 +80,17 @@ class AnalysisService:
             logger.warning(f"⚠️ 生成新的用户ID: {new_object_id}")
             return PyObjectId(new_object_id)
     
-    def _get_trading_graph(self, config: Dict[str, Any]) -> TradingAgentsGraph:
-        """获取或创建TradingAgents图实例（带缓存）- 与单股分析保持一致"""
-        config_key = json.dumps(config, sort_keys=True)
-
-        if config_key not in self._trading_graph_cache:
-            # 直接使用完整配置，不再合并DEFAULT_CONFIG（因为create_analysis_config已经处理了）
-            # 这与单股分析服务和web目录的方式一致
-            self._trading_graph_cache[config_key] = TradingAgentsGraph(
-                selected_analysts=config.get("selected_analysts", ["market", "fundamentals"]),
-                debug=config.get("debug", False),
-                config=config
-            )
-
-            logger.info(f"创建新的TradingAgents实例: {config.get('llm_provider', 'default')}")
-
-        return self._trading_graph_cache[config_key]
+    def _get_trading_graph(self, config: Dict[str, Any]) -> "TradingAgentsGraph":
+        """获取TradingAgents图实例（进程内共享）- 与单股分析保持一致"""
+        # 直接使用完整配置，不再合并DEFAULT_CONFIG（因为create_analysis_config已经处理了）
+        # 延迟导入：图模块会加载 langchain 及全部智能体
+        from tradingagents.graph import get_shared_trading_graph
+
+        return get_shared_trading_graph(
+            selected_analysts=config.get("selected_analysts", ["market", "fundamentals"]),
+            debug=config.get("debug", False),
+            config=config
+        )
 
     def _execute_analysis_sync_with_progress(self, task: AnalysisTask, progress_tracker: RedisProgressTracker) -> AnalysisResult:
         """同步执行分析任务（在线程池中运行，带进度跟踪）"""
@@ -19,7 +19,7 @@ from typing import Any, Dict, List, Optional
 from motor.motor_asyncio import AsyncIOMotorDatabase
 from pymongo import UpdateOne
 
-from app.core.database import get_mongo_db
+from app.core.database import get_mongo_db, refresh_stock_screening
 from app.core.config import settings
 
 from app.services.basics_sync import (
@@ -341,6 +341,10 @@ class BasicsSyncService:
             stats.status = "success" if errors == 0 else "success_with_errors"
             stats.finished_at = datetime.utcnow().isoformat()
             await self._persist_status(db, stats.__dict__.copy())
+
+            # 基础信息变化后全量刷新筛选物化集合
+            await refresh_stock_screening(db=db)
+
             logger.info(
                 f"Stock basics sync finished: total={stats.total} inserted={inserted} updated={updated} errors={errors} trade_date={latest_trade_date}"
             )
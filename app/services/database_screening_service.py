@@ -7,7 +7,7 @@ import logging
 from typing import Any, Dict, List, Optional, Tuple
 from datetime import datetime
 
-from app.core.database import get_mongo_db
+from app.core.database import get_mongo_db, STOCK_SCREENING_COLLECTION
 # from app.models.screening import ScreeningCondition  # 避免循环导入
 
 logger = logging.getLogger(__name__)
@@ -17,8 +17,8 @@ class DatabaseScreeningService:
     """基于数据库的股票筛选服务"""
     
     def __init__(self):
-        # 使用视图而不是基础信息表，视图已经包含了实时行情数据
-        self.collection_name = "stock_screening_view"
+        # 使用物化筛选集合，已包含实时行情和最新财务数据（由写入方增量刷新）
+        self.collection_name = STOCK_SCREENING_COLLECTION
         
         # 支持的基础信息字段映射
         self.basic_fields = {
@@ -53,6 +53,17 @@ class DatabaseScreeningService:
             "volume": "volume",                # 成交量
         }
         
+        # 查询投影：只取 _format_result 需要的字段，减少传输量
+        self.result_projection = {
+            "_id": 0,
+            "code": 1, "name": 1, "industry": 1, "area": 1, "market": 1, "sse": 1, "list_date": 1,
+            "total_mv": 1, "circ_mv": 1,
+            "pe": 1, "pb": 1, "pe_ttm": 1, "pb_mrq": 1, "roe": 1,
+            "turnover_rate": 1, "volume_ratio": 1,
+            "close": 1, "pct_chg": 1, "amount": 1, "volume": 1, "open": 1, "high": 1, "low": 1,
+            "source": 1, "updated_at": 1,
+        }
+
         # 支持的操作符
         self.operators = {
             ">": "$gt",
@@ -143,7 +154,7 @@ class DatabaseScreeningService:
                 source = enabled_sources[0] if enabled_sources else 'tushare'
                 logger.info(f"✅ [database_screening] 最终使用的数据源: {source}")
 
-            # 构建查询条件（现在视图已包含实时行情数据，可以直接查询所有字段）
+            # 构建查询条件（物化集合已包含实时行情数据，可以直接查询所有字段）
             query = await self._build_query(conditions)
 
             # 🔥 添加数据源筛选
@@ -157,8 +168,8 @@ class DatabaseScreeningService:
             # 获取总数
             total_count = await collection.count_documents(query)
 
-            # 执行查询
-            cursor = collection.find(query)
+            # 执行查询（行情条件已作为查询谓词下推，排序和分页均在数据库端完成）
+            cursor = collection.find(query, self.result_projection)
 
             # 应用排序
             if sort_conditions:
@@ -176,7 +187,7 @@ class DatabaseScreeningService:
                 results.append(result)
                 codes.append(doc.get("code"))
 
-            # 批量查询财务数据（ROE等）- 如果视图中没有包含
+            # 批量查询财务数据（ROE等）- 如果物化集合中没有包含
             if codes:
                 await self._enrich_with_financial_data(results, codes)
 
@@ -207,32 +218,32 @@ class DatabaseScreeningService:
 
             logger.info(f"✅ [_build_query] 字段映射: {field} -> {db_field}")
             
-            # 处理不同操作符
+            # 处理不同操作符（同一字段的多个条件合并为一个谓词，如 pct_chg > 1 且 pct_chg < 5）
+            predicate = query.setdefault(db_field, {})
             if operator == "between":
                 # between操作需要两个值
                 if isinstance(value, list) and len(value) == 2:
-                    query[db_field] = {
-                        "$gte": value[0],
-                        "$lte": value[1]
-                    }
+                    predicate["$gte"] = value[0]
+                    predicate["$lte"] = value[1]
             elif operator == "contains":
                 # 字符串包含（不区分大小写）
-                query[db_field] = {
-                    "$regex": str(value),
-                    "$options": "i"
-                }
+                predicate["$regex"] = str(value)
+                predicate["$options"] = "i"
             elif operator in self.operators:
                 # 标准操作符
                 mongo_op = self.operators[operator]
-                query[db_field] = {mongo_op: value}
-            
+                predicate[mongo_op] = value
+
+            if not predicate:
+                query.pop(db_field)
+
         return query
     
     def _build_sort_conditions(self, order_by: Optional[List[Dict[str, str]]]) -> List[Tuple[str, int]]:
-        """构建排序条件"""
+        """构建排序条件（末尾追加 code 作为稳定排序键，保证 skip/limit 分页不重复、不遗漏）"""
         if not order_by:
             # 默认按总市值降序排序
-            return [("total_mv", -1)]
+            return [("total_mv", -1), ("code", 1)]
         
         sort_conditions = []
         for order in order_by:
@@ -247,7 +258,10 @@ class DatabaseScreeningService:
             # 映射排序方向
             sort_direction = -1 if direction.lower() == "desc" else 1
             sort_conditions.append((db_field, sort_direction))
-        
+
+        if sort_conditions and all(f != "code" for f, _ in sort_conditions):
+            sort_conditions.append(("code", 1))
+
         return sort_conditions
     
     async def _enrich_with_financial_data(self, results: List[Dict[str, Any]], codes: List[str]) -> None:
@@ -360,7 +374,7 @@ class DatabaseScreeningService:
             "turnover_rate": doc.get("turnover_rate"),
             "volume_ratio": doc.get("volume_ratio"),
 
-            # 交易数据（从视图中获取，视图已包含实时行情数据）
+            # 交易数据（从物化集合中获取，已包含实时行情数据）
             "close": doc.get("close"),              # 收盘价
             "pct_chg": doc.get("pct_chg"),          # 涨跌幅(%)
             "amount": doc.get("amount"),            # 成交额
@@ -436,123 +450,6 @@ class DatabaseScreeningService:
             logger.error(f"获取字段统计失败: {e}")
             return {"field": field, "error": str(e)}
     
-    def _separate_conditions(self, conditions: List[Dict[str, Any]]) -> Tuple[List[Dict[str, Any]], List[Dict[str, Any]]]:
-        """
-        分离基础信息条件和实时行情条件
-
-        Args:
-            conditions: 所有筛选条件
-
-        Returns:
-            Tuple[基础信息条件列表, 实时行情条件列表]
-        """
-        # 实时行情字段（需要从 market_quotes 查询）
-        quote_fields = {"pct_chg", "amount", "close", "volume"}
-
-        basic_conditions = []
-        quote_conditions = []
-
-        for condition in conditions:
-            field = condition.get("field") if isinstance(condition, dict) else condition.field
-            if field in quote_fields:
-                quote_conditions.append(condition)
-            else:
-                basic_conditions.append(condition)
-
-        return basic_conditions, quote_conditions
-
-    async def _filter_by_quotes(
-        self,
-        results: List[Dict[str, Any]],
-        codes: List[str],
-        quote_conditions: List[Dict[str, Any]]
-    ) -> List[Dict[str, Any]]:
-        """
-        根据实时行情数据进行二次筛选
-
-        Args:
-            results: 初步筛选结果
-            codes: 股票代码列表
-            quote_conditions: 实时行情筛选条件
-
-        Returns:
-            List[Dict]: 筛选后的结果
-        """
-        try:
-            db = get_mongo_db()
-            quotes_collection = db['market_quotes']
-
-            # 批量查询实时行情数据
-            quotes_cursor = quotes_collection.find({"code": {"$in": codes}})
-            quotes_map = {}
-            async for quote in quotes_cursor:
-                code = quote.get("code")
-                quotes_map[code] = {
-                    "close": quote.get("close"),
-                    "pct_chg": quote.get("pct_chg"),
-                    "amount": quote.get("amount"),
-                    "volume": quote.get("volume"),
-                }
-
-            logger.info(f"📊 查询到 {len(quotes_map)} 只股票的实时行情数据")
-
-            # 过滤结果
-            filtered_results = []
-            for result in results:
-                code = result.get("code")
-                quote_data = quotes_map.get(code)
-
-                if not quote_data:
-                    # 没有实时行情数据，跳过
-                    continue
-
-                # 检查是否满足所有实时行情条件
-                match = True
-                for condition in quote_conditions:
-                    field = condition.get("field") if isinstance(condition, dict) else condition.field
-                    operator = condition.get("operator") if isinstance(condition, dict) else condition.operator
-                    value = condition.get("value") if isinstance(condition, dict) else condition.value
-
-                    field_value = quote_data.get(field)
-                    if field_value is None:
-                        match = False
-                        break
-
-                    # 检查条件
-                    if operator == "between" and isinstance(value, list) and len(value) == 2:
-                        if not (value[0] <= field_value <= value[1]):
-                            match = False
-                            break
-                    elif operator == ">":
-                        if not (field_value > value):
-                            match = False
-                            break
-                    elif operator == "<":
-                        if not (field_value < value):
-                            match = False
-                            break
-                    elif operator == ">=":
-                        if not (field_value >= value):
-                            match = False
-                            break
-                    elif operator == "<=":
-                        if not (field_value <= value):
-                            match = False
-                            break
-
-                if match:
-                    # 将实时行情数据合并到结果中
-                    result.update(quote_data)
-                    filtered_results.append(result)
-
-            logger.info(f"✅ 实时行情筛选完成: 筛选前={len(results)}, 筛选后={len(filtered_results)}")
-            return filtered_results
-
-        except Exception as e:
-            logger.error(f"❌ 实时行情筛选失败: {e}")
-            # 如果失败，返回原始结果
-            return results
-
     async def get_available_values(self, field: str, limit: int = 100) -> List[str]:
         """
         获取字段的可选值列表（用于枚举类型字段）
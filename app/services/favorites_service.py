@@ -9,6 +9,7 @@ from bson import ObjectId
 from app.core.database import get_mongo_db
 from app.models.user import FavoriteStock
 from app.services.quotes_service import get_quotes_service
+from app.services.quote_snapshot import get_quote_snapshot_cache
 
 
 class FavoritesService:
@@ -119,13 +120,10 @@ class FavoritesService:
                     it["board"] = "-"
                     it["exchange"] = "-"
 
-        # 批量获取行情（优先使用入库的 market_quotes，30秒更新）
+        # 批量获取行情（进程内行情快照，随 market_quotes 入库周期刷新，不查库）
         if codes:
             try:
-                coll = db["market_quotes"]
-                cursor = coll.find({"code": {"$in": codes}}, {"code": 1, "close": 1, "pct_chg": 1, "amount": 1})
-                docs = await cursor.to_list(length=None)
-                quotes_map = {str(d.get("code")).zfill(6): d for d in (docs or [])}
+                quotes_map = await get_quote_snapshot_cache().get_quotes(codes)
                 for it in items:
                     code = it.get("stock_code")
                     q = quotes_map.get(code)
@@ -9,7 +9,7 @@ from typing import Dict, Any, List, Optional
 import pandas as pd
 from pymongo import ReplaceOne
 
-from app.core.database import get_mongo_db
+from app.core.database import get_mongo_db, refresh_stock_screening
 
 logger = logging.getLogger(__name__)
 
@@ -153,6 +153,10 @@ class FinancialDataService:
                 actual_saved = result.upserted_count + result.modified_count
                 
                 logger.info(f"✅ {symbol} 财务数据保存完成: {actual_saved}条记录")
+
+                # 增量刷新筛选物化集合（ROE 等财务指标）
+                if actual_saved > 0:
+                    await refresh_stock_screening([symbol], db=self.db)
                 return actual_saved
             
             return 0
@@ -18,7 +18,7 @@ from enum import Enum
 from motor.motor_asyncio import AsyncIOMotorDatabase
 from pymongo import UpdateOne
 
-from app.core.database import get_mongo_db
+from app.core.database import get_mongo_db, refresh_stock_screening
 from app.services.basics_sync import add_financial_metrics as _add_financial_metrics_util
 
 
@@ -314,6 +314,10 @@ class MultiSourceBasicsSyncService:
             stats.finished_at = datetime.now().isoformat()
 
             await self._persist_status(db, stats.__dict__.copy())
+
+            # 基础信息变化后全量刷新筛选物化集合
+            await refresh_stock_screening(db=db)
+
             logger.info(
                 f"✅ Multi-source sync finished: total={stats.total} inserted={inserted} "
                 f"updated={updated} errors={errors} sources={stats.data_sources_used}"
@@ -2,11 +2,14 @@
 新闻数据服务
 提供统一的新闻数据存储、查询和管理功能
 """
-from typing import Optional, List, Dict, Any, Union
+from typing import Optional, List, Dict, Any, Tuple, Union
+from collections import OrderedDict
 from datetime import datetime, timedelta
 from dataclasses import dataclass
+import hashlib
 import logging
-from pymongo import ReplaceOne
+import threading
+from pymongo import UpdateOne
 from pymongo.errors import BulkWriteError
 from bson import ObjectId
 
@@ -15,6 +18,30 @@ from app.core.database import get_database
 logger = logging.getLogger(__name__)
 
 
+# 进程内记住最近写入 / 确认已存在的新闻，重复同步时不再提交到 MongoDB
+RECENT_NEWS_HASHES_MAX = 50000
+
+# 重复键错误（并发写入同一新闻，或与旧数据的 url+标题+时间 唯一索引冲突），视为已存在
+DUPLICATE_KEY_ERROR = 11000
+
+
+def news_content_hash(news_data: Dict[str, Any]) -> str:
+    """
+    新闻去重键：URL + 标题 + 发布时间（与原唯一索引的字段一致）的 SHA-1
+
+    发布时间使用原始值而不是解析结果，无法解析的时间不会因为回退到当前时间而改变哈希
+    """
+    publish_time = news_data.get("publish_time")
+    if isinstance(publish_time, datetime):
+        publish_time = publish_time.isoformat()
+    parts = (
+        str(news_data.get("url") or "").strip(),
+        str(news_data.get("title") or "").strip(),
+        str(publish_time or "").strip(),
+    )
+    return hashlib.sha1("\x1f".join(parts).encode("utf-8")).hexdigest()
+
+
 def convert_objectid_to_str(data: Union[Dict, List[Dict]]) -> Union[Dict, List[Dict]]:
     """
     转换 MongoDB ObjectId 为字符串，避免 JSON 序列化错误
@@ -83,6 +110,8 @@ class NewsDataService:
         self._db = None
         self._collection = None
         self._indexes_ensured = False
+        self._recent_hashes: "OrderedDict[str, None]" = OrderedDict()
+        self._recent_lock = threading.Lock()
 
     async def _ensure_indexes(self):
         """确保必要的索引存在"""
@@ -100,6 +129,15 @@ class NewsDataService:
                 ("publish_time", 1)
             ], unique=True, name="url_title_time_unique", background=True)
 
+            # 1.1 去重键唯一索引（旧数据没有 content_hash，用部分索引避免空值冲突）
+            await collection.create_index(
+                [("content_hash", 1)],
+                unique=True,
+                name="content_hash_unique",
+                partialFilterExpression={"content_hash": {"$exists": True}},
+                background=True
+            )
+
             # 2. 股票代码索引（查询单只股票的新闻）
             await collection.create_index([("symbol", 1)], name="symbol_index", background=True)
 
@@ -158,7 +196,7 @@ class NewsDataService:
             market: 市场标识
 
         Returns:
-            保存的记录数量
+            新增的记录数量（已存在的新闻不计入）
         """
         try:
             # 🔥 确保索引存在（第一次调用时创建）
@@ -176,66 +214,26 @@ class NewsDataService:
             if not news_list:
                 return 0
             
-            # 准备批量操作
-            operations = []
-
-            for i, news in enumerate(news_list):
-                # 标准化新闻数据
-                standardized_news = self._standardize_news_data(
-                    news, data_source, market, now
-                )
-
-                # 🔍 记录前3条数据的详细信息
-                if i < 3:
-                    self.logger.info(f"   📝 标准化后的新闻 {i+1}:")
-                    self.logger.info(f"      symbol: {standardized_news.get('symbol')}")
-                    self.logger.info(f"      title: {standardized_news.get('title', '')[:50]}...")
-                    self.logger.info(f"      publish_time: {standardized_news.get('publish_time')} (type: {type(standardized_news.get('publish_time'))})")
-                    self.logger.info(f"      url: {standardized_news.get('url', '')[:80]}...")
-
-                # 使用URL、标题和发布时间作为唯一标识
-                filter_query = {
-                    "url": standardized_news["url"],
-                    "title": standardized_news["title"],
-                    "publish_time": standardized_news["publish_time"]
-                }
-
-                operations.append(
-                    ReplaceOne(
-                        filter_query,
-                        standardized_news,
-                        upsert=True
-                    )
-                )
-            
-            # 执行批量操作
-            if operations:
-                result = await collection.bulk_write(operations)
-                saved_count = result.upserted_count + result.modified_count
-                
-                self.logger.info(f"💾 新闻数据保存完成: {saved_count}条记录 (数据源: {data_source})")
-                return saved_count
-            
-            return 0
-            
-        except BulkWriteError as e:
-            # 处理批量写入错误，但不完全失败
-            write_errors = e.details.get('writeErrors', [])
-            error_count = len(write_errors)
-            self.logger.warning(f"⚠️ 部分新闻数据保存失败: {error_count}条错误")
-
-            # 记录详细错误信息
-            for i, error in enumerate(write_errors[:3], 1):  # 只记录前3个错误
-                error_msg = error.get('errmsg', 'Unknown error')
-                error_code = error.get('code', 'N/A')
-                self.logger.warning(f"   错误 {i}: [Code {error_code}] {error_msg}")
-
-            # 计算成功保存的数量
-            success_count = len(operations) - error_count
-            if success_count > 0:
-                self.logger.info(f"💾 成功保存 {success_count} 条新闻数据")
+            # 准备批量操作（已存在的新闻在这里跳过）
+            operations, hashes = self._build_insert_operations(news_list, data_source, market, now)
+            if not operations:
+                self.logger.info(f"💾 新闻数据无新增: {len(news_list)}条均已存在 (数据源: {data_source})")
+                return 0
 
-            return success_count
+            # 执行批量操作（无序：单条冲突不影响其他新闻）
+            try:
+                result = await collection.bulk_write(operations, ordered=False)
+                saved_count, failed = result.upserted_count, set()
+            except BulkWriteError as e:
+                saved_count, failed = self._handle_bulk_write_error(e)
+
+            # 写入失败的新闻不记入，下次同步时重试
+            self._remember_hashes([h for i, h in enumerate(hashes) if i not in failed])
+            self.logger.info(
+                f"💾 新闻数据保存完成: 新增{saved_count}条, 提交{len(operations)}条, "
+                f"收到{len(news_list)}条 (数据源: {data_source})"
+            )
+            return saved_count
             
         except Exception as e:
             self.logger.error(f"❌ 保存新闻数据失败: {e}")
@@ -257,7 +255,7 @@ class NewsDataService:
             market: 市场标识
 
         Returns:
-            保存的记录数量
+            新增的记录数量（已存在的新闻不计入）
         """
         try:
             from app.core.database import get_mongo_db_sync
@@ -276,73 +274,110 @@ class NewsDataService:
             if not news_list:
                 return 0
 
-            # 准备批量操作
-            operations = []
-
-            self.logger.info(f"📝 开始标准化 {len(news_list)} 条新闻数据...")
-
-            for i, news in enumerate(news_list, 1):
-                # 标准化新闻数据
-                standardized_news = self._standardize_news_data(news, data_source, market, now)
-
-                # 记录前3条新闻的详细信息
-                if i <= 3:
-                    self.logger.info(f"   📝 标准化后的新闻 {i}:")
-                    self.logger.info(f"      symbol: {standardized_news.get('symbol')}")
-                    self.logger.info(f"      title: {standardized_news.get('title', '')[:50]}...")
-                    publish_time = standardized_news.get('publish_time')
-                    self.logger.info(f"      publish_time: {publish_time} (type: {type(publish_time)})")
-                    self.logger.info(f"      url: {standardized_news.get('url', '')[:60]}...")
-
-                # 使用URL+标题+发布时间作为唯一标识
-                filter_query = {
-                    "url": standardized_news.get("url"),
-                    "title": standardized_news.get("title"),
-                    "publish_time": standardized_news.get("publish_time")
-                }
+            # 准备批量操作（已存在的新闻在这里跳过）
+            operations, hashes = self._build_insert_operations(news_list, data_source, market, now)
+            if not operations:
+                self.logger.info(f"💾 新闻数据无新增: {len(news_list)}条均已存在 (数据源: {data_source})")
+                return 0
+
+            # 执行批量操作（同步方式，无序）
+            try:
+                result = collection.bulk_write(operations, ordered=False)
+                saved_count, failed = result.upserted_count, set()
+            except BulkWriteError as e:
+                saved_count, failed = self._handle_bulk_write_error(e)
+
+            # 写入失败的新闻不记入，下次同步时重试
+            self._remember_hashes([h for i, h in enumerate(hashes) if i not in failed])
+            self.logger.info(
+                f"💾 新闻数据保存完成: 新增{saved_count}条, 提交{len(operations)}条, "
+                f"收到{len(news_list)}条 (数据源: {data_source})"
+            )
+            return saved_count
+
+        except Exception as e:
+            self.logger.error(f"❌ 保存新闻数据失败: {e}")
+            import traceback
+            self.logger.error(traceback.format_exc())
+            return 0
+
+    def _build_insert_operations(
+        self,
+        news_list: List[Dict[str, Any]],
+        data_source: str,
+        market: str,
+        now: datetime
+    ) -> Tuple[List[UpdateOne], List[str]]:
+        """
+        构建"不存在才插入"的批量操作
 
-                operations.append(
-                    ReplaceOne(
-                        filter_query,
-                        standardized_news,
-                        upsert=True
-                    )
+        - 按 content_hash 去重：同一批内重复的、本进程最近已写入的新闻不提交
+        - $setOnInsert：已存在的新闻匹配后不做任何修改，不产生写入
+        """
+        operations = []
+        hashes = []
+        seen = set()
+
+        for i, news in enumerate(news_list):
+            content_hash = news_content_hash(news)
+            if content_hash in seen or self._is_recent(content_hash):
+                continue
+            seen.add(content_hash)
+
+            # 标准化新闻数据
+            standardized_news = self._standardize_news_data(news, data_source, market, now)
+            standardized_news["content_hash"] = content_hash
+
+            if i < 3:
+                self.logger.debug(
+                    f"   📝 标准化后的新闻 {i+1}: symbol={standardized_news.get('symbol')}, "
+                    f"title={standardized_news.get('title', '')[:50]}, "
+                    f"publish_time={standardized_news.get('publish_time')}, "
+                    f"url={standardized_news.get('url', '')[:80]}"
                 )
 
-            # 执行批量操作（同步方式）
-            if operations:
-                result = collection.bulk_write(operations)
-                saved_count = result.upserted_count + result.modified_count
+            operations.append(
+                UpdateOne(
+                    {"content_hash": content_hash},
+                    {"$setOnInsert": standardized_news},
+                    upsert=True
+                )
+            )
+            hashes.append(content_hash)
 
-                self.logger.info(f"💾 新闻数据保存完成: {saved_count}条记录 (数据源: {data_source})")
-                return saved_count
+        return operations, hashes
 
-            return 0
+    def _handle_bulk_write_error(self, e: BulkWriteError) -> Tuple[int, set]:
+        """重复键错误视为新闻已存在，返回 (实际新增的数量, 写入失败的操作下标)"""
+        details = e.details or {}
+        write_errors = details.get('writeErrors', [])
+        other_errors = [err for err in write_errors if err.get('code') != DUPLICATE_KEY_ERROR]
 
-        except BulkWriteError as e:
+        if other_errors:
             # 处理批量写入错误，但不完全失败
-            write_errors = e.details.get('writeErrors', [])
-            error_count = len(write_errors)
-            self.logger.warning(f"⚠️ 部分新闻数据保存失败: {error_count}条错误")
-
+            self.logger.warning(f"⚠️ 部分新闻数据保存失败: {len(other_errors)}条错误")
             # 记录详细错误信息
-            for i, error in enumerate(write_errors[:3], 1):  # 只记录前3个错误
+            for i, error in enumerate(other_errors[:3], 1):  # 只记录前3个错误
                 error_msg = error.get('errmsg', 'Unknown error')
                 error_code = error.get('code', 'N/A')
                 self.logger.warning(f"   错误 {i}: [Code {error_code}] {error_msg}")
 
-            # 计算成功保存的数量
-            success_count = len(operations) - error_count
-            if success_count > 0:
-                self.logger.info(f"💾 成功保存 {success_count} 条新闻数据")
-
-            return success_count
-
-        except Exception as e:
-            self.logger.error(f"❌ 保存新闻数据失败: {e}")
-            import traceback
-            self.logger.error(traceback.format_exc())
-            return 0
+        return details.get('nUpserted', 0), {err.get('index') for err in other_errors}
+
+    def _is_recent(self, content_hash: str) -> bool:
+        with self._recent_lock:
+            if content_hash in self._recent_hashes:
+                self._recent_hashes.move_to_end(content_hash)
+                return True
+            return False
+
+    def _remember_hashes(self, hashes: List[str]) -> None:
+        with self._recent_lock:
+            for content_hash in hashes:
+                self._recent_hashes[content_hash] = None
+                self._recent_hashes.move_to_end(content_hash)
+            while len(self._recent_hashes) > RECENT_NEWS_HASHES_MAX:
+                self._recent_hashes.popitem(last=False)
 
     def _standardize_news_data(
         self,
@@ -0,0 +1,169 @@
+"""
+操作日志写入缓冲
+
+OperationLogMiddleware 原来在每个已认证请求返回前 await 一次 insert_one，
+审计日志的写入延迟直接叠加在接口响应时间上。这里改为：
+- 响应路径只把日志文档放入进程内有界队列（无数据库 I/O）
+- 后台任务攒够 batch_size 条或距上次写入超过 flush_interval 秒时 insert_many
+- 队列满时丢弃新日志并计数（背压，不阻塞请求）
+- 应用关闭时（close_db 之前）写完队列中剩余的日志
+"""
+import asyncio
+import logging
+import time
+from typing import Any, Awaitable, Callable, Dict, List, Optional
+
+from app.core.config import settings
+
+logger = logging.getLogger("webapi")
+
+BatchWriter = Callable[[List[Dict[str, Any]]], Awaitable[Any]]
+
+
+class OperationLogBuffer:
+    """操作日志的有界内存队列 + 批量写入"""
+
+    def __init__(
+        self,
+        max_size: int = 10000,
+        batch_size: int = 200,
+        flush_interval: float = 2.0,
+        writer: Optional[BatchWriter] = None,
+    ) -> None:
+        self.max_size = max_size
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self._writer = writer
+        self._queue: Optional[asyncio.Queue] = None
+        self._task: Optional[asyncio.Task] = None
+        # 已从队列取出、尚未写入的日志；正在写入的批次（停止时不能丢失）
+        self._pending: List[Dict[str, Any]] = []
+        self._inflight: Optional[asyncio.Future] = None
+        self._enqueued = 0
+        self._written = 0
+        self._dropped = 0
+        self._failed = 0
+        self._last_drop_warning = 0.0
+
+    async def _write(self, batch: List[Dict[str, Any]]) -> None:
+        if self._writer is not None:
+            await self._writer(batch)
+            return
+        from app.services.operation_log_service import get_operation_log_service
+        await get_operation_log_service().insert_logs(batch)
+
+    def submit(self, log_doc: Dict[str, Any]) -> bool:
+        """
+        放入队列（必须在事件循环中调用，不做任何 I/O）
+
+        Returns:
+            False 表示队列已满，日志被丢弃
+        """
+        if self._queue is None:
+            self._queue = asyncio.Queue(maxsize=self.max_size)
+        if self._task is None or self._task.done():
+            # 未经 lifespan 启动时（脚本 / 测试中的应用）首次提交时启动写入任务
+            self.start()
+        try:
+            self._queue.put_nowait(log_doc)
+        except asyncio.QueueFull:
+            self._dropped += 1
+            now = time.monotonic()
+            if now - self._last_drop_warning >= 60:
+                self._last_drop_warning = now
+                logger.warning(f"⚠️ 操作日志队列已满（{self.max_size}），已丢弃 {self._dropped} 条日志")
+            return False
+        self._enqueued += 1
+        return True
+
+    def _drain(self) -> None:
+        while len(self._pending) < self.batch_size:
+            try:
+                self._pending.append(self._queue.get_nowait())
+            except asyncio.QueueEmpty:
+                return
+
+    async def _flush(self, batch: List[Dict[str, Any]]) -> None:
+        if not batch:
+            return
+        try:
+            await self._write(batch)
+            self._written += len(batch)
+            logger.debug(f"📝 操作日志批量写入 {len(batch)} 条")
+        except Exception as e:
+            self._failed += len(batch)
+            logger.error(f"❌ 操作日志批量写入失败（{len(batch)} 条）: {e}")
+
+    async def _run(self) -> None:
+        loop = asyncio.get_running_loop()
+        while True:
+            self._pending.append(await self._queue.get())
+            deadline = loop.time() + self.flush_interval
+            while len(self._pending) < self.batch_size:
+                self._drain()
+                remaining = deadline - loop.time()
+                if len(self._pending) >= self.batch_size or remaining <= 0:
+                    break
+                try:
+                    self._pending.append(await asyncio.wait_for(self._queue.get(), timeout=remaining))
+                except asyncio.TimeoutError:
+                    break
+            batch, self._pending = self._pending, []
+            # 停止时取消的是等待，写入本身继续完成
+            self._inflight = asyncio.ensure_future(self._flush(batch))
+            await asyncio.shield(self._inflight)
+
+    def start(self) -> None:
+        if self._queue is None:
+            self._queue = asyncio.Queue(maxsize=self.max_size)
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self._run())
+            logger.info(f"📝 操作日志批量写入已启动（批量 {self.batch_size} 条 / {self.flush_interval}s）")
+
+    async def flush(self) -> None:
+        """立即写入队列中的全部日志"""
+        if self._queue is None:
+            return
+        while self._pending or not self._queue.empty():
+            self._drain()
+            batch, self._pending = self._pending, []
+            await self._flush(batch)
+
+    async def stop(self) -> None:
+        """停止后台任务并写完剩余日志（应在关闭数据库连接前调用）"""
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except (asyncio.CancelledError, Exception):
+                pass
+            self._task = None
+        if self._inflight is not None and not self._inflight.done():
+            await self._inflight
+        await self.flush()
+        # 队列绑定在当前事件循环上，重新启动时新建
+        self._queue = None
+        logger.info(f"📝 操作日志批量写入已停止: {self.stats()}")
+
+    def stats(self) -> Dict[str, int]:
+        return {
+            "queued": (self._queue.qsize() if self._queue is not None else 0) + len(self._pending),
+            "enqueued": self._enqueued,
+            "written": self._written,
+            "dropped": self._dropped,
+            "failed": self._failed,
+        }
+
+
+_operation_log_buffer: Optional[OperationLogBuffer] = None
+
+
+def get_operation_log_buffer() -> OperationLogBuffer:
+    global _operation_log_buffer
+    if _operation_log_buffer is None:
+        _operation_log_buffer = OperationLogBuffer(
+            max_size=settings.OPERATION_LOG_QUEUE_MAX_SIZE,
+            batch_size=settings.OPERATION_LOG_BATCH_SIZE,
+            flush_interval=settings.OPERATION_LOG_FLUSH_INTERVAL_SECONDS,
+        )
+    return _operation_log_buffer
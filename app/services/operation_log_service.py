@@ -27,6 +27,33 @@ class OperationLogService:
     def __init__(self):
         self.collection_name = "operation_logs"
     
+    @staticmethod
+    def build_log_doc(
+        user_id: str,
+        username: str,
+        log_data: OperationLogCreate,
+        ip_address: Optional[str] = None,
+        user_agent: Optional[str] = None
+    ) -> Dict[str, Any]:
+        """构建日志文档"""
+        # 🔥 使用 naive datetime（不带时区信息），MongoDB 会按原样存储，不会转换为 UTC
+        current_time = now_tz().replace(tzinfo=None)  # 移除时区信息，保留本地时间值
+        return {
+            "user_id": user_id,
+            "username": username,
+            "action_type": log_data.action_type,
+            "action": log_data.action,
+            "details": log_data.details or {},
+            "success": log_data.success,
+            "error_message": log_data.error_message,
+            "duration_ms": log_data.duration_ms,
+            "ip_address": ip_address or log_data.ip_address,
+            "user_agent": user_agent or log_data.user_agent,
+            "session_id": log_data.session_id,
+            "timestamp": current_time,  # naive datetime，MongoDB 按原样存储
+            "created_at": current_time  # naive datetime，MongoDB 按原样存储
+        }
+
     async def create_log(
         self,
         user_id: str,
@@ -39,25 +66,8 @@ class OperationLogService:
         try:
             db = get_mongo_db()
 
-            # 构建日志文档
-            # 🔥 使用 naive datetime（不带时区信息），MongoDB 会按原样存储，不会转换为 UTC
-            current_time = now_tz().replace(tzinfo=None)  # 移除时区信息，保留本地时间值
-            log_doc = {
-                "user_id": user_id,
-                "username": username,
-                "action_type": log_data.action_type,
-                "action": log_data.action,
-                "details": log_data.details or {},
-                "success": log_data.success,
-                "error_message": log_data.error_message,
-                "duration_ms": log_data.duration_ms,
-                "ip_address": ip_address or log_data.ip_address,
-                "user_agent": user_agent or log_data.user_agent,
-                "session_id": log_data.session_id,
-                "timestamp": current_time,  # naive datetime，MongoDB 按原样存储
-                "created_at": current_time  # naive datetime，MongoDB 按原样存储
-            }
-            
+            log_doc = self.build_log_doc(user_id, username, log_data, ip_address, user_agent)
+
             # 插入数据库
             result = await db[self.collection_name].insert_one(log_doc)
             
@@ -67,6 +77,14 @@ class OperationLogService:
         except Exception as e:
             logger.error(f"创建操作日志失败: {e}")
             raise Exception(f"创建操作日志失败: {str(e)}")
+
+    async def insert_logs(self, log_docs: List[Dict[str, Any]]) -> int:
+        """批量写入已构建的日志文档（OperationLogBuffer 使用）"""
+        if not log_docs:
+            return 0
+        db = get_mongo_db()
+        result = await db[self.collection_name].insert_many(log_docs, ordered=False)
+        return len(result.inserted_ids)
     
     async def get_logs(self, query: OperationLogQuery) -> Tuple[List[OperationLogResponse], int]:
         """获取操作日志列表"""
@@ -282,3 +300,39 @@ async def log_operation(
         session_id=session_id
     )
     return await service.create_log(user_id, username, log_data, ip_address, user_agent)
+
+
+def enqueue_operation_log(
+    user_id: str,
+    username: str,
+    action_type: str,
+    action: str,
+    details: Optional[Dict[str, Any]] = None,
+    success: bool = True,
+    error_message: Optional[str] = None,
+    duration_ms: Optional[int] = None,
+    ip_address: Optional[str] = None,
+    user_agent: Optional[str] = None,
+    session_id: Optional[str] = None
+) -> bool:
+    """
+    记录操作日志但不等待写库：放入 OperationLogBuffer，由后台任务批量写入
+
+    Returns:
+        False 表示缓冲队列已满，日志被丢弃
+    """
+    from app.services.operation_log_buffer import get_operation_log_buffer
+
+    log_data = OperationLogCreate(
+        action_type=action_type,
+        action=action,
+        details=details,
+        success=success,
+        error_message=error_message,
+        duration_ms=duration_ms,
+        ip_address=ip_address,
+        user_agent=user_agent,
+        session_id=session_id
+    )
+    log_doc = OperationLogService.build_log_doc(user_id, username, log_data, ip_address, user_agent)
+    return get_operation_log_buffer().submit(log_doc)
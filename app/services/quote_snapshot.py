@@ -0,0 +1,222 @@
+"""
+进程内行情快照（QuoteSnapshot）
+
+- market_quotes 只在每个行情入库周期变化一次，读路径（自选股、筛选、股票详情/K线、QuotesService）
+  不必每个请求都查库。
+- 快照使用紧凑的数组结构：数值字段存放在一个 float64 二维数组中（缺失为 NaN），按 code 建行索引。
+- QuotesIngestionService.run_once 入库后通过 Redis pub/sub 发布「行情已更新」事件，
+  各进程收到事件后从 market_quotes 整表加载一次；Redis 不可用时按最长使用时间兜底刷新。
+"""
+from __future__ import annotations
+
+import asyncio
+import json
+import logging
+import time
+from datetime import datetime
+from typing import Any, Dict, Iterable, List, Optional
+
+import numpy as np
+
+from app.core.config import settings
+from app.core.database import get_mongo_db, get_redis_client
+
+logger = logging.getLogger(__name__)
+
+# 数值字段（按列存放在二维数组中）
+NUMERIC_FIELDS = (
+    "close", "pct_chg", "amount", "volume", "open", "high", "low", "pre_close",
+    "turnover_rate", "volume_ratio",
+)
+_FIELD_POS = {name: i for i, name in enumerate(NUMERIC_FIELDS)}
+
+
+def _to_float(v: Any) -> float:
+    try:
+        return float(v) if v is not None else np.nan
+    except (TypeError, ValueError):
+        return np.nan
+
+
+class QuoteSnapshot:
+    """不可变的全市场行情快照（数组存储，按 code 索引）"""
+
+    __slots__ = ("codes", "values", "trade_dates", "updated_ats", "loaded_at", "_index")
+
+    def __init__(
+        self,
+        codes: List[str],
+        values: np.ndarray,
+        trade_dates: List[Optional[str]],
+        updated_ats: List[Optional[datetime]],
+    ) -> None:
+        self.codes = codes
+        self.values = values
+        self.trade_dates = trade_dates
+        self.updated_ats = updated_ats
+        self.loaded_at = time.monotonic()
+        self._index = {code: i for i, code in enumerate(codes)}
+
+    @classmethod
+    def from_docs(cls, docs: Iterable[Dict[str, Any]]) -> "QuoteSnapshot":
+        codes: List[str] = []
+        rows: List[List[float]] = []
+        trade_dates: List[Optional[str]] = []
+        updated_ats: List[Optional[datetime]] = []
+        for doc in docs:
+            code = doc.get("code")
+            if not code:
+                continue
+            codes.append(str(code).zfill(6))
+            rows.append([_to_float(doc.get(f)) for f in NUMERIC_FIELDS])
+            trade_dates.append(doc.get("trade_date"))
+            updated_ats.append(doc.get("updated_at"))
+        values = np.array(rows, dtype=np.float64).reshape(len(rows), len(NUMERIC_FIELDS))
+        return cls(codes, values, trade_dates, updated_ats)
+
+    def __len__(self) -> int:
+        return len(self.codes)
+
+    def __contains__(self, code: str) -> bool:
+        return code in self._index
+
+    def get(self, code: str) -> Optional[Dict[str, Any]]:
+        """返回单只股票的行情字典（缺失字段不出现在结果中），不存在返回 None"""
+        row = self._index.get(code)
+        if row is None:
+            return None
+        quote: Dict[str, Any] = {"code": code}
+        for name, v in zip(NUMERIC_FIELDS, self.values[row].tolist()):
+            if v == v:  # 过滤 NaN
+                quote[name] = v
+        if self.trade_dates[row] is not None:
+            quote["trade_date"] = self.trade_dates[row]
+        if self.updated_ats[row] is not None:
+            quote["updated_at"] = self.updated_ats[row]
+        return quote
+
+    def column(self, field: str) -> np.ndarray:
+        """按字段取整列（只读视图），用于向量化计算"""
+        col = self.values[:, _FIELD_POS[field]]
+        col.flags.writeable = False
+        return col
+
+
+class QuoteSnapshotCache:
+    """进程级行情快照缓存：订阅 Redis 更新事件，事件到达后整表重载一次"""
+
+    def __init__(self, collection_name: str = "market_quotes") -> None:
+        self.collection_name = collection_name
+        self._snapshot: Optional[QuoteSnapshot] = None
+        self._lock = asyncio.Lock()
+        self._listener: Optional[asyncio.Task] = None
+
+    @property
+    def snapshot(self) -> Optional[QuoteSnapshot]:
+        return self._snapshot
+
+    def invalidate(self) -> None:
+        self._snapshot = None
+
+    async def refresh(self) -> QuoteSnapshot:
+        """从 market_quotes 加载全市场快照"""
+        db = get_mongo_db()
+        projection = {"_id": 0, "code": 1, "trade_date": 1, "updated_at": 1}
+        projection.update({f: 1 for f in NUMERIC_FIELDS})
+        docs = await db[self.collection_name].find({}, projection).to_list(length=None)
+        snapshot = QuoteSnapshot.from_docs(docs)
+        self._snapshot = snapshot
+        logger.info(f"📦 行情快照已加载: {len(snapshot)} 只股票")
+        return snapshot
+
+    async def _current(self) -> QuoteSnapshot:
+        snapshot = self._snapshot
+        if snapshot is not None and time.monotonic() - snapshot.loaded_at < settings.QUOTES_SNAPSHOT_MAX_AGE_SECONDS:
+            return snapshot
+        async with self._lock:
+            # 等锁期间可能已被其他协程刷新
+            snapshot = self._snapshot
+            if snapshot is not None and time.monotonic() - snapshot.loaded_at < settings.QUOTES_SNAPSHOT_MAX_AGE_SECONDS:
+                return snapshot
+            return await self.refresh()
+
+    async def get_quote(self, code: str) -> Optional[Dict[str, Any]]:
+        snapshot = await self._current()
+        return snapshot.get(str(code).zfill(6))
+
+    async def get_quotes(self, codes: Iterable[str]) -> Dict[str, Dict[str, Any]]:
+        """批量获取行情，只返回快照中存在的代码"""
+        snapshot = await self._current()
+        result: Dict[str, Dict[str, Any]] = {}
+        for code in codes:
+            if not code:
+                continue
+            code6 = str(code).zfill(6)
+            quote = snapshot.get(code6)
+            if quote is not None:
+                result[code6] = quote
+        return result
+
+    async def start(self) -> None:
+        """启动 Redis 订阅（后台任务）"""
+        if self._listener is None or self._listener.done():
+            self._listener = asyncio.create_task(self._listen())
+
+    async def stop(self) -> None:
+        if self._listener is not None:
+            self._listener.cancel()
+            try:
+                await self._listener
+            except (asyncio.CancelledError, Exception):
+                pass
+            self._listener = None
+
+    async def _listen(self) -> None:
+        channel = settings.QUOTES_SNAPSHOT_CHANNEL
+        while True:
+            pubsub = None
+            try:
+                pubsub = get_redis_client().pubsub()
+                await pubsub.subscribe(channel)
+                logger.info(f"📡 行情快照已订阅更新事件: {channel}")
+                async for message in pubsub.listen():
+                    if message.get("type") != "message":
+                        continue
+                    try:
+                        await self.refresh()
+                    except Exception as e:
+                        # 刷新失败时丢弃旧快照，下次读取时重新加载
+                        logger.warning(f"⚠️ 行情快照刷新失败: {e}")
+                        self.invalidate()
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.warning(f"⚠️ 行情快照订阅中断，5秒后重试: {e}")
+                await asyncio.sleep(5)
+            finally:
+                if pubsub is not None:
+                    try:
+                        await pubsub.unsubscribe(channel)
+                        await pubsub.close()
+                    except Exception:
+                        pass
+
+
+async def publish_quotes_updated(source: Optional[str] = None, records_count: int = 0) -> None:
+    """行情入库完成后发布更新事件；Redis 不可用时仅让本进程快照失效"""
+    try:
+        payload = {"source": source, "records_count": records_count, "ts": time.time()}
+        await get_redis_client().publish(settings.QUOTES_SNAPSHOT_CHANNEL, json.dumps(payload))
+    except Exception as e:
+        logger.warning(f"⚠️ 发布行情更新事件失败，仅刷新本进程快照: {e}")
+        get_quote_snapshot_cache().invalidate()
+
+
+_quote_snapshot_cache: Optional[QuoteSnapshotCache] = None
+
+
+def get_quote_snapshot_cache() -> QuoteSnapshotCache:
+    global _quote_snapshot_cache
+    if _quote_snapshot_cache is None:
+        _quote_snapshot_cache = QuoteSnapshotCache()
+    return _quote_snapshot_cache
@@ -4,14 +4,26 @@ from typing import Dict, Optional, Tuple, List
 from zoneinfo import ZoneInfo
 from collections import deque
 
+import numpy as np
 from pymongo import UpdateOne
 
 from app.core.config import settings
-from app.core.database import get_mongo_db
+from app.core.database import get_mongo_db, refresh_stock_screening
 from app.services.data_sources.manager import DataSourceManager
+from app.services.quote_snapshot import publish_quotes_updated
 
 logger = logging.getLogger(__name__)
 
+# 参与变化比对的行情字段
+QUOTE_DIFF_FIELDS = ("close", "pct_chg", "amount", "volume", "open", "high", "low", "pre_close")
+
+
+def _to_float(v) -> float:
+    try:
+        return float(v) if v is not None else np.nan
+    except (TypeError, ValueError):
+        return np.nan
+
 
 class QuotesIngestionService:
     """
@@ -23,6 +35,7 @@ class QuotesIngestionService:
     - 智能限流：Tushare免费用户每小时最多2次，付费用户自动切换到高频模式（5秒）
     - 休市时间：跳过任务，保持上次收盘数据；必要时执行一次性兜底补数
     - 字段：code(6位)、close、pct_chg、amount、open、high、low、pre_close、trade_date、updated_at
+    - 增量写入：保留上一轮入库的列式快照，向量化比对后只写入变化的行（休市、停牌时几乎不产生写入）
     """
 
     def __init__(self, collection_name: str = "market_quotes") -> None:
@@ -44,6 +57,11 @@ class QuotesIngestionService:
         self._rotation_sources = ["tushare", "akshare_eastmoney", "akshare_sina"]
         self._rotation_index = 0  # 当前轮换索引
 
+        # 上一轮入库的行情快照（列式数组，按代码排序），用于只写入变化的行
+        self._last_codes: Optional[np.ndarray] = None
+        self._last_values: Optional[np.ndarray] = None
+        self._last_trade_date: Optional[str] = None
+
     @staticmethod
     def _normalize_stock_code(code: str) -> str:
         """
@@ -364,11 +382,15 @@ class QuotesIngestionService:
         except Exception:
             return True
 
-    async def _bulk_upsert(self, quotes_map: Dict[str, Dict], trade_date: str, source: Optional[str] = None) -> None:
-        db = get_mongo_db()
-        coll = db[self.collection_name]
-        ops = []
-        updated_at = datetime.now(self.tz)
+    def _quotes_to_columns(self, quotes_map: Dict[str, Dict]) -> Tuple[np.ndarray, np.ndarray, Dict[str, Dict]]:
+        """
+        将 quotes_map 转换为按代码排序的列式数组
+
+        Returns:
+            (codes, values, normalized): 6位代码数组、与 QUOTE_DIFF_FIELDS 对齐的 float64 二维数组（缺失为 NaN）、
+            以标准化代码为键的原始行情字典
+        """
+        normalized: Dict[str, Dict] = {}
         for code, q in quotes_map.items():
             if not code:
                 continue
@@ -376,6 +398,41 @@ class QuotesIngestionService:
             code6 = self._normalize_stock_code(code)
             if not code6:
                 continue
+            normalized[code6] = q
+
+        codes = np.array(sorted(normalized), dtype=str)
+        values = np.array(
+            [[_to_float(normalized[c].get(f)) for f in QUOTE_DIFF_FIELDS] for c in codes.tolist()],
+            dtype=np.float64,
+        ).reshape(len(codes), len(QUOTE_DIFF_FIELDS))
+        return codes, values, normalized
+
+    def _changed_mask(self, codes: np.ndarray, values: np.ndarray, trade_date: str) -> np.ndarray:
+        """与上一轮入库快照做向量化比对，返回需要写入的行（新代码或任一字段变化）"""
+        prev_codes, prev_values = self._last_codes, self._last_values
+        if prev_codes is None or len(prev_codes) == 0 or trade_date != self._last_trade_date:
+            return np.ones(len(codes), dtype=bool)
+
+        pos = np.searchsorted(prev_codes, codes)
+        pos_clipped = np.minimum(pos, len(prev_codes) - 1)
+        found = prev_codes[pos_clipped] == codes
+
+        prev = prev_values[pos_clipped]
+        same = (prev == values) | (np.isnan(prev) & np.isnan(values))
+        return ~found | ~same.all(axis=1)
+
+    async def _bulk_upsert(self, quotes_map: Dict[str, Dict], trade_date: str, source: Optional[str] = None) -> None:
+        db = get_mongo_db()
+        coll = db[self.collection_name]
+        updated_at = datetime.now(self.tz)
+
+        codes_arr, values, normalized = self._quotes_to_columns(quotes_map)
+        changed = self._changed_mask(codes_arr, values, trade_date)
+        codes: List[str] = codes_arr[changed].tolist()
+
+        ops = []
+        for code6 in codes:
+            q = normalized[code6]
 
             # 🔥 日志：记录写入的成交量值
             volume = q.get("volume")
@@ -403,13 +460,25 @@ class QuotesIngestionService:
                 )
             )
         if not ops:
-            logger.info("无可写入的数据，跳过")
+            if len(codes_arr):
+                logger.info(f"⏭️ 行情无变化，跳过入库 source={source}, total={len(codes_arr)}")
+            else:
+                logger.info("无可写入的数据，跳过")
             return
         result = await coll.bulk_write(ops, ordered=False)
         logger.info(
-            f"✅ 行情入库完成 source={source}, matched={result.matched_count}, upserted={len(result.upserted_ids) if result.upserted_ids else 0}, modified={result.modified_count}"
+            f"✅ 行情入库完成 source={source}, changed={len(ops)}/{len(codes_arr)}, matched={result.matched_count}, upserted={len(result.upserted_ids) if result.upserted_ids else 0}, modified={result.modified_count}"
         )
 
+        # 写入成功后再更新比对快照，失败时下一轮会重新写入
+        self._last_codes, self._last_values, self._last_trade_date = codes_arr, values, trade_date
+
+        # 增量刷新筛选物化集合
+        await refresh_stock_screening(codes)
+
+        # 通知各进程刷新内存行情快照
+        await publish_quotes_updated(source, len(codes))
+
     async def backfill_from_historical_data(self) -> None:
         """
         从历史数据集合导入前一天的收盘数据到 market_quotes
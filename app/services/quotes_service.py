@@ -1,5 +1,6 @@
 """
-QuotesService: 提供A股批量实时快照获取（AKShare东方财富 spot 接口），带内存TTL缓存。
+QuotesService: 提供A股批量实时快照获取，优先读取进程内行情快照（market_quotes），
+快照中缺失的代码再回退到 AKShare东方财富 spot 接口（带内存TTL缓存）。
 - 不使用通达信（TDX）作为兜底数据源。
 - 仅用于筛选返回前对 items 进行行情富集。
 """
@@ -10,6 +11,8 @@ import time
 import logging
 from typing import Dict, List, Optional
 
+from app.services.quote_snapshot import get_quote_snapshot_cache
+
 logger = logging.getLogger(__name__)
 
 
@@ -40,19 +43,32 @@ class QuotesService:
 
     async def get_quotes(self, codes: List[str]) -> Dict[str, Dict[str, Optional[float]]]:
         """获取一批股票的近实时快照（最新价、涨跌幅、成交额）。
-        - 优先使用缓存；缓存超时或为空则刷新一次全市场快照。
+        - 优先使用进程内行情快照（与行情入库周期同步刷新）。
+        - 快照未命中的代码使用 AKShare 缓存；缓存超时或为空则刷新一次全市场快照。
         - 返回仅包含请求的 codes。
         """
         codes = [c.strip() for c in codes if c]
+        result: Dict[str, Dict[str, Optional[float]]] = {}
+        try:
+            snapshot_quotes = await get_quote_snapshot_cache().get_quotes(codes)
+            for c, q in snapshot_quotes.items():
+                result[c] = {"close": q.get("close"), "pct_chg": q.get("pct_chg"), "amount": q.get("amount")}
+        except Exception as e:
+            logger.warning(f"读取行情快照失败，回退 AKShare: {e}")
+
+        missing = [c for c in codes if c not in result]
+        if not missing:
+            return result
+
         now = time.time()
         async with self._lock:
-            if self._cache and (now - self._cache_ts) < self._ttl:
-                return {c: q for c, q in self._cache.items() if c in codes and q}
-            # 刷新缓存（阻塞IO放到线程）
-            data = await asyncio.to_thread(self._fetch_spot_akshare)
-            self._cache = data
-            self._cache_ts = time.time()
-            return {c: q for c, q in self._cache.items() if c in codes and q}
+            if not self._cache or (now - self._cache_ts) >= self._ttl:
+                # 刷新缓存（阻塞IO放到线程）
+                data = await asyncio.to_thread(self._fetch_spot_akshare)
+                self._cache = data
+                self._cache_ts = time.time()
+            result.update({c: q for c, q in self._cache.items() if c in missing and q})
+            return result
 
     def _fetch_spot_akshare(self) -> Dict[str, Dict[str, Optional[float]]]:
         """通过 AKShare 东方财富全市场快照接口拉取行情，并标准化为字典。
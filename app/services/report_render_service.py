@@ -0,0 +1,212 @@
+"""
+报告渲染服务（PDF / Word）
+
+pandoc / wkhtmltopdf 每次渲染都要启动子进程，耗时数秒。这里：
+- 按「格式 + Markdown 内容」的哈希把渲染结果缓存到磁盘，总大小超过上限时按最近使用时间淘汰
+- 渲染在独立的进程池中执行，不占用事件循环和默认线程池
+- 同一份内容的并发下载共享一次渲染
+"""
+import asyncio
+import hashlib
+import logging
+import multiprocessing
+import os
+import tempfile
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import Any, Dict, Optional
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+# 渲染逻辑变更时递增，使旧缓存失效
+RENDER_VERSION = "1"
+
+SUPPORTED_FORMATS = ("pdf", "docx")
+
+
+def _render_markdown(fmt: str, md_content: str) -> bytes:
+    """在渲染进程中执行（模块级函数，可被 pickle）"""
+    from app.utils.report_exporter import report_exporter
+
+    if fmt == "pdf":
+        return report_exporter.render_pdf(md_content)
+    if fmt == "docx":
+        return report_exporter.render_docx(md_content)
+    raise ValueError(f"不支持的渲染格式: {fmt}")
+
+
+class RenderedReportCache:
+    """渲染结果的磁盘缓存（按内容哈希命名，大小有上限）"""
+
+    def __init__(self, cache_dir: str, max_bytes: int):
+        self.cache_dir = Path(cache_dir)
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+        self._total_bytes: Optional[int] = None
+
+    def _path(self, key: str) -> Path:
+        return self.cache_dir / key[:2] / key
+
+    def get(self, key: str) -> Optional[bytes]:
+        path = self._path(key)
+        try:
+            data = path.read_bytes()
+        except FileNotFoundError:
+            return None
+        except OSError as e:
+            logger.warning(f"⚠️ 读取渲染缓存失败 {path}: {e}")
+            return None
+        try:
+            # 更新访问时间，淘汰时按最近使用排序
+            os.utime(path)
+        except OSError:
+            pass
+        return data
+
+    def put(self, key: str, data: bytes) -> None:
+        if self.max_bytes <= 0 or len(data) > self.max_bytes:
+            return
+        path = self._path(key)
+        try:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            # 先写临时文件再原子替换，避免读到半个文件
+            fd, tmp = tempfile.mkstemp(dir=path.parent, suffix=".tmp")
+            with os.fdopen(fd, "wb") as f:
+                f.write(data)
+            os.replace(tmp, path)
+        except OSError as e:
+            logger.warning(f"⚠️ 写入渲染缓存失败 {path}: {e}")
+            return
+
+        with self._lock:
+            if self._total_bytes is None:
+                self._total_bytes = self._scan_size()
+            else:
+                self._total_bytes += len(data)
+            if self._total_bytes > self.max_bytes:
+                self._evict()
+
+    def _files(self):
+        return [p for p in self.cache_dir.glob("*/*") if p.is_file() and not p.name.endswith(".tmp")]
+
+    def _scan_size(self) -> int:
+        return sum(p.stat().st_size for p in self._files())
+
+    def _evict(self) -> None:
+        """按最近使用时间淘汰，直到总大小降到上限的 90%"""
+        entries = []
+        for p in self._files():
+            try:
+                st = p.stat()
+            except OSError:
+                continue
+            entries.append((st.st_mtime, st.st_size, p))
+        entries.sort()
+
+        total = sum(size for _, size, _ in entries)
+        target = int(self.max_bytes * 0.9)
+        removed = 0
+        for _, size, p in entries:
+            if total <= target:
+                break
+            try:
+                p.unlink()
+                total -= size
+                removed += 1
+            except OSError:
+                pass
+        self._total_bytes = total
+        logger.info(f"🧹 渲染缓存淘汰 {removed} 个文件，当前 {total / 1024 / 1024:.1f}MB")
+
+
+class ReportRenderService:
+    """PDF / Word 报告渲染（磁盘缓存 + 进程池 + 并发去重）"""
+
+    def __init__(self, cache: RenderedReportCache, max_workers: int = 2):
+        self.cache = cache
+        self.max_workers = max_workers
+        self._executor: Optional[ProcessPoolExecutor] = None
+        self._inflight: Dict[str, asyncio.Future] = {}
+        self.stats = {"hits": 0, "renders": 0, "shared": 0}
+
+    @staticmethod
+    def cache_key(fmt: str, md_content: str) -> str:
+        h = hashlib.sha256()
+        h.update(f"{RENDER_VERSION}:{fmt}:".encode("utf-8"))
+        h.update(md_content.encode("utf-8"))
+        return f"{h.hexdigest()}.{fmt}"
+
+    def _get_executor(self) -> ProcessPoolExecutor:
+        if self._executor is None:
+            # spawn：避免 fork 带有事件循环和线程的 API 进程
+            self._executor = ProcessPoolExecutor(
+                max_workers=self.max_workers,
+                mp_context=multiprocessing.get_context("spawn"),
+            )
+        return self._executor
+
+    async def _run_render(self, fmt: str, md_content: str) -> bytes:
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self._get_executor(), _render_markdown, fmt, md_content)
+
+    async def render(self, fmt: str, report_doc: Dict[str, Any]) -> bytes:
+        """渲染报告，返回文件内容"""
+        if fmt not in SUPPORTED_FORMATS:
+            raise ValueError(f"不支持的渲染格式: {fmt}")
+
+        from app.utils.report_exporter import report_exporter
+
+        md_content = report_exporter.generate_markdown_report(report_doc)
+        key = self.cache_key(fmt, md_content)
+
+        # 同一内容正在渲染：等待同一个结果
+        inflight = self._inflight.get(key)
+        if inflight is not None:
+            self.stats["shared"] += 1
+            return await asyncio.shield(inflight)
+
+        future: asyncio.Future = asyncio.get_running_loop().create_future()
+        self._inflight[key] = future
+        try:
+            data = await asyncio.to_thread(self.cache.get, key)
+            if data is not None:
+                self.stats["hits"] += 1
+                logger.info(f"⚡ 渲染缓存命中: {key[:12]} ({fmt})")
+            else:
+                self.stats["renders"] += 1
+                data = await self._run_render(fmt, md_content)
+                await asyncio.to_thread(self.cache.put, key, data)
+            future.set_result(data)
+            return data
+        except asyncio.CancelledError:
+            future.cancel()
+            raise
+        except Exception as e:
+            future.set_exception(e)
+            # 没有其他等待者时避免 "exception was never retrieved" 警告
+            future.exception()
+            raise
+        finally:
+            self._inflight.pop(key, None)
+
+    def shutdown(self) -> None:
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+
+
+_report_render_service: Optional[ReportRenderService] = None
+
+
+def get_report_render_service() -> ReportRenderService:
+    global _report_render_service
+    if _report_render_service is None:
+        cache = RenderedReportCache(
+            settings.REPORT_RENDER_CACHE_DIR,
+            settings.REPORT_RENDER_CACHE_MAX_MB * 1024 * 1024,
+        )
+        _report_render_service = ReportRenderService(cache, max_workers=settings.REPORT_RENDER_WORKERS)
+    return _report_render_service
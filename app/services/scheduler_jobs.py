@@ -0,0 +1,335 @@
+"""
+数据同步定时任务注册
+
+由调度器 Leader（独立调度进程，或 SCHEDULER_MODE=embedded 时选举出的 API 进程）调用，
+API 副本本身不注册、不执行这些任务。
+"""
+import asyncio
+import logging
+from datetime import datetime
+
+from apscheduler.schedulers.asyncio import AsyncIOScheduler
+from apscheduler.triggers.cron import CronTrigger
+from apscheduler.triggers.interval import IntervalTrigger
+
+from app.core.config import settings
+from app.services.multi_source_basics_sync_service import MultiSourceBasicsSyncService
+from app.services.quotes_ingestion_service import QuotesIngestionService
+from app.worker.tushare_sync_service import (
+    run_tushare_basic_info_sync,
+    run_tushare_quotes_sync,
+    run_tushare_historical_sync,
+    run_tushare_financial_sync,
+    run_tushare_status_check
+)
+from app.worker.akshare_sync_service import (
+    run_akshare_basic_info_sync,
+    run_akshare_quotes_sync,
+    run_akshare_historical_sync,
+    run_akshare_financial_sync,
+    run_akshare_status_check
+)
+from app.worker.baostock_sync_service import (
+    run_baostock_basic_info_sync,
+    run_baostock_daily_quotes_sync,
+    run_baostock_historical_sync,
+    run_baostock_status_check
+)
+
+logger = logging.getLogger("app.scheduler")
+
+
+async def register_sync_jobs(scheduler: AsyncIOScheduler) -> None:
+    """向调度器注册全部数据同步任务（含启动后立即执行一次的基础信息同步）"""
+    # 使用多数据源同步服务（支持自动切换）
+    multi_source_service = MultiSourceBasicsSyncService()
+
+    # 根据 TUSHARE_ENABLED 配置决定优先数据源
+    # 如果 Tushare 被禁用，系统会自动使用其他可用数据源（AKShare/BaoStock）
+    preferred_sources = None  # None 表示使用默认优先级顺序
+
+    if settings.TUSHARE_ENABLED:
+        # Tushare 启用时，优先使用 Tushare
+        preferred_sources = ["tushare", "akshare", "baostock"]
+        logger.info(f"📊 股票基础信息同步优先数据源: Tushare > AKShare > BaoStock")
+    else:
+        # Tushare 禁用时，使用 AKShare 和 BaoStock
+        preferred_sources = ["akshare", "baostock"]
+        logger.info(f"📊 股票基础信息同步优先数据源: AKShare > BaoStock (Tushare已禁用)")
+
+    # 立即在启动后尝试一次（不阻塞）
+    async def run_sync_with_sources():
+        await multi_source_service.run_full_sync(force=False, preferred_sources=preferred_sources)
+
+    asyncio.create_task(run_sync_with_sources())
+
+    # 配置调度：优先使用 CRON，其次使用 HH:MM
+    if settings.SYNC_STOCK_BASICS_ENABLED:
+        if settings.SYNC_STOCK_BASICS_CRON:
+            # 如果提供了cron表达式
+            scheduler.add_job(
+                lambda: multi_source_service.run_full_sync(force=False, preferred_sources=preferred_sources),
+                CronTrigger.from_crontab(settings.SYNC_STOCK_BASICS_CRON, timezone=settings.TIMEZONE),
+                id="basics_sync_service",
+                name="股票基础信息同步（多数据源）"
+            )
+            logger.info(f"📅 Stock basics sync scheduled by CRON: {settings.SYNC_STOCK_BASICS_CRON} ({settings.TIMEZONE})")
+        else:
+            hh, mm = (settings.SYNC_STOCK_BASICS_TIME or "06:30").split(":")
+            scheduler.add_job(
+                lambda: multi_source_service.run_full_sync(force=False, preferred_sources=preferred_sources),
+                CronTrigger(hour=int(hh), minute=int(mm), timezone=settings.TIMEZONE),
+                id="basics_sync_service",
+                name="股票基础信息同步（多数据源）"
+            )
+            logger.info(f"📅 Stock basics sync scheduled daily at {settings.SYNC_STOCK_BASICS_TIME} ({settings.TIMEZONE})")
+
+    # 实时行情入库任务（每N秒），内部自判交易时段
+    if settings.QUOTES_INGEST_ENABLED:
+        quotes_ingestion = QuotesIngestionService()
+        await quotes_ingestion.ensure_indexes()
+        scheduler.add_job(
+            quotes_ingestion.run_once,  # coroutine function; AsyncIOScheduler will await it
+            IntervalTrigger(seconds=settings.QUOTES_INGEST_INTERVAL_SECONDS, timezone=settings.TIMEZONE),
+            id="quotes_ingestion_service",
+            name="实时行情入库服务"
+        )
+        logger.info(f"⏱ 实时行情入库任务已启动: 每 {settings.QUOTES_INGEST_INTERVAL_SECONDS}s")
+
+    # Tushare统一数据同步任务配置
+    logger.info("🔄 配置Tushare统一数据同步任务...")
+
+    # 基础信息同步任务
+    scheduler.add_job(
+        run_tushare_basic_info_sync,
+        CronTrigger.from_crontab(settings.TUSHARE_BASIC_INFO_SYNC_CRON, timezone=settings.TIMEZONE),
+        id="tushare_basic_info_sync",
+        name="股票基础信息同步（Tushare）",
+        kwargs={"force_update": False}
+    )
+    if not (settings.TUSHARE_UNIFIED_ENABLED and settings.TUSHARE_BASIC_INFO_SYNC_ENABLED):
+        scheduler.pause_job("tushare_basic_info_sync")
+        logger.info(f"⏸️ Tushare基础信息同步已添加但暂停: {settings.TUSHARE_BASIC_INFO_SYNC_CRON}")
+    else:
+        logger.info(f"📅 Tushare基础信息同步已配置: {settings.TUSHARE_BASIC_INFO_SYNC_CRON}")
+
+    # 实时行情同步任务
+    scheduler.add_job(
+        run_tushare_quotes_sync,
+        CronTrigger.from_crontab(settings.TUSHARE_QUOTES_SYNC_CRON, timezone=settings.TIMEZONE),
+        id="tushare_quotes_sync",
+        name="实时行情同步（Tushare）"
+    )
+    if not (settings.TUSHARE_UNIFIED_ENABLED and settings.TUSHARE_QUOTES_SYNC_ENABLED):
+        scheduler.pause_job("tushare_quotes_sync")
+        logger.info(f"⏸️ Tushare行情同步已添加但暂停: {settings.TUSHARE_QUOTES_SYNC_CRON}")
+    else:
+        logger.info(f"📈 Tushare行情同步已配置: {settings.TUSHARE_QUOTES_SYNC_CRON}")
+
+    # 历史数据同步任务
+    scheduler.add_job(
+        run_tushare_historical_sync,
+        CronTrigger.from_crontab(settings.TUSHARE_HISTORICAL_SYNC_CRON, timezone=settings.TIMEZONE),
+        id="tushare_historical_sync",
+        name="历史数据同步（Tushare）",
+        kwargs={"incremental": True}
+    )
+    if not (settings.TUSHARE_UNIFIED_ENABLED and settings.TUSHARE_HISTORICAL_SYNC_ENABLED):
+        scheduler.pause_job("tushare_historical_sync")
+        logger.info(f"⏸️ Tushare历史数据同步已添加但暂停: {settings.TUSHARE_HISTORICAL_SYNC_CRON}")
+    else:
+        logger.info(f"📊 Tushare历史数据同步已配置: {settings.TUSHARE_HISTORICAL_SYNC_CRON}")
+
+    # 财务数据同步任务
+    scheduler.add_job(
+        run_tushare_financial_sync,
+        CronTrigger.from_crontab(settings.TUSHARE_FINANCIAL_SYNC_CRON, timezone=settings.TIMEZONE),
+        id="tushare_financial_sync",
+        name="财务数据同步（Tushare）"
+    )
+    if not (settings.TUSHARE_UNIFIED_ENABLED and settings.TUSHARE_FINANCIAL_SYNC_ENABLED):
+        scheduler.pause_job("tushare_financial_sync")
+        logger.info(f"⏸️ Tushare财务数据同步已添加但暂停: {settings.TUSHARE_FINANCIAL_SYNC_CRON}")
+    else:
+        logger.info(f"💰 Tushare财务数据同步已配置: {settings.TUSHARE_FINANCIAL_SYNC_CRON}")
+
+    # 状态检查任务
+    scheduler.add_job(
+        run_tushare_status_check,
+        CronTrigger.from_crontab(settings.TUSHARE_STATUS_CHECK_CRON, timezone=settings.TIMEZONE),
+        id="tushare_status_check",
+        name="数据源状态检查（Tushare）"
+    )
+    if not (settings.TUSHARE_UNIFIED_ENABLED and settings.TUSHARE_STATUS_CHECK_ENABLED):
+        scheduler.pause_job("tushare_status_check")
+        logger.info(f"⏸️ Tushare状态检查已添加但暂停: {settings.TUSHARE_STATUS_CHECK_CRON}")
+    else:
+        logger.info(f"🔍 Tushare状态检查已配置: {settings.TUSHARE_STATUS_CHECK_CRON}")
+
+    # AKShare统一数据同步任务配置
+    logger.info("🔄 配置AKShare统一数据同步任务...")
+
+    # 基础信息同步任务
+    scheduler.add_job(
+        run_akshare_basic_info_sync,
+        CronTrigger.from_crontab(settings.AKSHARE_BASIC_INFO_SYNC_CRON, timezone=settings.TIMEZONE),
+        id="akshare_basic_info_sync",
+        name="股票基础信息同步（AKShare）",
+        kwargs={"force_update": False}
+    )
+    if not (settings.AKSHARE_UNIFIED_ENABLED and settings.AKSHARE_BASIC_INFO_SYNC_ENABLED):
+        scheduler.pause_job("akshare_basic_info_sync")
+        logger.info(f"⏸️ AKShare基础信息同步已添加但暂停: {settings.AKSHARE_BASIC_INFO_SYNC_CRON}")
+    else:
+        logger.info(f"📅 AKShare基础信息同步已配置: {settings.AKSHARE_BASIC_INFO_SYNC_CRON}")
+
+    # 实时行情同步任务
+    scheduler.add_job(
+        run_akshare_quotes_sync,
+        CronTrigger.from_crontab(settings.AKSHARE_QUOTES_SYNC_CRON, timezone=settings.TIMEZONE),
+        id="akshare_quotes_sync",
+        name="实时行情同步（AKShare）"
+    )
+    if not (settings.AKSHARE_UNIFIED_ENABLED and settings.AKSHARE_QUOTES_SYNC_ENABLED):
+        scheduler.pause_job("akshare_quotes_sync")
+        logger.info(f"⏸️ AKShare行情同步已添加但暂停: {settings.AKSHARE_QUOTES_SYNC_CRON}")
+    else:
+        logger.info(f"📈 AKShare行情同步已配置: {settings.AKSHARE_QUOTES_SYNC_CRON}")
+
+    # 历史数据同步任务
+    scheduler.add_job(
+        run_akshare_historical_sync,
+        CronTrigger.from_crontab(settings.AKSHARE_HISTORICAL_SYNC_CRON, timezone=settings.TIMEZONE),
+        id="akshare_historical_sync",
+        name="历史数据同步（AKShare）",
+        kwargs={"incremental": True}
+    )
+    if not (settings.AKSHARE_UNIFIED_ENABLED and settings.AKSHARE_HISTORICAL_SYNC_ENABLED):
+        scheduler.pause_job("akshare_historical_sync")
+        logger.info(f"⏸️ AKShare历史数据同步已添加但暂停: {settings.AKSHARE_HISTORICAL_SYNC_CRON}")
+    else:
+        logger.info(f"📊 AKShare历史数据同步已配置: {settings.AKSHARE_HISTORICAL_SYNC_CRON}")
+
+    # 财务数据同步任务
+    scheduler.add_job(
+        run_akshare_financial_sync,
+        CronTrigger.from_crontab(settings.AKSHARE_FINANCIAL_SYNC_CRON, timezone=settings.TIMEZONE),
+        id="akshare_financial_sync",
+        name="财务数据同步（AKShare）"
+    )
+    if not (settings.AKSHARE_UNIFIED_ENABLED and settings.AKSHARE_FINANCIAL_SYNC_ENABLED):
+        scheduler.pause_job("akshare_financial_sync")
+        logger.info(f"⏸️ AKShare财务数据同步已添加但暂停: {settings.AKSHARE_FINANCIAL_SYNC_CRON}")
+    else:
+        logger.info(f"💰 AKShare财务数据同步已配置: {settings.AKSHARE_FINANCIAL_SYNC_CRON}")
+
+    # 状态检查任务
+    scheduler.add_job(
+        run_akshare_status_check,
+        CronTrigger.from_crontab(settings.AKSHARE_STATUS_CHECK_CRON, timezone=settings.TIMEZONE),
+        id="akshare_status_check",
+        name="数据源状态检查（AKShare）"
+    )
+    if not (settings.AKSHARE_UNIFIED_ENABLED and settings.AKSHARE_STATUS_CHECK_ENABLED):
+        scheduler.pause_job("akshare_status_check")
+        logger.info(f"⏸️ AKShare状态检查已添加但暂停: {settings.AKSHARE_STATUS_CHECK_CRON}")
+    else:
+        logger.info(f"🔍 AKShare状态检查已配置: {settings.AKSHARE_STATUS_CHECK_CRON}")
+
+    # BaoStock统一数据同步任务配置
+    logger.info("🔄 配置BaoStock统一数据同步任务...")
+
+    # 基础信息同步任务
+    scheduler.add_job(
+        run_baostock_basic_info_sync,
+        CronTrigger.from_crontab(settings.BAOSTOCK_BASIC_INFO_SYNC_CRON, timezone=settings.TIMEZONE),
+        id="baostock_basic_info_sync",
+        name="股票基础信息同步（BaoStock）"
+    )
+    if not (settings.BAOSTOCK_UNIFIED_ENABLED and settings.BAOSTOCK_BASIC_INFO_SYNC_ENABLED):
+        scheduler.pause_job("baostock_basic_info_sync")
+        logger.info(f"⏸️ BaoStock基础信息同步已添加但暂停: {settings.BAOSTOCK_BASIC_INFO_SYNC_CRON}")
+    else:
+        logger.info(f"📋 BaoStock基础信息同步已配置: {settings.BAOSTOCK_BASIC_INFO_SYNC_CRON}")
+
+    # 日K线同步任务（注意：BaoStock不支持实时行情）
+    scheduler.add_job(
+        run_baostock_daily_quotes_sync,
+        CronTrigger.from_crontab(settings.BAOSTOCK_DAILY_QUOTES_SYNC_CRON, timezone=settings.TIMEZONE),
+        id="baostock_daily_quotes_sync",
+        name="日K线数据同步（BaoStock）"
+    )
+    if not (settings.BAOSTOCK_UNIFIED_ENABLED and settings.BAOSTOCK_DAILY_QUOTES_SYNC_ENABLED):
+        scheduler.pause_job("baostock_daily_quotes_sync")
+        logger.info(f"⏸️ BaoStock日K线同步已添加但暂停: {settings.BAOSTOCK_DAILY_QUOTES_SYNC_CRON}")
+    else:
+        logger.info(f"📈 BaoStock日K线同步已配置: {settings.BAOSTOCK_DAILY_QUOTES_SYNC_CRON} (注意：BaoStock不支持实时行情)")
+
+    # 历史数据同步任务
+    scheduler.add_job(
+        run_baostock_historical_sync,
+        CronTrigger.from_crontab(settings.BAOSTOCK_HISTORICAL_SYNC_CRON, timezone=settings.TIMEZONE),
+        id="baostock_historical_sync",
+        name="历史数据同步（BaoStock）"
+    )
+    if not (settings.BAOSTOCK_UNIFIED_ENABLED and settings.BAOSTOCK_HISTORICAL_SYNC_ENABLED):
+        scheduler.pause_job("baostock_historical_sync")
+        logger.info(f"⏸️ BaoStock历史数据同步已添加但暂停: {settings.BAOSTOCK_HISTORICAL_SYNC_CRON}")
+    else:
+        logger.info(f"📊 BaoStock历史数据同步已配置: {settings.BAOSTOCK_HISTORICAL_SYNC_CRON}")
+
+    # 状态检查任务
+    scheduler.add_job(
+        run_baostock_status_check,
+        CronTrigger.from_crontab(settings.BAOSTOCK_STATUS_CHECK_CRON, timezone=settings.TIMEZONE),
+        id="baostock_status_check",
+        name="数据源状态检查（BaoStock）"
+    )
+    if not (settings.BAOSTOCK_UNIFIED_ENABLED and settings.BAOSTOCK_STATUS_CHECK_ENABLED):
+        scheduler.pause_job("baostock_status_check")
+        logger.info(f"⏸️ BaoStock状态检查已添加但暂停: {settings.BAOSTOCK_STATUS_CHECK_CRON}")
+    else:
+        logger.info(f"🔍 BaoStock状态检查已配置: {settings.BAOSTOCK_STATUS_CHECK_CRON}")
+
+    # 新闻数据同步任务配置（使用AKShare同步所有股票新闻）
+    logger.info("🔄 配置新闻数据同步任务...")
+
+    from app.worker.akshare_sync_service import get_akshare_sync_service
+
+    async def run_news_sync():
+        """运行新闻同步任务 - 使用AKShare同步自选股新闻"""
+        try:
+            logger.info("📰 开始新闻数据同步（AKShare - 仅自选股）...")
+            service = await get_akshare_sync_service()
+            result = await service.sync_news_data(
+                symbols=None,  # None + favorites_only=True 表示只同步自选股
+                max_news_per_stock=settings.NEWS_SYNC_MAX_PER_SOURCE,
+                favorites_only=True  # 只同步自选股
+            )
+            logger.info(
+                f"✅ 新闻同步完成: "
+                f"处理{result['total_processed']}只自选股, "
+                f"成功{result['success_count']}只, "
+                f"失败{result['error_count']}只, "
+                f"新闻总数{result['news_count']}条, "
+                f"耗时{(datetime.utcnow() - result['start_time']).total_seconds():.2f}秒"
+            )
+        except Exception as e:
+            logger.error(f"❌ 新闻同步失败: {e}", exc_info=True)
+
+    # ==================== 港股/美股数据配置 ====================
+    # 港股和美股采用按需获取+缓存模式，不再配置定时同步任务
+    logger.info("🇭🇰 港股数据采用按需获取+缓存模式")
+    logger.info("🇺🇸 美股数据采用按需获取+缓存模式")
+
+    scheduler.add_job(
+        run_news_sync,
+        CronTrigger.from_crontab(settings.NEWS_SYNC_CRON, timezone=settings.TIMEZONE),
+        id="news_sync",
+        name="新闻数据同步（AKShare - 仅自选股）"
+    )
+    if not settings.NEWS_SYNC_ENABLED:
+        scheduler.pause_job("news_sync")
+        logger.info(f"⏸️ 新闻数据同步已添加但暂停: {settings.NEWS_SYNC_CRON}")
+    else:
+        logger.info(f"📰 新闻数据同步已配置（仅自选股）: {settings.NEWS_SYNC_CRON}")
@@ -6,6 +6,7 @@
 """
 
 import asyncio
+import json
 from typing import List, Dict, Any, Optional
 from datetime import datetime, timedelta, timezone
 from apscheduler.schedulers.asyncio import AsyncIOScheduler
@@ -26,6 +27,14 @@ logger = get_logger(__name__)
 # UTC+8 时区
 UTC_8 = timezone(timedelta(hours=8))
 
+# 调度器状态共享：Leader 定期写入，API 副本读取
+SCHEDULER_JOBS_COLLECTION = "scheduler_jobs"
+SCHEDULER_STATE_COLLECTION = "scheduler_state"
+# API 副本转发给 Leader 的任务操作（Redis 列表）
+SCHEDULER_COMMANDS_KEY = "scheduler:commands"
+# Leader 心跳超过该时间未更新视为调度器停止
+SCHEDULER_HEARTBEAT_TIMEOUT_SECONDS = 60
+
 
 def get_utc8_now():
     """
@@ -837,7 +846,7 @@ class SchedulerService:
             db = self._get_db()
 
             # 获取任务名称
-            job = self.scheduler.get_job(job_id)
+            job = self.scheduler.get_job(job_id) if self.scheduler else None
             job_name = job.name if job else job_id
 
             # 如果是完成状态（success/failed），先查找是否有对应的 running 记录
@@ -996,8 +1005,7 @@ class SchedulerService:
         """
         try:
             # 检查任务是否存在
-            job = self.scheduler.get_job(job_id)
-            if not job:
+            if not await self._job_exists(job_id):
                 logger.error(f"❌ 任务 {job_id} 不存在")
                 return False
 
@@ -1025,22 +1033,185 @@ class SchedulerService:
             logger.error(f"❌ 更新任务 {job_id} 元数据失败: {e}")
             return False
 
+    async def _job_exists(self, job_id: str) -> bool:
+        return self.scheduler.get_job(job_id) is not None
+
+    # ---------- 调度器状态共享（Leader 写入，API 副本读取） ----------
+
+    async def publish_job_states(self, leader_id: Optional[str] = None) -> None:
+        """将当前任务状态写入共享存储，供没有调度器的 API 副本读取"""
+        try:
+            db = self._get_db()
+            now = get_utc8_now()
+            job_ids = []
+            for job in self.scheduler.get_jobs():
+                job_dict = self._job_to_dict(job, include_details=True)
+                job_dict["args"] = list(job_dict.get("args") or [])
+                job_dict["updated_at"] = now
+                job_ids.append(job.id)
+                await db[SCHEDULER_JOBS_COLLECTION].update_one(
+                    {"_id": job.id}, {"$set": job_dict}, upsert=True
+                )
+            await db[SCHEDULER_JOBS_COLLECTION].delete_many({"_id": {"$nin": job_ids}})
+            await db[SCHEDULER_STATE_COLLECTION].update_one(
+                {"_id": "scheduler"},
+                {"$set": {
+                    "leader": leader_id,
+                    "running": self.scheduler.running,
+                    "state": self.scheduler.state,
+                    "heartbeat_at": now,
+                }},
+                upsert=True,
+            )
+        except Exception as e:
+            logger.warning(f"⚠️ 发布调度器任务状态失败: {e}")
+
+    async def apply_command(self, command: Dict[str, Any]) -> bool:
+        """执行 API 副本转发过来的任务操作（pause / resume / trigger）"""
+        action = command.get("action")
+        job_id = command.get("job_id")
+        if action == "pause":
+            return await self.pause_job(job_id)
+        if action == "resume":
+            return await self.resume_job(job_id)
+        if action == "trigger":
+            return await self.trigger_job(job_id, command.get("kwargs"))
+        logger.warning(f"⚠️ 未知的调度器命令: {command}")
+        return False
+
+
+class RemoteSchedulerService(SchedulerService):
+    """
+    没有本地调度器的进程（API 副本）使用的调度器服务
+
+    任务状态从 Leader 发布的 scheduler_jobs 集合读取；暂停/恢复/触发通过 Redis 列表转发给 Leader 执行。
+    执行历史、元数据等本来就保存在 MongoDB 中的数据与本地模式共用实现。
+    """
+
+    def __init__(self):
+        self.scheduler = None
+        self.db = None
+
+    async def _job_docs(self, query: Optional[Dict[str, Any]] = None) -> List[Dict[str, Any]]:
+        db = self._get_db()
+        return await db[SCHEDULER_JOBS_COLLECTION].find(query or {}).sort("_id", 1).to_list(length=None)
+
+    @staticmethod
+    def _doc_to_job_dict(doc: Dict[str, Any], include_details: bool = False) -> Dict[str, Any]:
+        keys = ["id", "name", "next_run_time", "paused", "trigger"]
+        if include_details:
+            keys += ["func", "args", "kwargs", "misfire_grace_time", "max_instances"]
+        return {k: doc.get(k) for k in keys}
+
+    async def _job_exists(self, job_id: str) -> bool:
+        return bool(await self._job_docs({"_id": job_id}))
+
+    async def list_jobs(self) -> List[Dict[str, Any]]:
+        jobs = []
+        for doc in await self._job_docs():
+            job_dict = self._doc_to_job_dict(doc)
+            metadata = await self._get_job_metadata(doc["_id"])
+            if metadata:
+                job_dict["display_name"] = metadata.get("display_name")
+                job_dict["description"] = metadata.get("description")
+            jobs.append(job_dict)
+        logger.info(f"📋 获取到 {len(jobs)} 个定时任务（共享状态）")
+        return jobs
+
+    async def get_job(self, job_id: str) -> Optional[Dict[str, Any]]:
+        docs = await self._job_docs({"_id": job_id})
+        if not docs:
+            return None
+        job_dict = self._doc_to_job_dict(docs[0], include_details=True)
+        metadata = await self._get_job_metadata(job_id)
+        if metadata:
+            job_dict["display_name"] = metadata.get("display_name")
+            job_dict["description"] = metadata.get("description")
+        return job_dict
+
+    async def _send_command(self, action: str, job_id: str, kwargs: Optional[Dict[str, Any]] = None) -> bool:
+        try:
+            if not await self._job_exists(job_id):
+                logger.error(f"❌ 任务 {job_id} 不存在")
+                return False
+            from app.core.database import get_redis_client
+
+            command = {"action": action, "job_id": job_id, "kwargs": kwargs, "requested_at": get_utc8_now().isoformat()}
+            await get_redis_client().rpush(SCHEDULER_COMMANDS_KEY, json.dumps(command, ensure_ascii=False))
+            logger.info(f"📨 已转发调度器命令给 Leader: {action} {job_id}")
+            return True
+        except Exception as e:
+            logger.error(f"❌ 转发调度器命令失败 {action} {job_id}: {e}")
+            await self._record_job_action(job_id, action, "failed", str(e))
+            return False
+
+    async def pause_job(self, job_id: str) -> bool:
+        return await self._send_command("pause", job_id)
+
+    async def resume_job(self, job_id: str) -> bool:
+        return await self._send_command("resume", job_id)
+
+    async def trigger_job(self, job_id: str, kwargs: Optional[Dict[str, Any]] = None) -> bool:
+        return await self._send_command("trigger", job_id, kwargs)
+
+    async def _scheduler_state(self) -> Dict[str, Any]:
+        db = self._get_db()
+        state = await db[SCHEDULER_STATE_COLLECTION].find_one({"_id": "scheduler"}) or {}
+        heartbeat_at = state.get("heartbeat_at")
+        alive = bool(
+            heartbeat_at
+            and get_utc8_now() - heartbeat_at <= timedelta(seconds=SCHEDULER_HEARTBEAT_TIMEOUT_SECONDS)
+        )
+        return {**state, "running": alive and bool(state.get("running"))}
+
+    async def get_stats(self) -> Dict[str, Any]:
+        docs = await self._job_docs()
+        state = await self._scheduler_state()
+        paused = sum(1 for doc in docs if doc.get("paused"))
+        return {
+            "total_jobs": len(docs),
+            "running_jobs": len(docs) - paused,
+            "paused_jobs": paused,
+            "scheduler_running": state["running"],
+            "scheduler_state": state.get("state"),
+            "leader": state.get("leader"),
+        }
+
+    async def health_check(self) -> Dict[str, Any]:
+        state = await self._scheduler_state()
+        heartbeat_at = state.get("heartbeat_at")
+        return {
+            "status": "healthy" if state["running"] else "stopped",
+            "running": state["running"],
+            "state": state.get("state"),
+            "leader": state.get("leader"),
+            "heartbeat_at": heartbeat_at.isoformat() if heartbeat_at else None,
+            "timestamp": get_utc8_now().isoformat()
+        }
+
 
 # 全局服务实例
 _scheduler_service: Optional[SchedulerService] = None
 _scheduler_instance: Optional[AsyncIOScheduler] = None
+_remote_scheduler_service: Optional[RemoteSchedulerService] = None
 
 
-def set_scheduler_instance(scheduler: AsyncIOScheduler):
+def set_scheduler_instance(scheduler: Optional[AsyncIOScheduler]):
     """
     设置调度器实例
     
     Args:
         scheduler: APScheduler调度器实例
     """
-    global _scheduler_instance
+    global _scheduler_instance, _scheduler_service
     _scheduler_instance = scheduler
-    logger.info("✅ 调度器实例已设置")
+    # 调度器实例变化（如重新当选 Leader）时重建服务，重新挂载事件监听器
+    if _scheduler_service is not None and _scheduler_service.scheduler is not scheduler:
+        _scheduler_service = None
+    if scheduler is None:
+        logger.info("ℹ️ 调度器实例已清除，任务管理切换为共享状态模式")
+    else:
+        logger.info("✅ 调度器实例已设置")
 
 
 def get_scheduler_service() -> SchedulerService:
@@ -1050,10 +1221,13 @@ def get_scheduler_service() -> SchedulerService:
     Returns:
         调度器服务实例
     """
-    global _scheduler_service, _scheduler_instance
+    global _scheduler_service, _scheduler_instance, _remote_scheduler_service
 
+    # 本进程不是调度器 Leader：从共享存储读取任务状态，操作转发给 Leader
     if _scheduler_instance is None:
-        raise RuntimeError("调度器实例未设置，请先调用 set_scheduler_instance()")
+        if _remote_scheduler_service is None:
+            _remote_scheduler_service = RemoteSchedulerService()
+        return _remote_scheduler_service
 
     if _scheduler_service is None:
         _scheduler_service = SchedulerService(_scheduler_instance)
@@ -7,7 +7,7 @@ import asyncio
 import uuid
 import logging
 from datetime import datetime
-from typing import Dict, Any, Optional, List
+from typing import TYPE_CHECKING, Dict, Any, Optional, List
 from pathlib import Path
 import sys
 
@@ -19,7 +19,6 @@ sys.path.insert(0, str(project_root))
 from tradingagents.utils.logging_init import init_logging
 init_logging()
 
-from tradingagents.graph.trading_graph import TradingAgentsGraph
 from tradingagents.default_config import DEFAULT_CONFIG
 from app.models.analysis import (
     AnalysisTask, AnalysisStatus, SingleAnalysisRequest, AnalysisParameters
@@ -28,20 +27,27 @@ from app.models.user import PyObjectId
 from app.models.notification import NotificationCreate
 from bson import ObjectId
 from app.core.database import get_mongo_db
+from app.utils.report_fields import MARKET_TYPE_MAP, SEARCH_TEXT_FIELD, build_search_text, report_size_bytes
 from app.services.config_service import ConfigService
 from app.services.memory_state_manager import get_memory_state_manager, TaskStatus
 from app.services.redis_progress_tracker import RedisProgressTracker, get_progress_by_id
 from app.services.progress_log_handler import register_analysis_tracker, unregister_analysis_tracker
 
+if TYPE_CHECKING:
+    from tradingagents.graph.trading_graph import TradingAgentsGraph
+
 # 股票基础信息获取（用于补充显示名称）
-try:
-    from tradingagents.dataflows.data_source_manager import get_data_source_manager
-    _data_source_manager = get_data_source_manager()
-    def _get_stock_info_safe(stock_code: str):
-        """获取股票基础信息的安全封装"""
-        return _data_source_manager.get_stock_basic_info(stock_code)
-except Exception:
-    _get_stock_info_safe = None
+# 数据源管理器初始化会探测各数据源，耗时较长，首次使用时再创建
+_data_source_manager = None
+
+
+def _get_stock_info_safe(stock_code: str):
+    """获取股票基础信息的安全封装"""
+    global _data_source_manager
+    if _data_source_manager is None:
+        from tradingagents.dataflows.data_source_manager import get_data_source_manager
+        _data_source_manager = get_data_source_manager()
+    return _data_source_manager.get_stock_basic_info(stock_code)
 
 # 设置日志
 logger = logging.getLogger("app.services.simple_analysis_service")
@@ -592,7 +598,6 @@ class SimpleAnalysisService:
     """简化的股票分析服务类"""
 
     def __init__(self):
-        self._trading_graph_cache = {}
         self.memory_manager = get_memory_state_manager()
 
         # 进度跟踪器缓存
@@ -704,29 +709,22 @@ class SimpleAnalysisService:
             logger.warning(f"⚠️ 生成新的用户ID: {new_object_id}")
             return PyObjectId(new_object_id)
 
-    def _get_trading_graph(self, config: Dict[str, Any]) -> TradingAgentsGraph:
-        """获取或创建TradingAgents实例
-
-        ⚠️ 注意：为了避免并发执行时的数据混淆，每次都创建新实例
-        虽然这会增加一些初始化开销，但可以确保线程安全
+    def _get_trading_graph(self, config: Dict[str, Any]) -> "TradingAgentsGraph":
+        """获取TradingAgents实例（进程内共享）
 
-        TradingAgentsGraph 实例包含可变状态（self.ticker, self.curr_state等），
-        如果多个线程共享同一个实例，会导致数据混淆。
+        编译好的 LangGraph、LLM 客户端、工具节点和记忆句柄按「分析师组合 + 配置」缓存复用；
+        每次运行的可变状态（ticker、curr_state、节点计时）保存在线程本地的 GraphRunContext 中，
+        因此并发任务共享同一实例也不会互相干扰。
         """
-        # 🔧 [并发安全] 每次都创建新实例，避免多线程共享状态
-        # 不再使用缓存，因为 TradingAgentsGraph 有可变的实例变量
-        logger.info(f"🔧 创建新的TradingAgents实例（并发安全模式）...")
+        # 延迟导入：图模块会加载 langchain 及全部智能体
+        from tradingagents.graph import get_shared_trading_graph
 
-        trading_graph = TradingAgentsGraph(
+        return get_shared_trading_graph(
             selected_analysts=config.get("selected_analysts", ["market", "fundamentals"]),
             debug=config.get("debug", False),
             config=config
         )
 
-        logger.info(f"✅ TradingAgents实例创建成功（实例ID: {id(trading_graph)}）")
-
-        return trading_graph
-
     async def create_analysis_task(
         self,
         user_id: str,
@@ -2526,13 +2524,7 @@ class SimpleAnalysisService:
             # 🔥 根据股票代码推断市场类型
             from tradingagents.utils.stock_utils import StockUtils
             market_info = StockUtils.get_market_info(stock_symbol)
-            market_type_map = {
-                "china_a": "A股",
-                "hong_kong": "港股",
-                "us": "美股",
-                "unknown": "A股"  # 默认为A股
-            }
-            market_type = market_type_map.get(market_info.get("market", "unknown"), "A股")
+            market_type = MARKET_TYPE_MAP.get(market_info.get("market", "unknown"), "A股")
             logger.info(f"📊 推断市场类型: {stock_symbol} -> {market_type}")
 
             # 🔥 获取股票名称
@@ -2600,6 +2592,7 @@ class SimpleAnalysisService:
 
                 # 报告内容
                 "reports": reports,
+                "size_bytes": report_size_bytes(reports),  # 预计算大小，列表接口无需读取报告内容
 
                 # 🔥 关键修复：添加格式化后的decision字段！
                 "decision": result.get("decision", {}),
@@ -2621,6 +2614,9 @@ class SimpleAnalysisService:
                 "performance_metrics": result.get("performance_metrics", {})
             }
 
+            # 🔍 全文检索字段（中文切分在写入时完成）
+            document[SEARCH_TEXT_FIELD] = build_search_text(document)
+
             # 保存到analysis_reports集合（与web目录保持一致）
             result_insert = await db.analysis_reports.insert_one(document)
 
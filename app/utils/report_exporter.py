@@ -290,6 +290,12 @@ pre, code {
 
         # 生成 Markdown 内容
         md_content = self.generate_markdown_report(report_doc)
+        return self.render_docx(md_content)
+
+    def render_docx(self, md_content: str) -> bytes:
+        """将 Markdown 渲染为 Word 文档（调用 pandoc 子进程）"""
+        if not self.pandoc_available:
+            raise Exception("Pandoc 不可用，无法生成 Word 文档。请安装 pandoc 或使用 Markdown 格式导出。")
 
         try:
             # 创建临时文件
@@ -636,6 +642,12 @@ pre, code {
         """生成 PDF 格式报告（使用 pdfkit + wkhtmltopdf）"""
         logger.info("📊 开始生成 PDF 文档...")
 
+        # 生成 Markdown 内容
+        md_content = self.generate_markdown_report(report_doc)
+        return self.render_pdf(md_content)
+
+    def render_pdf(self, md_content: str) -> bytes:
+        """将 Markdown 渲染为 PDF（调用 wkhtmltopdf 子进程）"""
         # 检查 pdfkit 是否可用
         if not self.pdfkit_available:
             error_msg = (
@@ -650,9 +662,6 @@ pre, code {
             logger.error(f"❌ {error_msg}")
             raise Exception(error_msg)
 
-        # 生成 Markdown 内容
-        md_content = self.generate_markdown_report(report_doc)
-
         # 使用 pdfkit 生成 PDF
         try:
             html_content = self._markdown_to_html(md_content)
@@ -0,0 +1,181 @@
+"""
+分析报告预计算字段
+
+报告列表只需要元数据，不应为了「文件大小」「市场类型」读取整份报告内容。
+这些字段在保存报告时计算并写入文档，列表接口直接读取；旧文档缺失时由列表接口补齐并回写。
+
+搜索使用 MongoDB 文本索引：写入时把股票代码、名称、分析ID、摘要切分为检索词存入 search_text
+（中文按单字 + 二元组切分，英文/数字按词切分并附加子串），查询时按同样规则切分关键词。
+单个英文/数字字符不建索引，这类关键词回退为正则匹配。
+"""
+
+import base64
+import json
+import re
+from datetime import datetime
+from typing import Any, Dict, Iterable, List, Optional
+
+# 报告列表只读取的字段（不包含 reports / decision 等大字段）
+REPORT_LIST_PROJECTION: Dict[str, int] = {
+    "analysis_id": 1,
+    "stock_symbol": 1,
+    "stock_name": 1,
+    "market_type": 1,
+    "model_info": 1,
+    "status": 1,
+    "created_at": 1,
+    "analysis_date": 1,
+    "analysts": 1,
+    "research_depth": 1,
+    "summary": 1,
+    "size_bytes": 1,
+    "source": 1,
+    "task_id": 1,
+}
+
+MARKET_TYPE_MAP = {
+    "china_a": "A股",
+    "hong_kong": "港股",
+    "us": "美股",
+    "unknown": "A股",  # 默认为A股
+}
+
+
+def report_size_bytes(reports: Any) -> int:
+    """报告内容的大小（UTF-8 编码后的 JSON 字节数）"""
+    if not reports:
+        return 0
+    try:
+        return len(json.dumps(reports, ensure_ascii=False, default=str).encode("utf-8"))
+    except (TypeError, ValueError):
+        return len(str(reports).encode("utf-8"))
+
+
+def infer_market_type(stock_code: str) -> str:
+    """根据股票代码推断市场类型（A股/港股/美股）"""
+    from tradingagents.utils.stock_utils import StockUtils
+
+    market_info = StockUtils.get_market_info(stock_code)
+    return MARKET_TYPE_MAP.get(market_info.get("market", "unknown"), "A股")
+
+
+# ---------- 全文检索 ----------
+
+SEARCH_TEXT_FIELD = "search_text"
+# 参与检索的字段
+SEARCH_SOURCE_FIELDS = ("stock_symbol", "stock_name", "analysis_id", "summary")
+# 英文/数字词附加子串的最大长度（支持按代码片段搜索，如 "0000" / "0519" 命中 "000001" / "600519"）
+_MAX_SUBSTRING_LEN = 12
+# 回退为正则匹配时检索的字段
+_REGEX_SEARCH_FIELDS = ("stock_symbol", "stock_name", "analysis_id", "summary")
+
+_TOKEN_RE = re.compile(r"[\u4e00-\u9fff]+|[a-z0-9]+")
+
+
+def _is_cjk(token: str) -> bool:
+    return "\u4e00" <= token[0] <= "\u9fff"
+
+
+def tokenize_search_text(text: str, with_substrings: bool = False) -> List[str]:
+    """切分检索词：中文单字 + 二元组，英文/数字按词（可附加长度 >= 2 的子串），保持首次出现顺序去重"""
+    tokens: Dict[str, None] = {}
+    for run in _TOKEN_RE.findall(str(text or "").lower()):
+        if _is_cjk(run):
+            if with_substrings:
+                tokens.update(dict.fromkeys(run))
+            if len(run) == 1:
+                tokens[run] = None
+            for i in range(len(run) - 1):
+                tokens[run[i:i + 2]] = None
+        else:
+            if with_substrings and len(run) <= _MAX_SUBSTRING_LEN:
+                tokens.update(dict.fromkeys(
+                    run[i:j] for i in range(len(run)) for j in range(i + 2, len(run) + 1)
+                ))
+            tokens[run] = None
+    return list(tokens)
+
+
+def build_search_text(doc: Dict[str, Any]) -> str:
+    """根据报告文档生成 search_text 字段（写入时调用）"""
+    parts: Iterable[str] = (str(doc.get(field) or "") for field in SEARCH_SOURCE_FIELDS)
+    return " ".join(tokenize_search_text(" ".join(parts), with_substrings=True))
+
+
+def build_search_filter(keyword: str) -> Optional[Dict[str, Any]]:
+    """
+    将搜索关键词转换为 $text 查询（所有检索词都需命中）
+
+    包含单个英文/数字字符（如 "5"）时文本索引无法命中，回退为各字段的正则子串匹配；
+    关键词中没有可检索的字符时返回 None。
+    """
+    tokens = tokenize_search_text(keyword)
+    if not tokens:
+        return None
+    if any(len(t) == 1 and not _is_cjk(t) for t in tokens):
+        pattern = re.escape(keyword.strip())
+        return {"$or": [{field: {"$regex": pattern, "$options": "i"}} for field in _REGEX_SEARCH_FIELDS]}
+    return {"$text": {"$search": " ".join(f'"{t}"' for t in tokens)}}
+
+
+async def backfill_search_text(collection, batch_size: int = 500) -> int:
+    """
+    为缺少 search_text 的旧报告补齐检索词（幂等，创建文本索引时调用），返回更新数量
+
+    没有 search_text 的报告不会被 $text 查询命中。
+    """
+    from pymongo import UpdateOne
+
+    missing = {SEARCH_TEXT_FIELD: {"$exists": False}}
+    projection = {field: 1 for field in SEARCH_SOURCE_FIELDS}
+    updated, ops = 0, []
+    async for doc in collection.find(missing, projection):
+        # 条件中保留 $exists：多个 worker 同时启动时不会覆盖已写入的值
+        ops.append(UpdateOne({"_id": doc["_id"], **missing},
+                             {"$set": {SEARCH_TEXT_FIELD: build_search_text(doc)}}))
+        if len(ops) >= batch_size:
+            updated += (await collection.bulk_write(ops, ordered=False)).modified_count
+            ops = []
+    if ops:
+        updated += (await collection.bulk_write(ops, ordered=False)).modified_count
+    return updated
+
+
+# ---------- 游标分页 ----------
+
+def encode_report_cursor(doc: Dict[str, Any]) -> str:
+    """用最后一条记录的 (created_at, _id) 生成下一页游标"""
+    created_at = doc.get("created_at")
+    payload = {
+        "t": created_at.isoformat() if isinstance(created_at, datetime) else created_at,
+        "id": str(doc.get("_id")),
+    }
+    return base64.urlsafe_b64encode(json.dumps(payload).encode("utf-8")).decode("ascii")
+
+
+def decode_report_cursor(cursor: str) -> Dict[str, Any]:
+    """
+    将游标转换为「排在该记录之后」的查询条件（created_at 倒序，_id 倒序）
+
+    Raises:
+        ValueError: 游标格式无效
+    """
+    try:
+        payload = json.loads(base64.urlsafe_b64decode(cursor.encode("ascii")))
+        created_at = payload["t"]
+        if isinstance(created_at, str):
+            created_at = datetime.fromisoformat(created_at)
+        last_id: Any = payload["id"]
+    except Exception as e:
+        raise ValueError(f"无效的分页游标: {cursor}") from e
+
+    try:
+        from bson import ObjectId
+        last_id = ObjectId(last_id)
+    except Exception:
+        pass
+
+    return {"$or": [
+        {"created_at": {"$lt": created_at}},
+        {"created_at": created_at, "_id": {"$lt": last_id}},
+    ]}
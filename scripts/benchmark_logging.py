@@ -0,0 +1,115 @@
+#!/usr/bin/env python3
+"""
+日志开销基准测试：同步处理器 vs 异步队列（QueueHandler/QueueListener）vs 异步 + 限流
+
+模拟分析线程上的数据获取热点（每次调用 5 条 INFO 日志，与 DataSourceManager.get_stock_data 相当），
+多个线程并发调用，统计调用线程上的单次耗时，以及包含后台线程写完日志在内的总耗时。
+
+用法：
+    python scripts/benchmark_logging.py
+    python scripts/benchmark_logging.py --threads 8 --calls 2000
+"""
+
+import argparse
+import statistics
+import sys
+import tempfile
+import threading
+import time
+from pathlib import Path
+
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from tradingagents.utils.logging_manager import get_logger, setup_logging, stop_logging
+
+
+def build_config(log_dir: str, async_enabled: bool, sampling_enabled: bool) -> dict:
+    file_format = '%(asctime)s | %(name)-20s | %(levelname)-8s | %(module)s:%(funcName)s:%(lineno)d | %(message)s'
+    return {
+        'level': 'INFO',
+        'format': {'console': file_format, 'file': file_format, 'structured': 'json'},
+        'handlers': {
+            'console': {'enabled': False, 'colored': False, 'level': 'INFO'},
+            'file': {'enabled': True, 'level': 'DEBUG', 'max_size': '10MB', 'backup_count': 5, 'directory': log_dir},
+            'error': {'enabled': True, 'level': 'WARNING', 'max_size': '10MB', 'backup_count': 5,
+                      'directory': log_dir, 'filename': 'error.log'},
+            'structured': {'enabled': True, 'level': 'INFO', 'directory': log_dir},
+        },
+        'loggers': {},
+        'docker': {'enabled': False, 'stdout_only': True},
+        'async': {'enabled': async_enabled, 'queue_size': 100000},
+        'sampling': {'enabled': sampling_enabled, 'rate_per_second': 10, 'burst_seconds': 5, 'loggers': {}},
+    }
+
+
+def fetch_stock_data(logger, symbol: str, i: int) -> int:
+    """模拟一次数据获取调用中的日志"""
+    logger.info(f"📊 [数据来源: tushare] 开始获取daily数据: {symbol}",
+                extra={'symbol': symbol, 'event_type': 'data_fetch_start'})
+    logger.info(f"🔍 [股票代码追踪] DataSourceManager.get_stock_data 接收到的股票代码: '{symbol}' (类型: {type(symbol)})")
+    logger.info(f"🔍 [股票代码追踪] 当前数据源: tushare")
+    logger.info(f"🔍 [股票代码追踪] 调用 Tushare 数据源，传入参数: symbol='{symbol}', period='daily'")
+    logger.info(f"✅ [数据来源: tushare] 成功获取数据: {symbol} ({i} 条)")
+    return i
+
+
+def run_mode(name: str, threads: int, calls: int, async_enabled: bool, sampling_enabled: bool) -> dict:
+    with tempfile.TemporaryDirectory() as log_dir:
+        setup_logging(build_config(log_dir, async_enabled, sampling_enabled))
+        logger = get_logger('dataflows')
+        durations = [[] for _ in range(threads)]
+
+        def worker(idx: int):
+            samples = durations[idx]
+            for i in range(calls):
+                start = time.perf_counter()
+                fetch_stock_data(logger, f"60{idx:04d}", i)
+                samples.append(time.perf_counter() - start)
+
+        wall_start = time.perf_counter()
+        workers = [threading.Thread(target=worker, args=(i,)) for i in range(threads)]
+        for t in workers:
+            t.start()
+        for t in workers:
+            t.join()
+        caller_wall = time.perf_counter() - wall_start
+        # 异步模式下等待监听线程写完，统计总耗时
+        stop_logging()
+        total_wall = time.perf_counter() - wall_start
+        lines = sum(1 for _ in open(Path(log_dir) / 'tradingagents.log', encoding='utf-8'))
+
+    all_samples = sorted(s for samples in durations for s in samples)
+    return {
+        'mode': name,
+        'mean_us': statistics.mean(all_samples) * 1e6,
+        'p99_us': all_samples[int(len(all_samples) * 0.99) - 1] * 1e6,
+        'caller_wall_s': caller_wall,
+        'total_wall_s': total_wall,
+        'lines': lines,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="日志开销基准测试")
+    parser.add_argument('--threads', type=int, default=4, help='并发分析线程数')
+    parser.add_argument('--calls', type=int, default=1000, help='每个线程的调用次数')
+    args = parser.parse_args()
+
+    modes = [
+        ('sync', False, False),
+        ('async', True, False),
+        ('async+sampling', True, True),
+    ]
+    results = [run_mode(name, args.threads, args.calls, a, s) for name, a, s in modes]
+
+    print(f"\n线程数 {args.threads}，每线程调用 {args.calls} 次，每次 5 条 INFO 日志"
+          f"（文件 + 错误 + 结构化 JSON 处理器）\n")
+    print(f"{'模式':<16}{'单次均值(us)':>14}{'单次P99(us)':>14}{'调用线程(s)':>13}{'含写完(s)':>12}{'写入行数':>10}")
+    for r in results:
+        print(f"{r['mode']:<16}{r['mean_us']:>14.1f}{r['p99_us']:>14.1f}"
+              f"{r['caller_wall_s']:>13.3f}{r['total_wall_s']:>12.3f}{r['lines']:>10}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,112 @@
+#!/usr/bin/env python3
+"""
+数据迁移脚本：为已有的分析报告添加 search_text（全文检索）和 size_bytes 字段
+
+报告列表的关键词搜索使用 search_text 文本索引，旧报告需要补齐该字段才能被搜索到。
+应用启动创建索引时会自动补齐缺失的 search_text；本脚本用于同时补齐 size_bytes，或在切分规则变更后重建。
+
+使用方法：
+    python scripts/migrate_add_report_search_text.py [--dry-run] [--rebuild]
+
+参数：
+    --dry-run: 只统计将要更新的数据，不实际执行更新
+    --rebuild: 按当前切分规则重建所有报告的 search_text（切分规则变更后使用）
+"""
+
+import sys
+import asyncio
+from pathlib import Path
+
+# 添加项目根目录到路径
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from pymongo import UpdateOne
+
+from app.core.database import init_database, close_database, get_mongo_db
+from app.utils.report_fields import (
+    SEARCH_SOURCE_FIELDS,
+    SEARCH_TEXT_FIELD,
+    build_search_text,
+    report_size_bytes,
+)
+from tradingagents.utils.logging_init import get_logger
+
+logger = get_logger("default")
+
+BATCH_SIZE = 500
+
+
+async def migrate_add_search_text(dry_run: bool = False, rebuild: bool = False):
+    """为缺少 search_text / size_bytes 的报告补齐字段（rebuild=True 时重建所有报告）"""
+
+    logger.info("=" * 60)
+    logger.info("开始数据迁移：添加 search_text / size_bytes 字段")
+    logger.info("=" * 60)
+
+    if dry_run:
+        logger.info("🔍 DRY RUN 模式：只统计将要更新的数据，不实际执行更新")
+
+    try:
+        logger.info("📡 正在连接数据库...")
+        await init_database()
+        logger.info("✅ 数据库连接成功")
+
+        db = get_mongo_db()
+
+        query = {} if rebuild else {"$or": [
+            {SEARCH_TEXT_FIELD: {"$exists": False}},
+            {"size_bytes": {"$exists": False}},
+        ]}
+        total_count = await db.analysis_reports.count_documents(query)
+        logger.info(f"📊 找到 {total_count} 条需要更新的报告")
+
+        if total_count == 0 or dry_run:
+            if dry_run:
+                logger.info("\n💡 提示：移除 --dry-run 参数以实际执行更新")
+            return
+
+        projection = {field: 1 for field in SEARCH_SOURCE_FIELDS}
+        projection["reports"] = 1
+
+        updated_count = 0
+        ops = []
+        async for doc in db.analysis_reports.find(query, projection):
+            ops.append(UpdateOne({"_id": doc["_id"]}, {"$set": {
+                SEARCH_TEXT_FIELD: build_search_text(doc),
+                "size_bytes": report_size_bytes(doc.get("reports")),
+            }}))
+            if len(ops) >= BATCH_SIZE:
+                result = await db.analysis_reports.bulk_write(ops, ordered=False)
+                updated_count += result.modified_count
+                ops = []
+                logger.info(f"📝 已更新 {updated_count}/{total_count}")
+
+        if ops:
+            result = await db.analysis_reports.bulk_write(ops, ordered=False)
+            updated_count += result.modified_count
+
+        logger.info("=" * 60)
+        logger.info("迁移完成")
+        logger.info("=" * 60)
+        logger.info(f"📊 总数：{total_count}")
+        logger.info(f"✅ 成功：{updated_count}")
+
+    except Exception as e:
+        logger.error(f"❌ 迁移失败：{e}")
+        import traceback
+        logger.error(traceback.format_exc())
+
+
+async def main():
+    """主函数"""
+    try:
+        await migrate_add_search_text(dry_run="--dry-run" in sys.argv, rebuild="--rebuild" in sys.argv)
+    finally:
+        logger.info("\n📡 正在关闭数据库连接...")
+        await close_database()
+        logger.info("✅ 数据库连接已关闭")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,61 @@
+import os
+
+import pandas as pd
+import pytest
+
+
+def _write(path, n=5, start=1.0):
+    pd.DataFrame({
+        "Date": pd.bdate_range("2025-01-01", periods=n).strftime("%Y-%m-%d"),
+        "Close": [start + i for i in range(n)],
+    }).to_csv(path, index=False)
+
+
+def test_store_loads_once_and_hands_out_read_only_views(tmp_path):
+    from tradingagents.dataflows.cache.price_frames import PriceFrameStore
+
+    path = tmp_path / "AAA-YFin-data.csv"
+    _write(path)
+    store = PriceFrameStore()
+
+    first = store.get(str(path))
+    first["DateOnly"] = first["Date"].str[:10]  # 新增列只影响调用方自己的视图
+    second = store.get(str(path))
+    assert "DateOnly" not in second.columns
+    assert store.stats()["loads"] == 1
+
+    with pytest.raises(ValueError):
+        second.loc[0, "Close"] = 100.0
+
+    # 文件变化后重新加载
+    _write(path, start=10.0)
+    st = os.stat(path)
+    os.utime(path, ns=(st.st_atime_ns, st.st_mtime_ns + 1_000_000))
+    assert store.get(str(path))["Close"].iloc[0] == 10.0
+    assert store.stats()["loads"] == 2
+
+
+def test_store_evicts_least_recently_used(tmp_path):
+    from tradingagents.dataflows.cache.price_frames import PriceFrameStore
+
+    paths = []
+    for name in ("A", "B", "C"):
+        p = tmp_path / f"{name}.csv"
+        _write(p)
+        paths.append(str(p))
+
+    probe = PriceFrameStore()
+    probe.get(paths[0])
+    one = probe.stats()["bytes"]
+
+    store = PriceFrameStore(max_bytes=one * 2)
+    store.get(paths[0])
+    store.get(paths[1])
+    store.get(paths[0])
+    store.get(paths[2])  # 淘汰最久未使用的 B
+    assert store.stats()["files"] == 2
+
+    store.get(paths[0])
+    assert store.stats()["loads"] == 3
+    store.get(paths[1])
+    assert store.stats()["loads"] == 4
@@ -0,0 +1,54 @@
+import numpy as np
+import pandas as pd
+
+
+def _write_prices(tmp_path, symbol="TEST"):
+    dates = pd.bdate_range("2025-01-01", periods=80)
+    n = len(dates)
+    data = pd.DataFrame({
+        "Date": dates.strftime("%Y-%m-%d"),
+        "Open": np.linspace(10, 20, n),
+        "High": np.linspace(11, 21, n),
+        "Low": np.linspace(9, 19, n),
+        "Close": np.linspace(10.5, 20.5, n),
+        "Volume": np.linspace(1e6, 2e6, n),
+    })
+    data.to_csv(tmp_path / f"{symbol}-YFin-data-2015-01-01-2025-03-25.csv", index=False)
+    return dates
+
+
+def test_window_reads_once_and_matches_single_day(tmp_path, monkeypatch):
+    import tradingagents.dataflows.technical.stockstats as ss_mod
+    from tradingagents.dataflows.technical.stockstats import StockstatsUtils
+
+    ss_mod.clear_indicator_cache()
+    dates = _write_prices(tmp_path)
+
+    reads = []
+    real_read_csv = pd.read_csv
+
+    def _counting_read_csv(*args, **kwargs):
+        reads.append(args[0])
+        return real_read_csv(*args, **kwargs)
+
+    monkeypatch.setattr(ss_mod.pd, "read_csv", _counting_read_csv)
+
+    curr_date = dates[-1].strftime("%Y-%m-%d")
+    window = StockstatsUtils.get_stock_stats_window("TEST", "close_10_ema", curr_date, 10, str(tmp_path))
+
+    # 只包含交易日，日期倒序
+    assert [d for d, _ in window] == [d.strftime("%Y-%m-%d") for d in dates[dates >= dates[-1] - pd.Timedelta(days=10)]][::-1]
+    for day, value in window:
+        assert StockstatsUtils.get_stock_stats("TEST", "close_10_ema", day, str(tmp_path)) == value
+    assert StockstatsUtils.get_stock_stats("TEST", "close_10_ema", "2025-01-04", str(tmp_path)) == ss_mod.NOT_TRADING_DAY
+    assert len(reads) == 1
+
+    # 数据文件变化后重新计算
+    _write_prices(tmp_path)
+    import os
+    path = tmp_path / "TEST-YFin-data-2015-01-01-2025-03-25.csv"
+    st = os.stat(path)
+    os.utime(path, ns=(st.st_atime_ns, st.st_mtime_ns + 1_000_000))
+    StockstatsUtils.get_stock_stats_window("TEST", "close_10_ema", curr_date, 10, str(tmp_path))
+    assert len(reads) == 2
+    ss_mod.clear_indicator_cache()
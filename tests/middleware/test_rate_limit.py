@@ -0,0 +1,100 @@
+import asyncio
+
+import pytest
+from fastapi import HTTPException
+
+from app.core.redis_client import RateLimitResult
+
+
+class _FakeRedisService:
+    """按 RATE_LIMIT_SCRIPT 的语义在内存中模拟一次调用完成的限流 + 配额检查"""
+
+    def __init__(self):
+        self.calls = []
+        self.windows = {}
+        self.quotas = {}
+
+    async def check_rate_and_quota(self, rate_key, limit, window_seconds=60, quota_key=None, quota=0, quota_ttl=86400):
+        self.calls.append((rate_key, quota_key))
+        count = self.windows.get(rate_key, 0)
+        if limit > 0 and count >= limit:
+            return RateLimitResult(0, count, 30_000, 0)
+        usage = self.quotas.get(quota_key, 0)
+        if quota_key and quota > 0:
+            if usage >= quota:
+                return RateLimitResult(2, count, 0, usage)
+            usage = self.quotas[quota_key] = usage + 1
+        if limit > 0:
+            count = self.windows[rate_key] = count + 1
+        return RateLimitResult(1, count, 0, usage)
+
+
+@pytest.fixture
+def fake_redis(monkeypatch):
+    from app.middleware import rate_limit
+
+    fake = _FakeRedisService()
+    monkeypatch.setattr(rate_limit, "get_redis_service", lambda: fake)
+    return fake
+
+
+def test_rate_limit_single_call_and_local_block(fake_redis):
+    from app.middleware.rate_limit import RateLimitMiddleware
+
+    mw = RateLimitMiddleware(app=None)
+
+    async def _run():
+        for _ in range(10):
+            await mw.check_rate_limit("u1", "/api/analysis/single")
+        # 本进程已放行 10 次，第 11 次不访问 Redis
+        with pytest.raises(HTTPException) as local:
+            await mw.check_rate_limit("u1", "/api/analysis/single")
+
+        # 其他 worker 已用满窗口：Redis 返回限流，之后等待时间内由进程内预检查拒绝
+        fake_redis.windows["rate_limit:u2:_api_analysis_single"] = 10
+        with pytest.raises(HTTPException) as remote:
+            await mw.check_rate_limit("u2", "/api/analysis/single")
+        with pytest.raises(HTTPException):
+            await mw.check_rate_limit("u2", "/api/analysis/single")
+        return local.value, remote.value
+
+    local, remote = asyncio.run(_run())
+    assert local.status_code == 429 and local.detail["error"]["code"] == "RATE_LIMIT_EXCEEDED"
+    assert remote.headers["Retry-After"] == "30" and remote.detail["error"]["current_count"] == 10
+    assert len(fake_redis.calls) == 11
+    assert all(quota_key is None for _, quota_key in fake_redis.calls)
+
+
+def test_quota_checked_in_same_redis_call(fake_redis):
+    from app.middleware.rate_limit import RateLimitMiddleware
+
+    mw = RateLimitMiddleware(app=None, daily_quota=2)
+
+    async def _run():
+        for _ in range(2):
+            await mw.check_rate_limit("u1", "/api/analysis/single", quota_user_id="u1")
+        with pytest.raises(HTTPException) as exc:
+            await mw.check_rate_limit("u1", "/api/analysis/single", quota_user_id="u1")
+        with pytest.raises(HTTPException):
+            await mw.check_rate_limit("u1", "/api/analysis/single", quota_user_id="u1")
+        return exc.value
+
+    exc = asyncio.run(_run())
+    assert exc.detail["error"]["code"] == "DAILY_QUOTA_EXCEEDED"
+    assert exc.detail["error"]["current_usage"] == 2
+    # 每个请求一次调用，配额超限后本进程不再访问 Redis；拒绝的请求不占用速率窗口
+    assert len(fake_redis.calls) == 3
+    assert all(quota_key and quota_key.startswith("quota:u1:") for _, quota_key in fake_redis.calls)
+    assert list(fake_redis.windows.values()) == [2]
+
+
+def test_local_gate_only_rejects_when_certainly_over_limit():
+    from app.middleware.rate_limit import LocalRateGate
+
+    gate = LocalRateGate()
+    for _ in range(3):
+        assert gate.retry_after("k", 3, 60) is None
+        gate.record("k", 3)
+    assert 59 < gate.retry_after("k", 3, 60) <= 60
+    assert gate.retry_after("k", 4, 60) is None
+    assert gate.retry_after("k", 3, 0) is None
@@ -0,0 +1,63 @@
+import asyncio
+import json
+import threading
+import time
+
+
+class _SlowSyncCache:
+    """模拟同步缓存：查找时阻塞，记录调用线程"""
+
+    def __init__(self):
+        self.threads = []
+
+    def find_cached_stock_data(self, symbol=None, data_source=None, **kwargs):
+        self.threads.append(threading.get_ident())
+        time.sleep(0.2)
+        return f"{data_source}:{symbol}"
+
+    def load_stock_data(self, cache_key):
+        self.threads.append(threading.get_ident())
+        return json.dumps({"price": 123.4, "updated_at": "2025-01-02T10:00:00"})
+
+    def save_stock_data(self, **kwargs):
+        return "ok"
+
+
+def test_us_quote_cache_hit_does_not_block_event_loop():
+    from app.services.foreign_stock_service import ForeignStockService
+    from app.core.loop_monitor import EventLoopLagMonitor
+    from tradingagents.dataflows.cache.async_adapter import AsyncStockDataCache
+
+    sync_cache = _SlowSyncCache()
+    svc = ForeignStockService.__new__(ForeignStockService)
+    svc.cache = AsyncStockDataCache(sync_cache)
+
+    monitor = EventLoopLagMonitor(interval=0.02, warn_ms=10_000)
+
+    async def _run():
+        loop_thread = threading.get_ident()
+        monitor.start()
+        quote = await svc._get_us_quote("AAPL")
+        await monitor.stop()
+        return loop_thread, quote
+
+    loop_thread, quote = asyncio.run(_run())
+
+    assert quote["price"] == 123.4 and quote["market"] == "US" and quote["code"] == "AAPL"
+    assert sync_cache.threads and loop_thread not in sync_cache.threads
+    stats = monitor.stats()
+    assert stats["samples"] > 0
+    assert stats["max_ms"] < 150
+
+
+def test_loop_lag_monitor_percentiles():
+    from app.core.loop_monitor import EventLoopLagMonitor
+
+    monitor = EventLoopLagMonitor(window=100, warn_ms=10_000)
+    assert monitor.stats()["samples"] == 0
+    for v in range(100):
+        monitor.record(float(v))
+    stats = monitor.stats()
+    assert stats["samples"] == 100
+    assert stats["max_ms"] == 99.0
+    assert 97.0 <= stats["p99_ms"] <= 99.0
@@ -0,0 +1,94 @@
+import asyncio
+import json
+import time
+
+
+class _FakeRedis:
+    def __init__(self):
+        self.data = {}
+        self.expires = {}
+
+    def _alive(self, key):
+        exp = self.expires.get(key)
+        if exp is not None and time.monotonic() >= exp:
+            self.data.pop(key, None)
+            self.expires.pop(key, None)
+        return key in self.data
+
+    async def get(self, key):
+        return self.data.get(key) if self._alive(key) else None
+
+    async def set(self, key, value, nx=False, px=None):
+        if nx and self._alive(key):
+            return None
+        self.data[key] = value
+        self.expires[key] = time.monotonic() + px / 1000 if px else None
+        return True
+
+    async def eval(self, script, numkeys, key, token):
+        if self._alive(key) and self.data[key] == token:
+            del self.data[key]
+            return 1
+        return 0
+
+
+def _make(redis, namespace="foreign_quote"):
+    from app.core.single_flight import RedisSingleFlight
+
+    return RedisSingleFlight(namespace, result_ttl=5, lock_ttl=2, poll_interval=0.01, redis_getter=lambda: redis)
+
+
+def test_concurrent_fetches_across_processes_call_api_once():
+    redis = _FakeRedis()
+    # 两个实例模拟两个 API 进程（各自的进程内去重状态，共享 Redis）
+    p1, p2 = _make(redis), _make(redis)
+    calls = []
+
+    async def _fetch():
+        calls.append(1)
+        await asyncio.sleep(0.05)
+        return {"code": "AAPL", "price": 190.1}
+
+    async def _run():
+        return await asyncio.gather(*(p.run("US_quote_AAPL", _fetch) for p in (p1, p2, p1, p2, p1)))
+
+    results = asyncio.run(_run())
+
+    assert calls == [1]
+    assert all(r == {"code": "AAPL", "price": 190.1} for r in results)
+    assert p1.stats["local_shared"] + p2.stats["local_shared"] == 3
+    assert p1.stats["remote_shared"] + p2.stats["remote_shared"] == 1
+    # 结果在短 TTL 内广播，锁已释放
+    assert json.loads(redis.data["foreign_quote:result:US_quote_AAPL"])["price"] == 190.1
+    assert "foreign_quote:lock:US_quote_AAPL" not in redis.data
+
+
+def test_waiter_takes_over_when_fetcher_fails_and_falls_back_without_redis():
+    redis = _FakeRedis()
+    p1, p2 = _make(redis), _make(redis)
+
+    async def _boom():
+        await asyncio.sleep(0.03)
+        raise RuntimeError("yfinance down")
+
+    async def _ok():
+        return {"code": "00700", "price": 320.0}
+
+    async def _run():
+        first = asyncio.create_task(p1.run("HK_quote_00700", _boom))
+        await asyncio.sleep(0.01)
+        second = await p2.run("HK_quote_00700", _ok)
+        return await asyncio.gather(first, return_exceptions=True), second
+
+    (first,), second = asyncio.run(_run())
+    assert isinstance(first, RuntimeError)
+    assert second["price"] == 320.0
+
+    def _no_redis():
+        raise RuntimeError("Redis客户端未初始化")
+
+    from app.core.single_flight import RedisSingleFlight
+
+    local_only = RedisSingleFlight("foreign_quote", redis_getter=_no_redis)
+    assert asyncio.run(local_only.run("US_quote_MSFT", _ok))["price"] == 320.0
+    assert local_only.stats["fetches"] == 1
@@ -0,0 +1,75 @@
+import asyncio
+from types import SimpleNamespace
+
+from pymongo.errors import BulkWriteError
+
+
+class _FakeNewsCollection:
+    """按 content_hash 模拟 $setOnInsert upsert"""
+
+    def __init__(self):
+        self.docs = {}
+        self.calls = []
+
+    async def bulk_write(self, operations, ordered=True):
+        self.calls.append((len(operations), ordered))
+        upserted = 0
+        for op in operations:
+            doc = op._doc["$setOnInsert"]
+            if op._filter["content_hash"] not in self.docs:
+                self.docs[op._filter["content_hash"]] = dict(doc)
+                upserted += 1
+        return SimpleNamespace(upserted_count=upserted)
+
+
+def _news(i, **extra):
+    return {"symbol": "600519", "title": f"新闻{i}", "url": f"https://example.com/{i}",
+            "publish_time": "2025-01-02 10:00:00", **extra}
+
+
+def _service(collection):
+    from app.services.news_data_service import NewsDataService
+
+    svc = NewsDataService()
+    svc._collection = collection
+    svc._indexes_ensured = True
+    return svc
+
+
+def test_news_sync_only_writes_new_articles():
+    coll = _FakeNewsCollection()
+    svc = _service(coll)
+
+    async def _run():
+        first = await svc.save_news_data([_news(1), _news(2), _news(2)], "akshare")
+        again = await svc.save_news_data([_news(1), _news(2, content="正文更新")], "akshare")
+        more = await svc.save_news_data([_news(2), _news(3)], "akshare")
+        return first, again, more
+
+    assert asyncio.run(_run()) == (2, 0, 1)
+    # 批内重复、已写入的新闻不提交到 MongoDB；无序批量写入
+    assert coll.calls == [(2, False), (1, False)]
+    doc = next(iter(coll.docs.values()))
+    assert len(doc["content_hash"]) == 40 and doc["title"] == "新闻1"
+
+
+def test_duplicate_key_errors_count_as_existing_and_failures_retry():
+    from app.services.news_data_service import news_content_hash
+
+    svc = _service(None)
+    calls = []
+
+    class _Coll:
+        async def bulk_write(self, operations, ordered=True):
+            calls.append(len(operations))
+            raise BulkWriteError({"nUpserted": 1, "writeErrors": [
+                {"index": 1, "code": 11000, "errmsg": "E11000 duplicate key"},
+                {"index": 2, "code": 121, "errmsg": "Document failed validation"},
+            ]})
+
+    svc._collection = _Coll()
+    saved = asyncio.run(svc.save_news_data([_news(1), _news(2), _news(3)], "tushare"))
+    assert saved == 1
+    assert svc._is_recent(news_content_hash(_news(2)))
+    assert not svc._is_recent(news_content_hash(_news(3)))
+    assert news_content_hash(_news(1)) == news_content_hash(dict(_news(1), content="x"))
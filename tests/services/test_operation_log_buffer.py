@@ -0,0 +1,81 @@
+import asyncio
+
+
+class _FakeCollection:
+    def __init__(self, delay=0.0):
+        self.delay = delay
+        self.batches = []
+
+    async def insert_many(self, docs, ordered=True):
+        await asyncio.sleep(self.delay)
+        self.batches.append(list(docs))
+
+
+def test_buffer_batches_by_size_and_time_and_drops_when_full():
+    from app.services.operation_log_buffer import OperationLogBuffer
+
+    coll = _FakeCollection()
+    buf = OperationLogBuffer(max_size=5, batch_size=3, flush_interval=0.05, writer=coll.insert_many)
+
+    async def _run():
+        buf.start()
+        for i in range(4):
+            assert buf.submit({"i": i})
+        await asyncio.sleep(0.01)
+        # 满 3 条立即写入，剩余 1 条等到时间阈值
+        assert [len(b) for b in coll.batches] == [3]
+        await asyncio.sleep(0.1)
+        assert [len(b) for b in coll.batches] == [3, 1]
+
+        # 写入阻塞时队列满则丢弃
+        coll.delay = 0.2
+        results = [buf.submit({"i": i}) for i in range(10)]
+        assert results.count(False) == 5
+        await buf.stop()
+
+    asyncio.run(_run())
+    stats = buf.stats()
+    assert stats["written"] == 9 and stats["dropped"] == 5 and stats["queued"] == 0
+    assert sum(len(b) for b in coll.batches) == 9
+
+
+def test_middleware_enqueues_without_db_io_and_shutdown_flushes(monkeypatch):
+    from fastapi import FastAPI
+    from fastapi.testclient import TestClient
+
+    from app.middleware import operation_log_middleware as mw
+    from app.services import operation_log_buffer as olb
+    from app.services import operation_log_service as ols
+
+    coll = _FakeCollection()
+    buf = olb.OperationLogBuffer(batch_size=100, flush_interval=60, writer=coll.insert_many)
+    monkeypatch.setattr(olb, "_operation_log_buffer", buf)
+    monkeypatch.setattr(ols, "get_mongo_db", lambda: (_ for _ in ()).throw(AssertionError("db io")))
+
+    async def _user(self, request):
+        return {"id": "u1", "username": "alice"}
+
+    monkeypatch.setattr(mw.OperationLogMiddleware, "_get_user_info", _user)
+
+    app = FastAPI()
+
+    @app.on_event("shutdown")
+    async def _shutdown():
+        await buf.stop()
+
+    app.add_middleware(mw.OperationLogMiddleware)
+
+    @app.post("/api/analysis/single")
+    async def _analyze():
+        return {"ok": True}
+
+    with TestClient(app) as client:
+        for _ in range(3):
+            assert client.post("/api/analysis/single").status_code == 200
+        assert coll.batches == []
+        assert buf.stats()["queued"] == 3
+
+    docs = coll.batches[0]
+    assert len(docs) == 3
+    assert docs[0]["username"] == "alice" and docs[0]["details"]["status_code"] == 200
+    assert docs[0]["timestamp"].tzinfo is None
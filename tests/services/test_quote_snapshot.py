@@ -0,0 +1,52 @@
+import asyncio
+from typing import Any, Dict, List
+
+
+def test_snapshot_indexes_codes_and_drops_missing_fields():
+    from app.services.quote_snapshot import QuoteSnapshot
+
+    snap = QuoteSnapshot.from_docs([
+        {"code": "1", "close": 10.5, "pct_chg": 1.2, "trade_date": "20250102"},
+        {"code": "600000", "close": "9.9", "amount": None},
+        {"close": 1.0},  # 无代码，忽略
+    ])
+    assert len(snap) == 2
+    assert "000001" in snap
+    assert snap.get("000001") == {"code": "000001", "close": 10.5, "pct_chg": 1.2, "trade_date": "20250102"}
+    assert snap.get("600000") == {"code": "600000", "close": 9.9}
+    assert snap.get("300750") is None
+    assert snap.column("close").tolist() == [10.5, 9.9]
+
+
+def test_snapshot_cache_loads_once_per_update(monkeypatch):
+    import app.services.quote_snapshot as qs_mod
+
+    calls: List[int] = []
+
+    class _FakeCursor:
+        async def to_list(self, length=None):
+            calls.append(1)
+            return [{"code": "000001", "close": 10.0}, {"code": "600000", "close": 9.0}]
+
+    class _FakeDB:
+        def __getitem__(self, name: str):
+            class _Coll:
+                def find(self, query, projection=None):
+                    return _FakeCursor()
+            return _Coll()
+
+    monkeypatch.setattr(qs_mod, "get_mongo_db", lambda: _FakeDB(), raising=True)
+
+    async def _run():
+        cache = qs_mod.QuoteSnapshotCache()
+        first = await cache.get_quotes(["000001", "300750"])
+        second = await cache.get_quote("600000")
+        assert first == {"000001": {"code": "000001", "close": 10.0}}
+        assert second == {"code": "600000", "close": 9.0}
+        assert len(calls) == 1
+
+        cache.invalidate()
+        await cache.get_quote("000001")
+        assert len(calls) == 2
+
+    asyncio.run(_run())
@@ -34,13 +34,14 @@ def test_enhanced_screening_enriches_from_db(monkeypatch):
         {"code": "600000", "close": 9.9, "pct_chg": -0.5, "amount": 8.76e7},
     ]
 
-    # Patch get_mongo_db used inside enhanced_screening_service module
-    import app.services.enhanced_screening_service as ess_mod
+    # Patch get_mongo_db used by the in-process quote snapshot, starting from an empty cache
+    import app.services.quote_snapshot as qs_mod
 
     def _fake_get_mongo_db():
         return FakeDB(quotes_docs)
 
-    monkeypatch.setattr(ess_mod, "get_mongo_db", _fake_get_mongo_db, raising=True)
+    monkeypatch.setattr(qs_mod, "get_mongo_db", _fake_get_mongo_db, raising=True)
+    monkeypatch.setattr(qs_mod, "_quote_snapshot_cache", None, raising=True)
 
     # Patch condition analysis to force DB path
     def _fake_analyze(_self, _conditions):
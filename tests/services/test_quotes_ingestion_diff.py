@@ -0,0 +1,61 @@
+import asyncio
+from typing import Any, List
+
+
+def _install_fake_db(monkeypatch, written: List[List[str]]):
+    import app.services.quotes_ingestion_service as qis_mod
+
+    class _FakeResult:
+        matched_count = 0
+        modified_count = 0
+        upserted_ids = {}
+
+    class _FakeColl:
+        async def bulk_write(self, ops, ordered=False):
+            written.append([op._filter["code"] for op in ops])
+            return _FakeResult()
+
+    class _FakeDB:
+        def __getitem__(self, name: str):
+            return _FakeColl()
+
+    async def _noop(*_args, **_kwargs):
+        return None
+
+    monkeypatch.setattr(qis_mod, "get_mongo_db", lambda: _FakeDB(), raising=True)
+    monkeypatch.setattr(qis_mod, "refresh_stock_screening", _noop, raising=True)
+    monkeypatch.setattr(qis_mod, "publish_quotes_updated", _noop, raising=True)
+
+
+def test_bulk_upsert_writes_only_changed_rows(monkeypatch):
+    from app.services.quotes_ingestion_service import QuotesIngestionService
+
+    written: List[List[str]] = []
+    _install_fake_db(monkeypatch, written)
+
+    first = {
+        "000001": {"close": 10.0, "pct_chg": 0.1, "amount": 1.0e8, "volume": None},
+        "sh600000": {"close": 9.0, "pct_chg": -0.3, "amount": 7.5e7, "volume": 1000},
+        "300750": {"close": 200.0, "pct_chg": 1.5, "amount": 3.0e9, "volume": 5000},
+    }
+    second = {
+        "000001": {"close": 10.0, "pct_chg": 0.1, "amount": 1.0e8, "volume": None},  # 未变化（含 None）
+        "600000": {"close": 9.1, "pct_chg": 0.8, "amount": 7.9e7, "volume": 1200},   # 变化
+        "300750": {"close": 200.0, "pct_chg": 1.5, "amount": 3.0e9, "volume": 5000},  # 未变化
+        "688981": {"close": 50.0, "pct_chg": 0.0, "amount": 1.0e8, "volume": 300},    # 新代码
+    }
+
+    async def _run():
+        svc = QuotesIngestionService()
+        await svc._bulk_upsert(first, "20250102", "fake")
+        await svc._bulk_upsert(second, "20250102", "fake")
+        await svc._bulk_upsert(second, "20250102", "fake")  # 完全无变化，不写库
+        await svc._bulk_upsert(second, "20250103", "fake")  # 交易日变化，全部重写
+
+    asyncio.run(_run())
+
+    assert written == [
+        ["000001", "300750", "600000"],
+        ["600000", "688981"],
+        ["000001", "300750", "600000", "688981"],
+    ]
@@ -0,0 +1,74 @@
+import asyncio
+import os
+import time
+
+
+def _make_service(tmp_path, max_bytes=1024 * 1024):
+    from app.services.report_render_service import RenderedReportCache, ReportRenderService
+
+    svc = ReportRenderService(RenderedReportCache(str(tmp_path), max_bytes))
+    calls = []
+
+    async def _fake_render(fmt, md_content):
+        calls.append(fmt)
+        await asyncio.sleep(0.05)
+        return f"{fmt}:{len(md_content)}".encode("utf-8")
+
+    svc._run_render = _fake_render
+    return svc, calls
+
+
+def test_concurrent_downloads_share_one_render_and_hit_disk_cache(tmp_path):
+    svc, calls = _make_service(tmp_path)
+    doc = {"stock_symbol": "000001", "analysis_date": "2025-01-02", "reports": {"market_report": "内容"}}
+
+    async def _run():
+        first = await asyncio.gather(*(svc.render("pdf", doc) for _ in range(5)))
+        again = await svc.render("pdf", doc)
+        docx = await svc.render("docx", doc)
+        return first, again, docx
+
+    first, again, docx = asyncio.run(_run())
+
+    assert len(set(first)) == 1 and again == first[0]
+    assert calls == ["pdf", "docx"]
+    assert svc.stats == {"hits": 1, "renders": 2, "shared": 4}
+
+    # 新实例（如进程重启）直接命中磁盘缓存
+    svc2, calls2 = _make_service(tmp_path)
+    assert asyncio.run(svc2.render("pdf", doc)) == first[0]
+    assert calls2 == []
+
+
+def test_render_failure_propagates_to_all_waiters(tmp_path):
+    svc, _ = _make_service(tmp_path)
+
+    async def _boom(fmt, md_content):
+        await asyncio.sleep(0.02)
+        raise RuntimeError("wkhtmltopdf missing")
+
+    svc._run_render = _boom
+
+    async def _run():
+        return await asyncio.gather(*(svc.render("pdf", {"reports": {}}) for _ in range(3)), return_exceptions=True)
+
+    results = asyncio.run(_run())
+    assert all(isinstance(r, RuntimeError) for r in results)
+    assert svc._inflight == {}
+
+
+def test_disk_cache_evicts_least_recently_used(tmp_path):
+    from app.services.report_render_service import RenderedReportCache
+
+    cache = RenderedReportCache(str(tmp_path), max_bytes=250)
+    cache.put("aa1", b"x" * 100)
+    cache.put("bb2", b"y" * 100)
+    # 让 aa1 的访问时间早于 bb2
+    old = time.time() - 60
+    os.utime(cache._path("aa1"), (old, old))
+
+    cache.put("cc3", b"z" * 100)
+
+    assert cache.get("aa1") is None
+    assert cache.get("bb2") == b"y" * 100
+    assert cache.get("cc3") == b"z" * 100
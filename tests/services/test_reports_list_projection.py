@@ -0,0 +1,203 @@
+import asyncio
+from datetime import datetime
+from typing import Any, Dict, List
+
+
+class _FakeCursor:
+    def __init__(self, docs: List[Dict[str, Any]]):
+        self.docs = docs
+
+    def sort(self, *args, **kwargs):
+        return self
+
+    def skip(self, n):
+        return self
+
+    def limit(self, n):
+        return self
+
+    async def to_list(self, length=None):
+        return self.docs
+
+    def __aiter__(self):
+        async def _gen():
+            for doc in self.docs:
+                yield doc
+        return _gen()
+
+
+class _FakeReports:
+    def __init__(self, docs: List[Dict[str, Any]]):
+        self.docs = docs
+        self.finds: List[Any] = []
+        self.updates: List[Any] = []
+        self.counts: List[Any] = []
+
+    async def count_documents(self, query, limit=None):
+        self.counts.append((query, limit))
+        return len(self.docs)
+
+    async def estimated_document_count(self):
+        self.counts.append(("estimated", None))
+        return len(self.docs)
+
+    def find(self, query, projection=None):
+        self.finds.append((query, projection))
+        if projection == {"reports": 1}:
+            ids = query["_id"]["$in"]
+            return _FakeCursor([{"_id": d["_id"], "reports": d["reports"]} for d in self.docs if d["_id"] in ids])
+        return _FakeCursor([{k: v for k, v in d.items() if k in projection or k == "_id"} for d in self.docs])
+
+    async def update_one(self, query, update):
+        self.updates.append((query, update))
+
+
+class _FakeDB:
+    def __init__(self, coll):
+        self.analysis_reports = coll
+
+
+def _list(reports_mod, **kwargs):
+    params = dict(
+        page=1, page_size=20, search_keyword=None, market_filter=None, start_date=None,
+        end_date=None, stock_code=None, cursor=None, count_mode="estimated", user={"id": "u1"},
+    )
+    params.update(kwargs)
+    return reports_mod.get_reports_list(**params)
+
+
+def test_reports_list_uses_projection_and_precomputed_fields(monkeypatch):
+    import app.routers.reports as reports_mod
+
+    now = datetime(2025, 1, 2, 8, 0, 0)
+    coll = _FakeReports([
+        {"_id": 1, "stock_symbol": "000001", "stock_name": "平安银行", "market_type": "A股",
+         "size_bytes": 1234, "created_at": now, "reports": {"market_report": "x" * 10_000}},
+        {"_id": 2, "stock_symbol": "AAPL", "created_at": now, "reports": {"market_report": "报告"}},
+    ])
+    monkeypatch.setattr(reports_mod, "get_mongo_db", lambda: _FakeDB(coll))
+    monkeypatch.setattr(reports_mod, "get_stock_name", lambda code: f"name-{code}")
+
+    resp = asyncio.run(_list(reports_mod))
+
+    # 列表查询不读取报告内容
+    _, projection = coll.finds[0]
+    assert "reports" not in projection and projection["size_bytes"] == 1
+
+    rows = resp["data"]["reports"]
+    assert rows[0]["file_size"] == 1234 and rows[0]["stock_name"] == "平安银行"
+
+    # 旧文档：补齐字段并回写
+    assert rows[1]["stock_name"] == "name-AAPL"
+    assert rows[1]["market_type"] == "美股"
+    assert rows[1]["file_size"] == len('{"market_report": "报告"}'.encode("utf-8"))
+    assert coll.updates == [({"_id": 2}, {"$set": {
+        "size_bytes": rows[1]["file_size"], "stock_name": "name-AAPL", "market_type": "美股",
+    }})]
+
+
+def test_search_text_tokenization():
+    from app.utils.report_fields import build_search_filter, build_search_text
+
+    text = build_search_text({"stock_symbol": "000001", "stock_name": "平安银行", "summary": "建议买入"}).split()
+    assert {"000001", "0000", "平安", "安银", "银行", "平", "买入"} <= set(text)
+
+    assert build_search_filter("平安银 0000") == {"$text": {"$search": '"平安" "安银" "0000"'}}
+    assert build_search_filter("  ") is None
+
+
+def test_search_matches_code_fragments_and_single_characters():
+    from app.utils.report_fields import build_search_filter, build_search_text
+
+    text = set(build_search_text({"stock_symbol": "600519", "stock_name": "贵州茅台"}).split())
+    # 代码中间的片段也能命中（与原来的子串匹配一致）
+    assert {"0519", "519", "60", "600519"} <= text
+    assert "5" not in text
+    assert build_search_filter("0519") == {"$text": {"$search": '"0519"'}}
+
+    # 单个英文/数字字符回退为正则匹配
+    assert build_search_filter(" 5 ") == {"$or": [
+        {field: {"$regex": "5", "$options": "i"}}
+        for field in ("stock_symbol", "stock_name", "analysis_id", "summary")
+    ]}
+    assert build_search_filter("茅") == {"$text": {"$search": '"茅"'}}
+
+
+def test_reports_list_search_cursor_and_count(monkeypatch):
+    import app.routers.reports as reports_mod
+    from app.utils.report_fields import decode_report_cursor
+
+    now = datetime(2025, 1, 2, 8, 0, 0)
+    coll = _FakeReports([
+        {"_id": i, "stock_symbol": "000001", "stock_name": "平安银行", "market_type": "A股",
+         "size_bytes": 1, "created_at": now}
+        for i in (3, 2)
+    ])
+    monkeypatch.setattr(reports_mod, "get_mongo_db", lambda: _FakeDB(coll))
+
+    resp = asyncio.run(_list(reports_mod, page_size=2, search_keyword="平安"))
+    query, _ = coll.finds[0]
+    assert query == {"$text": {"$search": '"平安"'}}
+    # 有筛选条件：有上限的统计
+    assert coll.counts == [(query, reports_mod.REPORT_COUNT_LIMIT)]
+    assert resp["data"]["total_estimated"] is False
+
+    next_cursor = resp["data"]["next_cursor"]
+    assert decode_report_cursor(next_cursor) == {"$or": [
+        {"created_at": {"$lt": now}},
+        {"created_at": now, "_id": {"$lt": "2"}},
+    ]}
+
+    coll.finds.clear()
+    coll.counts.clear()
+    asyncio.run(_list(reports_mod, page_size=2, cursor=next_cursor))
+    query, _ = coll.finds[0]
+    assert query == decode_report_cursor(next_cursor)
+    # 无筛选条件：读取集合元数据
+    assert coll.counts == [("estimated", None)]
+
+
+def test_cursor_page_keeps_single_character_search_filter(monkeypatch):
+    import app.routers.reports as reports_mod
+    from app.utils.report_fields import build_search_filter, decode_report_cursor
+
+    now = datetime(2025, 1, 2, 8, 0, 0)
+    coll = _FakeReports([
+        {"_id": i, "stock_symbol": "600519", "stock_name": "贵州茅台", "market_type": "A股",
+         "size_bytes": 1, "created_at": now}
+        for i in (3, 2)
+    ])
+    monkeypatch.setattr(reports_mod, "get_mongo_db", lambda: _FakeDB(coll))
+
+    resp = asyncio.run(_list(reports_mod, page_size=2, search_keyword="5"))
+    search_filter = build_search_filter("5")
+    assert "$or" in search_filter and coll.finds[0][0] == search_filter
+
+    next_cursor = resp["data"]["next_cursor"]
+    coll.finds.clear()
+    asyncio.run(_list(reports_mod, page_size=2, search_keyword="5", cursor=next_cursor))
+    query, _ = coll.finds[0]
+    # 第二页同时保留搜索条件和游标条件
+    assert query == {"$and": [search_filter, decode_report_cursor(next_cursor)]}
+
+
+def test_backfill_search_text_only_touches_missing_docs():
+    from app.utils.report_fields import build_search_text, backfill_search_text
+
+    docs = [{"_id": i, "stock_symbol": f"60051{i}", "stock_name": "贵州茅台"} for i in range(3)]
+    writes = []
+
+    class _Coll:
+        def find(self, query, projection=None):
+            assert query == {"search_text": {"$exists": False}}
+            return _FakeCursor(docs)
+
+        async def bulk_write(self, ops, ordered=True):
+            writes.append([(op._filter, op._doc) for op in ops])
+            return type("R", (), {"modified_count": len(ops)})()
+
+    assert asyncio.run(backfill_search_text(_Coll(), batch_size=2)) == 3
+    assert [len(batch) for batch in writes] == [2, 1]
+    flt, update = writes[0][0]
+    assert flt == {"_id": 0, "search_text": {"$exists": False}}
+    assert update == {"$set": {"search_text": build_search_text(docs[0])}}
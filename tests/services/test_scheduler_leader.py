@@ -0,0 +1,194 @@
+import asyncio
+import json
+import time
+
+
+class _FakeRedis:
+    """只实现 Leader 锁和命令队列用到的命令（PX 过期用单调时钟模拟）"""
+
+    def __init__(self):
+        self.data = {}
+        self.expires = {}
+        self.lists = {}
+
+    def _alive(self, key):
+        exp = self.expires.get(key)
+        if exp is not None and time.monotonic() >= exp:
+            self.data.pop(key, None)
+            self.expires.pop(key, None)
+        return key in self.data
+
+    async def set(self, key, value, nx=False, px=None):
+        if nx and self._alive(key):
+            return None
+        self.data[key] = value
+        if px:
+            self.expires[key] = time.monotonic() + px / 1000
+        return True
+
+    async def get(self, key):
+        return self.data.get(key) if self._alive(key) else None
+
+    async def eval(self, script, numkeys, key, owner, *args):
+        if not self._alive(key) or self.data[key] != owner:
+            return 0
+        if "PEXPIRE" in script:
+            self.expires[key] = time.monotonic() + int(args[0]) / 1000
+        else:
+            self.data.pop(key)
+            self.expires.pop(key, None)
+        return 1
+
+    async def rpush(self, key, value):
+        self.lists.setdefault(key, []).append(value)
+
+    async def lpop(self, key):
+        items = self.lists.get(key)
+        return items.pop(0) if items else None
+
+
+def test_only_one_instance_becomes_leader_and_failover_after_ttl():
+    from app.core.leader_election import RedisLeaderLock
+
+    redis = _FakeRedis()
+    a = RedisLeaderLock(redis, "scheduler:leader", ttl_seconds=0.05, instance_id="a")
+    b = RedisLeaderLock(redis, "scheduler:leader", ttl_seconds=0.05, instance_id="b")
+
+    async def _run():
+        assert await a.try_acquire() is True
+        assert await b.try_acquire() is False
+        assert await a.renew() is True
+        assert await b.renew() is False
+
+        # a 卡住没有续约：锁过期后 b 接管，a 的续约失败
+        await asyncio.sleep(0.08)
+        assert await b.try_acquire() is True
+        assert await a.renew() is False
+        assert await redis.get("scheduler:leader") == "b"
+
+        # 非持有者释放不影响当前 Leader
+        await a.release()
+        assert await b.current_leader() == "b"
+
+    asyncio.run(_run())
+
+
+def test_runner_starts_scheduler_only_on_leader_and_steps_down(monkeypatch):
+    import app.services.scheduler_service as svc_mod
+    from app.scheduler_runner import SchedulerRunner
+
+    published = []
+    applied = []
+
+    class _FakeService:
+        async def publish_job_states(self, leader_id=None):
+            published.append(leader_id)
+
+        async def apply_command(self, command):
+            applied.append((command["action"], command["job_id"]))
+            return True
+
+    monkeypatch.setattr(svc_mod, "get_scheduler_service", lambda: _FakeService())
+    monkeypatch.setattr(svc_mod, "set_scheduler_instance", lambda scheduler: None)
+
+    registered = []
+
+    async def _register(scheduler):
+        registered.append(scheduler)
+
+    redis = _FakeRedis()
+
+    async def _run():
+        r1 = SchedulerRunner(redis=redis, ttl_seconds=30, publish_interval=60, register_jobs=_register)
+        r2 = SchedulerRunner(redis=redis, ttl_seconds=30, publish_interval=60, register_jobs=_register)
+        await r1.tick()
+        await r2.tick()
+        assert r1.is_leader and not r2.is_leader
+        assert len(registered) == 1
+
+        # 没有命令时按发布间隔发布，不在每一轮重写任务状态
+        published_count = len(published)
+        await r1.tick()
+        assert len(published) == published_count
+
+        # 其他副本转发的命令由 Leader 执行，执行后立即发布
+        await redis.rpush(svc_mod.SCHEDULER_COMMANDS_KEY, json.dumps({"action": "pause", "job_id": "news_sync"}))
+        await r1.tick()
+        assert applied == [("pause", "news_sync")]
+        assert len(published) == published_count + 1
+        assert set(published) == {r1.lock.instance_id}
+
+        # 锁被他人接管（如 r1 长时间卡顿）：r1 续约失败后停止调度器，r2 当选
+        redis.data["scheduler:leader"] = "someone-else"
+        await r1.tick()
+        assert not r1.is_leader
+        redis.data.clear()
+        await r2.tick()
+        assert r2.is_leader and len(registered) == 2
+
+        await r2._stop_scheduler()
+
+    asyncio.run(_run())
+
+
+def test_remote_service_forwards_commands_to_leader(monkeypatch):
+    import app.core.database as db_mod
+    import app.services.scheduler_service as svc_mod
+
+    redis = _FakeRedis()
+    monkeypatch.setattr(db_mod, "get_redis_client", lambda: redis)
+    monkeypatch.setattr(svc_mod, "_scheduler_instance", None)
+    monkeypatch.setattr(svc_mod, "_remote_scheduler_service", None)
+
+    service = svc_mod.get_scheduler_service()
+    assert isinstance(service, svc_mod.RemoteSchedulerService)
+
+    known = {"news_sync"}
+
+    async def _job_exists(job_id):
+        return job_id in known
+
+    monkeypatch.setattr(service, "_job_exists", _job_exists)
+
+    async def _run():
+        assert await service.trigger_job("news_sync", {"force": True}) is True
+        assert await service.pause_job("missing") is False
+
+    asyncio.run(_run())
+
+    queued = [json.loads(x) for x in redis.lists[svc_mod.SCHEDULER_COMMANDS_KEY]]
+    assert [(c["action"], c["job_id"], c["kwargs"]) for c in queued] == [("trigger", "news_sync", {"force": True})]
+
+
+def test_standalone_main_applies_runtime_config(monkeypatch):
+    import app.core.config_bridge as config_bridge
+    import app.core.database as database
+    import app.core.logging_config as logging_config
+    import app.scheduler_runner as runner_mod
+
+    calls = []
+
+    async def _fake_apply(logger_names=()):
+        calls.append(("apply", tuple(logger_names)))
+
+    async def _fake_init_db():
+        calls.append(("init_db",))
+
+    async def _fake_close_db():
+        calls.append(("close_db",))
+
+    async def _fake_run(self):
+        calls.append(("run",))
+
+    monkeypatch.setattr(config_bridge, "apply_runtime_config", _fake_apply)
+    monkeypatch.setattr(database, "init_db", _fake_init_db)
+    monkeypatch.setattr(database, "close_db", _fake_close_db)
+    monkeypatch.setattr(runner_mod.SchedulerRunner, "run", _fake_run)
+    monkeypatch.setattr(runner_mod, "RedisLeaderLock", lambda *a, **k: object())
+    monkeypatch.setattr(database, "get_redis_client", lambda: object())
+    monkeypatch.setattr(logging_config, "setup_logging", lambda *a, **k: None)
+
+    asyncio.run(runner_mod.main())
+    # 与 API lifespan 一致：数据库初始化后桥接配置并应用动态设置，再运行调度器
+    assert [c[0] for c in calls] == ["init_db", "apply", "run", "close_db"]
+    assert "app.scheduler" in calls[1][1]
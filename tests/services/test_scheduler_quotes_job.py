@@ -1,18 +1,14 @@
-import inspect
+import asyncio
 from types import SimpleNamespace
 
 from apscheduler.triggers.interval import IntervalTrigger
-from fastapi import FastAPI
 
 
 def test_scheduler_adds_quotes_job(monkeypatch):
     # Flags to assert behavior
-    state = SimpleNamespace(
-        ensure_indexes_called=False,
-        create_task_called=False,
-    )
+    state = SimpleNamespace(ensure_indexes_called=False)
 
-    # Fake QuotesIngestionService used by app.main during startup
+    # Fake QuotesIngestionService used by register_sync_jobs
     class _FakeQuotesIngestion:
         async def ensure_indexes(self):
             state.ensure_indexes_called = True
@@ -21,78 +17,50 @@ def test_scheduler_adds_quotes_job(monkeypatch):
             # simple async no-op
             return None
 
+    class _FakeMultiSourceService:
+        async def run_full_sync(self, force: bool = False, preferred_sources=None):
+            return None
+
     # Capture added jobs from scheduler
     class _FakeScheduler:
         def __init__(self):
             self.jobs = []
+            self.paused = []
 
         def add_job(self, func, trigger, *args, **kwargs):
             # record and keep a handle to the callable and trigger
             self.jobs.append({"func": func, "trigger": trigger, "args": args, "kwargs": kwargs})
 
-        def start(self):
-            # no-op in tests
-            return None
+        def pause_job(self, job_id):
+            self.paused.append(job_id)
 
-        def shutdown(self, wait=False):
-            return None
+    import app.services.scheduler_jobs as jobs_mod
 
-    # Patch scheduler and service in app.main before startup runs
-    import app.main as main_mod
+    monkeypatch.setattr(jobs_mod, "QuotesIngestionService", _FakeQuotesIngestion, raising=True)
+    monkeypatch.setattr(jobs_mod, "MultiSourceBasicsSyncService", _FakeMultiSourceService, raising=True)
+    monkeypatch.setattr(jobs_mod.settings, "QUOTES_INGEST_ENABLED", True)
 
     fake_scheduler = _FakeScheduler()
 
-    def _fake_asyncio_create_task(coro):
-        # We don't need a running loop; just record and close the coroutine to avoid warnings
-        state.create_task_called = True
-        assert inspect.iscoroutine(coro)
-        try:
-            coro.close()
-        except Exception:
-            pass
-        return None
-
-    # Patch blocking init/close DB and basic sync service
-    async def _noop_async(*args, **kwargs):
-        return None
-
-    class _FakeBasicsService:
-        async def run_full_sync(self, force: bool = False):
-            return None
-
-    monkeypatch.setattr(main_mod, "init_db", _noop_async, raising=True)
-    monkeypatch.setattr(main_mod, "close_db", _noop_async, raising=True)
-    monkeypatch.setattr(main_mod, "get_basics_sync_service", lambda: _FakeBasicsService(), raising=True)
-
-    # Patch scheduler, quotes service and asyncio.create_task
-    monkeypatch.setattr(main_mod, "AsyncIOScheduler", lambda *args, **kwargs: fake_scheduler, raising=True)
-    monkeypatch.setattr(main_mod, "QuotesIngestionService", _FakeQuotesIngestion, raising=True)
-    monkeypatch.setattr(main_mod.asyncio, "create_task", _fake_asyncio_create_task, raising=True)
-
-    # Directly drive the lifespan to avoid importing full router stack
-    import asyncio as _asyncio
-
     async def _run():
-        async with main_mod.lifespan(FastAPI()):
-            return
+        await jobs_mod.register_sync_jobs(fake_scheduler)
+        # 让启动时的基础信息同步任务跑完
+        await asyncio.sleep(0)
 
-    _asyncio.run(_run())
+    asyncio.run(_run())
 
     # Assert a job with IntervalTrigger was scheduled
-    assert fake_scheduler.jobs, "No jobs scheduled for quotes ingestion"
     job = None
     for j in fake_scheduler.jobs:
-        if isinstance(j["trigger"], IntervalTrigger):
+        if j["kwargs"].get("id") == "quotes_ingestion_service":
             job = j
             break
-    assert job is not None, "Quotes ingestion IntervalTrigger job not found"
+    assert job is not None, "Quotes ingestion job not found"
+    assert isinstance(job["trigger"], IntervalTrigger)
 
-    # Ensure ensure_indexes called during startup
+    # Ensure ensure_indexes called during registration
     assert state.ensure_indexes_called is True
 
-    # Simulate scheduler tick by invoking the stored func
-    job_func = job["func"]
-    job_func()  # should call asyncio.create_task(...) with our fake
-
-    assert state.create_task_called is True
-
+    # The scheduled callable is the coroutine function AsyncIOScheduler awaits
+    assert asyncio.iscoroutinefunction(job["func"])
+    assert asyncio.run(job["func"]()) is None
@@ -0,0 +1,30 @@
+import asyncio
+
+
+def test_quote_conditions_merge_into_single_range_predicate():
+    from app.services.database_screening_service import DatabaseScreeningService
+
+    svc = DatabaseScreeningService()
+
+    async def _run():
+        query = await svc._build_query([
+            {"field": "pct_chg", "operator": ">", "value": 1},
+            {"field": "pct_chg", "operator": "<", "value": 5},
+            {"field": "amount", "operator": "between", "value": [1e7, 1e9]},
+            {"field": "close", "operator": "between", "value": [1]},  # 非法 between，忽略
+        ])
+        assert query == {
+            "pct_chg": {"$gt": 1, "$lt": 5},
+            "amount": {"$gte": 1e7, "$lte": 1e9},
+        }
+
+    asyncio.run(_run())
+
+
+def test_sort_conditions_have_stable_tiebreaker():
+    from app.services.database_screening_service import DatabaseScreeningService
+
+    svc = DatabaseScreeningService()
+    assert svc._build_sort_conditions(None) == [("total_mv", -1), ("code", 1)]
+    assert svc._build_sort_conditions([{"field": "pct_chg", "direction": "asc"}]) == [("pct_chg", 1), ("code", 1)]
+    assert svc._build_sort_conditions([{"field": "code", "direction": "desc"}]) == [("code", -1)]
@@ -41,7 +41,7 @@ def test_database_screening_formats_roe_in_result(monkeypatch):
             self._docs = docs
         async def count_documents(self, _query):
             return len(self._docs)
-        def find(self, _query):
+        def find(self, _query, _projection=None):
             return _FakeCursor(self._docs)
 
     class _FakeDB:
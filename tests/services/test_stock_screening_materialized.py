@@ -0,0 +1,101 @@
+import asyncio
+from typing import Any, Dict, List
+
+
+def test_screening_pipeline_full_and_incremental():
+    from app.core.database import build_stock_screening_pipeline, STOCK_SCREENING_COLLECTION
+
+    has_source = {"$exists": True, "$ne": None}
+    full = build_stock_screening_pipeline()
+    # 缺少 source 的文档不参与 $merge（否则整个刷新失败）
+    assert full[0] == {"$match": {"source": has_source}}
+    merge = full[-1]["$merge"]
+    assert merge["into"] == STOCK_SCREENING_COLLECTION
+    assert merge["on"] == ["code", "source"]
+
+    partial = build_stock_screening_pipeline(["000001", "600000"])
+    assert partial[0] == {"$match": {"source": has_source, "code": {"$in": ["000001", "600000"]}}}
+    assert partial[1:] == full[1:]
+
+
+def test_full_refresh_removes_stale_rows():
+    from app.core.database import refresh_stock_screening, STOCK_SCREENING_COLLECTION
+
+    calls = []
+
+    class _Cursor:
+        async def to_list(self, length=None):
+            return []
+
+    class _Collection:
+        def __init__(self, name):
+            self.name = name
+
+        def aggregate(self, pipeline):
+            calls.append(("aggregate", self.name, pipeline))
+            return _Cursor()
+
+        async def delete_many(self, query):
+            calls.append(("delete_many", self.name, query))
+            return type("R", (), {"deleted_count": 2})()
+
+    class _DB:
+        def __getitem__(self, name):
+            return _Collection(name)
+
+    asyncio.run(refresh_stock_screening(db=_DB()))
+    (_, source, pipeline), (_, target, query) = calls
+    assert source == "stock_basic_info" and target == STOCK_SCREENING_COLLECTION
+    # 本次刷新写入的时间戳与清理条件一致（毫秒精度）
+    refreshed_at = pipeline[-2]["$project"]["materialized_at"]["$literal"]
+    assert refreshed_at.microsecond % 1000 == 0
+    assert query["$or"][0] == {"materialized_at": {"$lt": refreshed_at}}
+
+    calls.clear()
+    asyncio.run(refresh_stock_screening(["000001"], db=_DB()))
+    # 增量刷新不清理
+    assert [c[0] for c in calls] == ["aggregate"]
+
+
+def test_refresh_stock_screening_skips_empty_codes():
+    from app.core.database import refresh_stock_screening
+
+    class _FailDB:
+        def __getitem__(self, name: str):
+            raise AssertionError("should not touch the database")
+
+    asyncio.run(refresh_stock_screening([], db=_FailDB()))
+
+
+def test_quotes_bulk_upsert_refreshes_written_codes(monkeypatch):
+    from app.services.quotes_ingestion_service import QuotesIngestionService
+    import app.services.quotes_ingestion_service as qis_mod
+
+    class _FakeResult:
+        matched_count = 0
+        modified_count = 0
+        upserted_ids = {}
+
+    class _FakeColl:
+        async def bulk_write(self, ops, ordered=False):
+            return _FakeResult()
+
+    class _FakeDB:
+        def __getitem__(self, name: str):
+            return _FakeColl()
+
+    refreshed: List[Any] = []
+
+    async def _fake_refresh(codes=None, db=None):
+        refreshed.append(codes)
+
+    monkeypatch.setattr(qis_mod, "get_mongo_db", lambda: _FakeDB(), raising=True)
+    monkeypatch.setattr(qis_mod, "refresh_stock_screening", _fake_refresh, raising=True)
+
+    quotes: Dict[str, Dict[str, Any]] = {
+        "sz000001": {"close": 10.1, "pct_chg": 0.1, "amount": 1.0e8},
+        "600000": {"close": 9.8, "pct_chg": -0.3, "amount": 7.5e7},
+    }
+    asyncio.run(QuotesIngestionService()._bulk_upsert(quotes, "20250102", "fake"))
+
+    assert refreshed == [["000001", "600000"]]
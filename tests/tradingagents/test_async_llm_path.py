@@ -0,0 +1,142 @@
+import asyncio
+import threading
+from types import SimpleNamespace
+
+
+class _FakeLLM:
+    def __init__(self, fail_first=False):
+        self.sync_calls = []
+        self.async_calls = []
+        self.fail_first = fail_first
+
+    def invoke(self, prompt):
+        self.sync_calls.append(prompt)
+        return SimpleNamespace(content=f"sync:{len(self.sync_calls)}")
+
+    async def ainvoke(self, prompt):
+        self.async_calls.append(prompt)
+        if self.fail_first and len(self.async_calls) == 1:
+            raise RuntimeError("rate limited")
+        await asyncio.sleep(0)
+        return SimpleNamespace(content=f"async:{len(self.async_calls)}")
+
+
+def test_llm_node_runs_sync_and_async_with_retry():
+    from tradingagents.agents.utils.llm_node import create_llm_node
+
+    def steps(state):
+        for attempt in range(3):
+            try:
+                response = yield f"{state['q']} #{attempt}"
+                break
+            except RuntimeError:
+                continue
+        # 提示词前后的同步处理在工作线程中执行，不阻塞事件循环
+        return {"answer": response.content, "thread": threading.current_thread().name}
+
+    llm = _FakeLLM(fail_first=True)
+    node = create_llm_node(llm, steps)
+
+    assert node({"q": "hi"})["answer"] == "sync:1"
+
+    out = asyncio.run(node.ainvoke({"q": "hi"}))
+    assert out["answer"] == "async:2"
+    assert llm.async_calls == ["hi #0", "hi #1"]
+    assert out["thread"] != threading.main_thread().name
+    assert llm.sync_calls == ["hi #0"]
+
+
+def test_debate_node_awaits_llm_inside_langgraph():
+    from langgraph.graph import END, START, StateGraph
+    from typing_extensions import TypedDict
+
+    from tradingagents.agents.risk_mgmt.neutral_debator import create_neutral_debator
+
+    class _State(TypedDict, total=False):
+        market_report: str
+        sentiment_report: str
+        news_report: str
+        fundamentals_report: str
+        trader_investment_plan: str
+        risk_debate_state: dict
+
+    llm = _FakeLLM()
+    graph = StateGraph(_State)
+    graph.add_node("Neutral Analyst", create_neutral_debator(llm))
+    graph.add_edge(START, "Neutral Analyst")
+    graph.add_edge("Neutral Analyst", END)
+
+    state = {
+        "market_report": "m", "sentiment_report": "s", "news_report": "n", "fundamentals_report": "f",
+        "trader_investment_plan": "买入",
+        "risk_debate_state": {"history": "", "count": 0},
+    }
+    result = asyncio.run(graph.compile().ainvoke(state))
+    assert result["risk_debate_state"]["current_neutral_response"] == "Neutral Analyst: async:1"
+    assert llm.sync_calls == []
+
+
+def test_adapters_share_pooled_http_clients_and_track_async_calls(monkeypatch):
+    from langchain_core.messages import AIMessage, HumanMessage
+    from langchain_core.outputs import ChatGeneration, ChatResult
+    from langchain_openai import ChatOpenAI
+
+    from tradingagents.llm_adapters.http_pool import get_pool_stats
+    from tradingagents.llm_adapters.openai_compatible_base import ChatDeepSeekOpenAI, OpenAICompatibleBase
+
+    a = ChatDeepSeekOpenAI(model="deepseek-chat", api_key="sk-test-0123456789")
+    b = ChatDeepSeekOpenAI(model="deepseek-reasoner", api_key="sk-test-0123456789")
+    assert a.http_client is b.http_client
+    assert a.http_async_client is b.http_async_client
+    assert a.http_client._transport._pool._max_connections == 50
+    assert any(entry.startswith("deepseek|") for entry in get_pool_stats()["sync"])
+
+    async def _fake_agenerate(self, messages, stop=None, run_manager=None, **kwargs):
+        return ChatResult(generations=[ChatGeneration(message=AIMessage(content="ok"))])
+
+    tracked = []
+    monkeypatch.setattr(ChatOpenAI, "_agenerate", _fake_agenerate)
+    monkeypatch.setattr(OpenAICompatibleBase, "_track_token_usage", lambda self, *args: tracked.append(args))
+
+    assert asyncio.run(a.ainvoke([HumanMessage(content="hi")])).content == "ok"
+    assert len(tracked) == 1
+
+
+def test_async_http_client_reused_across_event_loops(monkeypatch):
+    from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+    from tradingagents.llm_adapters import http_pool
+
+    class _Handler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+
+        def do_GET(self):
+            self.send_response(200)
+            self.send_header("Content-Length", "2")
+            self.end_headers()
+            self.wfile.write(b"ok")
+
+        def log_message(self, *args):
+            pass
+
+    server = ThreadingHTTPServer(("127.0.0.1", 0), _Handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    monkeypatch.setattr(http_pool, "_async_clients", {})
+    try:
+        url = f"http://127.0.0.1:{server.server_port}/v1"
+        client = http_pool.get_async_http_client("loop-test", url)
+
+        async def _get():
+            return (await client.get(url)).text
+
+        # 每次 asyncio.run 都是新的事件循环；keep-alive 连接不能跨循环复用
+        assert [asyncio.run(_get()) for _ in range(3)] == ["ok"] * 3
+        results = []
+        worker = threading.Thread(target=lambda: results.append(asyncio.run(_get())))
+        worker.start()
+        worker.join()
+        assert results == ["ok"]
+        assert http_pool.get_async_http_client("loop-test", url) is client
+    finally:
+        server.shutdown()
+        server.server_close()
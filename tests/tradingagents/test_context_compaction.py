@@ -0,0 +1,92 @@
+from types import SimpleNamespace
+
+
+class _RecordingLLM:
+    def __init__(self):
+        self.prompts = []
+
+    def invoke(self, prompt):
+        self.prompts.append(prompt)
+        return SimpleNamespace(content=f"第{len(self.prompts)}轮论点。" + "理由展开" * 200)
+
+
+def _long_report(title):
+    lines = [f"# {title}"]
+    for i in range(300):
+        lines.append(f"第{i}段背景描述，没有关键数字的普通叙述文字用于填充篇幅" if i % 3 else f"指标{i}: 数值 {i * 1.5:.1f}")
+    lines.append("## 投资建议：持有，目标价 1800")
+    return "\n".join(lines)
+
+
+def _state():
+    return {
+        "company_of_interest": "600519",
+        "stock_identity": {
+            "ticker": "600519",
+            "company_name": "贵州茅台",
+            "market_info": {"is_china": True, "is_hk": False, "is_us": False, "market_name": "中国A股",
+                            "currency_name": "人民币", "currency_symbol": "¥"},
+        },
+        "market_report": _long_report("市场报告"),
+        "sentiment_report": "情绪偏中性",
+        "news_report": _long_report("新闻报告"),
+        "fundamentals_report": _long_report("基本面报告"),
+        "investment_debate_state": {"history": "", "bull_history": "", "bear_history": "",
+                                    "current_response": "", "count": 0},
+    }
+
+
+def test_debate_prompts_stay_within_budget_and_keep_latest_arguments():
+    from tradingagents.agents.researchers.bear_researcher import create_bear_researcher
+    from tradingagents.agents.researchers.bull_researcher import create_bull_researcher
+    from tradingagents.agents.utils.context_compaction import ContextCompactor, estimate_tokens
+
+    compactor = ContextCompactor.from_config({"context_compaction": {
+        "enabled": True, "report_budget_tokens": 400, "keep_recent_turns": 2, "node_budget_tokens": 3000,
+    }})
+    llm = _RecordingLLM()
+    bull, bear = create_bull_researcher(llm, None, compactor), create_bear_researcher(llm, None, compactor)
+
+    state = _state()
+    for _ in range(5):
+        for node in (bull, bear):
+            state["investment_debate_state"] = node(state)["investment_debate_state"]
+
+    full_history = state["investment_debate_state"]["history"]
+    last_prompt = llm.prompts[-1]
+    # 状态中仍是全文历史，提示词不随轮数增长
+    assert "第1轮论点" in full_history and estimate_tokens(None, full_history) > 4000
+    assert estimate_tokens(None, last_prompt) < 4500
+    assert abs(len(llm.prompts[-1]) - len(llm.prompts[4])) < len(llm.prompts[4]) * 0.3
+    # 最近的论点原文保留，报告中的结论行保留
+    assert "第9轮论点" in last_prompt and "理由展开" * 200 in last_prompt
+    assert "投资建议：持有，目标价 1800" in last_prompt
+    assert "报告已压缩" in last_prompt
+
+
+def test_disabled_compaction_and_history_rolling():
+    from tradingagents.agents.utils.context_compaction import ContextCompactor
+
+    assert ContextCompactor.from_config({"context_compaction": {"enabled": False}}) is None
+    assert ContextCompactor.from_config({}) is None
+
+    compactor = ContextCompactor(keep_recent_turns=2, summary_chars_per_turn=20, node_budget_tokens=60)
+    history = "\nRisky Analyst: 第一点。很长的解释" + "\nSafe Analyst: 第二点。" + "\nNeutral Analyst: 第三点。"
+    turns = compactor.compact_history(history)
+    assert turns == ["- Risky Analyst: 第一点。很长的解释", "Safe Analyst: 第二点。", "Neutral Analyst: 第三点。"]
+
+    long_history = "\nRisky Analyst: 第一点。" + "很长的解释" * 50 + "\nSafe Analyst: 第二点。" + "\nNeutral Analyst: 第三点。"
+    context = compactor.build_context(None, {"market_report": "短报告"}, long_history)
+    assert context["market_report"] == "短报告"
+    assert context["history"].startswith("（较早的发言要点）\n- Risky Analyst")
+
+
+def test_small_state_passes_through_unchanged():
+    from tradingagents.agents.utils.context_compaction import REPORT_FIELDS, ContextCompactor
+
+    # 默认配置下：单份报告超过报告预算，但整体未超出节点预算，报告和历史都不压缩
+    compactor = ContextCompactor()
+    state = {field: "# 标题\n" + "普通叙述文字" * 700 for field in REPORT_FIELDS}
+    history = "\n".join(f"{'Bull' if i % 2 else 'Bear'} Analyst: 第{i}轮论点。" for i in range(8))
+    context = compactor.build_context(None, state, history, fixed=("对方最后论点",))
+    assert context == {**state, "history": history}
@@ -0,0 +1,53 @@
+import subprocess
+import sys
+
+
+def _loaded_after(statement: str, modules):
+    code = (
+        "import sys\n"
+        f"{statement}\n"
+        f"print('LOADED=' + ','.join(m for m in {list(modules)!r} if m in sys.modules))"
+    )
+    out = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True, check=True)
+    return next(line for line in out.stdout.splitlines() if line.startswith("LOADED="))[len("LOADED="):]
+
+
+def test_provider_and_graph_packages_import_lazily():
+    heavy = ["tushare", "akshare", "baostock", "yfinance", "langchain_openai", "tradingagents.dataflows.interface"]
+    assert _loaded_after(
+        "import tradingagents.dataflows.providers, tradingagents.dataflows.providers.china, "
+        "tradingagents.graph, tradingagents.dataflows.cache.price_frames",
+        heavy,
+    ) == ""
+
+
+def test_lazy_exports_resolve_on_first_access():
+    import tradingagents.dataflows.providers.hk as hk
+    from tradingagents.utils import lazy_import
+
+    assert hk.HK_STOCK_AVAILABLE is True
+
+    # 子模块存在但名称不存在时与 `from x import y` 一致，视为不可用
+    import tradingagents.dataflows.providers.china as china
+    assert china.BaostockProvider is None and china.BAOSTOCK_AVAILABLE is False
+    assert hk.HKStockProvider.__name__ == "HKStockProvider"
+    assert "HKStockProvider" in dir(hk)
+
+    ns = {"__name__": "tradingagents.dataflows.providers"}
+    getattr_, _ = lazy_import.lazy_exports(ns, {"Missing": (".nope", "Missing", None)}, flags={"NOPE_AVAILABLE": "Missing"})
+    assert getattr_("Missing") is None and getattr_("NOPE_AVAILABLE") is False
+    assert ns["Missing"] is None
+
+
+def test_parse_importtime_report():
+    from app.core.import_profile import format_report, parse_importtime, summarize_by_package
+
+    records = parse_importtime([
+        "import time: self [us] | cumulative | imported package",
+        "import time:       100 |        100 |     pandas.core",
+        "import time:       400 |        500 |   pandas",
+        "import time:        50 |        550 | app.main",
+    ])
+    assert [(r.module, r.depth) for r in records] == [("pandas.core", 2), ("pandas", 1), ("app.main", 0)]
+    assert summarize_by_package(records) == [("pandas", 500), ("app", 50)]
+    assert "app.main" in format_report(records, "app.main", top=2)
@@ -0,0 +1,117 @@
+from langchain_core.messages import AIMessage, HumanMessage, SystemMessage
+from langchain_core.outputs import ChatGeneration, ChatResult
+
+
+def _patch_upstream(monkeypatch):
+    from langchain_openai import ChatOpenAI
+
+    calls = []
+
+    def _fake_generate(self, messages, stop=None, run_manager=None, **kwargs):
+        calls.append(kwargs)
+        message = AIMessage(
+            content=f"answer #{len(calls)}",
+            tool_calls=[{"name": "get_stock_market_data_unified", "args": {"ticker": "600519"}, "id": "call_1"}],
+        )
+        return ChatResult(
+            generations=[ChatGeneration(message=message, generation_info={"finish_reason": "tool_calls"})],
+            llm_output={"token_usage": {"prompt_tokens": 120, "completion_tokens": 30}, "model_name": "deepseek-chat"},
+        )
+
+    monkeypatch.setattr(ChatOpenAI, "_generate", _fake_generate)
+    return calls
+
+
+def _make_llm(temperature):
+    from tradingagents.llm_adapters.openai_compatible_base import ChatDeepSeekOpenAI
+
+    return ChatDeepSeekOpenAI(model="deepseek-chat", api_key="sk-test-0123456789", temperature=temperature)
+
+
+def _messages():
+    return [SystemMessage(content="你是市场分析师"), HumanMessage(content="分析 600519")]
+
+
+def test_disk_cache_replays_deterministic_calls_and_reports_hit_rate(monkeypatch, tmp_path):
+    from tradingagents.config.config_manager import token_tracker
+    from tradingagents.llm_adapters.response_cache import (
+        DiskResponseBackend,
+        LLMResponseCache,
+        set_llm_response_cache,
+    )
+
+    calls = _patch_upstream(monkeypatch)
+    cache = LLMResponseCache(DiskResponseBackend(str(tmp_path), max_bytes=1024 * 1024), ttl_seconds=60)
+    set_llm_response_cache(cache)
+    token_tracker.reset_cache_stats()
+    try:
+        llm = _make_llm(0)
+        first = llm.invoke(_messages())
+        # 消息 id 等运行时字段不影响缓存键
+        second = llm.invoke([SystemMessage(content="你是市场分析师", id="x"), HumanMessage(content="分析 600519", id="y")])
+        assert len(calls) == 1
+        assert second.content == first.content == "answer #1"
+        assert second.tool_calls[0]["args"] == {"ticker": "600519"}
+
+        # 工具不同视为不同请求
+        llm.bind_tools([{"type": "function", "function": {"name": "f", "parameters": {"type": "object"}}}]).invoke(_messages())
+        assert len(calls) == 2
+
+        stats = token_tracker.get_cache_stats()
+        assert (stats["hits"], stats["misses"]) == (1, 2)
+        assert stats["saved_input_tokens"] == 120 and stats["saved_output_tokens"] == 30
+        assert cache.stats["hits"] == 1
+    finally:
+        set_llm_response_cache(None)
+        token_tracker.reset_cache_stats()
+
+
+def test_non_zero_temperature_bypasses_unless_forced(monkeypatch, tmp_path):
+    from tradingagents.llm_adapters.response_cache import (
+        DiskResponseBackend,
+        LLMResponseCache,
+        set_llm_response_cache,
+    )
+
+    calls = _patch_upstream(monkeypatch)
+    backend = DiskResponseBackend(str(tmp_path), max_bytes=1024 * 1024)
+    try:
+        cache = LLMResponseCache(backend, ttl_seconds=60)
+        set_llm_response_cache(cache)
+        llm = _make_llm(0.7)
+        llm.invoke(_messages())
+        llm.invoke(_messages())
+        assert len(calls) == 2
+        assert cache.stats["bypassed"] == 2
+
+        set_llm_response_cache(LLMResponseCache(backend, ttl_seconds=60, force=True))
+        llm.invoke(_messages())
+        assert llm.invoke(_messages()).content == "answer #3"
+        assert len(calls) == 3
+
+        # 过期条目不再命中
+        set_llm_response_cache(LLMResponseCache(backend, ttl_seconds=0, force=True))
+        llm.invoke([HumanMessage(content="另一个问题")])
+        llm.invoke([HumanMessage(content="另一个问题")])
+        assert len(calls) == 5
+    finally:
+        set_llm_response_cache(None)
+
+
+def test_disk_backend_evicts_least_recently_used(tmp_path):
+    import os
+    import time
+
+    from tradingagents.llm_adapters.response_cache import DiskResponseBackend
+
+    backend = DiskResponseBackend(str(tmp_path), max_bytes=600)
+    payload = {"generations": [], "llm_output": {"text": "x" * 100}}
+    for i, key in enumerate(["aa01", "bb02", "cc03"]):
+        backend.put(key, payload, ttl_seconds=60)
+        # 明确的访问时间顺序
+        os.utime(backend._path(key), (time.time() - 100 + i, time.time() - 100 + i))
+    assert backend.get("aa01") is not None  # 刷新 aa01 的访问时间
+
+    backend.put("dd04", payload, ttl_seconds=60)
+    assert backend.get("bb02") is None
+    assert backend.get("aa01") is not None and backend.get("dd04") is not None
@@ -0,0 +1,78 @@
+import logging
+import threading
+
+import pytest
+
+
+@pytest.fixture
+def restore_root_logging():
+    root = logging.getLogger()
+    handlers, level = list(root.handlers), root.level
+    yield
+    from tradingagents.utils.logging_manager import stop_logging
+
+    stop_logging()
+    root.handlers[:] = handlers
+    root.setLevel(level)
+
+
+def _config(log_dir, sampling):
+    fmt = '%(asctime)s | %(name)s | %(levelname)s | %(message)s'
+    return {
+        'level': 'INFO',
+        'format': {'console': fmt, 'file': fmt},
+        'handlers': {
+            'console': {'enabled': False},
+            'file': {'enabled': True, 'level': 'DEBUG', 'max_size': '1MB', 'backup_count': 1, 'directory': str(log_dir)},
+            'error': {'enabled': True, 'level': 'WARNING', 'directory': str(log_dir)},
+            'structured': {'enabled': False},
+        },
+        'loggers': {},
+        'docker': {'enabled': False, 'stdout_only': True},
+        'async': {'enabled': True, 'queue_size': 1000},
+        'sampling': {'enabled': sampling, 'rate_per_second': 1, 'burst_seconds': 3, 'loggers': {'noisy.quiet': 0}},
+    }
+
+
+def test_queue_logging_writes_from_listener_thread(tmp_path, restore_root_logging):
+    from tradingagents.utils.logging_manager import NonBlockingQueueHandler, setup_logging, stop_logging
+
+    setup_logging(_config(tmp_path, sampling=False))
+    root = logging.getLogger()
+    assert len(root.handlers) == 1 and isinstance(root.handlers[0], NonBlockingQueueHandler)
+
+    threads = []
+
+    class _Recorder(logging.Handler):
+        def emit(self, record):
+            threads.append(threading.current_thread())
+
+    from tradingagents.utils import logging_manager
+
+    logging_manager._queue_listener.handlers += (_Recorder(),)
+    logger = logging.getLogger('dataflows.bench')
+    logger.info("代码 %s 第 %d 次", "600519", 1)
+    logger.warning("数据源降级")
+    stop_logging()
+
+    main_log = (tmp_path / 'tradingagents.log').read_text(encoding='utf-8')
+    assert "代码 600519 第 1 次" in main_log and "数据源降级" in main_log
+    assert "数据源降级" in (tmp_path / 'error.log').read_text(encoding='utf-8')
+    assert threads and all(t is not threading.current_thread() for t in threads)
+
+
+def test_sampling_caps_hot_call_sites_but_not_warnings(tmp_path, restore_root_logging):
+    from tradingagents.utils.logging_manager import setup_logging, stop_logging
+
+    setup_logging(_config(tmp_path, sampling=True))
+    noisy, quiet = logging.getLogger('noisy'), logging.getLogger('noisy.quiet')
+    for i in range(20):
+        noisy.info(f"热点日志 {i}")
+        noisy.warning(f"警告 {i}")
+        quiet.info(f"不限流 {i}")
+    stop_logging()
+
+    main_log = (tmp_path / 'tradingagents.log').read_text(encoding='utf-8')
+    assert main_log.count("热点日志") == 3
+    assert main_log.count("警告") == 20
+    assert main_log.count("不限流") == 20
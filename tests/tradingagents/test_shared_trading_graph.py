@@ -0,0 +1,114 @@
+import threading
+
+
+def test_shared_graph_cached_per_analysts_and_config(monkeypatch):
+    import tradingagents.graph.trading_graph as tg_mod
+
+    created = []
+
+    class _FakeGraph:
+        def __init__(self, selected_analysts, debug, config):
+            created.append((tuple(selected_analysts), debug))
+
+    monkeypatch.setattr(tg_mod, "TradingAgentsGraph", _FakeGraph, raising=True)
+    monkeypatch.setattr(tg_mod, "_SHARED_GRAPH_MAX_SIZE", 2, raising=True)
+    tg_mod.clear_shared_trading_graphs()
+
+    cfg = {"llm_provider": "dashscope", "quick_think_llm": "qwen-turbo"}
+    g1 = tg_mod.get_shared_trading_graph(["market", "news"], False, dict(cfg))
+    g2 = tg_mod.get_shared_trading_graph(["news", "market"], False, dict(cfg))
+    assert g1 is g2
+    assert len(created) == 1
+
+    g3 = tg_mod.get_shared_trading_graph(["market"], False, dict(cfg))
+    g4 = tg_mod.get_shared_trading_graph(["market", "news"], False, {**cfg, "quick_think_llm": "qwen-plus"})
+    assert g3 is not g1 and g4 is not g1
+    assert len(created) == 3
+
+    # 容量为 2，最早的图已被淘汰
+    assert tg_mod.get_shared_trading_graph(["market", "news"], False, dict(cfg)) is not g1
+    tg_mod.clear_shared_trading_graphs()
+
+
+def test_run_context_is_thread_local():
+    from tradingagents.graph.trading_graph import TradingAgentsGraph
+    from tradingagents.graph.run_context import GraphRunContext
+
+    graph = object.__new__(TradingAgentsGraph)
+    graph._local = threading.local()
+    graph._local.run_context = GraphRunContext(ticker="000001", trade_date="2025-01-02", task_id="t1")
+
+    seen = {}
+
+    def _worker():
+        seen["before"] = graph.ticker
+        graph._local.run_context = GraphRunContext(ticker="600000", trade_date="2025-01-02")
+        graph._local.run_context.curr_state = {"final_trade_decision": "买入"}
+        seen["after"] = graph.ticker
+
+    t = threading.Thread(target=_worker)
+    t.start()
+    t.join()
+
+    assert seen == {"before": None, "after": "600000"}
+    assert graph.ticker == "000001"
+    assert graph.curr_state is None
+    assert graph._current_task_id == "t1"
+
+
+def test_concurrent_apropagate_logs_each_run_under_its_ticker(monkeypatch, tmp_path):
+    import asyncio
+    import json
+
+    import tradingagents.graph.trading_graph as tg_mod
+    from tradingagents.graph.trading_graph import TradingAgentsGraph
+
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setattr(tg_mod, "set_config", lambda config: None)
+    monkeypatch.setattr(tg_mod.Toolkit, "update_config", lambda config: None)
+
+    def _final_state(ticker):
+        debate = {k: "" for k in ("bull_history", "bear_history", "history", "current_response", "judge_decision")}
+        risk = {k: "" for k in ("risky_history", "safe_history", "neutral_history", "history", "judge_decision")}
+        state = {k: "" for k in ("trade_date", "market_report", "sentiment_report", "news_report",
+                                 "fundamentals_report", "trader_investment_plan", "investment_plan")}
+        return {**state, "company_of_interest": ticker, "investment_debate_state": debate,
+                "risk_debate_state": risk, "final_trade_decision": f"{ticker} 持有"}
+
+    class _Propagator:
+        def create_initial_state(self, company_name, trade_date):
+            return {"company_of_interest": company_name}
+
+        def get_graph_args(self, use_progress_callback=False):
+            return {}
+
+    class _Graph:
+        async def astream(self, state, **kwargs):
+            # 让多个运行在同一事件循环上交错执行
+            await asyncio.sleep(0.01)
+            yield {"Risk Judge": _final_state(state["company_of_interest"])}
+
+    graph = object.__new__(TradingAgentsGraph)
+    graph._local = threading.local()
+    graph._log_lock = threading.Lock()
+    graph.log_states_dict = {}
+    graph.config = {"tool_prefetch": False}
+    graph.propagator = _Propagator()
+    graph.graph = _Graph()
+    graph.deep_thinking_llm = object()
+    graph._print_timing_summary = lambda *args: None
+    seen = []
+    graph._build_performance_data = lambda *args: seen.append(graph.ticker) or {}
+    graph.process_signal = lambda decision, company_name: {"action": decision}
+
+    async def _run_all():
+        return await asyncio.gather(*(graph.apropagate(t, "2025-01-02") for t in ("AAA", "BBB", "CCC", "DDD")))
+
+    results = asyncio.run(_run_all())
+    assert [decision["action"] for _, decision in results] == [f"{t} 持有" for t in ("AAA", "BBB", "CCC", "DDD")]
+    assert sorted(seen) == ["AAA", "BBB", "CCC", "DDD"]
+    for ticker in ("AAA", "BBB", "CCC", "DDD"):
+        log_file = tmp_path / "eval_results" / ticker / "TradingAgentsStrategy_logs" / "full_states_log.json"
+        logged = json.loads(log_file.read_text())
+        assert logged["2025-01-02"]["company_of_interest"] == ticker
+    assert not (tmp_path / "eval_results" / "None").exists()
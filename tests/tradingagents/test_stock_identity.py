@@ -0,0 +1,45 @@
+def _count_resolves(monkeypatch, resolved=True):
+    import tradingagents.agents.utils.stock_identity as si
+
+    calls = []
+
+    def _fake_resolve(ticker, market_info):
+        calls.append(ticker)
+        return (f"名称{ticker}" if resolved else f"股票代码{ticker}"), resolved
+
+    si.clear_stock_identity_cache()
+    monkeypatch.setattr(si, "_resolve_company_name", _fake_resolve)
+    return si, calls
+
+
+def test_identity_resolved_once_and_carried_in_initial_state(monkeypatch):
+    si, calls = _count_resolves(monkeypatch)
+    from tradingagents.graph.propagation import Propagator
+
+    state = Propagator().create_initial_state("600519", "2025-01-20")
+    identity = state["stock_identity"]
+    assert identity["company_name"] == "名称600519"
+    assert identity["market_info"]["is_china"] is True
+    assert identity["market_info"]["currency_symbol"] == "¥"
+
+    # 节点读取状态中的身份信息，不再查询
+    for _ in range(5):
+        assert si.stock_identity_from_state(state) is identity
+    # 新一次运行命中进程级缓存
+    Propagator().create_initial_state("600519", "2025-01-21")
+    assert calls == ["600519"]
+
+    # 状态中没有身份信息（如单独调用节点）时回退到缓存
+    assert si.stock_identity_from_state({"company_of_interest": "600519"})["company_name"] == "名称600519"
+    assert calls == ["600519"]
+    si.clear_stock_identity_cache()
+
+
+def test_fallback_names_expire_quickly(monkeypatch):
+    si, calls = _count_resolves(monkeypatch, resolved=False)
+    monkeypatch.setattr(si, "FALLBACK_TTL_SECONDS", 0)
+
+    assert si.get_company_name("0700.HK") == "股票代码0700.HK"
+    si.get_company_name("0700.HK")
+    assert calls == ["0700.HK", "0700.HK"]
+    si.clear_stock_identity_cache()
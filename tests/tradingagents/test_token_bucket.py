@@ -0,0 +1,142 @@
+import asyncio
+
+
+def test_local_bucket_burst_then_paced(monkeypatch):
+    import tradingagents.utils.token_bucket as tb
+
+    sleeps = []
+    monkeypatch.setattr(tb.time, "sleep", lambda s: sleeps.append(s))
+
+    limiter = tb.TokenBucketLimiter("test", per_minute=600, burst=2, use_redis=False)
+    assert limiter.acquire() == 0
+    assert limiter.acquire() == 0
+    wait = limiter.acquire()
+    # 10 次/秒：透支 1 个令牌约需 0.1 秒
+    assert 0.05 < wait <= 0.1
+    assert sleeps == [wait]
+
+    stats = limiter.get_stats()
+    assert stats["backend"] == "local"
+    assert stats["total_calls"] == 3 and stats["total_waits"] == 1
+    assert stats["max_wait_time"] == wait
+
+
+def test_redis_failure_falls_back_to_local():
+    import tradingagents.utils.token_bucket as tb
+
+    class _BrokenRedis:
+        def register_script(self, script):
+            raise ConnectionError("redis down")
+
+    limiter = tb.TokenBucketLimiter("test", per_minute=60, burst=1, redis_client=_BrokenRedis())
+    assert asyncio.run(limiter.acquire_async()) == 0
+    assert limiter.get_stats()["backend"] == "local"
+    assert limiter.fallback_calls == 1
+
+
+def test_redis_script_wait_is_used(monkeypatch):
+    import tradingagents.utils.token_bucket as tb
+
+    calls = []
+
+    class _FakeScript:
+        def __call__(self, keys, args):
+            calls.append((keys, args))
+            return [250, -250]
+
+    class _FakeRedis:
+        def register_script(self, script):
+            assert "HMGET" in script
+            return _FakeScript()
+
+    sleeps = []
+    monkeypatch.setattr(tb.time, "sleep", lambda s: sleeps.append(s))
+
+    limiter = tb.TokenBucketLimiter("tushare", per_minute=120, burst=3, redis_client=_FakeRedis())
+    assert limiter.acquire() == 0.25
+    assert sleeps == [0.25]
+    assert calls == [(["ratelimit:tushare"], [2.0, 3.0, 1])]
+
+
+def test_endpoint_budget_from_env(monkeypatch):
+    import tradingagents.utils.token_bucket as tb
+
+    tb.reset_token_buckets()
+    monkeypatch.setenv("TA_RATELIMIT_TUSHARE_DAILY_PER_MIN", "30")
+    assert tb.get_token_bucket("tushare", "stock_basic") is None
+    daily = tb.get_token_bucket("tushare", "daily")
+    assert daily is not None and daily.get_stats()["per_minute"] == 30
+    tb.reset_token_buckets()
+
+
+def test_conflicting_budget_for_shared_bucket_warns_once(monkeypatch):
+    import tradingagents.utils.token_bucket as tb
+
+    tb.reset_token_buckets()
+    warnings = []
+    monkeypatch.setattr(tb.logger, "warning", lambda msg, *a, **k: warnings.append(msg))
+    try:
+        first = tb.get_token_bucket("demo", per_minute=60, burst=5)
+        # 相同预算、未指定预算：不提示
+        assert tb.get_token_bucket("demo", per_minute=60, burst=5) is first
+        assert tb.get_token_bucket("demo") is first
+        assert warnings == []
+
+        # 不同预算：沿用首次创建的预算，只提示一次
+        assert tb.get_token_bucket("demo", per_minute=120, burst=6) is first
+        assert tb.get_token_bucket("demo", per_minute=120, burst=6) is first
+        assert first.get_stats()["per_minute"] == 60 and first.get_stats()["burst"] == 5
+        assert len(warnings) == 1 and "demo" in warnings[0]
+    finally:
+        tb.reset_token_buckets()
+
+
+def test_akshare_rate_limiter_matches_default_budget(monkeypatch):
+    import tradingagents.utils.token_bucket as tb
+    from app.core.rate_limiter import AKShareRateLimiter
+
+    tb.reset_token_buckets()
+    warnings = []
+    monkeypatch.setattr(tb.logger, "warning", lambda msg, *a, **k: warnings.append(msg))
+    try:
+        provider_bucket = tb.get_token_bucket("akshare")
+        assert AKShareRateLimiter().bucket is provider_bucket
+        assert warnings == []
+    finally:
+        tb.reset_token_buckets()
+
+
+def test_redis_retried_after_cooldown(monkeypatch):
+    import tradingagents.utils.token_bucket as tb
+
+    now = [1000.0]
+    monkeypatch.setattr(tb.time, "monotonic", lambda: now[0])
+    script_calls = []
+
+    class _FlakyRedis:
+        def __init__(self):
+            self.down = True
+
+        def register_script(self, script):
+            def _run(keys, args):
+                script_calls.append(self.down)
+                if self.down:
+                    raise TimeoutError("redis timeout")
+                return [0, 0]
+            return _run
+
+    redis = _FlakyRedis()
+    limiter = tb.TokenBucketLimiter("flaky", per_minute=600, burst=5, redis_client=redis)
+    assert limiter.acquire() == 0
+    assert limiter.fallback_calls == 1 and limiter.get_stats()["backend"] == "local"
+
+    # 冷却期内不访问 Redis
+    redis.down = False
+    limiter.acquire()
+    assert script_calls == [True] and limiter.fallback_calls == 2
+
+    # 冷却结束后重新使用 Redis（跨进程预算恢复生效）
+    now[0] += tb.REDIS_RETRY_SECONDS
+    limiter.acquire()
+    assert script_calls == [True, False] and limiter.fallback_calls == 2
+    assert limiter.get_stats()["backend"] == "redis"
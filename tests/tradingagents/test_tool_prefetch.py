@@ -0,0 +1,187 @@
+import threading
+import time
+from types import SimpleNamespace
+
+from langchain_core.messages import AIMessage, ToolMessage
+
+
+class _FakeTool:
+    def __init__(self, name, delay=0.2):
+        self.name = name
+        self.delay = delay
+        self.calls = []
+
+    def invoke(self, args):
+        self.calls.append((dict(args), threading.current_thread().name))
+        time.sleep(self.delay)
+        return f"{self.name} data for {args['ticker']}"
+
+
+def _fake_toolkit():
+    names = [
+        "get_stock_market_data_unified",
+        "get_stock_fundamentals_unified",
+        "get_stock_news_unified",
+        "get_stock_sentiment_unified",
+    ]
+    return SimpleNamespace(**{n: _FakeTool(n) for n in names})
+
+
+def test_prefetch_runs_all_selected_analyst_tools_concurrently():
+    from tradingagents.agents.utils.tool_prefetch import start_prefetch
+
+    toolkit = _fake_toolkit()
+    start = time.monotonic()
+    cache = start_prefetch(toolkit, ["market", "fundamentals", "news", "social"], "000001", "2025-01-20")
+    # 立即返回，不等待数据
+    assert time.monotonic() - start < 0.1
+
+    assert cache.lookup("get_stock_fundamentals_unified", {
+        "ticker": "000001", "start_date": "2025-01-10", "end_date": "2025-01-20", "curr_date": "2025-01-20",
+    }) == "get_stock_fundamentals_unified data for 000001"
+    for name in ("get_stock_market_data_unified", "get_stock_sentiment_unified"):
+        tool = getattr(toolkit, name)
+        assert cache.lookup(name, tool.calls[0][0]) is not None
+    # 三个 0.2s 的调用并发执行；未指定模型时新闻分析师不会直接调用工具，不预取
+    assert time.monotonic() - start < 0.5
+    assert cache.stats == {"submitted": 3, "hits": 3, "misses": 0}
+    assert toolkit.get_stock_news_unified.calls == []
+
+
+def test_tool_node_served_from_prefetch_and_falls_back_on_mismatch():
+    from tradingagents.agents.utils.tool_prefetch import (
+        create_prefetch_tool_node,
+        reset_current_prefetch,
+        set_current_prefetch,
+        start_prefetch,
+    )
+
+    toolkit = _fake_toolkit()
+    delegated = []
+
+    class _FakeToolNode:
+        def invoke(self, state, config=None):
+            delegated.append(state["messages"][-1].tool_calls)
+            return {"messages": [ToolMessage(content="live", tool_call_id="x")]}
+
+    node = create_prefetch_tool_node(_FakeToolNode())
+    cache = start_prefetch(toolkit, ["market"], "AAPL", "2025-01-20")
+
+    hit_call = {"name": "get_stock_market_data_unified", "id": "call_1",
+                "args": {"ticker": "AAPL", "start_date": "2025-01-20", "end_date": "2025-01-20"}}
+    miss_call = {"name": "get_stock_market_data_unified", "id": "call_2",
+                 "args": {"ticker": "AAPL", "start_date": "2024-01-20", "end_date": "2025-01-20"}}
+
+    token = set_current_prefetch(cache)
+    try:
+        out = node({"messages": [AIMessage(content="", tool_calls=[hit_call])]}, {})
+        assert delegated == []
+        assert out["messages"][0].content == "get_stock_market_data_unified data for AAPL"
+        assert out["messages"][0].tool_call_id == "call_1"
+
+        out = node({"messages": [AIMessage(content="", tool_calls=[miss_call])]}, {})
+        assert out["messages"][0].content == "live"
+        assert len(delegated) == 1
+    finally:
+        reset_current_prefetch(token)
+
+    # 没有预取上下文时直接执行 ToolNode
+    node({"messages": [AIMessage(content="", tool_calls=[hit_call])]}, {})
+    assert len(delegated) == 2
+    assert len(toolkit.get_stock_market_data_unified.calls) == 1
+
+
+class _FakeChatLLM:
+    """第一次调用请求市场数据工具，之后返回报告"""
+
+    model_name = "fake-model"
+
+    def __init__(self, tool_args):
+        self.tool_args = tool_args
+
+    def bind_tools(self, tools):
+        from langchain_core.runnables import RunnableLambda
+
+        call = {"name": "get_stock_market_data_unified", "args": self.tool_args, "id": "call_1"}
+        return RunnableLambda(lambda _: AIMessage(content="", tool_calls=[call]))
+
+    def invoke(self, messages):
+        return AIMessage(content="技术分析报告")
+
+
+def test_market_analyst_node_uses_prefetched_market_data():
+    from tradingagents.agents.analysts.market_analyst import create_market_analyst
+    from tradingagents.agents.utils.tool_prefetch import (
+        reset_current_prefetch,
+        set_current_prefetch,
+        start_prefetch,
+    )
+
+    toolkit = _fake_toolkit()
+    args = {"ticker": "AAPL", "start_date": "2025-01-20", "end_date": "2025-01-20"}
+    node = create_market_analyst(_FakeChatLLM(args), toolkit)
+    state = {
+        "messages": [("human", "AAPL")],
+        "trade_date": "2025-01-20",
+        "company_of_interest": "AAPL",
+        "stock_identity": {
+            "ticker": "AAPL",
+            "company_name": "Apple",
+            "market_info": {"market_name": "美股", "currency_name": "美元", "currency_symbol": "$"},
+        },
+    }
+
+    cache = start_prefetch(toolkit, ["market"], "AAPL", "2025-01-20")
+    token = set_current_prefetch(cache)
+    try:
+        out = node(state)
+    finally:
+        reset_current_prefetch(token)
+
+    tool_messages = [m for m in out["messages"] if isinstance(m, ToolMessage)]
+    assert [m.content for m in tool_messages] == ["get_stock_market_data_unified data for AAPL"]
+    assert out["market_report"] == "技术分析报告"
+    # 节点内执行工具时命中预取，工具只被调用一次
+    assert len(toolkit.get_stock_market_data_unified.calls) == 1
+    assert cache.stats["hits"] == 1
+
+
+def test_news_prefetched_only_for_preprocess_models(monkeypatch):
+    from tradingagents.agents.utils import tool_prefetch
+    from tradingagents.tools import unified_news_tool
+
+    news_calls = []
+
+    def _create_news_tool(toolkit):
+        def get_stock_news_unified(stock_code, max_news=100, model_info=""):
+            news_calls.append((stock_code, max_news, model_info))
+            return f"news for {stock_code}"
+
+        get_stock_news_unified.name = "get_stock_news_unified"
+        return get_stock_news_unified
+
+    monkeypatch.setattr(unified_news_tool, "create_unified_news_tool", _create_news_tool)
+
+    class ChatOpenAI:
+        model_name = "gpt-4o-mini"
+
+    class ChatDashScopeOpenAI:
+        model_name = "qwen-turbo"
+
+    cache = tool_prefetch.start_prefetch(_fake_toolkit(), ["news"], "600519", "2025-01-20", llm=ChatOpenAI())
+    assert cache.stats["submitted"] == 0
+
+    llm = ChatDashScopeOpenAI()
+    cache = tool_prefetch.start_prefetch(_fake_toolkit(), ["news"], "600519", "2025-01-20", llm=llm)
+    token = tool_prefetch.set_current_prefetch(cache)
+    try:
+        # 与新闻分析师预处理模式相同的调用方式
+        news_tool = _create_news_tool(None)
+        args = tool_prefetch.news_tool_args("600519", tool_prefetch.llm_model_info(llm))
+        result = tool_prefetch.invoke_with_prefetch(news_tool, args)
+    finally:
+        tool_prefetch.reset_current_prefetch(token)
+
+    assert result == "news for 600519"
+    assert news_calls == [("600519", 10, "ChatDashScopeOpenAI:qwen-turbo")]
+    assert cache.stats == {"submitted": 1, "hits": 1, "misses": 0}
@@ -0,0 +1,57 @@
+import json
+import time
+from datetime import datetime
+
+from web.utils.user_activity_logger import UserActivity, UserActivityLogger
+
+
+def _activity(username, action_type, success=True, duration_ms=None, ts=None):
+    return UserActivity(
+        timestamp=ts or time.time(), username=username, user_role="user", action_type=action_type,
+        action_name=f"{action_type}_action", details={}, session_id="s1",
+        duration_ms=duration_ms, success=success,
+    )
+
+
+def test_activities_are_batched_and_rolled_up(tmp_path, monkeypatch):
+    activity_logger = UserActivityLogger(activity_dir=tmp_path, batch_size=3, flush_interval=60)
+    today = datetime.now().strftime("%Y-%m-%d")
+    activity_file = tmp_path / f"user_activities_{today}.jsonl"
+
+    activity_logger._write_activity(_activity("alice", "analysis", duration_ms=100))
+    activity_logger._write_activity(_activity("alice", "analysis", success=False, duration_ms=300))
+    assert not activity_file.exists()
+    activity_logger._write_activity(_activity("bob", "auth"))
+    assert len(activity_file.read_text(encoding="utf-8").splitlines()) == 3
+
+    # 剩余缓冲在读取统计前写入；统计只读汇总，不再解析活动文件
+    activity_logger._write_activity(_activity("bob", "analysis", duration_ms=200))
+    monkeypatch.setattr(activity_logger, "_read_activities_from_file",
+                        lambda *a, **k: (_ for _ in ()).throw(AssertionError("reparsed")))
+    stats = activity_logger.get_activity_statistics(days=1)
+    assert stats["total_activities"] == 4 and stats["unique_users"] == 2
+    assert stats["activity_types"] == {"analysis": 3, "auth": 1}
+    assert stats["daily_activities"] == {today: 4}
+    assert stats["success_rate"] == 75.0 and stats["average_duration"] == 200.0
+
+    filtered = activity_logger.get_activity_statistics(days=1, username="alice", action_type="analysis")
+    assert filtered["total_activities"] == 2 and filtered["success_rate"] == 50.0
+
+
+def test_rollup_built_once_for_existing_day_files(tmp_path):
+    day = "2025-01-02"
+    ts = datetime(2025, 1, 2, 10).timestamp()
+    lines = [{"timestamp": ts, "username": "carol", "action_type": "config", "success": True}] * 2
+    (tmp_path / f"user_activities_{day}.jsonl").write_text(
+        "".join(json.dumps(line) + "\n" for line in lines), encoding="utf-8")
+
+    activity_logger = UserActivityLogger(activity_dir=tmp_path)
+    stats = activity_logger.get_activity_statistics(start_date=datetime(2025, 1, 1), end_date=datetime(2025, 1, 3))
+    assert stats["user_activities"] == {"carol": 2}
+    assert (tmp_path / f"user_activities_{day}.rollup.json").exists()
+
+    # 追加新活动时在已有汇总上增量累加
+    activity_logger._write_activity(_activity("carol", "config", ts=ts + 60))
+    activity_logger.flush()
+    stats = activity_logger.get_activity_statistics(start_date=datetime(2025, 1, 2), end_date=datetime(2025, 1, 2))
+    assert stats["total_activities"] == 3
@@ -8,10 +8,17 @@ from tradingagents.utils.logging_init import get_logger
 from tradingagents.utils.tool_logging import log_analyst_module
 # 导入统一新闻工具
 from tradingagents.tools.unified_news_tool import create_unified_news_tool
-# 导入股票工具类
-from tradingagents.utils.stock_utils import StockUtils
+# 运行级股票身份信息（公司名称 / 市场信息）
+from tradingagents.agents.utils.stock_identity import stock_identity_from_state
 # 导入Google工具调用处理器
 from tradingagents.agents.utils.google_tool_handler import GoogleToolCallHandler
+# 预取结果（propagate 开始时与 LLM 调用并行获取）
+from tradingagents.agents.utils.tool_prefetch import (
+    invoke_with_prefetch,
+    llm_model_info,
+    news_tool_args,
+    uses_news_preprocess,
+)
 
 logger = get_logger("analysts.news")
 
@@ -33,66 +40,11 @@ def create_news_analyst(llm, toolkit):
         session_id = state.get("session_id", "未知会话")
         logger.info(f"[新闻分析师] 会话ID: {session_id}，开始时间: {start_time.strftime('%Y-%m-%d %H:%M:%S')}")
         
-        # 获取市场信息
-        market_info = StockUtils.get_market_info(ticker)
+        # 本次运行开始时已解析的市场信息和公司名称
+        identity = stock_identity_from_state(state)
+        market_info = identity["market_info"]
+        company_name = identity["company_name"]
         logger.info(f"[新闻分析师] 股票类型: {market_info['market_name']}")
-        
-        # 获取公司名称
-        def _get_company_name(ticker: str, market_info: dict) -> str:
-            """根据股票代码获取公司名称"""
-            try:
-                if market_info['is_china']:
-                    # 中国A股：使用统一接口获取股票信息
-                    from tradingagents.dataflows.interface import get_china_stock_info_unified
-                    stock_info = get_china_stock_info_unified(ticker)
-                    
-                    # 解析股票名称
-                    if "股票名称:" in stock_info:
-                        company_name = stock_info.split("股票名称:")[1].split("\n")[0].strip()
-                        logger.debug(f"📊 [DEBUG] 从统一接口获取中国股票名称: {ticker} -> {company_name}")
-                        return company_name
-                    else:
-                        logger.warning(f"⚠️ [DEBUG] 无法从统一接口解析股票名称: {ticker}")
-                        return f"股票代码{ticker}"
-                        
-                elif market_info['is_hk']:
-                    # 港股：使用改进的港股工具
-                    try:
-                        from tradingagents.dataflows.providers.hk.improved_hk import get_hk_company_name_improved
-                        company_name = get_hk_company_name_improved(ticker)
-                        logger.debug(f"📊 [DEBUG] 使用改进港股工具获取名称: {ticker} -> {company_name}")
-                        return company_name
-                    except Exception as e:
-                        logger.debug(f"📊 [DEBUG] 改进港股工具获取名称失败: {e}")
-                        # 降级方案：生成友好的默认名称
-                        clean_ticker = ticker.replace('.HK', '').replace('.hk', '')
-                        return f"港股{clean_ticker}"
-                        
-                elif market_info['is_us']:
-                    # 美股：使用简单映射或返回代码
-                    us_stock_names = {
-                        'AAPL': '苹果公司',
-                        'TSLA': '特斯拉',
-                        'NVDA': '英伟达',
-                        'MSFT': '微软',
-                        'GOOGL': '谷歌',
-                        'AMZN': '亚马逊',
-                        'META': 'Meta',
-                        'NFLX': '奈飞'
-                    }
-                    
-                    company_name = us_stock_names.get(ticker.upper(), f"美股{ticker}")
-                    logger.debug(f"📊 [DEBUG] 美股名称映射: {ticker} -> {company_name}")
-                    return company_name
-                    
-                else:
-                    return f"股票{ticker}"
-                    
-            except Exception as e:
-                logger.error(f"❌ [DEBUG] 获取公司名称失败: {e}")
-                return f"股票{ticker}"
-        
-        company_name = _get_company_name(ticker, market_info)
         logger.info(f"[新闻分析师] 公司名称: {company_name}")
         
         # 🔧 使用统一新闻工具，简化工具调用
@@ -188,30 +140,20 @@ def create_news_analyst(llm, toolkit):
         prompt = prompt.partial(ticker=ticker)
         
         # 获取模型信息用于统一新闻工具的特殊处理
-        model_info = ""
-        try:
-            if hasattr(llm, 'model_name'):
-                model_info = f"{llm.__class__.__name__}:{llm.model_name}"
-            else:
-                model_info = llm.__class__.__name__
-        except:
-            model_info = "Unknown"
+        model_info = llm_model_info(llm)
         
         logger.info(f"[新闻分析师] 准备调用LLM进行新闻分析，模型: {model_info}")
         
         # 🚨 DashScope/DeepSeek/Zhipu预处理：强制获取新闻数据
         pre_fetched_news = None
-        if ('DashScope' in llm.__class__.__name__ 
-            or 'DeepSeek' in llm.__class__.__name__
-            or 'Zhipu' in llm.__class__.__name__
-            ):
+        if uses_news_preprocess(llm):
             logger.warning(f"[新闻分析师] 🚨 检测到{llm.__class__.__name__}模型，启动预处理强制新闻获取...")
             try:
                 # 强制预先获取新闻数据
                 logger.info(f"[新闻分析师] 🔧 预处理：强制调用统一新闻工具...")
                 logger.info(f"[新闻分析师] 📊 调用参数: stock_code={ticker}, max_news=10, model_info={model_info}")
 
-                pre_fetched_news = unified_news_tool(stock_code=ticker, max_news=10, model_info=model_info)
+                pre_fetched_news = invoke_with_prefetch(unified_news_tool, news_tool_args(ticker, model_info))
 
                 logger.info(f"[新闻分析师] 📋 预处理返回结果长度: {len(pre_fetched_news) if pre_fetched_news else 0} 字符")
                 logger.info(f"[新闻分析师] 📄 预处理返回结果预览 (前500字符): {pre_fetched_news[:500] if pre_fetched_news else 'None'}")
@@ -341,7 +283,7 @@ def create_news_analyst(llm, toolkit):
                     logger.info(f"[新闻分析师] 🔧 强制调用统一新闻工具获取新闻数据...")
                     logger.info(f"[新闻分析师] 📊 调用参数: stock_code={ticker}, max_news=10")
 
-                    forced_news = unified_news_tool(stock_code=ticker, max_news=10, model_info=model_info)
+                    forced_news = invoke_with_prefetch(unified_news_tool, news_tool_args(ticker, model_info))
 
                     logger.info(f"[新闻分析师] 📋 强制获取返回结果长度: {len(forced_news) if forced_news else 0} 字符")
                     logger.info(f"[新闻分析师] 📄 强制获取返回结果预览 (前500字符): {forced_news[:500] if forced_news else 'None'}")
@@ -4,6 +4,7 @@ import json
 # 导入统一日志系统
 from tradingagents.utils.logging_init import get_logger
 logger = get_logger("default")
+from tradingagents.agents.utils.llm_node import create_llm_node
 
 
 def create_research_manager(llm, memory):
@@ -79,7 +80,7 @@ def create_research_manager(llm, memory):
         # ⏱️ 记录开始时间
         start_time = time.time()
 
-        response = llm.invoke(prompt)
+        response = yield prompt
 
         # ⏱️ 记录结束时间
         elapsed_time = time.time() - start_time
@@ -105,4 +106,4 @@ def create_research_manager(llm, memory):
             "investment_plan": response.content,
         }
 
-    return research_manager_node
+    return create_llm_node(llm, research_manager_node)
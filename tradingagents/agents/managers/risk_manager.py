@@ -4,6 +4,7 @@ import json
 # 导入统一日志系统
 from tradingagents.utils.logging_init import get_logger
 logger = get_logger("default")
+from tradingagents.agents.utils.llm_node import create_llm_node
 
 
 def create_risk_manager(llm, memory):
@@ -77,7 +78,7 @@ def create_risk_manager(llm, memory):
                 # ⏱️ 记录开始时间
                 start_time = time.time()
 
-                response = llm.invoke(prompt)
+                response = yield prompt
 
                 # ⏱️ 记录结束时间
                 elapsed_time = time.time() - start_time
@@ -160,4 +161,4 @@ def create_risk_manager(llm, memory):
             "final_trade_decision": response_content,
         }
 
-    return risk_manager_node
+    return create_llm_node(llm, risk_manager_node)
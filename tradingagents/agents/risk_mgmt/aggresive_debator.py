@@ -4,9 +4,10 @@ import json
 # 导入统一日志系统
 from tradingagents.utils.logging_init import get_logger
 logger = get_logger("default")
+from tradingagents.agents.utils.llm_node import create_llm_node
 
 
-def create_risky_debator(llm):
+def create_risky_debator(llm, compactor=None):
     def risky_node(state) -> dict:
         risk_debate_state = state["risk_debate_state"]
         history = risk_debate_state.get("history", "")
@@ -36,6 +37,20 @@ def create_risky_debator(llm):
                        len(current_safe_response) + len(current_neutral_response))
         logger.info(f"  - 总Prompt长度: {total_length:,} 字符 (~{total_length//4:,} tokens)")
 
+        # 压缩提示词上下文：报告摘要 + 滚动辩论历史 + 节点 token 预算（历史状态仍保存全文）
+        prompt_history = history
+        if compactor is not None:
+            context = compactor.build_context(
+                llm, state, history,
+                fixed=[trader_decision, current_safe_response, current_neutral_response],
+                node="Risky Analyst",
+            )
+            market_research_report = context["market_report"]
+            sentiment_report = context["sentiment_report"]
+            news_report = context["news_report"]
+            fundamentals_report = context["fundamentals_report"]
+            prompt_history = context["history"]
+
         prompt = f"""作为激进风险分析师，您的职责是积极倡导高回报、高风险的投资机会，强调大胆策略和竞争优势。在评估交易员的决策或计划时，请重点关注潜在的上涨空间、增长潜力和创新收益——即使这些伴随着较高的风险。使用提供的市场数据和情绪分析来加强您的论点，并挑战对立观点。具体来说，请直接回应保守和中性分析师提出的每个观点，用数据驱动的反驳和有说服力的推理进行反击。突出他们的谨慎态度可能错过的关键机会，或者他们的假设可能过于保守的地方。以下是交易员的决策：
 
 {trader_decision}
@@ -46,7 +61,7 @@ def create_risky_debator(llm):
 社交媒体情绪报告：{sentiment_report}
 最新世界事务报告：{news_report}
 公司基本面报告：{fundamentals_report}
-以下是当前对话历史：{history} 以下是保守分析师的最后论点：{current_safe_response} 以下是中性分析师的最后论点：{current_neutral_response}。如果其他观点没有回应，请不要虚构，只需提出您的观点。
+以下是当前对话历史：{prompt_history} 以下是保守分析师的最后论点：{current_safe_response} 以下是中性分析师的最后论点：{current_neutral_response}。如果其他观点没有回应，请不要虚构，只需提出您的观点。
 
 积极参与，解决提出的任何具体担忧，反驳他们逻辑中的弱点，并断言承担风险的好处以超越市场常规。专注于辩论和说服，而不仅仅是呈现数据。挑战每个反驳点，强调为什么高风险方法是最优的。请用中文以对话方式输出，就像您在说话一样，不使用任何特殊格式。"""
 
@@ -54,7 +69,7 @@ def create_risky_debator(llm):
         import time
         llm_start_time = time.time()
 
-        response = llm.invoke(prompt)
+        response = yield prompt
 
         llm_elapsed = time.time() - llm_start_time
         logger.info(f"⏱️ [Risky Analyst] LLM调用完成，耗时: {llm_elapsed:.2f}秒")
@@ -80,4 +95,4 @@ def create_risky_debator(llm):
 
         return {"risk_debate_state": new_risk_debate_state}
 
-    return risky_node
+    return create_llm_node(llm, risky_node)
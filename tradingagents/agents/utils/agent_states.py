@@ -54,6 +54,8 @@ class RiskDebateState(TypedDict):
 class AgentState(MessagesState):
     company_of_interest: Annotated[str, "Company that we are interested in trading"]
     trade_date: Annotated[str, "What date we are trading at"]
+    # 运行开始时解析一次的公司名称 / 市场信息（见 stock_identity）
+    stock_identity: Annotated[dict, "Company name and market info resolved once per run"]
 
     sender: Annotated[str, "Agent that sent this message"]
 
@@ -0,0 +1,201 @@
+"""
+辩论 / 风险讨论的提示词上下文压缩
+
+多空研究员和三位风险分析师每一轮都把四份分析师报告和不断增长的 history 全文放进提示词，
+提示词 token 随 max_debate_rounds / max_risk_discuss_rounds 近似平方增长。ContextCompactor：
+- 整体未超出 node_budget_tokens 时报告和历史原样返回，不做任何压缩
+- 报告摘要：超过预算的报告按行抽取（标题、结论/建议、含数据的行优先），按内容哈希缓存，
+  同一次运行的所有辩论节点只计算一次
+- 滚动历史：最近 K 次发言保留原文，更早的发言压缩为每条一句要点
+- 节点预算：整体超出 node_budget_tokens 时依次丢弃最早的要点、收紧报告摘要；
+  最新论点（最近 K 次发言及各方最后回应）始终完整保留
+token 估算优先使用适配器的 _estimate_tokens（千帆 / 智谱），否则按 2 字符/token 保守估算。
+"""
+
+import hashlib
+import re
+import threading
+from collections import OrderedDict
+from typing import Any, Dict, List, Mapping, Optional, Sequence
+
+from tradingagents.utils.logging_init import get_logger
+
+logger = get_logger("agents")
+
+REPORT_FIELDS = ("market_report", "sentiment_report", "news_report", "fundamentals_report")
+
+# 辩论 history 中每次发言的前缀（见各研究员 / 风险分析师节点的 argument）
+_TURN_SPLIT = re.compile(r"\n(?=(?:Bull|Bear|Risky|Safe|Neutral) Analyst:)")
+# 摘要时优先保留的行
+_KEY_TERMS = ("结论", "建议", "总结", "风险", "目标价", "评级", "买入", "卖出", "持有", "估值", "趋势", "信号")
+
+# 报告摘要缓存：(内容哈希, 预算) -> 摘要
+_DIGEST_CACHE_SIZE = 64
+_digest_cache: "OrderedDict[tuple, str]" = OrderedDict()
+_digest_lock = threading.Lock()
+
+
+def estimate_tokens(llm: Any, text: str) -> int:
+    """估算 token 数（与适配器的估算方式一致）"""
+    if not text:
+        return 0
+    estimator = getattr(llm, "_estimate_tokens", None)
+    if callable(estimator):
+        try:
+            return int(estimator(text))
+        except Exception:
+            pass
+    # 中文约1.5字符/token，英文约4字符/token，保守估算：2字符/token
+    return max(1, len(text) // 2)
+
+
+def _line_priority(line: str) -> int:
+    stripped = line.strip()
+    if stripped.startswith("#"):
+        return 0
+    if any(term in stripped for term in _KEY_TERMS):
+        return 1
+    if re.search(r"\d", stripped):
+        return 2
+    return 3
+
+
+def digest_report(llm: Any, text: str, budget_tokens: int) -> str:
+    """报告不超过预算时原样返回，否则按优先级抽取行（保持原有顺序）"""
+    if not text or estimate_tokens(llm, text) <= budget_tokens:
+        return text
+
+    cache_key = (hashlib.sha1(text.encode("utf-8")).hexdigest(), budget_tokens)
+    with _digest_lock:
+        cached = _digest_cache.get(cache_key)
+        if cached is not None:
+            _digest_cache.move_to_end(cache_key)
+            return cached
+
+    lines = [line for line in text.splitlines() if line.strip()]
+    ranked = sorted(range(len(lines)), key=lambda i: (_line_priority(lines[i]), i))
+    selected, used = set(), 0
+    for i in ranked:
+        cost = estimate_tokens(llm, lines[i])
+        if used + cost > budget_tokens:
+            continue
+        selected.add(i)
+        used += cost
+    digest = "\n".join(lines[i] for i in sorted(selected))
+    digest += f"\n...(报告已压缩，原文 {len(text)} 字符)"
+
+    with _digest_lock:
+        _digest_cache[cache_key] = digest
+        if len(_digest_cache) > _DIGEST_CACHE_SIZE:
+            _digest_cache.popitem(last=False)
+    return digest
+
+
+def split_turns(history: str) -> List[str]:
+    return [turn.strip() for turn in _TURN_SPLIT.split(history or "") if turn.strip()]
+
+
+def summarize_turn(turn: str, max_chars: int) -> str:
+    """较早的发言只保留发言人和开头的要点"""
+    speaker, sep, content = turn.partition(":")
+    body = " ".join(content.split()) if sep else " ".join(turn.split())
+    if len(body) > max_chars:
+        cut = body[:max_chars]
+        end = max(cut.rfind("。"), cut.rfind("；"), cut.rfind(". "))
+        body = (cut[:end + 1] if end >= max_chars // 3 else cut) + "…"
+    return f"- {speaker.strip()}: {body}" if sep else f"- {body}"
+
+
+class ContextCompactor:
+    """按节点 token 预算构建辩论提示词上下文"""
+
+    def __init__(
+        self,
+        report_budget_tokens: int = 1500,
+        keep_recent_turns: int = 3,
+        summary_chars_per_turn: int = 160,
+        node_budget_tokens: int = 12000,
+        min_report_budget_tokens: int = 300,
+    ):
+        self.report_budget_tokens = report_budget_tokens
+        self.keep_recent_turns = keep_recent_turns
+        self.summary_chars_per_turn = summary_chars_per_turn
+        self.node_budget_tokens = node_budget_tokens
+        self.min_report_budget_tokens = min_report_budget_tokens
+
+    @classmethod
+    def from_config(cls, config: Optional[Mapping[str, Any]]) -> Optional["ContextCompactor"]:
+        """config["context_compaction"] 未开启时返回 None（节点使用原始全文）"""
+        settings = dict((config or {}).get("context_compaction") or {})
+        if not settings.pop("enabled", False):
+            return None
+        return cls(**settings)
+
+    def compact_history(self, history: str) -> List[str]:
+        """返回 [较早发言要点..., 最近 K 次发言原文...]，要点行以 "- " 开头"""
+        turns = split_turns(history)
+        keep = max(self.keep_recent_turns, 0)
+        older, recent = (turns[:-keep], turns[-keep:]) if keep else (turns, [])
+        return [summarize_turn(t, self.summary_chars_per_turn) for t in older] + recent
+
+    def build_context(
+        self,
+        llm: Any,
+        state: Mapping[str, Any],
+        history: str,
+        fixed: Sequence[str] = (),
+        node: str = "",
+    ) -> Dict[str, str]:
+        """
+        构建提示词中的报告和历史
+
+        Args:
+            fixed: 提示词中必须完整保留的其他内容（对方最后论点、交易员决策、历史记忆等），只计入预算
+
+        Returns:
+            {"market_report", "sentiment_report", "news_report", "fundamentals_report", "history"}
+        """
+        reports = {field: state.get(field) or "" for field in REPORT_FIELDS}
+        fixed_tokens = sum(estimate_tokens(llm, text) for text in fixed if text)
+        original = (sum(estimate_tokens(llm, t) for t in reports.values())
+                    + estimate_tokens(llm, history) + fixed_tokens)
+        # 全文未超出节点预算：原样使用
+        if original <= self.node_budget_tokens:
+            return {**reports, "history": history}
+
+        turns = self.compact_history(history)
+        summary_count = sum(1 for t in turns if t.startswith("- "))
+
+        report_budget = self.report_budget_tokens
+        digests = {field: digest_report(llm, text, report_budget) for field, text in reports.items()}
+
+        def _total() -> int:
+            return (fixed_tokens
+                    + sum(estimate_tokens(llm, d) for d in digests.values())
+                    + sum(estimate_tokens(llm, t) for t in turns))
+
+        # 超出节点预算：先丢弃最早的要点
+        while summary_count and _total() > self.node_budget_tokens:
+            turns.pop(0)
+            summary_count -= 1
+
+        # 仍然超出：按剩余预算收紧报告摘要
+        if _total() > self.node_budget_tokens:
+            history_tokens = sum(estimate_tokens(llm, t) for t in turns)
+            remaining = self.node_budget_tokens - fixed_tokens - history_tokens
+            report_budget = max(self.min_report_budget_tokens, remaining // len(REPORT_FIELDS))
+            digests = {field: digest_report(llm, text, report_budget) for field, text in reports.items()}
+
+        if summary_count:
+            older, recent = turns[:summary_count], turns[summary_count:]
+            compact_history = "（较早的发言要点）\n" + "\n".join(older)
+            if recent:
+                compact_history += "\n（最近的发言）\n" + "\n".join(recent)
+        else:
+            compact_history = "\n".join(turns)
+
+        logger.info(f"🗜️ [上下文压缩] {node}: ~{original:,} -> ~{_total():,} tokens "
+                    f"(报告预算 {report_budget}, 保留最近 {self.keep_recent_turns} 次发言)")
+
+        return {**digests, "history": compact_history}
+
@@ -12,6 +12,8 @@ import logging
 from typing import Any, Dict, List, Optional, Tuple
 from langchain_core.messages import HumanMessage, ToolMessage, AIMessage
 
+from tradingagents.agents.utils.tool_prefetch import invoke_with_prefetch
+
 logger = logging.getLogger(__name__)
 
 class GoogleToolCallHandler:
@@ -181,13 +183,13 @@ class GoogleToolCallHandler:
                             if hasattr(tool, 'invoke'):
                                 # LangChain工具，使用invoke方法
                                 logger.info(f"[{analyst_name}] 🚀 正在调用LangChain工具.invoke()...")
-                                tool_result = tool.invoke(tool_args)
+                                tool_result = invoke_with_prefetch(tool, tool_args)
                                 logger.info(f"[{analyst_name}] ✅ LangChain工具执行成功，结果长度: {len(str(tool_result))} 字符")
                                 logger.debug(f"[{analyst_name}] 🔧 工具结果类型: {type(tool_result)}")
                             elif callable(tool):
                                 # 普通Python函数，直接调用
                                 logger.info(f"[{analyst_name}] 🚀 正在调用Python函数工具...")
-                                tool_result = tool(**tool_args)
+                                tool_result = invoke_with_prefetch(tool, tool_args)
                                 logger.info(f"[{analyst_name}] ✅ Python函数工具执行成功，结果长度: {len(str(tool_result))} 字符")
                                 logger.debug(f"[{analyst_name}] 🔧 工具结果类型: {type(tool_result)}")
                             else:
@@ -0,0 +1,67 @@
+"""
+同时支持同步 / 异步执行的 LLM 节点
+
+研究员、经理、交易员和风险分析师节点只有一次（或带重试的几次）LLM 调用。节点函数写成生成器：
+构造好提示词后 `response = yield prompt`，由驱动函数完成调用：
+- graph.stream / invoke：llm.invoke，与原来一致
+- graph.astream / ainvoke：await llm.ainvoke，等待 LLM 时不占用线程；
+  提示词构造和结果处理（可能包含记忆检索等同步 I/O）放到线程中执行，不阻塞事件循环
+LLM 调用抛出的异常会抛回生成器，节点原有的 try/except 重试逻辑照常生效。
+"""
+
+import asyncio
+from typing import Any, Callable, Dict, Generator
+
+from langchain_core.runnables import RunnableLambda
+
+NodeSteps = Callable[[Dict[str, Any]], Generator[Any, Any, Dict[str, Any]]]
+
+
+def _advance(step: Callable, arg: Any):
+    """推进生成器一步，返回 (是否结束, 下一个请求或节点返回值)
+
+    StopIteration 不能穿过 Future（asyncio.to_thread），在线程内转换为返回值
+    """
+    try:
+        return False, step(arg)
+    except StopIteration as stop:
+        return True, stop.value
+
+
+class LLMNode(RunnableLambda):
+    """LangGraph 节点（Runnable），也可以像原来的节点函数一样直接调用 node(state)"""
+
+    def __call__(self, state: Dict[str, Any]) -> Dict[str, Any]:
+        return self.func(state)
+
+
+def create_llm_node(llm: Any, steps: NodeSteps, name: str = None) -> LLMNode:
+    """把生成器形式的节点包装成同步 / 异步两种执行方式"""
+
+    def run(state):
+        gen = steps(state)
+        try:
+            request = next(gen)
+            while True:
+                try:
+                    response = llm.invoke(request)
+                except Exception as e:
+                    request = gen.throw(e)
+                else:
+                    request = gen.send(response)
+        except StopIteration as stop:
+            return stop.value
+
+    async def arun(state):
+        gen = steps(state)
+        done, value = await asyncio.to_thread(_advance, gen.send, None)
+        while not done:
+            try:
+                response = await llm.ainvoke(value)
+            except Exception as e:
+                done, value = await asyncio.to_thread(_advance, gen.throw, e)
+            else:
+                done, value = await asyncio.to_thread(_advance, gen.send, response)
+        return value
+
+    return LLMNode(run, afunc=arun, name=name or getattr(steps, "__name__", None))
@@ -0,0 +1,135 @@
+"""
+股票身份信息（公司名称 + 市场信息）
+
+分析师、研究员、交易员节点都需要公司名称和市场/货币信息，以前每个节点各自调用
+StockUtils.get_market_info 和 get_china_stock_info_unified / get_hk_company_name_improved，
+同一次 propagate 中会重复查询数据库或网络。现在：
+- Propagator.create_initial_state 在运行开始时解析一次，写入 AgentState["stock_identity"]
+- 节点通过 stock_identity_from_state(state) 读取
+- 进程级 TTL 缓存：symbol -> 身份信息，跨运行复用；解析失败得到的降级名称只缓存很短时间
+"""
+
+import os
+import threading
+import time
+from typing import Any, Dict, Mapping, Tuple
+
+from tradingagents.utils.logging_init import get_logger
+
+logger = get_logger("agents")
+
+# 成功解析的名称缓存时间（秒）
+IDENTITY_TTL_SECONDS = int(os.getenv("TA_STOCK_IDENTITY_TTL_SECONDS", str(6 * 3600)))
+# 降级名称（如 "股票代码000001"）的缓存时间，避免数据源短暂故障被长期缓存
+FALLBACK_TTL_SECONDS = 60
+
+_US_STOCK_NAMES = {
+    'AAPL': '苹果公司',
+    'TSLA': '特斯拉',
+    'NVDA': '英伟达',
+    'MSFT': '微软',
+    'GOOGL': '谷歌',
+    'AMZN': '亚马逊',
+    'META': 'Meta',
+    'NFLX': '奈飞'
+}
+
+_cache: Dict[str, Tuple[float, Dict[str, Any]]] = {}
+_cache_lock = threading.Lock()
+
+
+def _resolve_company_name(ticker: str, market_info: Mapping[str, Any]) -> Tuple[str, bool]:
+    """查询公司名称，返回 (名称, 是否为真实名称)"""
+    try:
+        if market_info['is_china']:
+            # 中国A股：使用统一接口获取股票信息
+            from tradingagents.dataflows.interface import get_china_stock_info_unified
+            stock_info = get_china_stock_info_unified(ticker)
+
+            # 解析股票名称
+            if stock_info and "股票名称:" in stock_info:
+                company_name = stock_info.split("股票名称:")[1].split("\n")[0].strip()
+                logger.info(f"✅ 成功获取中国股票名称: {ticker} -> {company_name}")
+                return company_name, True
+
+            # 降级方案：尝试直接从数据源管理器获取
+            logger.warning(f"⚠️ 无法从统一接口解析股票名称: {ticker}，尝试降级方案")
+            try:
+                from tradingagents.dataflows.data_source_manager import get_china_stock_info_unified as get_info_dict
+                info_dict = get_info_dict(ticker)
+                if info_dict and info_dict.get('name'):
+                    logger.info(f"✅ 降级方案成功获取股票名称: {ticker} -> {info_dict['name']}")
+                    return info_dict['name'], True
+            except Exception as e:
+                logger.error(f"❌ 降级方案也失败: {e}")
+
+            logger.error(f"❌ 所有方案都无法获取股票名称: {ticker}")
+            return f"股票代码{ticker}", False
+
+        if market_info['is_hk']:
+            # 港股：使用改进的港股工具
+            try:
+                from tradingagents.dataflows.providers.hk.improved_hk import get_hk_company_name_improved
+                company_name = get_hk_company_name_improved(ticker)
+                logger.debug(f"📊 [DEBUG] 使用改进港股工具获取名称: {ticker} -> {company_name}")
+                return company_name, True
+            except Exception as e:
+                logger.debug(f"📊 [DEBUG] 改进港股工具获取名称失败: {e}")
+                # 降级方案：生成友好的默认名称
+                clean_ticker = ticker.replace('.HK', '').replace('.hk', '')
+                return f"港股{clean_ticker}", False
+
+        if market_info['is_us']:
+            # 美股：使用简单映射或返回代码
+            company_name = _US_STOCK_NAMES.get(ticker.upper(), f"美股{ticker}")
+            logger.debug(f"📊 [DEBUG] 美股名称映射: {ticker} -> {company_name}")
+            return company_name, True
+
+        return f"股票{ticker}", True
+
+    except Exception as e:
+        logger.error(f"❌ 获取公司名称失败: {e}")
+        return f"股票{ticker}", False
+
+
+def get_stock_identity(ticker: str) -> Dict[str, Any]:
+    """
+    获取股票身份信息（带进程级 TTL 缓存）
+
+    Returns:
+        {"ticker": 代码, "company_name": 公司名称, "market_info": StockUtils.get_market_info 的结果}
+    """
+    now = time.monotonic()
+    with _cache_lock:
+        entry = _cache.get(ticker)
+        if entry and entry[0] > now:
+            return entry[1]
+
+    from tradingagents.utils.stock_utils import StockUtils
+
+    market_info = StockUtils.get_market_info(ticker)
+    company_name, resolved = _resolve_company_name(ticker, market_info)
+    identity = {"ticker": ticker, "company_name": company_name, "market_info": market_info}
+
+    ttl = IDENTITY_TTL_SECONDS if resolved else FALLBACK_TTL_SECONDS
+    with _cache_lock:
+        _cache[ticker] = (now + ttl, identity)
+    return identity
+
+
+def stock_identity_from_state(state: Mapping[str, Any]) -> Dict[str, Any]:
+    """节点读取本次运行的身份信息（旧状态或单独调用节点时回退到缓存查询）"""
+    ticker = state.get("company_of_interest", "")
+    identity = state.get("stock_identity")
+    if identity and identity.get("ticker") == ticker:
+        return identity
+    return get_stock_identity(ticker)
+
+
+def get_company_name(ticker: str) -> str:
+    return get_stock_identity(ticker)["company_name"]
+
+
+def clear_stock_identity_cache() -> None:
+    with _cache_lock:
+        _cache.clear()
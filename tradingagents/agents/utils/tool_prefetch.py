@@ -0,0 +1,202 @@
+"""
+分析师数据预取
+
+四个分析师第一次 LLM 调用几乎总是请求同一个统一工具（市场 / 基本面 / 新闻 / 情绪），
+数据获取要等 LLM 往返结束才开始。propagate 开始时把所选分析师的统一工具调用提交到线程池并发执行，
+结果放在本次运行的 ToolPrefetchCache 中（通过 ContextVar 传递给 LangGraph 的节点线程）：
+- 工具节点收到的 tool_calls 全部命中预取时直接返回结果（尚未完成则等待同一个 Future），不再重复获取
+- 分析师节点内直接执行工具的路径（市场分析师、Google 工具处理器、基本面/新闻强制调用）通过 invoke_with_prefetch 命中
+- 参数与预取不一致（LLM 自行选择了其他日期等）时照常执行 ToolNode
+"""
+
+import json
+from concurrent.futures import Future, ThreadPoolExecutor
+from contextvars import ContextVar
+from datetime import datetime, timedelta
+from threading import Lock
+from typing import Any, Callable, Dict, Iterable, Optional
+
+from langchain_core.messages import ToolMessage
+
+from tradingagents.utils.logging_init import get_logger
+
+logger = get_logger("agents")
+
+# 分析师 -> (统一工具名, 参数构造函数(ticker, trade_date))
+# 参数与各分析师提示词中要求 LLM 传递的参数一致，才能被工具节点命中
+PREFETCH_TOOLS: Dict[str, tuple] = {
+    "market": (
+        "get_stock_market_data_unified",
+        lambda ticker, date: {"ticker": ticker, "start_date": date, "end_date": date},
+    ),
+    "fundamentals": (
+        "get_stock_fundamentals_unified",
+        lambda ticker, date: {
+            "ticker": ticker,
+            # 与基本面分析师一致：固定获取10天数据
+            "start_date": (datetime.strptime(date, "%Y-%m-%d") - timedelta(days=10)).strftime("%Y-%m-%d"),
+            "end_date": date,
+            "curr_date": date,
+        },
+    ),
+    "social": (
+        "get_stock_sentiment_unified",
+        lambda ticker, date: {"ticker": ticker, "curr_date": date},
+    ),
+}
+
+# 新闻分析师绑定的是 create_unified_news_tool 生成的函数（参数 stock_code / max_news / model_info），
+# 只有以下模型走预处理模式、按固定参数直接调用；其他模型的参数由 LLM 决定，预取结果不会被使用
+NEWS_PREPROCESS_LLMS = ("DashScope", "DeepSeek", "Zhipu")
+NEWS_TOOL_NAME = "get_stock_news_unified"
+NEWS_MAX_NEWS = 10
+
+_executor: Optional[ThreadPoolExecutor] = None
+_executor_lock = Lock()
+
+_current_cache: ContextVar[Optional["ToolPrefetchCache"]] = ContextVar("tool_prefetch_cache", default=None)
+
+
+def _get_executor() -> ThreadPoolExecutor:
+    global _executor
+    with _executor_lock:
+        if _executor is None:
+            _executor = ThreadPoolExecutor(max_workers=8, thread_name_prefix="tool-prefetch")
+        return _executor
+
+
+class ToolPrefetchCache:
+    """单次运行的工具预取结果（按工具名 + 参数索引）"""
+
+    def __init__(self):
+        self._futures: Dict[str, Future] = {}
+        self.stats = {"submitted": 0, "hits": 0, "misses": 0}
+
+    @staticmethod
+    def key(tool_name: str, args: Dict[str, Any]) -> str:
+        return f"{tool_name}:{json.dumps(args, sort_keys=True, ensure_ascii=False, default=str)}"
+
+    def submit(self, tool_name: str, args: Dict[str, Any], fn: Callable[[Dict[str, Any]], Any]) -> None:
+        key = self.key(tool_name, args)
+        if key not in self._futures:
+            self._futures[key] = _get_executor().submit(fn, args)
+            self.stats["submitted"] += 1
+
+    def lookup(self, tool_name: str, args: Dict[str, Any]) -> Optional[Any]:
+        """返回预取结果；未预取或预取失败返回 None（调用方照常执行工具）"""
+        future = self._futures.get(self.key(tool_name, args))
+        if future is None:
+            self.stats["misses"] += 1
+            return None
+        try:
+            result = future.result()
+        except Exception as e:
+            logger.warning(f"⚠️ [预取] {tool_name} 预取失败，改为正常调用: {e}")
+            self.stats["misses"] += 1
+            return None
+        self.stats["hits"] += 1
+        return result
+
+
+def llm_model_info(llm) -> str:
+    """新闻工具使用的模型信息（类名:模型名）"""
+    try:
+        if hasattr(llm, 'model_name'):
+            return f"{llm.__class__.__name__}:{llm.model_name}"
+        return llm.__class__.__name__
+    except Exception:
+        return "Unknown"
+
+
+def uses_news_preprocess(llm) -> bool:
+    """新闻分析师是否对该模型启用预处理模式（直接获取新闻，不经过 LLM 工具调用）"""
+    return any(name in llm.__class__.__name__ for name in NEWS_PREPROCESS_LLMS)
+
+
+def news_tool_args(ticker: str, model_info: str) -> Dict[str, Any]:
+    """新闻分析师直接调用统一新闻工具的参数（预取与分析师必须一致才能命中）"""
+    return {"stock_code": ticker, "max_news": NEWS_MAX_NEWS, "model_info": model_info}
+
+
+def _submit_news_prefetch(cache: "ToolPrefetchCache", toolkit, ticker: str, llm) -> None:
+    if llm is None or not uses_news_preprocess(llm):
+        return
+    from tradingagents.tools.unified_news_tool import create_unified_news_tool
+
+    news_tool = create_unified_news_tool(toolkit)
+    cache.submit(NEWS_TOOL_NAME, news_tool_args(ticker, llm_model_info(llm)), lambda args: news_tool(**args))
+
+
+def start_prefetch(toolkit, selected_analysts: Iterable[str], ticker: str, trade_date: str,
+                   llm=None) -> ToolPrefetchCache:
+    """为所选分析师并发提交统一工具调用，立即返回（不等待结果）
+
+    llm 为分析师使用的快速思考模型；新闻数据只在该模型走新闻预处理模式时预取。
+    """
+    cache = ToolPrefetchCache()
+    for analyst in selected_analysts:
+        if analyst == "news":
+            _submit_news_prefetch(cache, toolkit, ticker, llm)
+            continue
+        spec = PREFETCH_TOOLS.get(analyst)
+        if spec is None:
+            continue
+        tool_name, build_args = spec
+        try:
+            args = build_args(ticker, str(trade_date))
+        except ValueError as e:
+            logger.warning(f"⚠️ [预取] 跳过 {tool_name}: 日期无法解析 ({e})")
+            continue
+        tool = getattr(toolkit, tool_name)
+        cache.submit(tool_name, args, tool.invoke)
+    logger.info(f"🚀 [预取] 已提交 {cache.stats['submitted']} 个工具调用: {ticker} {trade_date}")
+    return cache
+
+
+def set_current_prefetch(cache: Optional[ToolPrefetchCache]):
+    """设置当前运行的预取缓存，返回用于 reset_current_prefetch 的 token"""
+    return _current_cache.set(cache)
+
+
+def reset_current_prefetch(token) -> None:
+    _current_cache.reset(token)
+
+
+def get_current_prefetch() -> Optional[ToolPrefetchCache]:
+    return _current_cache.get()
+
+
+def invoke_with_prefetch(tool, args: Dict[str, Any]) -> Any:
+    """直接调用工具时优先使用预取结果（支持 LangChain 工具和普通函数工具）"""
+    tool_name = getattr(tool, "name", None) or getattr(tool, "__name__", str(tool))
+    cache = get_current_prefetch()
+    if cache is not None:
+        result = cache.lookup(tool_name, args)
+        if result is not None:
+            logger.info(f"⚡ [预取] 命中: {tool_name}")
+            return result
+    if hasattr(tool, "invoke"):
+        return tool.invoke(args)
+    return tool(**args)
+
+
+def create_prefetch_tool_node(tool_node):
+    """包装 ToolNode：最后一条消息的 tool_calls 全部命中预取时直接返回 ToolMessage"""
+
+    def prefetch_tool_node(state, config):
+        cache = get_current_prefetch()
+        messages = state.get("messages") or []
+        tool_calls = getattr(messages[-1], "tool_calls", None) if messages else None
+        if cache is not None and tool_calls:
+            results = [cache.lookup(call["name"], call.get("args") or {}) for call in tool_calls]
+            if all(result is not None for result in results):
+                logger.info(f"⚡ [预取] 工具调用全部命中: {[call['name'] for call in tool_calls]}")
+                return {
+                    "messages": [
+                        ToolMessage(content=str(result), name=call["name"], tool_call_id=call["id"])
+                        for call, result in zip(tool_calls, results)
+                    ]
+                }
+        return tool_node.invoke(state, config)
+
+    return prefetch_tool_node
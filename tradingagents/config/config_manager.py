@@ -12,6 +12,7 @@
 import json
 import os
 import re
+import threading
 import warnings
 from datetime import datetime
 from zoneinfo import ZoneInfo
@@ -694,6 +695,9 @@ class TokenTracker:
 
     def __init__(self, config_manager: ConfigManager):
         self.config_manager = config_manager
+        # LLM 响应缓存命中统计（进程内）：(provider, model) -> 计数
+        self._cache_lock = threading.Lock()
+        self._cache_stats: Dict[tuple, Dict[str, int]] = {}
 
     def track_usage(self, provider: str, model_name: str, input_tokens: int,
                    output_tokens: int, session_id: str = None, analysis_type: str = "stock_analysis"):
@@ -743,6 +747,62 @@ class TokenTracker:
         session_cost = sum(record.cost for record in records if record.session_id == session_id)
         return session_cost
 
+    def record_cache_lookup(self, provider: str, model_name: str, hit: bool,
+                            input_tokens: int = 0, output_tokens: int = 0):
+        """记录一次LLM响应缓存查询；命中时累计节省的token（命中不产生使用记录和成本）"""
+        with self._cache_lock:
+            stats = self._cache_stats.setdefault(
+                (provider, model_name),
+                {"hits": 0, "misses": 0, "saved_input_tokens": 0, "saved_output_tokens": 0},
+            )
+            if hit:
+                stats["hits"] += 1
+                stats["saved_input_tokens"] += input_tokens
+                stats["saved_output_tokens"] += output_tokens
+            else:
+                stats["misses"] += 1
+            hits, lookups = stats["hits"], stats["hits"] + stats["misses"]
+
+        if hit:
+            logger.info(f"💾 LLM缓存命中 - {provider}/{model_name}: 节省 {input_tokens}+{output_tokens} tokens, "
+                        f"命中率 {hits}/{lookups} ({hits / lookups:.0%})")
+
+    def get_cache_stats(self) -> Dict[str, Any]:
+        """LLM响应缓存命中率和节省的token/成本"""
+        with self._cache_lock:
+            snapshot = {key: dict(value) for key, value in self._cache_stats.items()}
+
+        models = []
+        totals = {"hits": 0, "misses": 0, "saved_input_tokens": 0, "saved_output_tokens": 0, "saved_cost": 0.0}
+        for (provider, model_name), stats in snapshot.items():
+            saved_cost = 0.0
+            if stats["hits"]:
+                try:
+                    saved_cost = self.config_manager.calculate_cost(
+                        provider, model_name, stats["saved_input_tokens"], stats["saved_output_tokens"]
+                    )[0]
+                except Exception as e:
+                    logger.debug(f"估算缓存节省成本失败: {e}")
+            lookups = stats["hits"] + stats["misses"]
+            models.append({
+                "provider": provider,
+                "model_name": model_name,
+                **stats,
+                "hit_rate": stats["hits"] / lookups if lookups else 0.0,
+                "saved_cost": saved_cost,
+            })
+            for field in ("hits", "misses", "saved_input_tokens", "saved_output_tokens"):
+                totals[field] += stats[field]
+            totals["saved_cost"] += saved_cost
+
+        lookups = totals["hits"] + totals["misses"]
+        totals["hit_rate"] = totals["hits"] / lookups if lookups else 0.0
+        return {**totals, "models": models}
+
+    def reset_cache_stats(self):
+        with self._cache_lock:
+            self._cache_stats.clear()
+
     def estimate_cost(self, provider: str, model_name: str, estimated_input_tokens: int,
                      estimated_output_tokens: int) -> tuple[float, str]:
         """
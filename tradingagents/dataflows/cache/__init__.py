@@ -113,9 +113,14 @@ def get_cache() -> Union[StockDataCache, IntegratedCacheManager]:
 
     return _cache_instance
 
+# 异步接口（在线程池中执行同步缓存 I/O，供 FastAPI 等异步代码使用）
+from .async_adapter import AsyncStockDataCache, get_async_cache
+
 __all__ = [
     # 统一入口（推荐使用）
     'get_cache',
+    'get_async_cache',
+    'AsyncStockDataCache',
 
     # 缓存类（供高级用户直接使用）
     'StockDataCache',
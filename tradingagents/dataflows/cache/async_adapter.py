@@ -0,0 +1,50 @@
+#!/usr/bin/env python3
+"""
+缓存的异步访问接口
+
+get_cache() 返回的缓存（文件/MongoDB/Redis）都是同步实现，查找时可能遍历元数据文件、
+读写磁盘或访问数据库。在事件循环中直接调用会阻塞同一 worker 的所有请求，
+这里把这些调用统一放到线程池中执行。
+"""
+
+import asyncio
+from typing import Any, Optional
+
+from . import get_cache
+
+
+class AsyncStockDataCache:
+    """同步缓存的异步包装（所有 I/O 在线程池中执行）"""
+
+    def __init__(self, cache: Any = None):
+        self.cache = cache if cache is not None else get_cache()
+
+    async def find_cached_stock_data(self, **kwargs: Any) -> Optional[str]:
+        return await asyncio.to_thread(self.cache.find_cached_stock_data, **kwargs)
+
+    async def load_stock_data(self, cache_key: str) -> Any:
+        return await asyncio.to_thread(self.cache.load_stock_data, cache_key)
+
+    async def save_stock_data(self, **kwargs: Any) -> Any:
+        return await asyncio.to_thread(self.cache.save_stock_data, **kwargs)
+
+    async def get(self, **kwargs: Any) -> Any:
+        """查找并加载缓存数据（一次线程切换），未命中返回 None"""
+        return await asyncio.to_thread(self._get_sync, kwargs)
+
+    def _get_sync(self, kwargs: dict) -> Any:
+        cache_key = self.cache.find_cached_stock_data(**kwargs)
+        if not cache_key:
+            return None
+        return self.cache.load_stock_data(cache_key)
+
+
+_async_cache_instance: Optional[AsyncStockDataCache] = None
+
+
+def get_async_cache() -> AsyncStockDataCache:
+    """获取异步缓存实例（包装 get_cache() 的全局缓存）"""
+    global _async_cache_instance
+    if _async_cache_instance is None:
+        _async_cache_instance = AsyncStockDataCache()
+    return _async_cache_instance
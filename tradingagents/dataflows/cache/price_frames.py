@@ -0,0 +1,128 @@
+#!/usr/bin/env python3
+"""
+进程内价格数据帧仓库
+
+stockstats 指标和 YFin 离线工具反复读取同一批 {symbol}-YFin-data-*.csv 文件，
+这里按文件路径缓存解析后的 DataFrame：
+- 文件 mtime/size 变化时自动重新加载
+- 按内存占用做 LRU 淘汰（TA_PRICE_FRAME_CACHE_MB，默认 256MB）
+- 对外只提供只读视图（底层数组不可写，调用方新增列只影响自己的浅拷贝）
+"""
+
+import os
+import threading
+from collections import OrderedDict
+from typing import Dict, Optional, Tuple
+
+import pandas as pd
+
+# 导入日志模块
+from tradingagents.utils.logging_manager import get_logger
+logger = get_logger('agents')
+
+
+def _freeze(frame: pd.DataFrame) -> pd.DataFrame:
+    """把 DataFrame 的底层数组设为只读"""
+    for block in frame._mgr.blocks:
+        values = getattr(block, "values", None)
+        if hasattr(values, "flags"):
+            values.flags.writeable = False
+    return frame
+
+
+class PriceFrameStore:
+    """按文件缓存 CSV 价格数据（mtime 失效 + 内存上限 LRU）"""
+
+    def __init__(self, max_bytes: Optional[int] = None):
+        if max_bytes is None:
+            max_bytes = int(os.getenv("TA_PRICE_FRAME_CACHE_MB", "256")) * 1024 * 1024
+        self.max_bytes = max_bytes
+        # path -> (mtime_ns, size, frame, nbytes)
+        self._frames: "OrderedDict[str, Tuple[int, int, pd.DataFrame, int]]" = OrderedDict()
+        self._total_bytes = 0
+        self._lock = threading.Lock()
+        self._load_locks: Dict[str, threading.Lock] = {}
+        self.hits = 0
+        self.loads = 0
+
+    def get(self, path: str) -> pd.DataFrame:
+        """返回 CSV 文件的只读视图，文件不存在时抛出 FileNotFoundError"""
+        path = os.path.abspath(path)
+        stat = os.stat(path)
+
+        frame = self._lookup(path, stat)
+        if frame is not None:
+            return frame.copy(deep=False)
+
+        # 同一文件只解析一次：并发请求在加载锁上等待
+        with self._lock:
+            load_lock = self._load_locks.setdefault(path, threading.Lock())
+        with load_lock:
+            stat = os.stat(path)
+            frame = self._lookup(path, stat)
+            if frame is None:
+                frame = pd.read_csv(path)
+                # 必须在冻结前统计内存（deep 统计需要可写缓冲区）
+                nbytes = int(frame.memory_usage(deep=True).sum())
+                self._store(path, stat, _freeze(frame), nbytes)
+        return frame.copy(deep=False)
+
+    def _lookup(self, path: str, stat: os.stat_result) -> Optional[pd.DataFrame]:
+        with self._lock:
+            entry = self._frames.get(path)
+            if entry is None:
+                return None
+            mtime_ns, size, frame, _ = entry
+            if mtime_ns != stat.st_mtime_ns or size != stat.st_size:
+                self._evict(path)
+                return None
+            self._frames.move_to_end(path)
+            self.hits += 1
+            return frame
+
+    def _store(self, path: str, stat: os.stat_result, frame: pd.DataFrame, nbytes: int) -> None:
+        with self._lock:
+            self.loads += 1
+            if path in self._frames:
+                self._evict(path)
+            if nbytes > self.max_bytes:
+                logger.debug(f"📦 价格数据过大，不缓存: {path} ({nbytes} bytes)")
+                return
+            self._frames[path] = (stat.st_mtime_ns, stat.st_size, frame, nbytes)
+            self._total_bytes += nbytes
+            while self._total_bytes > self.max_bytes and self._frames:
+                oldest = next(iter(self._frames))
+                self._evict(oldest)
+
+    def _evict(self, path: str) -> None:
+        entry = self._frames.pop(path, None)
+        if entry is not None:
+            self._total_bytes -= entry[3]
+
+    def clear(self) -> None:
+        with self._lock:
+            self._frames.clear()
+            self._total_bytes = 0
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            return {
+                "files": len(self._frames),
+                "bytes": self._total_bytes,
+                "hits": self.hits,
+                "loads": self.loads,
+            }
+
+
+_price_frame_store: Optional[PriceFrameStore] = None
+_price_frame_store_lock = threading.Lock()
+
+
+def get_price_frame_store() -> PriceFrameStore:
+    """获取进程级价格数据帧仓库"""
+    global _price_frame_store
+    if _price_frame_store is None:
+        with _price_frame_store_lock:
+            if _price_frame_store is None:
+                _price_frame_store = PriceFrameStore()
+    return _price_frame_store
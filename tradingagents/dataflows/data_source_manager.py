@@ -1054,8 +1054,8 @@ class DataSourceManager:
 
         # 添加详细的股票代码追踪日志
         logger.info(f"🔍 [股票代码追踪] DataSourceManager.get_stock_data 接收到的股票代码: '{symbol}' (类型: {type(symbol)})")
-        logger.info(f"🔍 [股票代码追踪] 股票代码长度: {len(str(symbol))}")
-        logger.info(f"🔍 [股票代码追踪] 股票代码字符: {list(str(symbol))}")
+        logger.debug(f"🔍 [股票代码追踪] 股票代码长度: {len(str(symbol))}")
+        logger.debug(f"🔍 [股票代码追踪] 股票代码字符: {list(str(symbol))}")
         logger.info(f"🔍 [股票代码追踪] 当前数据源: {self.current_source.value}")
 
         start_time = time.time()
@@ -1186,10 +1186,10 @@ class DataSourceManager:
 
         # 添加详细的股票代码追踪日志
         logger.info(f"🔍 [股票代码追踪] _get_tushare_data 接收到的股票代码: '{symbol}' (类型: {type(symbol)})")
-        logger.info(f"🔍 [股票代码追踪] 股票代码长度: {len(str(symbol))}")
-        logger.info(f"🔍 [股票代码追踪] 股票代码字符: {list(str(symbol))}")
-        logger.info(f"🔍 [DataSourceManager详细日志] _get_tushare_data 开始执行")
-        logger.info(f"🔍 [DataSourceManager详细日志] 当前数据源: {self.current_source.value}")
+        logger.debug(f"🔍 [股票代码追踪] 股票代码长度: {len(str(symbol))}")
+        logger.debug(f"🔍 [股票代码追踪] 股票代码字符: {list(str(symbol))}")
+        logger.debug(f"🔍 [DataSourceManager详细日志] _get_tushare_data 开始执行")
+        logger.debug(f"🔍 [DataSourceManager详细日志] 当前数据源: {self.current_source.value}")
 
         start_time = time.time()
         try:
@@ -1221,7 +1221,7 @@ class DataSourceManager:
 
             # 2. 缓存未命中，从provider获取
             logger.info(f"🔍 [股票代码追踪] 调用 tushare_provider，传入参数: symbol='{symbol}'")
-            logger.info(f"🔍 [DataSourceManager详细日志] 开始调用tushare_provider...")
+            logger.debug(f"🔍 [DataSourceManager详细日志] 开始调用tushare_provider...")
 
             provider = self._get_tushare_adapter()
             if not provider:
@@ -1253,7 +1253,7 @@ class DataSourceManager:
                 result = self._format_stock_data_response(data, symbol, stock_name, start_date, end_date)
 
                 duration = time.time() - start_time
-                logger.info(f"🔍 [DataSourceManager详细日志] 调用完成，耗时: {duration:.3f}秒")
+                logger.debug(f"🔍 [DataSourceManager详细日志] 调用完成，耗时: {duration:.3f}秒")
                 logger.info(f"🔍 [股票代码追踪] 返回结果前200字符: {result[:200] if result else 'None'}")
                 logger.debug(f"📊 [Tushare] 调用完成: 耗时={duration:.2f}s, 结果长度={len(result) if result else 0}")
 
@@ -2156,8 +2156,8 @@ def get_china_stock_data_unified(symbol: str, start_date: str, end_date: str) ->
 
     # 添加详细的股票代码追踪日志
     logger.info(f"🔍 [股票代码追踪] data_source_manager.get_china_stock_data_unified 接收到的股票代码: '{symbol}' (类型: {type(symbol)})")
-    logger.info(f"🔍 [股票代码追踪] 股票代码长度: {len(str(symbol))}")
-    logger.info(f"🔍 [股票代码追踪] 股票代码字符: {list(str(symbol))}")
+    logger.debug(f"🔍 [股票代码追踪] 股票代码长度: {len(str(symbol))}")
+    logger.debug(f"🔍 [股票代码追踪] 股票代码字符: {list(str(symbol))}")
 
     manager = get_data_source_manager()
     logger.info(f"🔍 [股票代码追踪] 调用 manager.get_stock_data，传入参数: symbol='{symbol}', start_date='{start_date}', end_date='{end_date}'")
@@ -15,6 +15,7 @@ from .cache import get_cache
 from tradingagents.config.config_manager import config_manager
 
 from tradingagents.config.runtime_settings import get_float, get_timezone_name
+from tradingagents.utils.token_bucket import interval_budget
 # 导入日志模块
 from tradingagents.utils.logging_manager import get_logger
 logger = get_logger('agents')
@@ -29,21 +30,13 @@ class OptimizedChinaDataProvider:
     def __init__(self):
         self.cache = get_cache()
         self.config = config_manager.load_settings()
-        self.last_api_call = 0
         self.min_api_interval = get_float("TA_CHINA_MIN_API_INTERVAL_SECONDS", "ta_china_min_api_interval_seconds", 0.5)
 
         logger.info(f"📊 优化A股数据提供器初始化完成")
 
     def _wait_for_rate_limit(self):
-        """等待API限制"""
-        current_time = time.time()
-        time_since_last_call = current_time - self.last_api_call
-
-        if time_since_last_call < self.min_api_interval:
-            wait_time = self.min_api_interval - time_since_last_call
-            time.sleep(wait_time)
-
-        self.last_api_call = time.time()
+        """等待API限制（跨进程令牌桶）"""
+        interval_budget("china", self.min_api_interval).acquire()
 
     def _format_financial_data_to_fundamentals(self, financial_data: Dict[str, Any], symbol: str) -> str:
         """将MongoDB财务数据转换为基本面分析格式"""
@@ -2,98 +2,37 @@
 统一数据源提供器包
 按市场分类组织数据提供器
 """
-from .base_provider import BaseStockDataProvider
-
-# 导入中国市场提供器（新路径）
-try:
-    from .china import (
-        AKShareProvider,
-        TushareProvider,
-        BaostockProvider as BaoStockProvider,
-        AKSHARE_AVAILABLE,
-        TUSHARE_AVAILABLE,
-        BAOSTOCK_AVAILABLE
-    )
-except ImportError:
-    # 向后兼容：尝试从旧路径导入
-    try:
-        from .tushare_provider import TushareProvider
-    except ImportError:
-        TushareProvider = None
-
-    try:
-        from .akshare_provider import AKShareProvider
-    except ImportError:
-        AKShareProvider = None
-
-    try:
-        from .baostock_provider import BaoStockProvider
-    except ImportError:
-        BaoStockProvider = None
-
-    AKSHARE_AVAILABLE = AKShareProvider is not None
-    TUSHARE_AVAILABLE = TushareProvider is not None
-    BAOSTOCK_AVAILABLE = BaoStockProvider is not None
-
-# 导入港股提供器
-try:
-    from .hk import (
-        ImprovedHKStockProvider,
-        get_improved_hk_provider,
-        HK_PROVIDER_AVAILABLE
-    )
-except ImportError:
-    ImprovedHKStockProvider = None
-    get_improved_hk_provider = None
-    HK_PROVIDER_AVAILABLE = False
-
-# 导入美股提供器
-try:
-    from .us import (
-        YFinanceUtils,
-        OptimizedUSDataProvider,
-        get_data_in_range,
-        YFINANCE_AVAILABLE,
-        OPTIMIZED_US_AVAILABLE,
-        FINNHUB_AVAILABLE
-    )
-except ImportError:
-    # 向后兼容：尝试从旧路径导入
-    try:
-        from ..yfin_utils import YFinanceUtils
-    except ImportError:
-        YFinanceUtils = None
-
-    try:
-        from ..optimized_us_data import OptimizedUSDataProvider
-    except ImportError:
-        OptimizedUSDataProvider = None
+from tradingagents.utils.lazy_import import lazy_exports
 
-    try:
-        from ..finnhub_utils import get_data_in_range
-    except ImportError:
-        get_data_in_range = None
-
-    YFINANCE_AVAILABLE = YFinanceUtils is not None
-    OPTIMIZED_US_AVAILABLE = OptimizedUSDataProvider is not None
-    FINNHUB_AVAILABLE = get_data_in_range is not None
-
-# 其他提供器（预留）
-try:
-    from .yahoo_provider import YahooProvider
-except ImportError:
-    YahooProvider = None
+# 基类（不依赖任何第三方数据源 SDK）
+from .base_provider import BaseStockDataProvider
 
-try:
-    from .finnhub_provider import FinnhubProvider
-except ImportError:
-    FinnhubProvider = None
+# 各市场提供器在首次访问时才导入（避免启动时加载 tushare / akshare / baostock / yfinance）
+__getattr__, __dir__ = lazy_exports(globals(), {
+    # 中国市场
+    "AKShareProvider": (".china", "AKShareProvider"),
+    "TushareProvider": (".china", "TushareProvider"),
+    "BaoStockProvider": (".china", "BaostockProvider"),
+    "AKSHARE_AVAILABLE": (".china", "AKSHARE_AVAILABLE"),
+    "TUSHARE_AVAILABLE": (".china", "TUSHARE_AVAILABLE"),
+    "BAOSTOCK_AVAILABLE": (".china", "BAOSTOCK_AVAILABLE"),
+    # 港股
+    "ImprovedHKStockProvider": (".hk", "ImprovedHKStockProvider"),
+    "get_improved_hk_provider": (".hk", "get_improved_hk_provider"),
+    "HK_PROVIDER_AVAILABLE": (".hk", "HK_PROVIDER_AVAILABLE"),
+    # 美股
+    "YFinanceUtils": (".us", "YFinanceUtils"),
+    "OptimizedUSDataProvider": (".us", "OptimizedUSDataProvider"),
+    "get_data_in_range": (".us", "get_data_in_range"),
+    "YFINANCE_AVAILABLE": (".us", "YFINANCE_AVAILABLE"),
+    "OPTIMIZED_US_AVAILABLE": (".us", "OPTIMIZED_US_AVAILABLE"),
+    "FINNHUB_AVAILABLE": (".us", "FINNHUB_AVAILABLE"),
+    # 其他（预留）
+    "YahooProvider": (".yahoo_provider", "YahooProvider", None),
+    "FinnhubProvider": (".finnhub_provider", "FinnhubProvider", None),
+})
 
 # TDXProvider 已移除
-# try:
-#     from .tdx_provider import TDXProvider
-# except ImportError:
-#     TDXProvider = None
 
 __all__ = [
     # 基类
@@ -1,39 +1,24 @@
 """
 中国市场数据提供器
 包含 A股、港股等中国市场的数据源
-"""
-
-# 导入 AKShare 提供器
-try:
-    from .akshare import AKShareProvider
-    AKSHARE_AVAILABLE = True
-except ImportError:
-    AKShareProvider = None
-    AKSHARE_AVAILABLE = False
 
-# 导入 Tushare 提供器
-try:
-    from .tushare import TushareProvider
-    TUSHARE_AVAILABLE = True
-except ImportError:
-    TushareProvider = None
-    TUSHARE_AVAILABLE = False
+各提供器在首次访问时才导入（避免启动时加载 tushare / akshare / baostock）
+"""
 
-# 导入 Baostock 提供器
-try:
-    from .baostock import BaostockProvider
-    BAOSTOCK_AVAILABLE = True
-except ImportError:
-    BaostockProvider = None
-    BAOSTOCK_AVAILABLE = False
+from tradingagents.utils.lazy_import import lazy_exports
 
-# 导入基本面快照工具
-try:
-    from .fundamentals_snapshot import get_fundamentals_snapshot
-    FUNDAMENTALS_SNAPSHOT_AVAILABLE = True
-except ImportError:
-    get_fundamentals_snapshot = None
-    FUNDAMENTALS_SNAPSHOT_AVAILABLE = False
+__getattr__, __dir__ = lazy_exports(globals(), {
+    "AKShareProvider": (".akshare", "AKShareProvider", None),
+    "TushareProvider": (".tushare", "TushareProvider", None),
+    "BaostockProvider": (".baostock", "BaostockProvider", None),
+    # 基本面快照工具
+    "get_fundamentals_snapshot": (".fundamentals_snapshot", "get_fundamentals_snapshot", None),
+}, flags={
+    "AKSHARE_AVAILABLE": "AKShareProvider",
+    "TUSHARE_AVAILABLE": "TushareProvider",
+    "BAOSTOCK_AVAILABLE": "BaostockProvider",
+    "FUNDAMENTALS_SNAPSHOT_AVAILABLE": "get_fundamentals_snapshot",
+})
 
 __all__ = [
     'AKShareProvider',
@@ -45,4 +30,3 @@ __all__ = [
     'get_fundamentals_snapshot',
     'FUNDAMENTALS_SNAPSHOT_AVAILABLE',
 ]
-
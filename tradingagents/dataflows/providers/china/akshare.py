@@ -9,6 +9,7 @@ from typing import Dict, Any, List, Optional, Union
 import pandas as pd
 
 from ..base_provider import BaseStockDataProvider
+from tradingagents.utils.token_bucket import acquire as token_bucket_acquire
 
 logger = logging.getLogger(__name__)
 
@@ -54,7 +55,6 @@ class AKShareProvider(BaseStockDataProvider):
             # AKShare的stock_news_em()函数没有设置必要的headers，导致API返回空响应
             if not hasattr(requests, '_akshare_headers_patched'):
                 original_get = requests.get
-                last_request_time = {'time': 0}  # 使用字典以便在闭包中修改
 
                 def patched_get(url, **kwargs):
                     """
@@ -65,11 +65,8 @@ class AKShareProvider(BaseStockDataProvider):
                     # 添加请求延迟，避免被反爬虫封禁
                     # 只对东方财富网的请求添加延迟
                     if 'eastmoney.com' in url:
-                        current_time = time.time()
-                        time_since_last_request = current_time - last_request_time['time']
-                        if time_since_last_request < 0.5:  # 至少间隔0.5秒
-                            time.sleep(0.5 - time_since_last_request)
-                        last_request_time['time'] = time.time()
+                        # 跨进程令牌桶：所有进程共享东方财富接口的调用预算
+                        token_bucket_acquire("eastmoney")
 
                     # 如果是东方财富网的请求，且 curl_cffi 可用，使用它来绕过反爬虫
                     if use_curl_cffi and 'eastmoney.com' in url:
@@ -6,10 +6,12 @@ from typing import Optional, Dict, Any, List, Union
 from datetime import datetime, date, timedelta
 import pandas as pd
 import asyncio
+import functools
 import logging
 
 from ..base_provider import BaseStockDataProvider
 from tradingagents.config.providers_config import get_provider_config
+from tradingagents.utils.token_bucket import acquire as token_bucket_acquire
 
 # 尝试导入tushare
 try:
@@ -22,6 +24,32 @@ except ImportError:
 logger = logging.getLogger(__name__)
 
 
+class RateLimitedTushareApi:
+    """
+    Tushare pro_api 代理
+    每次接口调用前获取跨进程令牌（Tushare 总预算 + 可选的单接口预算），
+    多个进程共用同一个 Token 时不会超出积分等级的调用频率
+    """
+
+    def __init__(self, api):
+        self._api = api
+
+    def __getattr__(self, name):
+        attr = getattr(self._api, name)
+        if name.startswith('_') or not callable(attr):
+            return attr
+
+        @functools.wraps(attr)
+        def call(*args, **kwargs):
+            endpoint = name
+            if name == 'query':
+                endpoint = args[0] if args else kwargs.get('api_name', name)
+            token_bucket_acquire("tushare", endpoint=endpoint)
+            return attr(*args, **kwargs)
+
+        return call
+
+
 class TushareProvider(BaseStockDataProvider):
     """
     统一的Tushare数据提供器
@@ -115,7 +143,7 @@ class TushareProvider(BaseStockDataProvider):
                 try:
                     self.logger.info(f"🔄 [步骤3] 尝试使用数据库中的 Tushare Token (超时: {test_timeout}秒)...")
                     ts.set_token(db_token)
-                    self.api = ts.pro_api()
+                    self.api = RateLimitedTushareApi(ts.pro_api())
 
                     # 测试连接 - 直接调用同步方法（不使用 asyncio.run）
                     try:
@@ -141,7 +169,7 @@ class TushareProvider(BaseStockDataProvider):
                 try:
                     self.logger.info(f"🔄 [步骤4] 尝试使用 .env 中的 Tushare Token (超时: {test_timeout}秒)...")
                     ts.set_token(env_token)
-                    self.api = ts.pro_api()
+                    self.api = RateLimitedTushareApi(ts.pro_api())
 
                     # 测试连接 - 直接调用同步方法（不使用 asyncio.run）
                     try:
@@ -191,7 +219,7 @@ class TushareProvider(BaseStockDataProvider):
                 try:
                     self.logger.info(f"🔄 尝试使用数据库中的 Tushare Token (超时: {test_timeout}秒)...")
                     ts.set_token(db_token)
-                    self.api = ts.pro_api()
+                    self.api = RateLimitedTushareApi(ts.pro_api())
 
                     # 测试连接（异步）- 使用超时
                     try:
@@ -221,7 +249,7 @@ class TushareProvider(BaseStockDataProvider):
                 try:
                     self.logger.info(f"🔄 尝试使用 .env 中的 Tushare Token (超时: {test_timeout}秒)...")
                     ts.set_token(env_token)
-                    self.api = ts.pro_api()
+                    self.api = RateLimitedTushareApi(ts.pro_api())
 
                     # 测试连接（异步）- 使用超时
                     try:
@@ -1,28 +1,22 @@
 """
 港股数据提供器
+
+各提供器在首次访问时才导入（避免启动时加载 akshare / yfinance）
 """
 
-# 导入改进的港股工具
-try:
-    from .improved_hk import (
-        ImprovedHKStockProvider,
-        get_improved_hk_provider,
-        get_hk_stock_info_improved
-    )
-    HK_PROVIDER_AVAILABLE = True
-except ImportError:
-    ImprovedHKStockProvider = None
-    get_improved_hk_provider = None
-    get_hk_stock_info_improved = None
-    HK_PROVIDER_AVAILABLE = False
+from tradingagents.utils.lazy_import import lazy_exports
 
-# 导入港股数据工具
-try:
-    from .hk_stock import HKStockProvider
-    HK_STOCK_AVAILABLE = True
-except ImportError:
-    HKStockProvider = None
-    HK_STOCK_AVAILABLE = False
+__getattr__, __dir__ = lazy_exports(globals(), {
+    # 改进的港股工具
+    "ImprovedHKStockProvider": (".improved_hk", "ImprovedHKStockProvider", None),
+    "get_improved_hk_provider": (".improved_hk", "get_improved_hk_provider", None),
+    "get_hk_stock_info_improved": (".improved_hk", "get_hk_stock_info_improved", None),
+    # 港股数据工具
+    "HKStockProvider": (".hk_stock", "HKStockProvider", None),
+}, flags={
+    "HK_PROVIDER_AVAILABLE": "ImprovedHKStockProvider",
+    "HK_STOCK_AVAILABLE": "HKStockProvider",
+})
 
 __all__ = [
     'ImprovedHKStockProvider',
@@ -32,4 +26,3 @@ __all__ = [
     'HKStockProvider',
     'HK_STOCK_AVAILABLE',
 ]
-
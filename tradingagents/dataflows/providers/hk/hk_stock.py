@@ -15,6 +15,7 @@ from tradingagents.config.runtime_settings import get_timezone_name
 import os
 
 from tradingagents.config.runtime_settings import get_float, get_int
+from tradingagents.utils.token_bucket import interval_budget
 # 导入日志模块
 from tradingagents.utils.logging_manager import get_logger
 logger = get_logger('agents')
@@ -26,7 +27,6 @@ class HKStockProvider:
 
     def __init__(self):
         """初始化港股数据提供器"""
-        self.last_request_time = 0
         self.min_request_interval = get_float("TA_HK_MIN_REQUEST_INTERVAL_SECONDS", "ta_hk_min_request_interval_seconds", 2.0)
         self.timeout = get_int("TA_HK_TIMEOUT_SECONDS", "ta_hk_timeout_seconds", 60)
         self.max_retries = get_int("TA_HK_MAX_RETRIES", "ta_hk_max_retries", 3)
@@ -35,15 +35,8 @@ class HKStockProvider:
         logger.info(f"🇭🇰 港股数据提供器初始化完成")
 
     def _wait_for_rate_limit(self):
-        """等待速率限制"""
-        current_time = time.time()
-        time_since_last_request = current_time - self.last_request_time
-
-        if time_since_last_request < self.min_request_interval:
-            sleep_time = self.min_request_interval - time_since_last_request
-            time.sleep(sleep_time)
-
-        self.last_request_time = time.time()
+        """等待速率限制（跨进程令牌桶）"""
+        interval_budget("hk", self.min_request_interval).acquire()
 
     def get_stock_data(self, symbol: str, start_date: str = None, end_date: str = None) -> Optional[pd.DataFrame]:
         """
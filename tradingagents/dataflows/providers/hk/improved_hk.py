@@ -12,6 +12,7 @@ from typing import Dict, Any, Optional
 from datetime import datetime, timedelta
 
 from tradingagents.config.runtime_settings import get_int
+from tradingagents.utils.token_bucket import interval_budget
 # 导入统一日志系统
 from tradingagents.utils.logging_init import get_logger
 logger = get_logger("default")
@@ -43,7 +44,6 @@ class ImprovedHKStockProvider:
 
         self.cache_ttl = get_int("TA_HK_CACHE_TTL_SECONDS", "ta_hk_cache_ttl_seconds", 3600 * 24)
         self.rate_limit_wait = get_int("TA_HK_RATE_LIMIT_WAIT_SECONDS", "ta_hk_rate_limit_wait_seconds", 5)
-        self.last_request_time = 0
 
         # 内置港股名称映射（避免API调用）
         self.hk_stock_names = {
@@ -137,16 +137,10 @@ class ImprovedHKStockProvider:
         return (time.time() - cache_time) < self.cache_ttl
 
     def _rate_limit(self):
-        """速率限制：确保两次请求之间有足够的间隔"""
-        current_time = time.time()
-        time_since_last_request = current_time - self.last_request_time
-
-        if time_since_last_request < self.rate_limit_wait:
-            wait_time = self.rate_limit_wait - time_since_last_request
+        """速率限制：确保两次请求之间有足够的间隔（跨进程令牌桶）"""
+        wait_time = interval_budget("hk_akshare", self.rate_limit_wait).acquire()
+        if wait_time > 0:
             logger.debug(f"⏱️ [速率限制] 等待 {wait_time:.2f} 秒")
-            time.sleep(wait_time)
-
-        self.last_request_time = time.time()
 
     def _normalize_hk_symbol(self, symbol: str) -> str:
         """标准化港股代码"""
@@ -205,13 +199,7 @@ class ImprovedHKStockProvider:
             # 方案2：优先尝试AKShare API获取（有速率限制保护）
             try:
                 # 速率限制保护
-                current_time = time.time()
-                if current_time - self.last_request_time < self.rate_limit_wait:
-                    wait_time = self.rate_limit_wait - (current_time - self.last_request_time)
-                    logger.debug(f"📊 [港股API] 速率限制保护，等待 {wait_time:.1f} 秒")
-                    time.sleep(wait_time)
-
-                self.last_request_time = time.time()
+                self._rate_limit()
 
                 # 优先尝试AKShare获取
                 try:
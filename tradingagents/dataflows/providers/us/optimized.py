@@ -30,6 +30,7 @@ except ImportError:
         return {}
 
 from tradingagents.config.runtime_settings import get_float, get_timezone_name
+from tradingagents.utils.token_bucket import interval_budget
 # 导入日志模块
 from tradingagents.utils.logging_manager import get_logger
 logger = get_logger('agents')
@@ -41,7 +42,6 @@ class OptimizedUSDataProvider:
     def __init__(self):
         self.cache = get_cache()
         self.config = get_config()
-        self.last_api_call = 0
         self.min_api_interval = get_float("TA_US_MIN_API_INTERVAL_SECONDS", "ta_us_min_api_interval_seconds", 1.0)
 
         # 🔥 初始化数据源管理器（从数据库读取配置）
@@ -56,16 +56,10 @@ class OptimizedUSDataProvider:
         logger.info(f"📊 优化美股数据提供器初始化完成")
 
     def _wait_for_rate_limit(self):
-        """等待API限制"""
-        current_time = time.time()
-        time_since_last_call = current_time - self.last_api_call
-
-        if time_since_last_call < self.min_api_interval:
-            wait_time = self.min_api_interval - time_since_last_call
+        """等待API限制（跨进程令牌桶，所有进程共享同一预算）"""
+        wait_time = interval_budget("us", self.min_api_interval).acquire()
+        if wait_time > 0:
             logger.info(f"⏳ API限制等待 {wait_time:.1f}s...")
-            time.sleep(wait_time)
-
-        self.last_api_call = time.time()
 
     def get_stock_data(self, symbol: str, start_date: str, end_date: str,
                       force_refresh: bool = False) -> str:
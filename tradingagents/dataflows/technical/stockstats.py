@@ -1,16 +1,120 @@
 import pandas as pd
 import yfinance as yf
 from stockstats import wrap
-from typing import Annotated
+from typing import Annotated, Any, Dict, List, Tuple
+from collections import OrderedDict
 import os
+import threading
 from tradingagents.config.config_manager import config_manager
+from tradingagents.dataflows.cache.price_frames import get_price_frame_store
 
 def get_config():
     """兼容性包装函数"""
     return config_manager.load_settings()
 
 
+NOT_TRADING_DAY = "N/A: Not a trading day (weekend or holiday)"
+
+# 指标序列缓存：(数据文件, mtime_ns, size, indicator) -> {日期: 指标值}
+# 数据文件被重新下载/覆盖后 mtime/size 变化，旧条目自然失效
+_INDICATOR_CACHE_MAX_SIZE = 256
+_indicator_cache: "OrderedDict[Tuple[str, int, int, str], Dict[str, Any]]" = OrderedDict()
+_indicator_cache_lock = threading.Lock()
+
+
+def clear_indicator_cache() -> None:
+    """清空指标序列缓存"""
+    with _indicator_cache_lock:
+        _indicator_cache.clear()
+
+
 class StockstatsUtils:
+    @staticmethod
+    def _get_data_file(symbol: str, data_dir: str, online: bool) -> str:
+        """返回价格数据文件路径；在线模式下文件不存在时先从 Yahoo Finance 下载"""
+        if not online:
+            data_file = os.path.join(
+                data_dir,
+                f"{symbol}-YFin-data-2015-01-01-2025-03-25.csv",
+            )
+            if not os.path.exists(data_file):
+                raise Exception("Stockstats fail: Yahoo Finance data not fetched yet!")
+            return data_file
+
+        # Get today's date as YYYY-mm-dd to add to cache
+        today_date = pd.Timestamp.today()
+        end_date = today_date
+        start_date = today_date - pd.DateOffset(years=15)
+        start_date = start_date.strftime("%Y-%m-%d")
+        end_date = end_date.strftime("%Y-%m-%d")
+
+        # Get config and ensure cache directory exists
+        config = get_config()
+        os.makedirs(config["data_cache_dir"], exist_ok=True)
+
+        data_file = os.path.join(
+            config["data_cache_dir"],
+            f"{symbol}-YFin-data-{start_date}-{end_date}.csv",
+        )
+
+        if not os.path.exists(data_file):
+            data = yf.download(
+                symbol,
+                start=start_date,
+                end=end_date,
+                multi_level_index=False,
+                progress=False,
+                auto_adjust=True,
+            )
+            data = data.reset_index()
+            data.to_csv(data_file, index=False)
+
+        return data_file
+
+    @staticmethod
+    def get_indicator_series(
+        symbol: Annotated[str, "ticker symbol for the company"],
+        indicator: Annotated[
+            str, "quantitative indicators based off of the stock data for the company"
+        ],
+        data_dir: Annotated[
+            str,
+            "directory where the stock data is stored.",
+        ],
+        online: Annotated[
+            bool,
+            "whether to use online tools to fetch data or offline tools. If True, will use online tools.",
+        ] = False,
+    ) -> Dict[str, Any]:
+        """在整段价格序列上计算一次指标，返回 {YYYY-mm-dd: 指标值}
+
+        结果按 (数据文件, 文件版本, 指标) 缓存，同一文件上的重复调用不再读 CSV 和重算指标。
+        """
+        data_file = StockstatsUtils._get_data_file(symbol, data_dir, online)
+        stat = os.stat(data_file)
+        key = (data_file, stat.st_mtime_ns, stat.st_size, indicator)
+
+        with _indicator_cache_lock:
+            series = _indicator_cache.get(key)
+            if series is not None:
+                _indicator_cache.move_to_end(key)
+                return series
+
+        # 价格数据来自进程级只读帧仓库，wrap 得到的是浅拷贝，计算列不会写回共享数据
+        data = get_price_frame_store().get(data_file)
+        df = wrap(data)
+        values = df[indicator]  # trigger stockstats to calculate the indicator
+        dates = pd.to_datetime(df["Date"].astype(str).str[:10]).dt.strftime("%Y-%m-%d")
+        indexed = pd.Series(values.values, index=dates.values)
+        # 与逐日查询一致：同一日期有多行时取第一行
+        series = indexed[~indexed.index.duplicated(keep="first")].to_dict()
+
+        with _indicator_cache_lock:
+            _indicator_cache[key] = series
+            while len(_indicator_cache) > _INDICATOR_CACHE_MAX_SIZE:
+                _indicator_cache.popitem(last=False)
+        return series
+
     @staticmethod
     def get_stock_stats(
         symbol: Annotated[str, "ticker symbol for the company"],
@@ -29,63 +133,38 @@ class StockstatsUtils:
             "whether to use online tools to fetch data or offline tools. If True, will use online tools.",
         ] = False,
     ):
-        df = None
-        data = None
+        series = StockstatsUtils.get_indicator_series(symbol, indicator, data_dir, online=online)
+        curr_date = pd.to_datetime(curr_date).strftime("%Y-%m-%d")
+        if curr_date in series:
+            return series[curr_date]
+        return NOT_TRADING_DAY
 
-        if not online:
-            try:
-                data = pd.read_csv(
-                    os.path.join(
-                        data_dir,
-                        f"{symbol}-YFin-data-2015-01-01-2025-03-25.csv",
-                    )
-                )
-                df = wrap(data)
-            except FileNotFoundError:
-                raise Exception("Stockstats fail: Yahoo Finance data not fetched yet!")
-        else:
-            # Get today's date as YYYY-mm-dd to add to cache
-            today_date = pd.Timestamp.today()
-            curr_date = pd.to_datetime(curr_date)
-
-            end_date = today_date
-            start_date = today_date - pd.DateOffset(years=15)
-            start_date = start_date.strftime("%Y-%m-%d")
-            end_date = end_date.strftime("%Y-%m-%d")
-
-            # Get config and ensure cache directory exists
-            config = get_config()
-            os.makedirs(config["data_cache_dir"], exist_ok=True)
-
-            data_file = os.path.join(
-                config["data_cache_dir"],
-                f"{symbol}-YFin-data-{start_date}-{end_date}.csv",
-            )
+    @staticmethod
+    def get_stock_stats_window(
+        symbol: Annotated[str, "ticker symbol for the company"],
+        indicator: Annotated[
+            str, "quantitative indicators based off of the stock data for the company"
+        ],
+        curr_date: Annotated[
+            str, "curr date for retrieving stock price data, YYYY-mm-dd"
+        ],
+        look_back_days: Annotated[int, "how many days to look back"],
+        data_dir: Annotated[
+            str,
+            "directory where the stock data is stored.",
+        ],
+        online: Annotated[
+            bool,
+            "whether to use online tools to fetch data or offline tools. If True, will use online tools.",
+        ] = False,
+    ) -> List[Tuple[str, Any]]:
+        """返回 [curr_date - look_back_days, curr_date] 区间内的指标值（日期倒序）
 
-            if os.path.exists(data_file):
-                data = pd.read_csv(data_file)
-                data["Date"] = pd.to_datetime(data["Date"])
-            else:
-                data = yf.download(
-                    symbol,
-                    start=start_date,
-                    end=end_date,
-                    multi_level_index=False,
-                    progress=False,
-                    auto_adjust=True,
-                )
-                data = data.reset_index()
-                data.to_csv(data_file, index=False)
-
-            df = wrap(data)
-            df["Date"] = df["Date"].dt.strftime("%Y-%m-%d")
-            curr_date = curr_date.strftime("%Y-%m-%d")
-
-        df[indicator]  # trigger stockstats to calculate the indicator
-        matching_rows = df[df["Date"].str.startswith(curr_date)]
-
-        if not matching_rows.empty:
-            indicator_value = matching_rows[indicator].values[0]
-            return indicator_value
-        else:
-            return "N/A: Not a trading day (weekend or holiday)"
+        离线模式只返回交易日；在线模式与逐日查询一致，非交易日返回 N/A 提示。
+        """
+        series = StockstatsUtils.get_indicator_series(symbol, indicator, data_dir, online=online)
+        end = pd.to_datetime(curr_date)
+        days = pd.date_range(end=end, periods=look_back_days + 1, freq="D")[::-1].strftime("%Y-%m-%d")
+        if online:
+            return [(day, series.get(day, NOT_TRADING_DAY)) for day in days]
+        return [(day, series[day]) for day in days if day in series]
@@ -21,6 +21,15 @@ DEFAULT_CONFIG = {
     "online_tools": os.getenv("ONLINE_TOOLS_ENABLED", "false").lower() == "true",
     "online_news": os.getenv("ONLINE_NEWS_ENABLED", "true").lower() == "true", 
     "realtime_data": os.getenv("REALTIME_DATA_ENABLED", "false").lower() == "true",
+    # 分析开始时并发预取所选分析师的统一工具数据，与首次 LLM 调用重叠
+    "tool_prefetch": os.getenv("TOOL_PREFETCH_ENABLED", "true").lower() == "true",
+    # 辩论 / 风险讨论提示词压缩：报告摘要 + 滚动历史 + 每个节点的 token 预算
+    "context_compaction": {
+        "enabled": os.getenv("CONTEXT_COMPACTION_ENABLED", "true").lower() == "true",
+        "report_budget_tokens": int(os.getenv("CONTEXT_REPORT_BUDGET_TOKENS", "1500")),
+        "keep_recent_turns": int(os.getenv("CONTEXT_KEEP_RECENT_TURNS", "3")),
+        "node_budget_tokens": int(os.getenv("CONTEXT_NODE_BUDGET_TOKENS", "12000")),
+    },
 
     # Note: Database and cache configuration is now managed by .env file and config.database_manager
     # No database/cache settings in default config to avoid configuration conflicts
@@ -1,18 +1,29 @@
 # TradingAgents/graph/__init__.py
+# 图模块会导入 langchain / langgraph 及全部智能体，按需延迟导入
 
-from .trading_graph import TradingAgentsGraph
-from .conditional_logic import ConditionalLogic
-from .setup import GraphSetup
-from .propagation import Propagator
-from .reflection import Reflector
-from .signal_processing import SignalProcessor
+from tradingagents.utils.lazy_import import lazy_exports
 
 # 导入统一日志系统
 from tradingagents.utils.logging_init import get_logger
 logger = get_logger("default")
 
+__getattr__, __dir__ = lazy_exports(globals(), {
+    "TradingAgentsGraph": (".trading_graph", "TradingAgentsGraph"),
+    "get_shared_trading_graph": (".trading_graph", "get_shared_trading_graph"),
+    "clear_shared_trading_graphs": (".trading_graph", "clear_shared_trading_graphs"),
+    "GraphRunContext": (".run_context", "GraphRunContext"),
+    "ConditionalLogic": (".conditional_logic", "ConditionalLogic"),
+    "GraphSetup": (".setup", "GraphSetup"),
+    "Propagator": (".propagation", "Propagator"),
+    "Reflector": (".reflection", "Reflector"),
+    "SignalProcessor": (".signal_processing", "SignalProcessor"),
+})
+
 __all__ = [
     "TradingAgentsGraph",
+    "GraphRunContext",
+    "get_shared_trading_graph",
+    "clear_shared_trading_graphs",
     "ConditionalLogic",
     "GraphSetup",
     "Propagator",
@@ -0,0 +1,25 @@
+# TradingAgents/graph/run_context.py
+
+import time
+from dataclasses import dataclass, field
+from typing import Any, Dict, Optional
+
+
+@dataclass
+class GraphRunContext:
+    """单次 propagate 运行的可变状态。
+
+    TradingAgentsGraph 的编译图、LLM 客户端、工具节点和记忆句柄在多个任务之间共享，
+    每次运行特有的数据（股票代码、最终状态、节点计时）都放在这里，互不干扰。
+    """
+
+    ticker: str
+    trade_date: str
+    task_id: Optional[str] = None
+    start_time: float = field(default_factory=time.time)
+    node_timings: Dict[str, float] = field(default_factory=dict)
+    curr_state: Optional[Dict[str, Any]] = None
+
+    @property
+    def elapsed(self) -> float:
+        return time.time() - self.start_time
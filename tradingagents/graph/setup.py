@@ -8,6 +8,8 @@ from langgraph.prebuilt import ToolNode
 from tradingagents.agents import *
 from tradingagents.agents.utils.agent_states import AgentState
 from tradingagents.agents.utils.agent_utils import Toolkit
+from tradingagents.agents.utils.tool_prefetch import create_prefetch_tool_node
+from tradingagents.agents.utils.context_compaction import ContextCompactor
 
 from .conditional_logic import ConditionalLogic
 
@@ -136,12 +138,15 @@ class GraphSetup:
             delete_nodes["fundamentals"] = create_msg_delete()
             tool_nodes["fundamentals"] = self.tool_nodes["fundamentals"]
 
+        # 辩论 / 风险讨论节点共用的提示词压缩器（未开启时为 None）
+        compactor = ContextCompactor.from_config(self.config)
+
         # Create researcher and manager nodes
         bull_researcher_node = create_bull_researcher(
-            self.quick_thinking_llm, self.bull_memory
+            self.quick_thinking_llm, self.bull_memory, compactor
         )
         bear_researcher_node = create_bear_researcher(
-            self.quick_thinking_llm, self.bear_memory
+            self.quick_thinking_llm, self.bear_memory, compactor
         )
         research_manager_node = create_research_manager(
             self.deep_thinking_llm, self.invest_judge_memory
@@ -149,9 +154,9 @@ class GraphSetup:
         trader_node = create_trader(self.quick_thinking_llm, self.trader_memory)
 
         # Create risk analysis nodes
-        risky_analyst = create_risky_debator(self.quick_thinking_llm)
-        neutral_analyst = create_neutral_debator(self.quick_thinking_llm)
-        safe_analyst = create_safe_debator(self.quick_thinking_llm)
+        risky_analyst = create_risky_debator(self.quick_thinking_llm, compactor)
+        neutral_analyst = create_neutral_debator(self.quick_thinking_llm, compactor)
+        safe_analyst = create_safe_debator(self.quick_thinking_llm, compactor)
         risk_manager_node = create_risk_manager(
             self.deep_thinking_llm, self.risk_manager_memory
         )
@@ -165,7 +170,10 @@ class GraphSetup:
             workflow.add_node(
                 f"Msg Clear {analyst_type.capitalize()}", delete_nodes[analyst_type]
             )
-            workflow.add_node(f"tools_{analyst_type}", tool_nodes[analyst_type])
+            # 工具调用优先使用 propagate 开始时预取的结果
+            workflow.add_node(
+                f"tools_{analyst_type}", create_prefetch_tool_node(tool_nodes[analyst_type])
+            )
 
         # Add other nodes
         workflow.add_node("Bull Researcher", bull_researcher_node)
@@ -1,16 +1,21 @@
 # TradingAgents/graph/trading_graph.py
 
+import asyncio
 import os
 from pathlib import Path
 import json
+import hashlib
+import threading
+from collections import OrderedDict
 from datetime import date
-from typing import Dict, Any, Tuple, List, Optional
+from typing import Dict, Any, Callable, Tuple, List, Optional
 import time
 
 from langchain_openai import ChatOpenAI
 from langchain_anthropic import ChatAnthropic
 from langchain_google_genai import ChatGoogleGenerativeAI
 from tradingagents.llm_adapters import ChatDashScopeOpenAI, ChatGoogleOpenAI
+from tradingagents.llm_adapters.http_pool import pooled_http_clients
 
 from langgraph.prebuilt import ToolNode
 
@@ -29,6 +34,11 @@ from tradingagents.agents.utils.agent_states import (
     InvestDebateState,
     RiskDebateState,
 )
+from tradingagents.agents.utils.tool_prefetch import (
+    reset_current_prefetch,
+    set_current_prefetch,
+    start_prefetch,
+)
 from tradingagents.dataflows.interface import set_config
 
 from .conditional_logic import ConditionalLogic
@@ -36,6 +46,7 @@ from .setup import GraphSetup
 from .propagation import Propagator
 from .reflection import Reflector
 from .signal_processing import SignalProcessor
+from .run_context import GraphRunContext
 
 
 def create_llm_by_provider(provider: str, model: str, backend_url: str, temperature: float, max_tokens: int, timeout: int, api_key: str = None):
@@ -137,7 +148,8 @@ def create_llm_by_provider(provider: str, model: str, backend_url: str, temperat
             api_key=api_key,
             temperature=temperature,
             max_tokens=max_tokens,
-            timeout=timeout
+            timeout=timeout,
+            **pooled_http_clients(provider, backend_url)
         )
 
     elif provider.lower() == "anthropic":
@@ -186,10 +198,57 @@ def create_llm_by_provider(provider: str, model: str, backend_url: str, temperat
             api_key=custom_api_key,
             temperature=temperature,
             max_tokens=max_tokens,
-            timeout=timeout
+            timeout=timeout,
+            **pooled_http_clients(provider, backend_url)
         )
 
 
+# ==================== 进程内共享组件 ====================
+# LLM 客户端、记忆句柄和编译好的 LangGraph 都是无状态/线程安全的，按配置在任务之间复用；
+# 每次运行的可变状态见 GraphRunContext。
+
+# LLM 客户端创建只依赖这些配置项
+_LLM_CONFIG_KEYS = (
+    "llm_provider", "deep_think_llm", "quick_think_llm", "backend_url",
+    "quick_provider", "deep_provider", "quick_backend_url", "deep_backend_url",
+    "quick_api_key", "deep_api_key", "custom_openai_base_url",
+    "quick_model_config", "deep_model_config",
+)
+
+_POOL_LOCK = threading.RLock()
+_LLM_POOL: Dict[str, Any] = {}
+_MEMORY_POOL: Dict[str, Any] = {}
+
+_SHARED_GRAPH_MAX_SIZE = int(os.getenv("TRADING_GRAPH_CACHE_SIZE", "8"))
+_SHARED_GRAPHS: "OrderedDict[str, TradingAgentsGraph]" = OrderedDict()
+
+
+def _config_fingerprint(data: Any) -> str:
+    """配置指纹（API Key 等敏感信息只以哈希形式出现在缓存键中）"""
+    raw = json.dumps(data, sort_keys=True, default=str, ensure_ascii=False)
+    return hashlib.sha256(raw.encode("utf-8")).hexdigest()
+
+
+def _llm_pool_key(config: Dict[str, Any]) -> str:
+    return _config_fingerprint({k: config.get(k) for k in _LLM_CONFIG_KEYS})
+
+
+def _get_pooled(pool: Dict[str, Any], key: str, factory: Callable[[], Any]) -> Any:
+    with _POOL_LOCK:
+        if key in pool:
+            return pool[key]
+    value = factory()
+    with _POOL_LOCK:
+        # 并发创建时保留先写入的实例
+        return pool.setdefault(key, value)
+
+
+def _get_shared_memory(name: str, config: Dict[str, Any]) -> FinancialSituationMemory:
+    """按 (名称, embedding 提供商, backend_url) 复用 FinancialSituationMemory"""
+    key = _config_fingerprint([name, config.get("llm_provider"), config.get("backend_url")])
+    return _get_pooled(_MEMORY_POOL, key, lambda: FinancialSituationMemory(name, config))
+
+
 class TradingAgentsGraph:
     """Main class that orchestrates the trading agents framework."""
 
@@ -218,7 +277,94 @@ class TradingAgentsGraph:
             exist_ok=True,
         )
 
-        # Initialize LLMs
+        # Initialize LLMs（按 LLM 相关配置在进程内复用）
+        self.quick_thinking_llm, self.deep_thinking_llm = _get_pooled(
+            _LLM_POOL, _llm_pool_key(self.config), self._create_llms
+        )
+
+        self.toolkit = Toolkit(config=self.config)
+
+        # Initialize memories (如果启用)
+        memory_enabled = self.config.get("memory_enabled", True)
+        if memory_enabled:
+            # 使用单例ChromaDB管理器，避免并发创建冲突；同一 embedding 配置下复用记忆句柄
+            self.bull_memory = _get_shared_memory("bull_memory", self.config)
+            self.bear_memory = _get_shared_memory("bear_memory", self.config)
+            self.trader_memory = _get_shared_memory("trader_memory", self.config)
+            self.invest_judge_memory = _get_shared_memory("invest_judge_memory", self.config)
+            self.risk_manager_memory = _get_shared_memory("risk_manager_memory", self.config)
+        else:
+            # 创建空的内存对象
+            self.bull_memory = None
+            self.bear_memory = None
+            self.trader_memory = None
+            self.invest_judge_memory = None
+            self.risk_manager_memory = None
+
+        # Create tool nodes
+        self.tool_nodes = self._create_tool_nodes()
+
+        # Initialize components
+        # 🔥 [修复] 从配置中读取辩论轮次参数
+        self.conditional_logic = ConditionalLogic(
+            max_debate_rounds=self.config.get("max_debate_rounds", 1),
+            max_risk_discuss_rounds=self.config.get("max_risk_discuss_rounds", 1)
+        )
+        logger.info(f"🔧 [ConditionalLogic] 初始化完成:")
+        logger.info(f"   - max_debate_rounds: {self.conditional_logic.max_debate_rounds}")
+        logger.info(f"   - max_risk_discuss_rounds: {self.conditional_logic.max_risk_discuss_rounds}")
+
+        self.graph_setup = GraphSetup(
+            self.quick_thinking_llm,
+            self.deep_thinking_llm,
+            self.toolkit,
+            self.tool_nodes,
+            self.bull_memory,
+            self.bear_memory,
+            self.trader_memory,
+            self.invest_judge_memory,
+            self.risk_manager_memory,
+            self.conditional_logic,
+            self.config,
+            getattr(self, 'react_llm', None),
+        )
+
+        self.propagator = Propagator()
+        self.reflector = Reflector(self.quick_thinking_llm)
+        self.signal_processor = SignalProcessor(self.quick_thinking_llm)
+
+        # State tracking：每次运行的可变状态放在 GraphRunContext 中（按线程隔离），
+        # 实例本身只保存可共享的编译图和组件
+        self._local = threading.local()
+        self._log_lock = threading.Lock()
+        self.log_states_dict = {}  # ticker -> {date: full state dict}
+
+        # Set up the graph
+        self.selected_analysts = list(selected_analysts)
+        self.graph = self.graph_setup.setup_graph(selected_analysts)
+
+    @property
+    def run_context(self) -> Optional[GraphRunContext]:
+        """当前线程最近一次 propagate 的运行上下文"""
+        return getattr(self._local, "run_context", None)
+
+    @property
+    def ticker(self) -> Optional[str]:
+        ctx = self.run_context
+        return ctx.ticker if ctx else None
+
+    @property
+    def curr_state(self) -> Optional[Dict[str, Any]]:
+        ctx = self.run_context
+        return ctx.curr_state if ctx else None
+
+    @property
+    def _current_task_id(self) -> Optional[str]:
+        ctx = self.run_context
+        return ctx.task_id if ctx else None
+
+    def _create_llms(self) -> Tuple[Any, Any]:
+        """根据配置创建快速/深度思考 LLM，返回 (quick_thinking_llm, deep_thinking_llm)"""
         # 🔧 从配置中读取模型参数（优先使用用户配置，否则使用默认值）
         quick_config = self.config.get("quick_model_config", {})
         deep_config = self.config.get("deep_model_config", {})
@@ -277,14 +423,16 @@ class TradingAgentsGraph:
                 base_url=self.config["backend_url"],
                 temperature=deep_temperature,
                 max_tokens=deep_max_tokens,
-                timeout=deep_timeout
+                timeout=deep_timeout,
+                **pooled_http_clients(self.config["llm_provider"], self.config["backend_url"])
             )
             self.quick_thinking_llm = ChatOpenAI(
                 model=self.config["quick_think_llm"],
                 base_url=self.config["backend_url"],
                 temperature=quick_temperature,
                 max_tokens=quick_max_tokens,
-                timeout=quick_timeout
+                timeout=quick_timeout,
+                **pooled_http_clients(self.config["llm_provider"], self.config["backend_url"])
             )
         elif self.config["llm_provider"] == "siliconflow":
             # SiliconFlow支持：使用OpenAI兼容API
@@ -302,7 +450,8 @@ class TradingAgentsGraph:
                 api_key=siliconflow_api_key,
                 temperature=deep_temperature,
                 max_tokens=deep_max_tokens,
-                timeout=deep_timeout
+                timeout=deep_timeout,
+                **pooled_http_clients(self.config["llm_provider"], self.config["backend_url"])
             )
             self.quick_thinking_llm = ChatOpenAI(
                 model=self.config["quick_think_llm"],
@@ -310,7 +459,8 @@ class TradingAgentsGraph:
                 api_key=siliconflow_api_key,
                 temperature=quick_temperature,
                 max_tokens=quick_max_tokens,
-                timeout=quick_timeout
+                timeout=quick_timeout,
+                **pooled_http_clients(self.config["llm_provider"], self.config["backend_url"])
             )
         elif self.config["llm_provider"] == "openrouter":
             # OpenRouter支持：优先使用OPENROUTER_API_KEY，否则使用OPENAI_API_KEY
@@ -328,7 +478,8 @@ class TradingAgentsGraph:
                 api_key=openrouter_api_key,
                 temperature=deep_temperature,
                 max_tokens=deep_max_tokens,
-                timeout=deep_timeout
+                timeout=deep_timeout,
+                **pooled_http_clients(self.config["llm_provider"], self.config["backend_url"])
             )
             self.quick_thinking_llm = ChatOpenAI(
                 model=self.config["quick_think_llm"],
@@ -336,7 +487,8 @@ class TradingAgentsGraph:
                 api_key=openrouter_api_key,
                 temperature=quick_temperature,
                 max_tokens=quick_max_tokens,
-                timeout=quick_timeout
+                timeout=quick_timeout,
+                **pooled_http_clients(self.config["llm_provider"], self.config["backend_url"])
             )
         elif self.config["llm_provider"] == "ollama":
             logger.info(f"🔧 [Ollama-快速模型] max_tokens={quick_max_tokens}, temperature={quick_temperature}, timeout={quick_timeout}s")
@@ -347,14 +499,16 @@ class TradingAgentsGraph:
                 base_url=self.config["backend_url"],
                 temperature=deep_temperature,
                 max_tokens=deep_max_tokens,
-                timeout=deep_timeout
+                timeout=deep_timeout,
+                **pooled_http_clients(self.config["llm_provider"], self.config["backend_url"])
             )
             self.quick_thinking_llm = ChatOpenAI(
                 model=self.config["quick_think_llm"],
                 base_url=self.config["backend_url"],
                 temperature=quick_temperature,
                 max_tokens=quick_max_tokens,
-                timeout=quick_timeout
+                timeout=quick_timeout,
+                **pooled_http_clients(self.config["llm_provider"], self.config["backend_url"])
             )
         elif self.config["llm_provider"].lower() == "anthropic":
             logger.info(f"🔧 [Anthropic-快速模型] max_tokens={quick_max_tokens}, temperature={quick_temperature}, timeout={quick_timeout}s")
@@ -751,65 +905,8 @@ class TradingAgentsGraph:
             )
 
             logger.info(f"✅ [自定义厂家 {provider_name}] 已配置自定义端点并应用用户配置的模型参数")
-        
-        self.toolkit = Toolkit(config=self.config)
-
-        # Initialize memories (如果启用)
-        memory_enabled = self.config.get("memory_enabled", True)
-        if memory_enabled:
-            # 使用单例ChromaDB管理器，避免并发创建冲突
-            self.bull_memory = FinancialSituationMemory("bull_memory", self.config)
-            self.bear_memory = FinancialSituationMemory("bear_memory", self.config)
-            self.trader_memory = FinancialSituationMemory("trader_memory", self.config)
-            self.invest_judge_memory = FinancialSituationMemory("invest_judge_memory", self.config)
-            self.risk_manager_memory = FinancialSituationMemory("risk_manager_memory", self.config)
-        else:
-            # 创建空的内存对象
-            self.bull_memory = None
-            self.bear_memory = None
-            self.trader_memory = None
-            self.invest_judge_memory = None
-            self.risk_manager_memory = None
-
-        # Create tool nodes
-        self.tool_nodes = self._create_tool_nodes()
-
-        # Initialize components
-        # 🔥 [修复] 从配置中读取辩论轮次参数
-        self.conditional_logic = ConditionalLogic(
-            max_debate_rounds=self.config.get("max_debate_rounds", 1),
-            max_risk_discuss_rounds=self.config.get("max_risk_discuss_rounds", 1)
-        )
-        logger.info(f"🔧 [ConditionalLogic] 初始化完成:")
-        logger.info(f"   - max_debate_rounds: {self.conditional_logic.max_debate_rounds}")
-        logger.info(f"   - max_risk_discuss_rounds: {self.conditional_logic.max_risk_discuss_rounds}")
 
-        self.graph_setup = GraphSetup(
-            self.quick_thinking_llm,
-            self.deep_thinking_llm,
-            self.toolkit,
-            self.tool_nodes,
-            self.bull_memory,
-            self.bear_memory,
-            self.trader_memory,
-            self.invest_judge_memory,
-            self.risk_manager_memory,
-            self.conditional_logic,
-            self.config,
-            getattr(self, 'react_llm', None),
-        )
-
-        self.propagator = Propagator()
-        self.reflector = Reflector(self.quick_thinking_llm)
-        self.signal_processor = SignalProcessor(self.quick_thinking_llm)
-
-        # State tracking
-        self.curr_state = None
-        self.ticker = None
-        self.log_states_dict = {}  # date to full state dict
-
-        # Set up the graph
-        self.graph = self.graph_setup.setup_graph(selected_analysts)
+        return self.quick_thinking_llm, self.deep_thinking_llm
 
     def _create_tool_nodes(self) -> Dict[str, ToolNode]:
         """Create tool nodes for different data sources.
@@ -878,33 +975,75 @@ class TradingAgentsGraph:
             progress_callback: Optional callback function for progress updates
             task_id: Optional task ID for tracking performance data
         """
+        # 分析师统一工具数据预取：与第一次 LLM 调用并行，工具节点命中时直接返回
+        prefetch = None
+        if self.config.get("tool_prefetch", True):
+            prefetch = start_prefetch(
+                self.toolkit, self.selected_analysts, company_name, str(trade_date), llm=self.quick_thinking_llm
+            )
+        token = set_current_prefetch(prefetch)
+        try:
+            return self._propagate(company_name, trade_date, progress_callback, task_id)
+        finally:
+            reset_current_prefetch(token)
+            if prefetch is not None:
+                logger.info(f"📊 [预取] 统计: {prefetch.stats}")
+
+    async def apropagate(self, company_name, trade_date, progress_callback=None, task_id=None):
+        """propagate 的异步版本：在事件循环上运行图（graph.astream）
+
+        研究员、经理、交易员和风险分析师节点通过 llm.ainvoke 等待模型，不占用线程；
+        分析师和工具节点仍是同步节点，由 LangGraph 放到线程池执行。
+        多个任务在同一事件循环上并发时，请使用返回的状态而不是 curr_state。
+        """
+        prefetch = None
+        if self.config.get("tool_prefetch", True):
+            prefetch = start_prefetch(
+                self.toolkit, self.selected_analysts, company_name, str(trade_date), llm=self.quick_thinking_llm
+            )
+        token = set_current_prefetch(prefetch)
+        try:
+            # 初始状态构造包含数据库/网络查询，放到线程中执行
+            ctx, init_agent_state = await asyncio.to_thread(self._start_run, company_name, trade_date, task_id)
+            self._local.run_context = ctx
+
+            args = self.propagator.get_graph_args(use_progress_callback=True)
+            final_state = init_agent_state.copy()
+            current_node_name = None
+            current_node_start = None
+            async for chunk in self.graph.astream(init_agent_state, **args):
+                for node_name, node_update in chunk.items():
+                    if node_name.startswith('__'):
+                        continue
+                    # 与同步路径一致：收到下一个节点的更新时记录上一个节点的耗时
+                    if current_node_name and current_node_start:
+                        elapsed = time.time() - current_node_start
+                        ctx.node_timings[current_node_name] = elapsed
+                        logger.info(f"⏱️ [{current_node_name}] 耗时: {elapsed:.2f}秒")
+                    current_node_name = node_name
+                    current_node_start = time.time()
+                    if node_update:
+                        final_state.update(node_update)
+                if progress_callback:
+                    self._send_progress_update(chunk, progress_callback)
 
-        # 添加详细的接收日志
-        logger.debug(f"🔍 [GRAPH DEBUG] ===== TradingAgentsGraph.propagate 接收参数 =====")
-        logger.debug(f"🔍 [GRAPH DEBUG] 接收到的company_name: '{company_name}' (类型: {type(company_name)})")
-        logger.debug(f"🔍 [GRAPH DEBUG] 接收到的trade_date: '{trade_date}' (类型: {type(trade_date)})")
-        logger.debug(f"🔍 [GRAPH DEBUG] 接收到的task_id: '{task_id}'")
-
-        self.ticker = company_name
-        logger.debug(f"🔍 [GRAPH DEBUG] 设置self.ticker: '{self.ticker}'")
+            # 信号处理会同步调用 LLM，同样放到线程中
+            return await asyncio.to_thread(
+                self._finish_run, ctx, company_name, trade_date, final_state, current_node_name, current_node_start
+            )
+        finally:
+            reset_current_prefetch(token)
+            if prefetch is not None:
+                logger.info(f"📊 [预取] 统计: {prefetch.stats}")
 
-        # Initialize state
-        logger.debug(f"🔍 [GRAPH DEBUG] 创建初始状态，传递参数: company_name='{company_name}', trade_date='{trade_date}'")
-        init_agent_state = self.propagator.create_initial_state(
-            company_name, trade_date
-        )
-        logger.debug(f"🔍 [GRAPH DEBUG] 初始状态中的company_of_interest: '{init_agent_state.get('company_of_interest', 'NOT_FOUND')}'")
-        logger.debug(f"🔍 [GRAPH DEBUG] 初始状态中的trade_date: '{init_agent_state.get('trade_date', 'NOT_FOUND')}'")
+    def _propagate(self, company_name, trade_date, progress_callback=None, task_id=None):
+        ctx, init_agent_state = self._start_run(company_name, trade_date, task_id)
 
         # 初始化计时器
-        node_timings = {}  # 记录每个节点的执行时间
-        total_start_time = time.time()  # 总体开始时间
+        node_timings = ctx.node_timings  # 记录每个节点的执行时间
         current_node_start = None  # 当前节点开始时间
         current_node_name = None  # 当前节点名称
 
-        # 保存task_id用于后续保存性能数据
-        self._current_task_id = task_id
-
         # 根据是否有进度回调选择不同的stream_mode
         args = self.propagator.get_graph_args(use_progress_callback=bool(progress_callback))
 
@@ -1008,6 +1147,43 @@ class TradingAgentsGraph:
                         if not node_name.startswith('__'):
                             final_state.update(node_update)
 
+        return self._finish_run(ctx, company_name, trade_date, final_state, current_node_name, current_node_start)
+
+    def _start_run(self, company_name, trade_date, task_id=None):
+        """准备一次运行：运行上下文、配置和初始状态"""
+
+        # 添加详细的接收日志
+        logger.debug(f"🔍 [GRAPH DEBUG] ===== TradingAgentsGraph.propagate 接收参数 =====")
+        logger.debug(f"🔍 [GRAPH DEBUG] 接收到的company_name: '{company_name}' (类型: {type(company_name)})")
+        logger.debug(f"🔍 [GRAPH DEBUG] 接收到的trade_date: '{trade_date}' (类型: {type(trade_date)})")
+        logger.debug(f"🔍 [GRAPH DEBUG] 接收到的task_id: '{task_id}'")
+
+        # 本次运行的可变状态（实例可能被多个任务共享）
+        ctx = GraphRunContext(ticker=company_name, trade_date=str(trade_date), task_id=task_id)
+        self._local.run_context = ctx
+        logger.debug(f"🔍 [GRAPH DEBUG] 设置运行上下文 ticker: '{ctx.ticker}'")
+
+        # 共享实例在其他配置的任务之后复用时，重新应用本实例的数据源/工具配置
+        set_config(self.config)
+        Toolkit.update_config(self.config)
+
+        # Initialize state
+        logger.debug(f"🔍 [GRAPH DEBUG] 创建初始状态，传递参数: company_name='{company_name}', trade_date='{trade_date}'")
+        init_agent_state = self.propagator.create_initial_state(
+            company_name, trade_date
+        )
+        logger.debug(f"🔍 [GRAPH DEBUG] 初始状态中的company_of_interest: '{init_agent_state.get('company_of_interest', 'NOT_FOUND')}'")
+        logger.debug(f"🔍 [GRAPH DEBUG] 初始状态中的trade_date: '{init_agent_state.get('trade_date', 'NOT_FOUND')}'")
+
+        return ctx, init_agent_state
+
+    def _finish_run(self, ctx, company_name, trade_date, final_state, current_node_name=None, current_node_start=None):
+        """结束一次运行：计时汇总、性能数据、日志和信号处理"""
+        # apropagate 在线程池中调用：工作线程上的运行上下文可能属于其他任务
+        self._local.run_context = ctx
+        node_timings = ctx.node_timings
+        total_start_time = ctx.start_time
+
         # 记录最后一个节点的时间
         if current_node_name and current_node_start:
             elapsed = time.time() - current_node_start
@@ -1034,10 +1210,10 @@ class TradingAgentsGraph:
         final_state['performance_metrics'] = performance_data
 
         # Store current state for reflection
-        self.curr_state = final_state
+        ctx.curr_state = final_state
 
         # Log state
-        self._log_state(trade_date, final_state)
+        self._log_state(trade_date, final_state, ticker=ctx.ticker)
 
         # 获取模型信息
         model_info = ""
@@ -1332,9 +1508,10 @@ class TradingAgentsGraph:
         logger.info(f"  • 快速思考模型: {self.config.get('quick_think_llm', 'unknown')}")
         logger.info("=" * 80)
 
-    def _log_state(self, trade_date, final_state):
+    def _log_state(self, trade_date, final_state, ticker=None):
         """Log the final state to a JSON file."""
-        self.log_states_dict[str(trade_date)] = {
+        ticker = ticker or self.ticker
+        entry = {
             "company_of_interest": final_state["company_of_interest"],
             "trade_date": final_state["trade_date"],
             "market_report": final_state["market_report"],
@@ -1364,15 +1541,18 @@ class TradingAgentsGraph:
             "final_trade_decision": final_state["final_trade_decision"],
         }
 
-        # Save to file
-        directory = Path(f"eval_results/{self.ticker}/TradingAgentsStrategy_logs/")
+        # Save to file（按股票分别记录，共享实例下避免并发写同一个字典/文件）
+        directory = Path(f"eval_results/{ticker}/TradingAgentsStrategy_logs/")
         directory.mkdir(parents=True, exist_ok=True)
 
-        with open(
-            f"eval_results/{self.ticker}/TradingAgentsStrategy_logs/full_states_log.json",
-            "w",
-        ) as f:
-            json.dump(self.log_states_dict, f, indent=4)
+        with self._log_lock:
+            ticker_states = self.log_states_dict.setdefault(ticker, {})
+            ticker_states[str(trade_date)] = entry
+            with open(
+                f"eval_results/{ticker}/TradingAgentsStrategy_logs/full_states_log.json",
+                "w",
+            ) as f:
+                json.dump(ticker_states, f, indent=4)
 
     def reflect_and_remember(self, returns_losses):
         """Reflect on decisions and update memory based on returns."""
@@ -1395,3 +1575,44 @@ class TradingAgentsGraph:
     def process_signal(self, full_signal, stock_symbol=None):
         """Process a signal to extract the core decision."""
         return self.signal_processor.process_signal(full_signal, stock_symbol)
+
+
+def get_shared_trading_graph(
+    selected_analysts: Optional[List[str]] = None,
+    debug: bool = False,
+    config: Dict[str, Any] = None,
+) -> TradingAgentsGraph:
+    """获取进程内共享的 TradingAgentsGraph（按分析师组合 + 配置缓存编译好的图）
+
+    图实例只保存不可变组件，每次 propagate 的状态保存在线程本地的 GraphRunContext 中，
+    因此多个任务可以并发复用同一实例。
+    """
+    selected_analysts = list(selected_analysts or ["market", "social", "news", "fundamentals"])
+    config = config or DEFAULT_CONFIG
+    key = _config_fingerprint([sorted(selected_analysts), bool(debug), config])
+
+    with _POOL_LOCK:
+        graph = _SHARED_GRAPHS.get(key)
+        if graph is not None:
+            _SHARED_GRAPHS.move_to_end(key)
+            logger.info(f"♻️ 复用已编译的TradingAgents图（实例ID: {id(graph)}）")
+            return graph
+
+    start = time.time()
+    graph = TradingAgentsGraph(selected_analysts=selected_analysts, debug=debug, config=config)
+    logger.info(f"✅ 已编译TradingAgents图并缓存，耗时 {time.time() - start:.2f}秒（实例ID: {id(graph)}）")
+
+    with _POOL_LOCK:
+        graph = _SHARED_GRAPHS.setdefault(key, graph)
+        _SHARED_GRAPHS.move_to_end(key)
+        while len(_SHARED_GRAPHS) > _SHARED_GRAPH_MAX_SIZE:
+            _SHARED_GRAPHS.popitem(last=False)
+    return graph
+
+
+def clear_shared_trading_graphs() -> None:
+    """清空共享的图、LLM 客户端和记忆句柄（配置变更后调用）"""
+    with _POOL_LOCK:
+        _SHARED_GRAPHS.clear()
+        _LLM_POOL.clear()
+        _MEMORY_POOL.clear()
@@ -10,6 +10,8 @@ from langchain_openai import ChatOpenAI
 from langchain_core.tools import BaseTool
 from pydantic import Field, SecretStr
 from ..config.config_manager import token_tracker
+from .response_cache import get_llm_response_cache
+from .http_pool import pooled_http_clients
 
 # 导入日志模块
 from tradingagents.utils.logging_manager import get_logger
@@ -89,6 +91,10 @@ class ChatDashScopeOpenAI(ChatOpenAI):
                 "(Settings -> LLM Providers) or set DASHSCOPE_API_KEY environment variable."
             )
 
+        # 按 base_url 共享 keep-alive 连接池（调用方显式传入客户端时不覆盖）
+        for key, client in pooled_http_clients("dashscope", final_base_url).items():
+            kwargs.setdefault(key, client)
+
         # 调用父类初始化
         super().__init__(**kwargs)
 
@@ -101,11 +107,42 @@ class ChatDashScopeOpenAI(ChatOpenAI):
     
     def _generate(self, *args, **kwargs):
         """重写生成方法，添加 token 使用量追踪"""
-        
+
+        # 响应缓存（未开启或温度非0时直接跳过）
+        response_cache = get_llm_response_cache()
+        cache_key, cached = self._lookup_response_cache(response_cache, args, kwargs)
+        if cached is not None:
+            return cached
+
         # 调用父类的生成方法
         result = super()._generate(*args, **kwargs)
-        
+
         # 追踪 token 使用量
+        self._track_token_usage(result, args, kwargs)
+
+        response_cache.store(cache_key, result)
+        return result
+
+    async def _agenerate(self, *args, **kwargs):
+        """异步生成（ainvoke 路径，使用异步连接池），添加 token 使用量追踪"""
+        response_cache = get_llm_response_cache()
+        cache_key, cached = self._lookup_response_cache(response_cache, args, kwargs)
+        if cached is not None:
+            return cached
+
+        result = await super()._agenerate(*args, **kwargs)
+        self._track_token_usage(result, args, kwargs)
+
+        response_cache.store(cache_key, result)
+        return result
+
+    def _lookup_response_cache(self, response_cache, args, kwargs):
+        messages = args[0] if args else kwargs.get("messages", [])
+        stop = args[1] if len(args) > 1 else kwargs.get("stop")
+        params = {k: v for k, v in kwargs.items() if k not in ("messages", "stop", "run_manager")}
+        return response_cache.lookup(self, "dashscope", messages, stop, params)
+
+    def _track_token_usage(self, result, args, kwargs):
         try:
             # 从结果中提取 token 使用信息
             if hasattr(result, 'llm_output') and result.llm_output:
@@ -132,8 +169,6 @@ class ChatDashScopeOpenAI(ChatOpenAI):
         except Exception as track_error:
             # token 追踪失败不应该影响主要功能
             logger.error(f"⚠️ Token 追踪失败: {track_error}")
-        
-        return result
 
 
 # 支持的模型列表
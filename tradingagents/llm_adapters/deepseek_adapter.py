@@ -8,13 +8,15 @@ from typing import Any, Dict, List, Optional, Union
 from langchain_core.messages import BaseMessage, AIMessage, HumanMessage, SystemMessage
 from langchain_core.outputs import ChatGeneration, ChatResult
 from langchain_openai import ChatOpenAI
-from langchain_core.callbacks import CallbackManagerForLLMRun
+from langchain_core.callbacks import AsyncCallbackManagerForLLMRun, CallbackManagerForLLMRun
 
 # 导入统一日志系统
 from tradingagents.utils.logging_init import setup_llm_logging
 
 # 导入日志模块
 from tradingagents.utils.logging_manager import get_logger, get_logger_manager
+from tradingagents.llm_adapters.response_cache import get_llm_response_cache
+from tradingagents.llm_adapters.http_pool import pooled_http_clients
 logger = get_logger('agents')
 logger = setup_llm_logging()
 
@@ -92,6 +94,10 @@ class ChatDeepSeek(ChatOpenAI):
                     "(设置 -> 大模型厂家) 或设置 DEEPSEEK_API_KEY 环境变量。"
                 )
         
+        # 按 base_url 共享 keep-alive 连接池（调用方显式传入客户端时不覆盖）
+        for key, client in pooled_http_clients("deepseek", base_url).items():
+            kwargs.setdefault(key, client)
+
         # 初始化父类
         super().__init__(
             model=model,
@@ -122,72 +128,118 @@ class ChatDeepSeek(ChatOpenAI):
         session_id = kwargs.pop('session_id', None)
         analysis_type = kwargs.pop('analysis_type', None)
 
+        # 响应缓存（未开启或温度非0时直接跳过）
+        response_cache = get_llm_response_cache()
+        cache_key, cached = response_cache.lookup(self, "deepseek", messages, stop, kwargs)
+        if cached is not None:
+            return cached
+
         try:
             # 调用父类方法生成响应
             result = super()._generate(messages, stop, run_manager, **kwargs)
             
-            # 提取token使用量
-            input_tokens = 0
-            output_tokens = 0
-            
-            # 尝试从响应中提取token使用量
-            if hasattr(result, 'llm_output') and result.llm_output:
-                token_usage = result.llm_output.get('token_usage', {})
-                if token_usage:
-                    input_tokens = token_usage.get('prompt_tokens', 0)
-                    output_tokens = token_usage.get('completion_tokens', 0)
-            
-            # 如果没有获取到token使用量，进行估算
-            if input_tokens == 0 and output_tokens == 0:
-                input_tokens = self._estimate_input_tokens(messages)
-                output_tokens = self._estimate_output_tokens(result)
-                logger.debug(f"🔍 [DeepSeek] 使用估算token: 输入={input_tokens}, 输出={output_tokens}")
-            else:
-                logger.info(f"📊 [DeepSeek] 实际token使用: 输入={input_tokens}, 输出={output_tokens}")
+            self._record_token_usage(messages, result, session_id, analysis_type)
+
+            response_cache.store(cache_key, result)
+            return result
             
-            # 记录token使用量
-            if TOKEN_TRACKING_ENABLED and (input_tokens > 0 or output_tokens > 0):
-                try:
-                    # 使用提取的参数或生成默认值
-                    if session_id is None:
-                        session_id = f"deepseek_{hash(str(messages))%10000}"
-                    if analysis_type is None:
-                        analysis_type = 'stock_analysis'
+        except Exception as e:
+            logger.error(f"❌ [DeepSeek] 调用失败: {e}", exc_info=True)
+            raise
 
-                    # 记录使用量
-                    usage_record = token_tracker.track_usage(
-                        provider="deepseek",
-                        model_name=self.model_name,
-                        input_tokens=input_tokens,
-                        output_tokens=output_tokens,
-                        session_id=session_id,
-                        analysis_type=analysis_type
-                    )
+    async def _agenerate(
+        self,
+        messages: List[BaseMessage],
+        stop: Optional[List[str]] = None,
+        run_manager: Optional[AsyncCallbackManagerForLLMRun] = None,
+        **kwargs: Any,
+    ) -> ChatResult:
+        """
+        异步生成聊天响应（ainvoke 路径），并记录token使用量
+        """
+        session_id = kwargs.pop('session_id', None)
+        analysis_type = kwargs.pop('analysis_type', None)
 
-                    if usage_record:
-                        if usage_record.cost == 0.0:
-                            logger.warning(f"⚠️ [DeepSeek] 成本计算为0，可能配置有问题")
-                        else:
-                            logger.info(f"💰 [DeepSeek] 本次调用成本: ¥{usage_record.cost:.6f}")
+        response_cache = get_llm_response_cache()
+        cache_key, cached = response_cache.lookup(self, "deepseek", messages, stop, kwargs)
+        if cached is not None:
+            return cached
 
-                        # 使用统一日志管理器的Token记录方法
-                        logger_manager = get_logger_manager()
-                        logger_manager.log_token_usage(
-                            logger, "deepseek", self.model_name,
-                            input_tokens, output_tokens, usage_record.cost,
-                            session_id
-                        )
-                    else:
-                        logger.warning(f"⚠️ [DeepSeek] 未创建使用记录")
+        try:
+            result = await super()._agenerate(messages, stop, run_manager, **kwargs)
+            self._record_token_usage(messages, result, session_id, analysis_type)
 
-                except Exception as track_error:
-                    logger.error(f"⚠️ [DeepSeek] Token统计失败: {track_error}", exc_info=True)
-            
+            response_cache.store(cache_key, result)
             return result
-            
+
         except Exception as e:
-            logger.error(f"❌ [DeepSeek] 调用失败: {e}", exc_info=True)
+            logger.error(f"❌ [DeepSeek] 异步调用失败: {e}", exc_info=True)
             raise
+
+    def _record_token_usage(
+        self,
+        messages: List[BaseMessage],
+        result: ChatResult,
+        session_id: Optional[str],
+        analysis_type: Optional[str],
+    ) -> None:
+        """提取（或估算）token使用量并记录到 TokenTracker"""
+        # 提取token使用量
+        input_tokens = 0
+        output_tokens = 0
+        
+        # 尝试从响应中提取token使用量
+        if hasattr(result, 'llm_output') and result.llm_output:
+            token_usage = result.llm_output.get('token_usage', {})
+            if token_usage:
+                input_tokens = token_usage.get('prompt_tokens', 0)
+                output_tokens = token_usage.get('completion_tokens', 0)
+        
+        # 如果没有获取到token使用量，进行估算
+        if input_tokens == 0 and output_tokens == 0:
+            input_tokens = self._estimate_input_tokens(messages)
+            output_tokens = self._estimate_output_tokens(result)
+            logger.debug(f"🔍 [DeepSeek] 使用估算token: 输入={input_tokens}, 输出={output_tokens}")
+        else:
+            logger.info(f"📊 [DeepSeek] 实际token使用: 输入={input_tokens}, 输出={output_tokens}")
+        
+        # 记录token使用量
+        if TOKEN_TRACKING_ENABLED and (input_tokens > 0 or output_tokens > 0):
+            try:
+                # 使用提取的参数或生成默认值
+                if session_id is None:
+                    session_id = f"deepseek_{hash(str(messages))%10000}"
+                if analysis_type is None:
+                    analysis_type = 'stock_analysis'
+
+                # 记录使用量
+                usage_record = token_tracker.track_usage(
+                    provider="deepseek",
+                    model_name=self.model_name,
+                    input_tokens=input_tokens,
+                    output_tokens=output_tokens,
+                    session_id=session_id,
+                    analysis_type=analysis_type
+                )
+
+                if usage_record:
+                    if usage_record.cost == 0.0:
+                        logger.warning(f"⚠️ [DeepSeek] 成本计算为0，可能配置有问题")
+                    else:
+                        logger.info(f"💰 [DeepSeek] 本次调用成本: ¥{usage_record.cost:.6f}")
+
+                    # 使用统一日志管理器的Token记录方法
+                    logger_manager = get_logger_manager()
+                    logger_manager.log_token_usage(
+                        logger, "deepseek", self.model_name,
+                        input_tokens, output_tokens, usage_record.cost,
+                        session_id
+                    )
+                else:
+                    logger.warning(f"⚠️ [DeepSeek] 未创建使用记录")
+
+            except Exception as track_error:
+                logger.error(f"⚠️ [DeepSeek] Token统计失败: {track_error}", exc_info=True)
     
     def _estimate_input_tokens(self, messages: List[BaseMessage]) -> int:
         """
@@ -12,6 +12,7 @@ from langchain_core.messages import BaseMessage, AIMessage, HumanMessage, System
 from langchain_core.outputs import LLMResult
 from pydantic import Field, SecretStr
 from ..config.config_manager import token_tracker
+from .response_cache import get_llm_response_cache
 
 # 导入日志模块
 from tradingagents.utils.logging_manager import get_logger
@@ -159,47 +160,79 @@ class ChatGoogleOpenAI(ChatGoogleGenerativeAI):
     def _generate(self, messages: List[BaseMessage], stop: Optional[List[str]] = None, **kwargs) -> LLMResult:
         """重写生成方法，优化工具调用处理和内容格式"""
 
+        # 响应缓存（未开启或温度非0时直接跳过）
+        response_cache = get_llm_response_cache()
+        params = {k: v for k, v in kwargs.items() if k != "run_manager"}
+        cache_key, cached = response_cache.lookup(self, "google", messages, stop, params)
+        if cached is not None:
+            return cached
+
         try:
             # 调用父类的生成方法
             result = super()._generate(messages, stop, **kwargs)
+            self._postprocess_result(result, kwargs)
+
+            response_cache.store(cache_key, result)
+            return result
+
+        except Exception as e:
+            return self._error_result(e)
+
+    async def _agenerate(self, messages: List[BaseMessage], stop: Optional[List[str]] = None, **kwargs) -> LLMResult:
+        """异步生成（ainvoke 路径），与 _generate 相同的内容优化和 token 追踪"""
 
-            # 优化返回内容格式
-            # 注意：result.generations 是二维列表 [[ChatGeneration]]
-            if result and result.generations:
-                for generation_list in result.generations:
-                    if isinstance(generation_list, list):
-                        for generation in generation_list:
-                            if hasattr(generation, 'message') and generation.message:
-                                # 优化消息内容格式
-                                self._optimize_message_content(generation.message)
-                    else:
-                        # 兼容性处理：如果不是列表，直接处理
-                        if hasattr(generation_list, 'message') and generation_list.message:
-                            self._optimize_message_content(generation_list.message)
-
-            # 追踪 token 使用量
-            self._track_token_usage(result, kwargs)
+        response_cache = get_llm_response_cache()
+        params = {k: v for k, v in kwargs.items() if k != "run_manager"}
+        cache_key, cached = response_cache.lookup(self, "google", messages, stop, params)
+        if cached is not None:
+            return cached
 
+        try:
+            result = await super()._agenerate(messages, stop, **kwargs)
+            self._postprocess_result(result, kwargs)
+
+            response_cache.store(cache_key, result)
             return result
 
         except Exception as e:
-            logger.error(f"❌ Google AI 生成失败: {e}")
-            logger.exception(e)  # 打印完整的堆栈跟踪
-
-            # 检查是否为 API Key 无效错误
-            error_str = str(e)
-            if 'API_KEY_INVALID' in error_str or 'API key not valid' in error_str:
-                error_content = "Google AI API Key 无效或未配置。\n\n请检查：\n1. GOOGLE_API_KEY 环境变量是否正确配置\n2. API Key 是否有效（访问 https://ai.google.dev/ 获取）\n3. 是否启用了 Gemini API\n\n建议：使用其他 AI 模型（如阿里百炼、DeepSeek）"
-            elif 'Connection' in error_str or 'Network' in error_str:
-                error_content = f"Google AI 网络连接失败: {error_str}\n\n请检查：\n1. 网络连接是否正常\n2. 是否需要科学上网\n3. 防火墙设置"
-            else:
-                error_content = f"Google AI 调用失败: {error_str}\n\n请检查配置或使用其他 AI 模型"
+            return self._error_result(e)
+
+    def _postprocess_result(self, result, kwargs: Dict[str, Any]) -> None:
+        # 优化返回内容格式
+        # 注意：result.generations 是二维列表 [[ChatGeneration]]
+        if result and result.generations:
+            for generation_list in result.generations:
+                if isinstance(generation_list, list):
+                    for generation in generation_list:
+                        if hasattr(generation, 'message') and generation.message:
+                            # 优化消息内容格式
+                            self._optimize_message_content(generation.message)
+                else:
+                    # 兼容性处理：如果不是列表，直接处理
+                    if hasattr(generation_list, 'message') and generation_list.message:
+                        self._optimize_message_content(generation_list.message)
+
+        # 追踪 token 使用量
+        self._track_token_usage(result, kwargs)
+
+    def _error_result(self, e: Exception) -> LLMResult:
+        logger.error(f"❌ Google AI 生成失败: {e}")
+        logger.exception(e)  # 打印完整的堆栈跟踪
+
+        # 检查是否为 API Key 无效错误
+        error_str = str(e)
+        if 'API_KEY_INVALID' in error_str or 'API key not valid' in error_str:
+            error_content = "Google AI API Key 无效或未配置。\n\n请检查：\n1. GOOGLE_API_KEY 环境变量是否正确配置\n2. API Key 是否有效（访问 https://ai.google.dev/ 获取）\n3. 是否启用了 Gemini API\n\n建议：使用其他 AI 模型（如阿里百炼、DeepSeek）"
+        elif 'Connection' in error_str or 'Network' in error_str:
+            error_content = f"Google AI 网络连接失败: {error_str}\n\n请检查：\n1. 网络连接是否正常\n2. 是否需要科学上网\n3. 防火墙设置"
+        else:
+            error_content = f"Google AI 调用失败: {error_str}\n\n请检查配置或使用其他 AI 模型"
 
-            # 返回一个包含错误信息的结果，而不是抛出异常
-            from langchain_core.outputs import ChatGeneration
-            error_message = AIMessage(content=error_content)
-            error_generation = ChatGeneration(message=error_message)
-            return LLMResult(generations=[[error_generation]])
+        # 返回一个包含错误信息的结果，而不是抛出异常
+        from langchain_core.outputs import ChatGeneration
+        error_message = AIMessage(content=error_content)
+        error_generation = ChatGeneration(message=error_message)
+        return LLMResult(generations=[[error_generation]])
     
     def _optimize_message_content(self, message: BaseMessage):
         """优化消息内容格式，确保包含新闻特征关键词"""
@@ -0,0 +1,150 @@
+"""
+LLM 适配器共享的 HTTP 连接池
+
+每个 TradingAgentsGraph 都会新建 LLM 客户端；按 (provider, base_url) 共享 keep-alive 的
+httpx.Client / httpx.AsyncClient，并发分析复用同一组 TCP/TLS 连接，连接数上限可配置：
+    LLM_HTTP_MAX_CONNECTIONS      单个 provider/base_url 的最大连接数，默认 50
+    LLM_HTTP_MAX_KEEPALIVE        保持的空闲连接数，默认 20
+    LLM_HTTP_KEEPALIVE_EXPIRY     空闲连接保持时间（秒），默认 30
+    LLM_HTTP_POOL_ENABLED         设为 false 时退回 langchain-openai 的默认客户端
+
+请求超时仍由各 LLM 实例的 timeout 参数控制（openai SDK 按请求传递）。
+异步连接绑定在创建它的事件循环上：共享的 AsyncClient 按当前运行的事件循环分别维护连接池
+（LoopLocalTransport），同一个 LLM 实例可以在多个事件循环 / 线程中使用 ainvoke。
+"""
+
+import asyncio
+import os
+import threading
+import weakref
+from typing import Any, Dict, Optional, Tuple
+
+import httpx
+
+from tradingagents.utils.logging_manager import get_logger
+
+logger = get_logger('agents')
+
+_clients: Dict[Tuple[str, str], httpx.Client] = {}
+_async_clients: Dict[Tuple[str, str], httpx.AsyncClient] = {}
+_lock = threading.Lock()
+
+
+def _limits() -> httpx.Limits:
+    return httpx.Limits(
+        max_connections=int(os.getenv("LLM_HTTP_MAX_CONNECTIONS", "50")),
+        max_keepalive_connections=int(os.getenv("LLM_HTTP_MAX_KEEPALIVE", "20")),
+        keepalive_expiry=float(os.getenv("LLM_HTTP_KEEPALIVE_EXPIRY", "30")),
+    )
+
+
+def _key(provider: str, base_url: Optional[str]) -> Tuple[str, str]:
+    return (provider or "openai").lower(), (base_url or "").rstrip("/")
+
+
+def get_http_client(provider: str, base_url: Optional[str]) -> httpx.Client:
+    """同步客户端（invoke 路径）"""
+    import openai
+
+    key = _key(provider, base_url)
+    with _lock:
+        client = _clients.get(key)
+        if client is None or client.is_closed:
+            client = openai.DefaultHttpxClient(limits=_limits())
+            _clients[key] = client
+            logger.info(f"🔌 [HTTP连接池] 创建同步连接池: {key[0]} {key[1] or '(默认地址)'}")
+        return client
+
+
+class LoopLocalTransport(httpx.AsyncBaseTransport):
+    """
+    按事件循环分别维护连接池的异步传输层
+
+    httpcore 的连接和锁绑定在创建它们的事件循环上，跨事件循环复用会报错。
+    每个事件循环首次请求时创建一个内部 AsyncClient（保留环境变量代理等默认行为），
+    事件循环被回收后对应的连接池随之释放。
+    """
+
+    def __init__(self, limits: httpx.Limits):
+        self._limits = limits
+        self._clients: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, httpx.AsyncClient]" = (
+            weakref.WeakKeyDictionary()
+        )
+        self._lock = threading.Lock()
+
+    def _client_for_running_loop(self) -> httpx.AsyncClient:
+        loop = asyncio.get_running_loop()
+        with self._lock:
+            client = self._clients.get(loop)
+            if client is None or client.is_closed:
+                # 重定向、超时由外层客户端处理（超时随请求的 extensions 传递）
+                client = httpx.AsyncClient(limits=self._limits, follow_redirects=False)
+                self._clients[loop] = client
+            return client
+
+    def loop_count(self) -> int:
+        with self._lock:
+            return sum(1 for loop, client in self._clients.items() if not loop.is_closed() and not client.is_closed)
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        return await self._client_for_running_loop().send(request, stream=True)
+
+    async def aclose(self) -> None:
+        """关闭当前事件循环的连接池"""
+        loop = asyncio.get_running_loop()
+        with self._lock:
+            client = self._clients.pop(loop, None)
+        if client is not None:
+            await client.aclose()
+
+
+def get_async_http_client(provider: str, base_url: Optional[str]) -> httpx.AsyncClient:
+    """异步客户端（ainvoke 路径，连接池按事件循环隔离）"""
+    import openai
+
+    key = _key(provider, base_url)
+    with _lock:
+        client = _async_clients.get(key)
+        if client is None or client.is_closed:
+            client = openai.DefaultAsyncHttpxClient(transport=LoopLocalTransport(_limits()))
+            _async_clients[key] = client
+            logger.info(f"🔌 [HTTP连接池] 创建异步连接池: {key[0]} {key[1] or '(默认地址)'}")
+        return client
+
+
+def pooled_http_clients(provider: str, base_url: Optional[str]) -> Dict[str, Any]:
+    """
+    ChatOpenAI 系列构造参数：{"http_client", "http_async_client"}
+
+    配置了代理（OPENAI_PROXY）或关闭连接池时返回空字典，由 langchain-openai 自行创建客户端
+    """
+    if os.getenv("LLM_HTTP_POOL_ENABLED", "true").lower() != "true" or os.getenv("OPENAI_PROXY"):
+        return {}
+    return {
+        "http_client": get_http_client(provider, base_url),
+        "http_async_client": get_async_http_client(provider, base_url),
+    }
+
+
+def get_pool_stats() -> Dict[str, Any]:
+    with _lock:
+        return {
+            "sync": [f"{p}|{u}" for (p, u), c in _clients.items() if not c.is_closed],
+            "async": [f"{p}|{u}" for (p, u), c in _async_clients.items() if not c.is_closed],
+            "async_loops": sum(
+                c._transport.loop_count() for c in _async_clients.values()
+                if isinstance(c._transport, LoopLocalTransport)
+            ),
+        }
+
+
+def close_http_clients() -> None:
+    """关闭同步连接池（异步客户端随事件循环关闭时释放）"""
+    with _lock:
+        for client in _clients.values():
+            try:
+                client.close()
+            except Exception as e:
+                logger.warning(f"⚠️ 关闭HTTP连接池失败: {e}")
+        _clients.clear()
+        _async_clients.clear()
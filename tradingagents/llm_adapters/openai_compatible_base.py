@@ -9,13 +9,15 @@ from typing import Any, Dict, List, Optional, Union
 from langchain_core.messages import BaseMessage
 from langchain_core.outputs import ChatResult
 from langchain_openai import ChatOpenAI
-from langchain_core.callbacks import CallbackManagerForLLMRun
+from langchain_core.callbacks import AsyncCallbackManagerForLLMRun, CallbackManagerForLLMRun
 
 # 导入统一日志系统
 from tradingagents.utils.logging_init import setup_llm_logging
 
 # 导入日志模块
 from tradingagents.utils.logging_manager import get_logger, get_logger_manager
+from tradingagents.llm_adapters.response_cache import get_llm_response_cache
+from tradingagents.llm_adapters.http_pool import pooled_http_clients
 logger = get_logger('agents')
 logger = setup_llm_logging()
 
@@ -134,6 +136,10 @@ class OpenAICompatibleBase(ChatOpenAI):
                 "openai_api_base": base_url
             })
         
+        # 按 provider/base_url 共享 keep-alive 连接池（调用方显式传入客户端时不覆盖）
+        for key, client in pooled_http_clients(provider_name, base_url).items():
+            openai_kwargs.setdefault(key, client)
+
         # 初始化父类
         super().__init__(**openai_kwargs)
 
@@ -162,7 +168,15 @@ class OpenAICompatibleBase(ChatOpenAI):
         """
         生成聊天响应，并记录token使用量
         """
-        
+
+        # 响应缓存（未开启或温度非0时直接跳过）
+        response_cache = get_llm_response_cache()
+        cache_key, cached = response_cache.lookup(
+            self, self.provider_name or "openai_compatible", messages, stop, kwargs
+        )
+        if cached is not None:
+            return cached
+
         # 记录开始时间
         start_time = time.time()
         
@@ -171,7 +185,33 @@ class OpenAICompatibleBase(ChatOpenAI):
         
         # 记录token使用
         self._track_token_usage(result, kwargs, start_time)
-        
+
+        response_cache.store(cache_key, result)
+        return result
+
+    async def _agenerate(
+        self,
+        messages: List[BaseMessage],
+        stop: Optional[List[str]] = None,
+        run_manager: Optional[AsyncCallbackManagerForLLMRun] = None,
+        **kwargs: Any,
+    ) -> ChatResult:
+        """
+        异步生成聊天响应（ainvoke 路径，使用异步连接池，不占用线程），记录token使用量
+        """
+
+        response_cache = get_llm_response_cache()
+        cache_key, cached = response_cache.lookup(
+            self, self.provider_name or "openai_compatible", messages, stop, kwargs
+        )
+        if cached is not None:
+            return cached
+
+        start_time = time.time()
+        result = await super()._agenerate(messages, stop, run_manager, **kwargs)
+        self._track_token_usage(result, kwargs, start_time)
+
+        response_cache.store(cache_key, result)
         return result
 
     def _track_token_usage(self, result: ChatResult, kwargs: Dict, start_time: float):
@@ -355,6 +395,17 @@ class ChatQianfanOpenAI(OpenAICompatibleBase):
         # 调用父类的_generate方法
         return super()._generate(truncated_messages, stop, run_manager, **kwargs)
 
+    async def _agenerate(
+        self,
+        messages: List[BaseMessage],
+        stop: Optional[List[str]] = None,
+        run_manager: Optional[AsyncCallbackManagerForLLMRun] = None,
+        **kwargs: Any,
+    ) -> ChatResult:
+        """异步生成聊天响应，包含千帆模型的token截断逻辑"""
+        truncated_messages = self._truncate_messages(messages)
+        return await super()._agenerate(truncated_messages, stop, run_manager, **kwargs)
+
 
 class ChatZhipuOpenAI(OpenAICompatibleBase):
     """智谱AI GLM OpenAI兼容适配器"""
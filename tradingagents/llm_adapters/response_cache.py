@@ -0,0 +1,383 @@
+"""
+LLM 响应缓存（按内容寻址，可选）
+
+回测、调试提示词时经常用相同的输入重复运行分析，每次都会重新请求模型。
+开启缓存后，适配器在调用模型前按 (provider, model, temperature, messages, tools 等参数)
+计算 sha256 作为缓存键，命中时直接返回上次的 ChatResult：
+- 后端：disk（本地 JSON 文件，按总大小 LRU 淘汰）或 mongo（llm_response_cache 集合，按条数淘汰）
+- 所有条目都有 TTL
+- temperature 非 0 时结果本身不确定，默认跳过缓存；TA_LLM_CACHE_FORCE=true 时强制缓存
+- 命中 / 未命中通过 token_tracker.record_cache_lookup 汇总命中率和节省的 token
+
+环境变量：
+    TA_LLM_CACHE=off|disk|mongo           默认 off
+    TA_LLM_CACHE_TTL_SECONDS              默认 7 天
+    TA_LLM_CACHE_DIR                      disk 后端目录，默认 dataflows/data_cache/llm_responses
+    TA_LLM_CACHE_MAX_MB                   disk 后端大小上限，默认 512
+    TA_LLM_CACHE_MAX_ENTRIES              mongo 后端条数上限，默认 50000
+    TA_LLM_CACHE_FORCE                    非 0 温度也缓存，默认 false
+"""
+
+import hashlib
+import json
+import os
+import tempfile
+import threading
+import time
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import Any, Dict, List, Mapping, Optional, Sequence, Tuple
+
+from langchain_core.messages import BaseMessage, messages_from_dict, message_to_dict
+from langchain_core.outputs import ChatGeneration, ChatResult
+
+from tradingagents.utils.logging_manager import get_logger
+
+logger = get_logger('agents')
+
+# 不参与缓存键的调用参数（会话统计用，不影响模型输出）
+_NON_SEMANTIC_KWARGS = {"session_id", "analysis_type"}
+
+LLM_CACHE_COLLECTION = "llm_response_cache"
+
+
+def _env_bool(name: str, default: bool = False) -> bool:
+    value = os.getenv(name)
+    if value is None:
+        return default
+    return value.strip().lower() in ("1", "true", "yes", "on")
+
+
+def _normalize_message(message: BaseMessage) -> Dict[str, Any]:
+    """只保留决定模型输出的字段（去掉 id、响应元数据等每次运行都会变化的字段）"""
+    normalized: Dict[str, Any] = {"type": message.type, "content": message.content}
+    name = getattr(message, "name", None)
+    if name:
+        normalized["name"] = name
+    tool_calls = getattr(message, "tool_calls", None)
+    if tool_calls:
+        normalized["tool_calls"] = [{"name": c.get("name"), "args": c.get("args")} for c in tool_calls]
+    return normalized
+
+
+def build_cache_key(
+    provider: str,
+    model: str,
+    temperature: Optional[float],
+    messages: Sequence[BaseMessage],
+    stop: Optional[List[str]] = None,
+    params: Optional[Mapping[str, Any]] = None,
+) -> str:
+    """计算缓存键：规范化 JSON 的 sha256"""
+    payload = {
+        "provider": provider,
+        "model": model,
+        "temperature": temperature,
+        "messages": [_normalize_message(m) for m in messages],
+        "stop": list(stop) if stop else None,
+        # tools / tool_choice / response_format 等通过 bind 传入的参数
+        "params": {k: v for k, v in (params or {}).items() if k not in _NON_SEMANTIC_KWARGS},
+    }
+    raw = json.dumps(payload, sort_keys=True, ensure_ascii=False, default=str)
+    return hashlib.sha256(raw.encode("utf-8")).hexdigest()
+
+
+def serialize_result(result: ChatResult) -> Dict[str, Any]:
+    return {
+        "generations": [
+            {"message": message_to_dict(g.message), "generation_info": g.generation_info}
+            for g in result.generations
+        ],
+        "llm_output": result.llm_output,
+    }
+
+
+def deserialize_result(data: Mapping[str, Any]) -> ChatResult:
+    generations = []
+    for item in data.get("generations", []):
+        message = messages_from_dict([item["message"]])[0]
+        generations.append(ChatGeneration(message=message, generation_info=item.get("generation_info")))
+    return ChatResult(generations=generations, llm_output=data.get("llm_output"))
+
+
+def _usage_tokens(result: ChatResult) -> Tuple[int, int]:
+    """从结果中取出 (输入, 输出) token 数，用于统计命中节省的用量"""
+    token_usage = (result.llm_output or {}).get("token_usage") or {}
+    input_tokens = token_usage.get("prompt_tokens") or 0
+    output_tokens = token_usage.get("completion_tokens") or 0
+    if not (input_tokens or output_tokens):
+        for g in result.generations:
+            usage = getattr(g.message, "usage_metadata", None) or {}
+            input_tokens += usage.get("input_tokens") or 0
+            output_tokens += usage.get("output_tokens") or 0
+    return int(input_tokens), int(output_tokens)
+
+
+class DiskResponseBackend:
+    """本地文件后端（每个键一个 JSON 文件，总大小超限时按最近使用淘汰）"""
+
+    def __init__(self, cache_dir: str, max_bytes: int):
+        self.cache_dir = Path(cache_dir)
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+        self._total_bytes: Optional[int] = None
+
+    def _path(self, key: str) -> Path:
+        return self.cache_dir / key[:2] / f"{key}.json"
+
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        path = self._path(key)
+        try:
+            entry = json.loads(path.read_text(encoding="utf-8"))
+        except FileNotFoundError:
+            return None
+        except (OSError, ValueError) as e:
+            logger.warning(f"⚠️ 读取LLM缓存失败 {path}: {e}")
+            return None
+        if entry.get("expires_at", 0) <= time.time():
+            try:
+                path.unlink()
+            except OSError:
+                pass
+            return None
+        try:
+            # 更新访问时间，淘汰时按最近使用排序
+            os.utime(path)
+        except OSError:
+            pass
+        return entry.get("payload")
+
+    def put(self, key: str, payload: Dict[str, Any], ttl_seconds: int) -> None:
+        data = json.dumps(
+            {"expires_at": time.time() + ttl_seconds, "payload": payload},
+            ensure_ascii=False, default=str,
+        ).encode("utf-8")
+        if self.max_bytes <= 0 or len(data) > self.max_bytes:
+            return
+        path = self._path(key)
+        try:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            # 先写临时文件再原子替换，避免并发读到半个文件
+            fd, tmp = tempfile.mkstemp(dir=path.parent, suffix=".tmp")
+            with os.fdopen(fd, "wb") as f:
+                f.write(data)
+            os.replace(tmp, path)
+        except OSError as e:
+            logger.warning(f"⚠️ 写入LLM缓存失败 {path}: {e}")
+            return
+
+        with self._lock:
+            if self._total_bytes is None:
+                self._total_bytes = sum(p.stat().st_size for p in self._files())
+            else:
+                self._total_bytes += len(data)
+            if self._total_bytes > self.max_bytes:
+                self._evict()
+
+    def _files(self):
+        return [p for p in self.cache_dir.glob("*/*.json") if p.is_file()]
+
+    def _evict(self) -> None:
+        """按最近使用时间淘汰，直到总大小降到上限的 90%"""
+        entries = []
+        for p in self._files():
+            try:
+                st = p.stat()
+            except OSError:
+                continue
+            entries.append((st.st_mtime, st.st_size, p))
+        entries.sort()
+
+        total = sum(size for _, size, _ in entries)
+        target = int(self.max_bytes * 0.9)
+        removed = 0
+        for _, size, p in entries:
+            if total <= target:
+                break
+            try:
+                p.unlink()
+                total -= size
+                removed += 1
+            except OSError:
+                pass
+        self._total_bytes = total
+        logger.info(f"🧹 LLM缓存淘汰 {removed} 个文件，当前 {total / 1024 / 1024:.1f}MB")
+
+
+class MongoResponseBackend:
+    """MongoDB 后端（TTL 索引自动过期，条数超限时按最近使用淘汰）"""
+
+    def __init__(self, collection=None, max_entries: int = 50000):
+        self._collection = collection
+        self.max_entries = max_entries
+        self._indexes_ready = False
+
+    def _get_collection(self):
+        if self._collection is None:
+            from tradingagents.config.database_manager import get_database_manager
+
+            db = get_database_manager().get_mongodb_db()
+            if db is None:
+                return None
+            self._collection = db[LLM_CACHE_COLLECTION]
+        if not self._indexes_ready:
+            try:
+                self._collection.create_index("expires_at", expireAfterSeconds=0)
+                self._collection.create_index("last_used_at")
+            except Exception as e:
+                logger.warning(f"⚠️ 创建LLM缓存索引失败: {e}")
+            self._indexes_ready = True
+        return self._collection
+
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        collection = self._get_collection()
+        if collection is None:
+            return None
+        now = datetime.utcnow()
+        # TTL 索引的后台清理有延迟，这里再按 expires_at 过滤一次
+        doc = collection.find_one_and_update(
+            {"_id": key, "expires_at": {"$gt": now}},
+            {"$set": {"last_used_at": now}, "$inc": {"hits": 1}},
+            projection={"payload": 1},
+        )
+        return doc.get("payload") if doc else None
+
+    def put(self, key: str, payload: Dict[str, Any], ttl_seconds: int) -> None:
+        collection = self._get_collection()
+        if collection is None:
+            return
+        now = datetime.utcnow()
+        collection.replace_one(
+            {"_id": key},
+            {
+                "_id": key,
+                "payload": payload,
+                "created_at": now,
+                "last_used_at": now,
+                "expires_at": now + timedelta(seconds=ttl_seconds),
+                "hits": 0,
+            },
+            upsert=True,
+        )
+        excess = collection.estimated_document_count() - self.max_entries
+        if excess > 0:
+            stale = [d["_id"] for d in collection.find({}, {"_id": 1}).sort("last_used_at", 1).limit(excess)]
+            if stale:
+                collection.delete_many({"_id": {"$in": stale}})
+                logger.info(f"🧹 LLM缓存淘汰 {len(stale)} 条记录")
+
+
+class LLMResponseCache:
+    """适配器共享的响应缓存（backend 为 None 表示未开启）"""
+
+    def __init__(self, backend=None, ttl_seconds: int = 7 * 24 * 3600, force: bool = False):
+        self.backend = backend
+        self.ttl_seconds = ttl_seconds
+        self.force = force
+        self.stats = {"hits": 0, "misses": 0, "bypassed": 0, "errors": 0}
+
+    @property
+    def enabled(self) -> bool:
+        return self.backend is not None
+
+    def lookup(
+        self,
+        llm: Any,
+        provider: str,
+        messages: Sequence[BaseMessage],
+        stop: Optional[List[str]] = None,
+        params: Optional[Mapping[str, Any]] = None,
+    ) -> Tuple[Optional[str], Optional[ChatResult]]:
+        """
+        查询缓存
+
+        Returns:
+            (缓存键, 命中的结果)。未开启或跳过缓存时键为 None（调用方不需要 store）
+        """
+        if self.backend is None:
+            return None, None
+        temperature = getattr(llm, "temperature", None)
+        if temperature != 0 and not self.force:
+            self.stats["bypassed"] += 1
+            return None, None
+
+        model = getattr(llm, "model_name", None) or getattr(llm, "model", None) or "unknown"
+        key = build_cache_key(provider, str(model), temperature, messages, stop, params)
+        try:
+            payload = self.backend.get(key)
+            result = deserialize_result(payload) if payload else None
+        except Exception as e:
+            logger.warning(f"⚠️ 查询LLM缓存失败，直接请求模型: {e}")
+            self.stats["errors"] += 1
+            return key, None
+
+        if result is None:
+            self.stats["misses"] += 1
+            _record_lookup(provider, str(model), False)
+            return key, None
+
+        self.stats["hits"] += 1
+        input_tokens, output_tokens = _usage_tokens(result)
+        _record_lookup(provider, str(model), True, input_tokens, output_tokens)
+        logger.info(f"💾 [LLM缓存] 命中: {provider}/{model} key={key[:12]}")
+        return key, result
+
+    def store(self, key: Optional[str], result: ChatResult) -> None:
+        if key is None or self.backend is None or result is None:
+            return
+        try:
+            self.backend.put(key, serialize_result(result), self.ttl_seconds)
+        except Exception as e:
+            logger.warning(f"⚠️ 写入LLM缓存失败: {e}")
+            self.stats["errors"] += 1
+
+
+def _record_lookup(provider: str, model: str, hit: bool, input_tokens: int = 0, output_tokens: int = 0) -> None:
+    try:
+        from tradingagents.config.config_manager import token_tracker
+
+        token_tracker.record_cache_lookup(provider, model, hit, input_tokens, output_tokens)
+    except Exception as e:
+        logger.debug(f"LLM缓存命中统计失败: {e}")
+
+
+def _create_from_env() -> LLMResponseCache:
+    mode = os.getenv("TA_LLM_CACHE", "off").strip().lower()
+    ttl = int(os.getenv("TA_LLM_CACHE_TTL_SECONDS", str(7 * 24 * 3600)))
+    force = _env_bool("TA_LLM_CACHE_FORCE")
+
+    backend = None
+    if mode == "disk":
+        from tradingagents.default_config import DEFAULT_CONFIG
+
+        cache_dir = os.getenv("TA_LLM_CACHE_DIR") or os.path.join(DEFAULT_CONFIG["data_cache_dir"], "llm_responses")
+        max_bytes = int(float(os.getenv("TA_LLM_CACHE_MAX_MB", "512")) * 1024 * 1024)
+        backend = DiskResponseBackend(cache_dir, max_bytes)
+        logger.info(f"💾 [LLM缓存] 已启用磁盘缓存: {cache_dir}")
+    elif mode == "mongo":
+        backend = MongoResponseBackend(max_entries=int(os.getenv("TA_LLM_CACHE_MAX_ENTRIES", "50000")))
+        logger.info("💾 [LLM缓存] 已启用 MongoDB 缓存")
+    elif mode not in ("", "off", "false", "0", "none"):
+        logger.warning(f"⚠️ [LLM缓存] 未知的 TA_LLM_CACHE={mode}，缓存保持关闭")
+
+    return LLMResponseCache(backend, ttl_seconds=ttl, force=force)
+
+
+_cache: Optional[LLMResponseCache] = None
+_cache_lock = threading.Lock()
+
+
+def get_llm_response_cache() -> LLMResponseCache:
+    global _cache
+    if _cache is None:
+        with _cache_lock:
+            if _cache is None:
+                _cache = _create_from_env()
+    return _cache
+
+
+def set_llm_response_cache(cache: Optional[LLMResponseCache]) -> None:
+    """替换全局缓存实例（测试或运行时切换后端；None 表示下次按环境变量重建）"""
+    global _cache
+    with _cache_lock:
+        _cache = cache
@@ -0,0 +1,71 @@
+#!/usr/bin/env python3
+"""
+包级别的延迟导出（PEP 562）
+
+数据源提供器和智能体图会连带导入 tushare / akshare / baostock / yfinance / langchain 等重量级依赖。
+包的 __init__ 使用这里的 lazy_exports 声明导出名称，只有第一次访问某个名称时才导入对应子模块，
+`import tradingagents.dataflows.providers` 这类语句本身几乎没有开销。
+
+用法（在包的 __init__.py 中）::
+
+    __getattr__, __dir__ = lazy_exports(globals(), {
+        "TushareProvider": (".china.tushare", "TushareProvider"),   # 导入失败时抛出 ImportError
+        "YahooProvider": (".yahoo_provider", "YahooProvider", None),  # 导入失败时返回默认值
+    }, flags={
+        "TUSHARE_AVAILABLE": "TushareProvider",  # 对应导出名称能否导入
+    })
+"""
+
+import importlib
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+
+def lazy_exports(
+    module_globals: Dict[str, Any],
+    exports: Dict[str, Tuple],
+    flags: Optional[Dict[str, str]] = None,
+) -> Tuple[Callable[[str], Any], Callable[[], List[str]]]:
+    """
+    生成模块级 __getattr__ / __dir__
+
+    Args:
+        module_globals: 包的 globals()，解析结果会写回其中，之后的访问不再经过 __getattr__
+        exports: 导出名称 -> (子模块, 属性名[, 导入失败时的默认值])
+        flags: 可用性标志名称 -> 导出名称（该名称能导入为 True，否则为 False）
+    """
+    package = module_globals["__name__"]
+    flags = flags or {}
+
+    def _load(name: str) -> Any:
+        submodule, attr = exports[name][:2]
+        module = importlib.import_module(submodule, package)
+        try:
+            return getattr(module, attr)
+        except AttributeError as e:
+            # 与 `from x import y` 一致：名称不存在视为导入失败
+            raise ImportError(f"cannot import name {attr!r} from {module.__name__!r}") from e
+
+    def __getattr__(name: str) -> Any:
+        if name in exports:
+            try:
+                value = _load(name)
+            except ImportError:
+                if len(exports[name]) < 3:
+                    raise
+                value = exports[name][2]
+        elif name in flags:
+            try:
+                _load(flags[name])
+                value = True
+            except ImportError:
+                value = False
+        else:
+            raise AttributeError(f"module {package!r} has no attribute {name!r}")
+
+        module_globals[name] = value
+        return value
+
+    def __dir__() -> List[str]:
+        return sorted(set(module_globals) | set(exports) | set(flags))
+
+    return __getattr__, __dir__
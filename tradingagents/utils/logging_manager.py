@@ -4,13 +4,18 @@
 提供项目级别的日志配置和管理功能
 """
 
+import atexit
+import copy
 import logging
 import logging.handlers
 import os
+import queue
 import sys
+import threading
+import time
 from datetime import datetime
 from pathlib import Path
-from typing import Dict, Any, Optional, Union
+from typing import Dict, Any, Optional, Tuple, Union
 import json
 import toml
 
@@ -33,8 +38,9 @@ class ColoredFormatter(logging.Formatter):
     }
     
     def format(self, record):
-        # 添加颜色
+        # 添加颜色（在副本上修改，避免文件处理器写入带颜色代码的级别名）
         if hasattr(record, 'levelname') and record.levelname in self.COLORS:
+            record = copy.copy(record)
             record.levelname = f"{self.COLORS[record.levelname]}{record.levelname}{self.COLORS['RESET']}"
         
         return super().format(record)
@@ -69,6 +75,121 @@ class StructuredFormatter(logging.Formatter):
         return json.dumps(log_entry, ensure_ascii=False)
 
 
+class SamplingFilter(logging.Filter):
+    """
+    高频日志限流：按调用位置（日志器 + 文件 + 行号）的令牌桶
+
+    - WARNING 及以上级别不限流
+    - rate_per_second <= 0 表示不限流；loggers 按日志器名前缀覆盖速率
+    - 恢复输出时在消息后注明此前被限流的条数
+    同一条记录经过多个处理器时只判定一次
+    """
+
+    def __init__(self, rate_per_second: float = 10.0, burst_seconds: float = 5.0,
+                 loggers: Optional[Dict[str, float]] = None, max_sites: int = 10000):
+        super().__init__()
+        self.rate_per_second = float(rate_per_second)
+        self.burst_seconds = float(burst_seconds)
+        self.logger_rates = {name: float(rate) for name, rate in (loggers or {}).items()}
+        self.max_sites = max_sites
+        self.suppressed = 0
+        self._rates: Dict[str, float] = {}
+        self._sites: Dict[Tuple[str, str, int], list] = {}
+        self._lock = threading.Lock()
+
+    def _rate_for(self, name: str) -> float:
+        rate = self._rates.get(name)
+        if rate is None:
+            rate = self.rate_per_second
+            matched = -1
+            for prefix, prefix_rate in self.logger_rates.items():
+                if (name == prefix or name.startswith(prefix + '.')) and len(prefix) > matched:
+                    rate, matched = prefix_rate, len(prefix)
+            self._rates[name] = rate
+        return rate
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        decision = getattr(record, '_ta_sampled', None)
+        if decision is None:
+            decision = self._allow(record)
+            record._ta_sampled = decision
+        return decision
+
+    def _allow(self, record: logging.LogRecord) -> bool:
+        if record.levelno >= logging.WARNING:
+            return True
+        rate = self._rate_for(record.name)
+        if rate <= 0:
+            return True
+
+        capacity = max(1.0, rate * self.burst_seconds)
+        key = (record.name, record.pathname, record.lineno)
+        now = time.monotonic()
+        with self._lock:
+            site = self._sites.get(key)
+            if site is None:
+                if len(self._sites) >= self.max_sites:
+                    self._sites.clear()
+                site = self._sites[key] = [capacity, now, 0]
+            tokens = min(capacity, site[0] + (now - site[1]) * rate)
+            site[1] = now
+            if tokens < 1:
+                site[0] = tokens
+                site[2] += 1
+                self.suppressed += 1
+                return False
+            site[0] = tokens - 1
+            suppressed, site[2] = site[2], 0
+
+        if suppressed:
+            record.msg = f"{record.msg}（此前 {suppressed} 条同位置日志已限流）"
+        return True
+
+
+class NonBlockingQueueHandler(logging.handlers.QueueHandler):
+    """
+    把日志记录放入队列，由 QueueListener 线程格式化和写入
+
+    - 延迟格式化：不在调用线程中 format，消息拼接、时间格式化和文件 I/O 都在监听线程执行
+    - 队列满时丢弃 WARNING 以下的日志并计数，WARNING 及以上阻塞等待
+    """
+
+    def __init__(self, log_queue: queue.Queue):
+        super().__init__(log_queue)
+        self.dropped = 0
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        # 同一进程内的队列不需要序列化，记录原样交给监听线程
+        return record
+
+    def enqueue(self, record: logging.LogRecord) -> None:
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            if record.levelno >= logging.WARNING:
+                self.queue.put(record)
+            else:
+                self.dropped += 1
+
+
+# 异步日志的监听线程（重新 setup_logging 时先停止旧的）
+_queue_listener: Optional[logging.handlers.QueueListener] = None
+_atexit_registered = False
+
+
+def stop_logging() -> None:
+    """停止异步日志监听线程并写完队列中的日志（进程退出时自动调用）"""
+    global _queue_listener
+    listener, _queue_listener = _queue_listener, None
+    if listener is not None:
+        listener.stop()
+        for handler in listener.handlers:
+            try:
+                handler.flush()
+            except Exception:
+                pass
+
+
 class TradingAgentsLogger:
     """TradingAgents统一日志管理器"""
     
@@ -133,9 +254,29 @@ class TradingAgentsLogger:
             'docker': {
                 'enabled': os.getenv('DOCKER_CONTAINER', 'false').lower() == 'true',
                 'stdout_only': True  # Docker环境只输出到stdout
-            }
+            },
+            'async': self._default_async_config({}),
+            'sampling': self._default_sampling_config({})
         }
 
+    @staticmethod
+    def _default_async_config(overrides: Dict[str, Any]) -> Dict[str, Any]:
+        """异步日志（QueueHandler + QueueListener），环境变量 TRADINGAGENTS_LOG_ASYNC 优先"""
+        config = {'enabled': False, 'queue_size': 10000, **overrides}
+        env = os.getenv('TRADINGAGENTS_LOG_ASYNC')
+        if env is not None:
+            config['enabled'] = env.lower() == 'true'
+        return config
+
+    @staticmethod
+    def _default_sampling_config(overrides: Dict[str, Any]) -> Dict[str, Any]:
+        """高频日志限流，环境变量 TRADINGAGENTS_LOG_SAMPLING 优先"""
+        config = {'enabled': False, 'rate_per_second': 10, 'burst_seconds': 5, 'loggers': {}, **overrides}
+        env = os.getenv('TRADINGAGENTS_LOG_SAMPLING')
+        if env is not None:
+            config['enabled'] = env.lower() == 'true'
+        return config
+
     def _load_config_file(self) -> Optional[Dict[str, Any]]:
         """从配置文件加载日志配置"""
         # 确定配置文件路径
@@ -178,6 +319,8 @@ class TradingAgentsLogger:
                 'enabled': is_docker,
                 'stdout_only': logging_config.get('docker', {}).get('stdout_only', True)
             },
+            'async': self._default_async_config(logging_config.get('async', {})),
+            'sampling': self._default_sampling_config(logging_config.get('sampling', {})),
             'performance': logging_config.get('performance', {}),
             'security': logging_config.get('security', {}),
             'business': logging_config.get('business', {})
@@ -195,6 +338,7 @@ class TradingAgentsLogger:
         root_logger.setLevel(getattr(logging, self.config['level']))
         
         # 清除现有处理器
+        stop_logging()
         root_logger.handlers.clear()
         
         # 添加处理器
@@ -205,9 +349,50 @@ class TradingAgentsLogger:
             self._add_error_handler(root_logger)  # 🔧 添加错误日志处理器
             if self.config['handlers']['structured']['enabled']:
                 self._add_structured_handler(root_logger)
+
+        # 高频日志限流
+        sampling_filter = self._create_sampling_filter()
+
+        # 异步模式：处理器交给监听线程，调用线程只入队
+        async_config = self.config.get('async') or {}
+        if async_config.get('enabled'):
+            self._enable_queue_logging(root_logger, async_config, sampling_filter)
+        elif sampling_filter is not None:
+            for handler in root_logger.handlers:
+                handler.addFilter(sampling_filter)
         
         # 配置特定日志器
         self._configure_specific_loggers()
+
+    def _create_sampling_filter(self) -> Optional[SamplingFilter]:
+        sampling_config = self.config.get('sampling') or {}
+        if not sampling_config.get('enabled'):
+            return None
+        return SamplingFilter(
+            rate_per_second=sampling_config.get('rate_per_second', 10),
+            burst_seconds=sampling_config.get('burst_seconds', 5),
+            loggers=sampling_config.get('loggers') or {},
+        )
+
+    def _enable_queue_logging(self, root_logger: logging.Logger, async_config: Dict[str, Any],
+                              sampling_filter: Optional[SamplingFilter]):
+        """用 QueueHandler 替换根日志器上的处理器，原处理器由 QueueListener 线程驱动"""
+        global _queue_listener, _atexit_registered
+
+        handlers = list(root_logger.handlers)
+        root_logger.handlers.clear()
+
+        log_queue = queue.Queue(maxsize=int(async_config.get('queue_size', 10000)))
+        queue_handler = NonBlockingQueueHandler(log_queue)
+        if sampling_filter is not None:
+            queue_handler.addFilter(sampling_filter)
+        root_logger.addHandler(queue_handler)
+
+        _queue_listener = logging.handlers.QueueListener(log_queue, *handlers, respect_handler_level=True)
+        _queue_listener.start()
+        if not _atexit_registered:
+            atexit.register(stop_logging)
+            _atexit_registered = True
     
     def _add_console_handler(self, logger: logging.Logger):
         """添加控制台处理器"""
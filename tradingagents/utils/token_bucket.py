@@ -0,0 +1,346 @@
+#!/usr/bin/env python3
+"""
+跨进程令牌桶限流器
+
+多个 API 进程 / worker 共用同一个数据源账号（如同一个 Tushare token）时，进程内限流无法
+控制总调用量。这里把令牌桶放在 Redis 中，用一段 Lua 脚本原子地「补充令牌 + 预约令牌」：
+- 每次调用只有一次 Redis 往返，返回需要等待的时间，调用方自行 sleep
+- 令牌允许透支（预约），排队的调用按到达顺序依次放行，不会同时醒来争抢
+- Redis 不可用时暂时降级为进程内令牌桶，冷却 REDIS_RETRY_SECONDS 后重新使用 Redis
+- 同时提供同步 acquire（数据源 provider）和异步 acquire_async（FastAPI / worker）
+
+预算按数据源配置，可选按接口（endpoint）再加一层预算，环境变量覆盖：
+    TA_RATELIMIT_<PROVIDER>_PER_MIN / TA_RATELIMIT_<PROVIDER>_BURST
+    TA_RATELIMIT_<PROVIDER>_<ENDPOINT>_PER_MIN / TA_RATELIMIT_<PROVIDER>_<ENDPOINT>_BURST
+"""
+
+import asyncio
+import os
+import threading
+import time
+from typing import Any, Dict, Optional, Tuple
+
+from tradingagents.utils.logging_manager import get_logger
+logger = get_logger('dataflows')
+
+
+# 令牌桶 Lua 脚本
+# KEYS[1]: 桶 key；ARGV: rate(令牌/秒), capacity(突发额度), requested(本次令牌数)
+# 返回 {等待毫秒数, 剩余令牌*1000}
+TOKEN_BUCKET_LUA = """
+redis.replicate_commands()
+local rate = tonumber(ARGV[1])
+local capacity = tonumber(ARGV[2])
+local requested = tonumber(ARGV[3])
+local t = redis.call('TIME')
+local now = tonumber(t[1]) * 1000 + math.floor(tonumber(t[2]) / 1000)
+
+local data = redis.call('HMGET', KEYS[1], 'tokens', 'ts')
+local tokens = tonumber(data[1])
+local ts = tonumber(data[2])
+if tokens == nil or ts == nil then
+  tokens = capacity
+  ts = now
+end
+
+tokens = math.min(capacity, tokens + math.max(0, now - ts) * rate / 1000)
+tokens = tokens - requested
+
+local wait_ms = 0
+if tokens < 0 then
+  wait_ms = math.ceil(-tokens * 1000 / rate)
+end
+
+redis.call('HSET', KEYS[1], 'tokens', tokens, 'ts', now)
+redis.call('PEXPIRE', KEYS[1], math.ceil((capacity - tokens) * 1000 / rate) + 1000)
+return {wait_ms, math.floor(tokens * 1000)}
+"""
+
+# 默认预算：provider -> (每分钟调用数, 突发额度)
+# 以固定间隔限流的 provider 由调用方按原有间隔配置（TA_*_INTERVAL_SECONDS）传入 per_minute
+# Tushare 积分等级对应的每分钟调用数（TUSHARE_TIER / TUSHARE_RATE_LIMIT_SAFETY_MARGIN）
+TUSHARE_TIER_PER_MIN = {"free": 100, "basic": 200, "standard": 400, "premium": 600, "vip": 800}
+
+
+def _tushare_budget() -> Tuple[float, float]:
+    tier = os.getenv("TUSHARE_TIER", "standard").lower()
+    try:
+        margin = float(os.getenv("TUSHARE_RATE_LIMIT_SAFETY_MARGIN", "0.8"))
+    except ValueError:
+        margin = 0.8
+    per_min = TUSHARE_TIER_PER_MIN.get(tier, TUSHARE_TIER_PER_MIN["standard"]) * margin
+    return per_min, max(1.0, per_min // 20)
+
+
+DEFAULT_BUDGETS: Dict[str, Tuple[float, float]] = {
+    "tushare": _tushare_budget(),
+    "akshare": (60, 5),
+    "eastmoney": (120, 1),       # AKShare 底层东方财富接口（至少间隔 0.5 秒）
+    "baostock": (100, 10),
+}
+
+# 按接口的额外预算：(provider, endpoint) -> (每分钟调用数, 突发额度)
+DEFAULT_ENDPOINT_BUDGETS: Dict[Tuple[str, str], Tuple[float, float]] = {}
+
+KEY_PREFIX = "ratelimit:"
+
+# Redis 调用失败后使用进程内令牌桶的时长（秒），之后重新尝试 Redis
+REDIS_RETRY_SECONDS = 5.0
+
+
+def _env_budget(prefix: str, default: Optional[Tuple[float, float]]) -> Optional[Tuple[float, float]]:
+    per_min = os.getenv(f"{prefix}_PER_MIN")
+    burst = os.getenv(f"{prefix}_BURST")
+    if per_min is None and burst is None:
+        return default
+    try:
+        base = default or (60.0, 1.0)
+        return (
+            float(per_min) if per_min is not None else base[0],
+            float(burst) if burst is not None else base[1],
+        )
+    except ValueError:
+        logger.warning(f"⚠️ 限流配置无效: {prefix}_PER_MIN={per_min}, {prefix}_BURST={burst}")
+        return default
+
+
+def _get_sync_redis():
+    try:
+        from tradingagents.config.database_manager import get_database_manager
+        manager = get_database_manager()
+        if manager.is_redis_available():
+            return manager.get_redis_client()
+    except Exception as e:
+        logger.debug(f"Redis 不可用，使用进程内限流: {e}")
+    return None
+
+
+class TokenBucketLimiter:
+    """单个令牌桶（Redis 共享，失败时降级为进程内）"""
+
+    def __init__(
+        self,
+        name: str,
+        per_minute: float,
+        burst: float = 1,
+        redis_client: Any = None,
+        use_redis: bool = True,
+    ):
+        self.name = name
+        self.key = f"{KEY_PREFIX}{name}"
+        self.rate = max(per_minute, 1e-6) / 60.0
+        self.capacity = max(float(burst), 1.0)
+        self._redis = redis_client
+        self._use_redis = use_redis
+        self._redis_resolved = redis_client is not None
+        self._redis_retry_at = 0.0  # 降级期间的截止时间（monotonic）
+        self._script = None
+
+        # 进程内令牌桶（Redis 不可用时使用）
+        self._lock = threading.Lock()
+        self._tokens = self.capacity
+        self._ts = time.monotonic()
+
+        # 统计
+        self.total_calls = 0
+        self.total_waits = 0
+        self.total_wait_time = 0.0
+        self.max_wait_time = 0.0
+        self.fallback_calls = 0
+
+    # ---------- 预约令牌 ----------
+
+    def _reserve_local(self, tokens: float) -> float:
+        with self._lock:
+            now = time.monotonic()
+            self._tokens = min(self.capacity, self._tokens + (now - self._ts) * self.rate)
+            self._ts = now
+            self._tokens -= tokens
+            return max(0.0, -self._tokens / self.rate)
+
+    def _in_fallback(self) -> bool:
+        return time.monotonic() < self._redis_retry_at
+
+    def _redis_client(self):
+        if not self._use_redis or self._in_fallback():
+            return None
+        if not self._redis_resolved:
+            self._redis = _get_sync_redis()
+            if self._redis is None:
+                # Redis 暂不可用：冷却后重新获取
+                self._redis_retry_at = time.monotonic() + REDIS_RETRY_SECONDS
+                return None
+            self._redis_resolved = True
+        return self._redis
+
+    def _reserve(self, tokens: float) -> float:
+        """预约令牌，返回需要等待的秒数"""
+        client = self._redis_client()
+        if client is not None:
+            try:
+                if self._script is None:
+                    self._script = client.register_script(TOKEN_BUCKET_LUA)
+                wait_ms, _ = self._script(keys=[self.key], args=[self.rate, self.capacity, tokens])
+                if self._redis_retry_at:
+                    self._redis_retry_at = 0.0
+                    logger.info(f"✅ [{self.name}] Redis 限流已恢复")
+                return int(wait_ms) / 1000.0
+            except Exception as e:
+                logger.warning(f"⚠️ [{self.name}] Redis 限流失败，{REDIS_RETRY_SECONDS:g}秒内使用进程内限流: {e}")
+                # 冷却期内不再访问失败的 Redis，之后重试（重新注册脚本）
+                self._redis_retry_at = time.monotonic() + REDIS_RETRY_SECONDS
+                self._script = None
+        self.fallback_calls += 1
+        return self._reserve_local(tokens)
+
+    def _record(self, wait: float) -> None:
+        self.total_calls += 1
+        if wait > 0:
+            self.total_waits += 1
+            self.total_wait_time += wait
+            self.max_wait_time = max(self.max_wait_time, wait)
+
+    # ---------- 对外接口 ----------
+
+    def acquire(self, tokens: float = 1) -> float:
+        """同步获取令牌（阻塞当前线程），返回等待秒数"""
+        wait = self._reserve(tokens)
+        self._record(wait)
+        if wait > 0:
+            logger.debug(f"⏳ [{self.name}] 限流等待 {wait:.2f}秒")
+            time.sleep(wait)
+        return wait
+
+    async def acquire_async(self, tokens: float = 1) -> float:
+        """异步获取令牌（不阻塞事件循环），返回等待秒数"""
+        if self._redis_client() is not None:
+            wait = await asyncio.to_thread(self._reserve, tokens)
+        else:
+            wait = self._reserve(tokens)
+        self._record(wait)
+        if wait > 0:
+            logger.debug(f"⏳ [{self.name}] 限流等待 {wait:.2f}秒")
+            await asyncio.sleep(wait)
+        return wait
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {
+            "name": self.name,
+            "per_minute": round(self.rate * 60, 3),
+            "burst": self.capacity,
+            "backend": "redis" if self._use_redis and self._redis is not None and not self._in_fallback() else "local",
+            "total_calls": self.total_calls,
+            "total_waits": self.total_waits,
+            "total_wait_time": self.total_wait_time,
+            "max_wait_time": self.max_wait_time,
+            "avg_wait_time": self.total_wait_time / self.total_waits if self.total_waits else 0,
+            "fallback_calls": self.fallback_calls,
+        }
+
+
+_limiters: Dict[str, TokenBucketLimiter] = {}
+_unbudgeted: set = set()  # 未配置预算的接口（避免每次调用都读取环境变量）
+_conflicts_warned: set = set()  # 已提示过的预算冲突 (name, per_minute, burst)
+_limiters_lock = threading.Lock()
+
+
+def _resolve_budget(
+    provider: str,
+    endpoint: Optional[str],
+    per_minute: Optional[float],
+    burst: Optional[float],
+) -> Optional[Tuple[float, float]]:
+    """按「调用方指定 > 默认预算」确定预算，环境变量优先级最高"""
+    env_prefix = f"TA_RATELIMIT_{provider.upper()}"
+    if endpoint:
+        env_prefix += f"_{endpoint.upper()}"
+        default = DEFAULT_ENDPOINT_BUDGETS.get((provider, endpoint))
+    else:
+        default = DEFAULT_BUDGETS.get(provider, (60, 1))
+    if per_minute is not None:
+        default = (per_minute, burst if burst is not None else (default[1] if default else 1))
+    return _env_budget(env_prefix, default)
+
+
+def _same_budget(limiter: TokenBucketLimiter, budget: Tuple[float, float]) -> bool:
+    return (abs(limiter.rate * 60 - max(budget[0], 1e-6)) < 1e-6
+            and limiter.capacity == max(float(budget[1]), 1.0))
+
+
+def get_token_bucket(
+    provider: str,
+    endpoint: Optional[str] = None,
+    per_minute: Optional[float] = None,
+    burst: Optional[float] = None,
+) -> Optional[TokenBucketLimiter]:
+    """
+    获取数据源（或数据源下某接口）的令牌桶，未配置预算的接口返回 None
+
+    同名令牌桶在进程内（以及通过 Redis 跨进程）共享，预算以首次创建时为准；
+    之后以不同的 per_minute / burst 获取时记录警告并沿用已有预算。
+    """
+    provider = provider.lower()
+    name = f"{provider}:{endpoint}" if endpoint else provider
+    with _limiters_lock:
+        limiter = _limiters.get(name)
+        if limiter is not None:
+            if per_minute is not None:
+                requested = _resolve_budget(provider, endpoint, per_minute, burst)
+                conflict = (name, *requested) if requested else None
+                if conflict and not _same_budget(limiter, requested) and conflict not in _conflicts_warned:
+                    _conflicts_warned.add(conflict)
+                    logger.warning(
+                        f"⚠️ 限流器 {name} 已按 {limiter.rate * 60:g}次/分钟、突发 {limiter.capacity:g} 创建，"
+                        f"忽略新的预算 {requested[0]:g}次/分钟、突发 {requested[1]:g}"
+                    )
+            return limiter
+        if name in _unbudgeted:
+            return None
+
+        budget = _resolve_budget(provider, endpoint, per_minute, burst)
+        if budget is None:
+            _unbudgeted.add(name)
+            return None
+
+        limiter = TokenBucketLimiter(name, per_minute=budget[0], burst=budget[1])
+        _limiters[name] = limiter
+        logger.info(f"🔧 限流器 {name}: {budget[0]:g}次/分钟, 突发 {budget[1]:g}")
+        return limiter
+
+
+def interval_budget(provider: str, min_interval: float) -> TokenBucketLimiter:
+    """按「两次调用最小间隔」配置的令牌桶（突发额度为 1）"""
+    return get_token_bucket(provider, per_minute=60.0 / max(min_interval, 1e-3), burst=1)
+
+
+def acquire(provider: str, endpoint: Optional[str] = None, tokens: float = 1) -> float:
+    """同步获取数据源令牌（先数据源预算，再接口预算），返回总等待秒数"""
+    wait = get_token_bucket(provider).acquire(tokens)
+    if endpoint:
+        endpoint_limiter = get_token_bucket(provider, endpoint)
+        if endpoint_limiter is not None:
+            wait += endpoint_limiter.acquire(tokens)
+    return wait
+
+
+async def acquire_async(provider: str, endpoint: Optional[str] = None, tokens: float = 1) -> float:
+    """异步获取数据源令牌（先数据源预算，再接口预算），返回总等待秒数"""
+    wait = await get_token_bucket(provider).acquire_async(tokens)
+    if endpoint:
+        endpoint_limiter = get_token_bucket(provider, endpoint)
+        if endpoint_limiter is not None:
+            wait += await endpoint_limiter.acquire_async(tokens)
+    return wait
+
+
+def get_all_limiter_stats() -> Dict[str, Dict[str, Any]]:
+    with _limiters_lock:
+        return {name: limiter.get_stats() for name, limiter in _limiters.items()}
+
+
+def reset_token_buckets() -> None:
+    """清空已创建的限流器（测试或配置变更后使用）"""
+    with _limiters_lock:
+        _limiters.clear()
+        _unbudgeted.clear()
+        _conflicts_warned.clear()
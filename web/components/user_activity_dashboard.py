@@ -65,6 +65,18 @@ def render_user_activity_dashboard():
         if action_type_filter == "全部":
             action_type_filter = None
     
+    # 统计数据来自每日汇总，活动明细只用于列表、用户分析和导出
+    stats = user_activity_logger.get_activity_statistics(
+        start_date=start_date,
+        end_date=end_date,
+        username=username_filter if username_filter else None,
+        action_type=action_type_filter
+    )
+
+    if not stats["total_activities"]:
+        st.warning("📭 未找到符合条件的活动记录")
+        return
+
     # 获取活动数据
     activities = user_activity_logger.get_user_activities(
         username=username_filter if username_filter else None,
@@ -74,35 +86,26 @@ def render_user_activity_dashboard():
         limit=1000
     )
     
-    if not activities:
-        st.warning("📭 未找到符合条件的活动记录")
-        return
-    
     # 显示统计概览
     col1, col2, col3, col4 = st.columns(4)
     
     with col1:
-        st.metric("📊 总活动数", len(activities))
+        st.metric("📊 总活动数", stats["total_activities"])
     
     with col2:
-        unique_users = len(set(a['username'] for a in activities))
-        st.metric("👥 活跃用户", unique_users)
+        st.metric("👥 活跃用户", stats["unique_users"])
     
     with col3:
-        successful_activities = sum(1 for a in activities if a.get('success', True))
-        success_rate = (successful_activities / len(activities) * 100) if activities else 0
-        st.metric("✅ 成功率", f"{success_rate:.1f}%")
+        st.metric("✅ 成功率", f"{stats['success_rate']:.1f}%")
     
     with col4:
-        durations = [a.get('duration_ms', 0) for a in activities if a.get('duration_ms')]
-        avg_duration = sum(durations) / len(durations) if durations else 0
-        st.metric("⏱️ 平均耗时", f"{avg_duration:.0f}ms")
+        st.metric("⏱️ 平均耗时", f"{stats['average_duration']:.0f}ms")
     
     # 标签页
     tab1, tab2, tab3, tab4 = st.tabs(["📈 统计图表", "📋 活动列表", "👥 用户分析", "📤 导出数据"])
     
     with tab1:
-        render_activity_charts(activities)
+        render_activity_charts(stats)
     
     with tab2:
         render_activity_list(activities)
@@ -113,15 +116,12 @@ def render_user_activity_dashboard():
     with tab4:
         render_export_options(activities)
 
-def render_activity_charts(activities: List[Dict[str, Any]]):
-    """渲染活动统计图表"""
+def render_activity_charts(stats: Dict[str, Any]):
+    """渲染活动统计图表（数据来自 get_activity_statistics 的每日汇总）"""
     
     # 按活动类型统计
     st.subheader("📊 按活动类型统计")
-    activity_types = {}
-    for activity in activities:
-        action_type = activity.get('action_type', 'unknown')
-        activity_types[action_type] = activity_types.get(action_type, 0) + 1
+    activity_types = stats.get("activity_types", {})
     
     if activity_types:
         fig_pie = px.pie(
@@ -133,10 +133,7 @@ def render_activity_charts(activities: List[Dict[str, Any]]):
     
     # 按时间统计
     st.subheader("📅 按时间统计")
-    daily_activities = {}
-    for activity in activities:
-        date_str = datetime.fromtimestamp(activity['timestamp']).strftime('%Y-%m-%d')
-        daily_activities[date_str] = daily_activities.get(date_str, 0) + 1
+    daily_activities = stats.get("daily_activities", {})
     
     if daily_activities:
         dates = sorted(daily_activities.keys())
@@ -160,10 +157,7 @@ def render_activity_charts(activities: List[Dict[str, Any]]):
     
     # 按用户统计
     st.subheader("👥 按用户统计")
-    user_activities = {}
-    for activity in activities:
-        username = activity.get('username', 'unknown')
-        user_activities[username] = user_activities.get(username, 0) + 1
+    user_activities = stats.get("user_activities", {})
     
     if user_activities:
         # 只显示前10个最活跃的用户
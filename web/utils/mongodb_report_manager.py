@@ -10,6 +10,8 @@ from datetime import datetime
 from typing import Dict, List, Optional, Any
 from pathlib import Path
 
+from app.utils.report_fields import SEARCH_TEXT_FIELD, build_search_text
+
 logger = logging.getLogger(__name__)
 
 try:
@@ -190,6 +192,9 @@ class MongoDBReportManager:
                 "updated_at": timestamp
             }
 
+            # 检索词（报告搜索使用 search_text 文本索引）
+            document[SEARCH_TEXT_FIELD] = build_search_text(document)
+
             # 插入文档
             result = self.collection.insert_one(document)
 
@@ -372,6 +377,7 @@ class MongoDBReportManager:
                     update_data = {
                         "$set": {
                             "reports": {},
+                            SEARCH_TEXT_FIELD: build_search_text(doc),
                             "updated_at": datetime.now()
                         }
                     }
@@ -409,6 +415,7 @@ class MongoDBReportManager:
 
             # 添加保存时间戳
             report_data['saved_at'] = datetime.now()
+            report_data[SEARCH_TEXT_FIELD] = build_search_text(report_data)
 
             # 使用upsert操作，如果存在则更新，不存在则插入
             result = self.collection.replace_one(
@@ -1,8 +1,13 @@
 """
 用户操作行为记录器
 记录用户在系统中的各种操作行为，并保存到独立的日志文件中
+
+- 活动先放入内存缓冲，攒够 batch_size 条或超过 flush_interval 秒后按日期批量追加到 JSONL 文件
+- 每次批量写入时增量更新当日汇总文件（按 用户 × 活动类型 的计数、成功数、耗时），
+  统计接口和活动仪表板读取汇总，不再逐行解析活动文件
 """
 
+import atexit
 import json
 import time
 from datetime import datetime, timedelta
@@ -37,12 +42,20 @@ class UserActivity:
 class UserActivityLogger:
     """用户操作行为记录器"""
     
-    def __init__(self):
-        self.activity_dir = Path(__file__).parent.parent / "data" / "user_activities"
+    def __init__(self, activity_dir: Path = None, batch_size: int = 50, flush_interval: float = 2.0):
+        self.activity_dir = activity_dir or Path(__file__).parent.parent / "data" / "user_activities"
         self.activity_dir.mkdir(parents=True, exist_ok=True)
         
         # 线程锁，确保文件写入安全
         self._lock = threading.Lock()
+
+        # 写入缓冲
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self._buffer: List[Dict[str, Any]] = []
+        self._buffer_lock = threading.Lock()
+        self._last_flush = time.monotonic()
+        self._flusher: Optional[threading.Thread] = None
         
         # 活动类型定义
         self.activity_types = {
@@ -63,6 +76,10 @@ class UserActivityLogger:
         if date is None:
             date = datetime.now().strftime("%Y-%m-%d")
         return self.activity_dir / f"user_activities_{date}.jsonl"
+
+    def _get_rollup_file_path(self, date: str) -> Path:
+        """获取每日汇总文件路径"""
+        return self.activity_dir / f"user_activities_{date}.rollup.json"
     
     def _get_session_id(self) -> str:
         """获取会话ID"""
@@ -141,21 +158,107 @@ class UserActivityLogger:
             logger.error(f"❌ 记录用户活动失败: {e}")
     
     def _write_activity(self, activity: UserActivity) -> None:
-        """写入活动记录到文件"""
+        """放入写入缓冲，达到批量大小或时间间隔时写入文件"""
+        activity_dict = asdict(activity)
+        activity_dict['datetime'] = datetime.fromtimestamp(activity.timestamp).isoformat()
+
+        with self._buffer_lock:
+            self._buffer.append(activity_dict)
+            due = (len(self._buffer) >= self.batch_size
+                   or time.monotonic() - self._last_flush >= self.flush_interval)
+        self._ensure_flusher()
+        if due:
+            self.flush()
+
+    def _ensure_flusher(self) -> None:
+        """后台线程定期写入缓冲中的活动（流量较低时也不会长时间滞留）"""
+        if self._flusher is not None and self._flusher.is_alive():
+            return
+        with self._buffer_lock:
+            if self._flusher is not None and self._flusher.is_alive():
+                return
+
+            def _run():
+                while True:
+                    time.sleep(self.flush_interval)
+                    self.flush()
+
+            self._flusher = threading.Thread(target=_run, name="user-activity-flusher", daemon=True)
+            self._flusher.start()
+
+    def flush(self) -> None:
+        """把缓冲中的活动按日期批量写入文件，并更新每日汇总"""
+        with self._buffer_lock:
+            batch, self._buffer = self._buffer, []
+            self._last_flush = time.monotonic()
+        if not batch:
+            return
+
+        by_date: Dict[str, List[Dict[str, Any]]] = {}
+        for activity_dict in batch:
+            date_str = datetime.fromtimestamp(activity_dict['timestamp']).strftime("%Y-%m-%d")
+            by_date.setdefault(date_str, []).append(activity_dict)
+
         with self._lock:
+            for date_str, activities in by_date.items():
+                try:
+                    activity_file = self._get_activity_file_path(date_str)
+                    # 先汇总已有文件，保证汇总与文件内容一致
+                    rollup = self._load_rollup(date_str)
+
+                    # 追加写入JSONL格式
+                    with open(activity_file, 'a', encoding='utf-8') as f:
+                        f.write(''.join(json.dumps(a, ensure_ascii=False) + '\n' for a in activities))
+
+                    for activity_dict in activities:
+                        self._add_to_rollup(rollup, activity_dict)
+                    self._save_rollup(date_str, rollup)
+                except Exception as e:
+                    logger.error(f"❌ 写入活动记录失败 ({date_str}, {len(activities)}条): {e}")
+
+    @staticmethod
+    def _add_to_rollup(rollup: Dict[str, Any], activity: Dict[str, Any]) -> None:
+        """把一条活动计入汇总：按 用户 × 活动类型 分组"""
+        username = activity.get('username', 'unknown')
+        action_type = activity.get('action_type', 'unknown')
+        group = rollup['groups'].setdefault(f"{username}\t{action_type}", {
+            "username": username,
+            "action_type": action_type,
+            "count": 0,
+            "success": 0,
+            "duration_sum": 0,
+            "duration_count": 0
+        })
+        group["count"] += 1
+        if activity.get('success', True):
+            group["success"] += 1
+        if activity.get('duration_ms'):
+            group["duration_sum"] += activity['duration_ms']
+            group["duration_count"] += 1
+
+    def _load_rollup(self, date_str: str) -> Dict[str, Any]:
+        """读取每日汇总；没有汇总的历史活动文件解析一次生成汇总"""
+        rollup_file = self._get_rollup_file_path(date_str)
+        if rollup_file.exists():
             try:
-                activity_file = self._get_activity_file_path()
-                
-                # 转换为JSON格式
-                activity_dict = asdict(activity)
-                activity_dict['datetime'] = datetime.fromtimestamp(activity.timestamp).isoformat()
-                
-                # 追加写入JSONL格式
-                with open(activity_file, 'a', encoding='utf-8') as f:
-                    f.write(json.dumps(activity_dict, ensure_ascii=False) + '\n')
-                
+                with open(rollup_file, 'r', encoding='utf-8') as f:
+                    return json.load(f)
             except Exception as e:
-                logger.error(f"❌ 写入活动记录失败: {e}")
+                logger.warning(f"⚠️ 活动汇总文件损坏，重新生成 {rollup_file.name}: {e}")
+
+        rollup = {"date": date_str, "groups": {}}
+        activity_file = self._get_activity_file_path(date_str)
+        if activity_file.exists():
+            for activity in self._read_activities_from_file(activity_file):
+                self._add_to_rollup(rollup, activity)
+        return rollup
+
+    def _save_rollup(self, date_str: str, rollup: Dict[str, Any]) -> None:
+        rollup_file = self._get_rollup_file_path(date_str)
+        tmp_file = rollup_file.with_suffix('.tmp')
+        with open(tmp_file, 'w', encoding='utf-8') as f:
+            json.dump(rollup, f, ensure_ascii=False)
+        os.replace(tmp_file, rollup_file)
     
     def log_login(self, username: str, success: bool, error_message: str = None) -> None:
         """记录登录活动"""
@@ -258,11 +361,19 @@ class UserActivityLogger:
         activities = []
         
         try:
+            # 先写入缓冲中的活动
+            self.flush()
+
             # 确定要查询的日期范围
             if start_date is None:
                 start_date = datetime.now() - timedelta(days=7)  # 默认查询最近7天
             if end_date is None:
                 end_date = datetime.now()
+            # st.date_input 返回 date，按整天处理
+            if not isinstance(start_date, datetime):
+                start_date = datetime.combine(start_date, datetime.min.time())
+            if not isinstance(end_date, datetime):
+                end_date = datetime.combine(end_date, datetime.max.time())
             
             # 遍历日期范围内的所有文件
             current_date = start_date.date()
@@ -321,58 +432,86 @@ class UserActivityLogger:
         
         return activities
     
-    def get_activity_statistics(self, days: int = 7) -> Dict[str, Any]:
+    def get_activity_statistics(self, days: int = 7,
+                                start_date: datetime = None,
+                                end_date: datetime = None,
+                                username: str = None,
+                                action_type: str = None) -> Dict[str, Any]:
         """
-        获取活动统计信息
+        获取活动统计信息（读取每日汇总，按自然日统计）
         
         Args:
-            days: 统计天数
+            days: 统计天数（未指定 start_date 时使用）
+            start_date: 开始日期
+            end_date: 结束日期
+            username: 用户名过滤
+            action_type: 活动类型过滤
             
         Returns:
             统计信息字典
         """
-        end_date = datetime.now()
-        start_date = end_date - timedelta(days=days)
-        
-        activities = self.get_user_activities(
-            start_date=start_date,
-            end_date=end_date,
-            limit=10000  # 获取更多记录用于统计
-        )
-        
-        # 统计分析
+        if end_date is None:
+            end_date = datetime.now()
+        if start_date is None:
+            start_date = end_date - timedelta(days=days)
+        # st.date_input 返回 date，其余调用方传入 datetime
+        start_day = start_date.date() if isinstance(start_date, datetime) else start_date
+        end_day = end_date.date() if isinstance(end_date, datetime) else end_date
+
         stats = {
-            "total_activities": len(activities),
-            "unique_users": len(set(a['username'] for a in activities)),
+            "total_activities": 0,
+            "unique_users": 0,
             "activity_types": {},
             "daily_activities": {},
             "user_activities": {},
             "success_rate": 0,
             "average_duration": 0
         }
-        
-        # 按类型统计
-        for activity in activities:
-            action_type = activity.get('action_type', 'unknown')
-            stats["activity_types"][action_type] = stats["activity_types"].get(action_type, 0) + 1
-            
-            # 按用户统计
-            username = activity.get('username', 'unknown')
-            stats["user_activities"][username] = stats["user_activities"].get(username, 0) + 1
-            
-            # 按日期统计
-            date_str = datetime.fromtimestamp(activity['timestamp']).strftime('%Y-%m-%d')
-            stats["daily_activities"][date_str] = stats["daily_activities"].get(date_str, 0) + 1
-        
+        success = duration_sum = duration_count = 0
+
+        try:
+            # 先写入缓冲中的活动
+            self.flush()
+
+            current_day = start_day
+            while current_day <= end_day:
+                date_str = current_day.strftime("%Y-%m-%d")
+                current_day += timedelta(days=1)
+                if not self._get_activity_file_path(date_str).exists():
+                    continue
+
+                with self._lock:
+                    rollup_missing = not self._get_rollup_file_path(date_str).exists()
+                    rollup = self._load_rollup(date_str)
+                    if rollup_missing:
+                        self._save_rollup(date_str, rollup)
+
+                for group in rollup["groups"].values():
+                    if username and group["username"] != username:
+                        continue
+                    if action_type and group["action_type"] != action_type:
+                        continue
+                    count = group["count"]
+                    stats["total_activities"] += count
+                    stats["activity_types"][group["action_type"]] = stats["activity_types"].get(group["action_type"], 0) + count
+                    stats["user_activities"][group["username"]] = stats["user_activities"].get(group["username"], 0) + count
+                    stats["daily_activities"][date_str] = stats["daily_activities"].get(date_str, 0) + count
+                    success += group["success"]
+                    duration_sum += group["duration_sum"]
+                    duration_count += group["duration_count"]
+
+        except Exception as e:
+            logger.error(f"❌ 获取活动统计失败: {e}")
+
+        stats["unique_users"] = len(stats["user_activities"])
+
         # 成功率统计
-        successful_activities = sum(1 for a in activities if a.get('success', True))
-        if activities:
-            stats["success_rate"] = successful_activities / len(activities) * 100
-        
+        if stats["total_activities"]:
+            stats["success_rate"] = success / stats["total_activities"] * 100
+
         # 平均耗时统计
-        durations = [a.get('duration_ms', 0) for a in activities if a.get('duration_ms')]
-        if durations:
-            stats["average_duration"] = sum(durations) / len(durations)
+        if duration_count:
+            stats["average_duration"] = duration_sum / duration_count
         
         return stats
     
@@ -398,6 +537,9 @@ class UserActivityLogger:
                     
                     if file_date < cutoff_date:
                         activity_file.unlink()
+                        rollup_file = self._get_rollup_file_path(date_str)
+                        if rollup_file.exists():
+                            rollup_file.unlink()
                         deleted_count += 1
                         logger.info(f"🗑️ 删除旧活动记录: {activity_file.name}")
                         
@@ -411,4 +553,7 @@ class UserActivityLogger:
         return deleted_count
 
 # 全局用户活动记录器实例
-user_activity_logger = UserActivityLogger()
\ No newline at end of file
+user_activity_logger = UserActivityLogger()
+
+# 进程退出时写入缓冲中的活动
+atexit.register(user_activity_logger.flush)
\ No newline at end of file